@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of validated agent code.
+
+Generating agent code costs an LLM round trip plus validation, with
+retries. The result depends only on what the prompt is built from: the
+spec's functional fields, the template type, the model and the generator's
+prompt version. AgentCodeCache keys validated code by a hash of exactly
+that, so an identical or equivalent spec (different id, timestamps, owner
+or capability order) reuses the code.
+
+Lookups go memory, then local disk, then Redis (when a client is given);
+hits from a lower tier are copied into the tiers above it. Concurrent
+requests for the same key share a single generation.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(os.getenv("AGENT_CODE_CACHE_DIR", Path.home() / ".heyjarvis" / "agent_code_cache"))
+
+# Spec fields that never reach the prompt
+VOLATILE_SPEC_FIELDS = {"id", "created_at", "updated_at", "created_by", "status"}
+
+
+def canonical_spec(spec) -> Dict[str, Any]:
+    """The parts of an AgentSpec that determine its generated code, in a stable form."""
+    data = spec.model_dump(mode="json", exclude=VOLATILE_SPEC_FIELDS)
+    data["capabilities"] = sorted(data.get("capabilities", []))
+    return data
+
+
+def spec_cache_key(spec, template_type: str, generator_version: str) -> str:
+    """sha256 of the canonical spec, template type and generator version."""
+    payload = {"spec": canonical_spec(spec), "template_type": template_type, "generator": generator_version}
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+class AgentCodeCache:
+    """Memory, disk and optional Redis tiers of validated code keyed by spec hash."""
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = DEFAULT_CACHE_DIR, redis_client=None,
+                 redis_prefix: str = "agent_code:", redis_ttl: Optional[int] = 30 * 24 * 3600,
+                 max_memory_entries: int = 256):
+        """
+        Initialize the AgentCodeCache.
+
+        Args:
+            cache_dir: Directory for the disk tier; None disables it
+            redis_client: redis.asyncio client for a cache shared between processes
+            redis_prefix: Prefix for Redis keys
+            redis_ttl: Expiry of Redis entries in seconds; None keeps them indefinitely
+            max_memory_entries: Size of the in-process LRU
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.redis_client = redis_client
+        self.redis_prefix = redis_prefix
+        self.redis_ttl = redis_ttl
+        self.max_memory_entries = max_memory_entries
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[str]"] = {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "redis_hits": 0, "misses": 0, "coalesced": 0}
+
+    async def get(self, key: str) -> Optional[str]:
+        """Cached code for ``key``, or None."""
+        code = self._memory.get(key)
+        if code is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return code
+
+        code = await self._read_disk(key)
+        if code is not None:
+            self.stats["disk_hits"] += 1
+            self._remember(key, code)
+            return code
+
+        code = await self._read_redis(key)
+        if code is not None:
+            self.stats["redis_hits"] += 1
+            self._remember(key, code)
+            await self._write_disk(key, code)
+            return code
+
+        return None
+
+    async def put(self, key: str, code: str, **metadata):
+        """Store validated code in every tier."""
+        self._remember(key, code)
+        await asyncio.gather(self._write_disk(key, code, metadata), self._write_redis(key, code))
+
+    async def get_or_generate(self, key: str, generate: Callable[[], Awaitable[str]], **metadata) -> str:
+        """
+        Cached code for ``key``, generating and storing it on a miss.
+
+        Concurrent callers with the same key wait for one ``generate`` call.
+        A failed generation is not cached; every waiter sees the exception.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            code = await self.get(key)
+            if code is None:
+                self.stats["misses"] += 1
+                code = await generate()
+                await self.put(key, code, **metadata)
+            future.set_result(code)
+            return code
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved here so an unawaited failure is not reported
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def invalidate(self, key: str):
+        self._memory.pop(key, None)
+        if self.cache_dir is not None:
+            await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.delete(self.redis_prefix + key)
+            except Exception as e:
+                logger.warning(f"Failed to invalidate cached agent code in Redis: {e}")
+
+    def _remember(self, key: str, code: str):
+        self._memory[key] = code
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    async def _read_disk(self, key: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        return await asyncio.to_thread(self._read_disk_sync, key)
+
+    def _read_disk_sync(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            code = entry["code"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable agent code cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        if entry.get("sha256") != _code_hash(code):
+            logger.warning(f"Discarding corrupted agent code cache entry {path}")
+            path.unlink(missing_ok=True)
+            return None
+        return code
+
+    async def _write_disk(self, key: str, code: str, metadata: Optional[Dict[str, Any]] = None):
+        if self.cache_dir is None:
+            return
+        try:
+            await asyncio.to_thread(self._write_disk_sync, key, code, metadata or {})
+        except OSError as e:
+            logger.warning(f"Failed to write agent code cache entry: {e}")
+
+    def _write_disk_sync(self, key: str, code: str, metadata: Dict[str, Any]):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "key": key,
+            "sha256": _code_hash(code),
+            "cached_at": datetime.now(timezone.utc).isoformat(),
+            **metadata,
+            "code": code
+        }
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    async def _read_redis(self, key: str) -> Optional[str]:
+        if self.redis_client is None:
+            return None
+        try:
+            value = await self.redis_client.get(self.redis_prefix + key)
+        except Exception as e:
+            logger.warning(f"Failed to read cached agent code from Redis: {e}")
+            return None
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    async def _write_redis(self, key: str, code: str):
+        if self.redis_client is None:
+            return
+        try:
+            if self.redis_ttl:
+                await self.redis_client.set(self.redis_prefix + key, code, ex=self.redis_ttl)
+            else:
+                await self.redis_client.set(self.redis_prefix + key, code)
+        except Exception as e:
+            logger.warning(f"Failed to write cached agent code to Redis: {e}")
+
+
+_default_cache: Optional[AgentCodeCache] = None
+
+
+def get_default_code_cache() -> AgentCodeCache:
+    """Process-wide cache used by generators that are not given one."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AgentCodeCache()
+    return _default_cache
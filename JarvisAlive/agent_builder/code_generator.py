@@ -2,6 +2,7 @@
 
 import ast
 import asyncio
+import hashlib
 import logging
 import re
 import json
@@ -13,9 +14,13 @@ from langchain_anthropic import ChatAnthropic
 from langchain.schema import HumanMessage, SystemMessage
 
 from .agent_spec import AgentSpec, TimeTrigger, EventTrigger, ManualTrigger
+from .code_cache import AgentCodeCache, get_default_code_cache, spec_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Bump when prompts or validation change, so previously cached code is regenerated
+PROMPT_VERSION = "1"
+
 
 @dataclass
 class ValidationResult:
@@ -37,12 +42,13 @@ class CodeGenerationError(Exception):
 class AgentCodeGenerator:
     """LLM-powered generator for agent Python code."""
     
-    def __init__(self, anthropic_api_key: str):
-        self.llm = ChatAnthropic(
-            api_key=anthropic_api_key,
-            model="claude-3-5-sonnet-20241022",
-            temperature=0.1
-        )
+    def __init__(self, anthropic_api_key: str, cache: Optional[AgentCodeCache] = None, use_cache: bool = True):
+        self.anthropic_api_key = anthropic_api_key
+        self.model = "claude-3-5-sonnet-20241022"
+        self._llm = None
+        
+        # Validated code is reused for equivalent specs
+        self.cache = (cache or get_default_code_cache()) if use_cache else None
         
         # Define approved libraries for security
         self.approved_libraries = {
@@ -64,8 +70,44 @@ class AgentCodeGenerator:
             r'open\s*\([^)]*["\']w["\']', r'open\s*\([^)]*["\']a["\']'
         ]
 
+    @property
+    def llm(self) -> ChatAnthropic:
+        """Created on first use; cached code never needs a client."""
+        if self._llm is None:
+            self._llm = ChatAnthropic(
+                api_key=self.anthropic_api_key,
+                model=self.model,
+                temperature=0.1
+            )
+        return self._llm
+    
+    @llm.setter
+    def llm(self, llm):
+        self._llm = llm
+    
     async def generate_agent_code(self, spec: AgentSpec) -> str:
-        """Generate Python code for an agent specification."""
+        """Generate Python code for an agent specification, reusing cached code for equivalent specs."""
+        if self.cache is None:
+            return await self._generate_validated_code(spec)
+        
+        template_type = self._determine_template_type(spec)
+        key = self.cache_key(spec, template_type)
+        return await self.cache.get_or_generate(
+            key,
+            lambda: self._generate_validated_code(spec),
+            agent_name=spec.name,
+            template_type=template_type
+        )
+    
+    def cache_key(self, spec: AgentSpec, template_type: Optional[str] = None) -> str:
+        """Content hash of everything the generated code depends on."""
+        template_type = template_type or self._determine_template_type(spec)
+        rules = '\n'.join(sorted(self.approved_libraries) + self.forbidden_patterns)
+        rules_hash = hashlib.sha256(rules.encode('utf-8')).hexdigest()[:12]
+        return spec_cache_key(spec, template_type, f"{self.model}/{PROMPT_VERSION}/{rules_hash}")
+    
+    async def _generate_validated_code(self, spec: AgentSpec) -> str:
+        """Generate code with the LLM, validating and retrying up to three times."""
         logger.info(f"Code generation attempt 1/3 for agent: {spec.name}")
         
         previous_error = None
@@ -765,16 +807,18 @@ class BaseAgent(ABC):
 
 
 # Main function for external use
-async def generate_agent_code(spec: AgentSpec, anthropic_api_key: str) -> str:
+async def generate_agent_code(spec: AgentSpec, anthropic_api_key: str,
+                              cache: Optional[AgentCodeCache] = None) -> str:
     """
     Generate executable Python code for an AgentSpec.
     
     Args:
         spec: Validated AgentSpec instance
         anthropic_api_key: Anthropic API key for LLM
+        cache: Code cache to use; defaults to the process-wide disk cache
         
     Returns:
         Executable Python code as string
     """
-    generator = AgentCodeGenerator(anthropic_api_key)
+    generator = AgentCodeGenerator(anthropic_api_key, cache=cache)
     return await generator.generate_agent_code(spec)
\ No newline at end of file
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""Pool of pre-warmed sandbox containers for HeyJarvis agents.
+
+Creating a sandbox container is the slow part of deploying an agent. The
+pool keeps ``target_size`` generic containers created and running (idling
+on ``sleep``) so an agent deployment only has to hand one out: the agent
+code, secrets and logs live in a per-container host directory bind-mounted
+into it, and are written when the sandbox is acquired. Released containers
+have every process the agent left behind killed and its files cleared, and
+are reused until ``max_uses``; a background task replaces containers as
+they are handed out, health-checks the idle ones and shrinks the pool back
+to ``target_size`` once extra containers sit idle for ``idle_timeout``.
+"""
+
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .docker_executor import DockerExecutor
+
+logger = logging.getLogger(__name__)
+
+IDLE_COMMAND = ["sleep", "infinity"]
+# Between tenants: kill everything the last agent left running (kill -1 spares
+# PID 1 and the shell itself), wipe /tmp, then fail unless no other live
+# process remains. Zombies are left for the idle PID 1 and hold nothing open.
+RESET_COMMAND = ["sh", "-c", (
+    "kill -9 -1 2>/dev/null; sleep 0.1; "
+    "rm -rf /tmp/* /tmp/.[!.]* 2>/dev/null; "
+    "for stat in /proc/[0-9]*/stat; do "
+    "read -r pid comm state rest < \"$stat\" 2>/dev/null || continue; "
+    "[ \"$pid\" = 1 ] || [ \"$pid\" = $$ ] || [ \"$state\" = Z ] || exit 1; "
+    "done; exit 0"
+)]
+
+
+@dataclass
+class PooledSandbox:
+    """A warm container and the host directory mounted into it."""
+    name: str
+    container: Any
+    workdir: Path
+    created_at: float = field(default_factory=time.time)
+    uses: int = 0
+    idle_since: float = 0.0
+    limits: Optional[Tuple[float, int]] = None  # (CPU cores, memory MB) currently applied
+
+    @property
+    def agent_dir(self) -> Path:
+        return self.workdir / "agent"
+
+    @property
+    def secrets_dir(self) -> Path:
+        return self.workdir / "secrets"
+
+    @property
+    def logs_dir(self) -> Path:
+        return self.workdir / "logs"
+
+
+class SandboxPool:
+    """Keeps idle sandbox containers ready to be acquired."""
+
+    def __init__(self, docker_client, config, target_size: int = 2, max_size: int = 8,
+                 max_uses: int = 20, health_check_interval: float = 30.0, idle_timeout: float = 300.0,
+                 executor: Optional[DockerExecutor] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            docker_client: docker.DockerClient (or anything with the same containers API)
+            config: SandboxConfig with the image, network and resource ceilings
+            target_size: Idle containers to keep ready
+            max_size: Upper bound on idle plus in-use containers
+            max_uses: Agent runs after which a container is replaced instead of reset
+            health_check_interval: Seconds between health checks of idle containers
+            idle_timeout: Seconds an idle container beyond target_size is kept for reuse
+            executor: DockerExecutor for the blocking Docker calls; a private one if omitted
+        """
+        self.docker_client = docker_client
+        self.config = config
+        self.target_size = target_size
+        self.max_size = max(max_size, target_size, 1)
+        self.max_uses = max_uses
+        self.health_check_interval = health_check_interval
+        self.idle_timeout = idle_timeout
+        self.executor = executor or DockerExecutor()
+
+        self._idle: Deque[PooledSandbox] = deque()
+        self._in_use: Dict[str, PooledSandbox] = {}
+        self._warming = 0     # Background creations headed for the idle queue
+        self._cold = 0        # Creations for an acquire that found no idle container
+        self._changed: Optional[asyncio.Condition] = None
+        self._replenish: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.created = 0
+        self.destroyed = 0
+        self.hits = 0
+        self.misses = 0
+        self.acquire_latencies: Deque[float] = deque(maxlen=1000)
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._warming + self._cold
+
+    def _ensure_primitives(self):
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+            self._replenish = asyncio.Event()
+
+    async def start(self) -> None:
+        """Start warming containers and the maintenance task; returns immediately."""
+        self._ensure_primitives()
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintain())
+        self._replenish.set()
+
+    async def fill(self) -> int:
+        """Create containers until ``target_size`` are idle (or warming); returns how many were added."""
+        self._ensure_primitives()
+        async with self._changed:
+            needed = min(self.target_size - len(self._idle) - self._warming, self.max_size - self.size)
+            if self._closed or needed <= 0:
+                return 0
+            self._warming += needed
+
+        results = await asyncio.gather(*(self._create() for _ in range(needed)), return_exceptions=True)
+        added = 0
+        async with self._changed:
+            self._warming -= needed
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to warm sandbox container: {result}")
+                elif self._closed:
+                    asyncio.create_task(self._destroy(result))
+                else:
+                    self._push_idle(result)
+                    added += 1
+            self._changed.notify_all()
+        return added
+
+    async def acquire(self) -> PooledSandbox:
+        """Take an idle container, creating one if none is ready and the pool is below max_size."""
+        self._ensure_primitives()
+        start = time.perf_counter()
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._closed or self._idle or self.size < self.max_size)
+            if self._closed:
+                raise RuntimeError("Sandbox pool is closed")
+            # Most recently used first, so surplus containers age out at the other end
+            sandbox = self._idle.pop() if self._idle else None
+            if sandbox is None:
+                self._cold += 1
+
+        if sandbox is None:
+            self.misses += 1
+            try:
+                sandbox = await self._create()
+            finally:
+                async with self._changed:
+                    self._cold -= 1
+                    self._changed.notify_all()
+        else:
+            self.hits += 1
+
+        sandbox.uses += 1
+        self._in_use[sandbox.name] = sandbox
+        self._replenish.set()
+        self.acquire_latencies.append(time.perf_counter() - start)
+        return sandbox
+
+    async def release(self, sandbox: PooledSandbox, reuse: bool = True) -> None:
+        """Return a container; it is reset and kept for reuse if healthy, destroyed otherwise."""
+        self._ensure_primitives()
+        if sandbox.name not in self._in_use:
+            return
+
+        # The container counts against max_size until it is back in the idle queue or removed
+        keep = reuse and not self._closed and sandbox.uses < self.max_uses
+        if keep:
+            keep = await self._reset(sandbox)
+        if not keep:
+            await self._destroy(sandbox)
+
+        async with self._changed:
+            if self._in_use.pop(sandbox.name, None) is not None and keep:
+                self._push_idle(sandbox)
+            self._changed.notify_all()
+        self._replenish.set()
+
+    async def check_health(self) -> int:
+        """Destroy idle containers that stopped running or are surplus; returns how many were removed."""
+        self._ensure_primitives()
+        idle = list(self._idle)
+        healthy = await asyncio.gather(*(self._is_running(sandbox) for sandbox in idle))
+        dead = [sandbox for sandbox, ok in zip(idle, healthy) if not ok]
+        for sandbox in dead:
+            logger.warning(f"Idle sandbox {sandbox.name} is unhealthy, replacing it")
+
+        async with self._changed:
+            removed = []
+            for sandbox in dead:
+                try:
+                    self._idle.remove(sandbox)
+                    removed.append(sandbox)
+                except ValueError:
+                    pass  # Acquired meanwhile; it is replaced when released
+            # The least recently used containers sit at the left
+            expired = time.monotonic() - self.idle_timeout
+            while len(self._idle) > self.target_size and self._idle[0].idle_since < expired:
+                removed.append(self._idle.popleft())
+            self._changed.notify_all()
+
+        await asyncio.gather(*(self._destroy(sandbox) for sandbox in removed))
+        if dead:
+            self._replenish.set()
+        return len(removed)
+
+    async def close(self) -> None:
+        """Stop maintenance and destroy every container the pool owns."""
+        self._ensure_primitives()
+        self._closed = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        async with self._changed:
+            sandboxes = list(self._idle) + list(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+            self._changed.notify_all()
+        await asyncio.gather(*(self._destroy(sandbox) for sandbox in sandboxes))
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.acquire_latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            "idle": len(self._idle),
+            "in_use": len(self._in_use),
+            "warming": self._warming,
+            "target_size": self.target_size,
+            "max_size": self.max_size,
+            "created": self.created,
+            "destroyed": self.destroyed,
+            "hits": self.hits,
+            "misses": self.misses,
+            "acquire_p50_ms": round(percentile(0.50), 3),
+            "acquire_p95_ms": round(percentile(0.95), 3)
+        }
+
+    def _push_idle(self, sandbox: PooledSandbox):
+        sandbox.idle_since = time.monotonic()
+        self._idle.append(sandbox)
+
+    async def _maintain(self):
+        """Refill after acquires and releases; check idle containers periodically."""
+        next_check = time.monotonic() + self.health_check_interval
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._replenish.wait(), max(0.0, next_check - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            self._replenish.clear()
+            try:
+                if time.monotonic() >= next_check:
+                    next_check = time.monotonic() + self.health_check_interval
+                    await self.check_health()
+                await self.fill()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Sandbox pool maintenance failed: {e}")
+
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking Docker SDK call on the executor."""
+        return await self.executor.run(fn, *args, **kwargs)
+
+    async def _create(self) -> PooledSandbox:
+        return await self._run(self._create_sync)
+
+    def _create_sync(self) -> PooledSandbox:
+        name = f"sandbox-pool-{uuid.uuid4().hex[:8]}"
+        workdir = Path(tempfile.mkdtemp(prefix=f"{name}-"))
+        sandbox = PooledSandbox(name=name, container=None, workdir=workdir,
+                                limits=(self.config.max_cpu_cores, self.config.max_memory_mb))
+        for directory in (sandbox.agent_dir, sandbox.secrets_dir, sandbox.logs_dir):
+            directory.mkdir()
+
+        try:
+            memory_limit = f"{self.config.max_memory_mb}m"
+            sandbox.container = self.docker_client.containers.create(
+                image=self.config.base_image,
+                name=name,
+                environment={'SANDBOX_ID': name, 'AGENT_FILE': '/app/agent/agent.py'},
+                volumes={
+                    str(sandbox.agent_dir): {'bind': '/app/agent', 'mode': 'ro'},
+                    str(sandbox.secrets_dir): {'bind': self.config.secrets_volume, 'mode': 'ro'},
+                    str(sandbox.logs_dir): {'bind': self.config.logs_volume, 'mode': 'rw'}
+                },
+                network=self.config.network_name,
+                security_opt=['no-new-privileges:true'],
+                read_only=True,
+                tmpfs={'/tmp': 'size=100m,noexec'},
+                mem_limit=memory_limit,
+                memswap_limit=memory_limit,
+                cpu_period=100000,
+                cpu_quota=int(self.config.max_cpu_cores * 100000),
+                detach=True,
+                user="agentuser",
+                working_dir="/app",
+                labels={'heyjarvis.sandbox.pool': 'true'},
+                command=IDLE_COMMAND
+            )
+            sandbox.container.start()
+        except Exception:
+            if sandbox.container is not None:
+                try:
+                    sandbox.container.remove(force=True)
+                except Exception:
+                    pass
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise
+
+        self.created += 1
+        logger.debug(f"Warmed sandbox container {name}")
+        return sandbox
+
+    async def _destroy(self, sandbox: PooledSandbox):
+        try:
+            await self._run(sandbox.container.remove, force=True)
+        except Exception as e:
+            logger.warning(f"Failed to remove sandbox container {sandbox.name}: {e}")
+        await self._run(shutil.rmtree, sandbox.workdir, ignore_errors=True)
+        self.destroyed += 1
+
+    async def _is_running(self, sandbox: PooledSandbox) -> bool:
+        try:
+            await self._run(sandbox.container.reload)
+            return sandbox.container.status == "running"
+        except Exception:
+            return False
+
+    async def _reset(self, sandbox: PooledSandbox) -> bool:
+        """
+        Clear the previous agent's processes, files and scratch space.
+
+        Returns False if the container is unusable or a process survived, in
+        which case it must not be handed to another agent.
+        """
+        try:
+            if not await self._is_running(sandbox):
+                return False
+            # Processes go before the workdir, so nothing of the last agent can write into it afterwards
+            result = await self._run(sandbox.container.exec_run, RESET_COMMAND, user="agentuser")
+            if result.exit_code != 0:
+                logger.warning(f"Sandbox {sandbox.name} still runs processes after reset, replacing it")
+                return False
+            await self._run(self._clear_workdir, sandbox)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset sandbox {sandbox.name}: {e}")
+            return False
+
+    @staticmethod
+    def _clear_workdir(sandbox: PooledSandbox):
+        for directory in (sandbox.agent_dir, sandbox.secrets_dir, sandbox.logs_dir):
+            shutil.rmtree(directory, ignore_errors=True)
+            directory.mkdir()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Runs blocking Docker SDK calls off the event loop.
+
+The ``docker`` SDK is synchronous: every container, image and network call
+blocks on an HTTP round trip to the daemon. DockerExecutor runs them on a
+dedicated, bounded thread pool (so Docker work cannot exhaust the loop's
+default executor) and bounds how long the caller waits for each one.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_STREAM_END = object()
+
+
+class DockerCallTimeout(TimeoutError):
+    """Raised when a Docker call does not finish within its timeout."""
+    pass
+
+
+class DockerExecutor:
+    """Bounded thread pool with per-call timeouts for Docker SDK calls."""
+
+    def __init__(self, max_workers: int = 8, timeout: Optional[float] = 60.0):
+        """
+        Initialize the DockerExecutor.
+
+        Args:
+            max_workers: Number of Docker worker threads (and the cap on in-flight calls)
+            timeout: Default seconds to wait for a call; None waits indefinitely
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.calls = 0
+        self.timeouts = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="docker")
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args, call_timeout: Optional[float] = ..., **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` on a Docker worker thread.
+
+        A call that times out keeps its worker thread until the daemon
+        answers; only the caller stops waiting for it.
+
+        Args:
+            fn: Blocking Docker SDK callable
+            call_timeout: Seconds to wait; defaults to the executor's timeout, None waits indefinitely
+        """
+        timeout = self.timeout if call_timeout is ... else call_timeout
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        self.calls += 1
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            name = getattr(fn, "__qualname__", repr(fn))
+            raise DockerCallTimeout(f"Docker call {name} timed out after {timeout}s")
+
+    async def iterate(self, factory: Callable[[], Iterator[Any]], max_buffered: int = 16) -> AsyncIterator[Any]:
+        """
+        Consume a blocking Docker stream (stats, logs, events) without blocking the loop.
+
+        The stream is read on its own thread rather than the bounded pool,
+        since it blocks between items for as long as the subscription lasts.
+        When the consumer stops early the reader thread exits after its
+        next item.
+
+        Args:
+            factory: Opens the blocking iterator, e.g. ``lambda: container.stats(stream=True, decode=True)``
+            max_buffered: Items buffered ahead of a slow consumer; older items are dropped
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+
+        def put(item):
+            if queue.qsize() >= max_buffered and item is not _STREAM_END and not isinstance(item, BaseException):
+                queue.get_nowait()  # Keep the newest items for a slow consumer
+            queue.put_nowait(item)
+
+        def read():
+            try:
+                stream = factory()
+                try:
+                    for item in stream:
+                        if stopped.is_set():
+                            break
+                        loop.call_soon_threadsafe(put, item)
+                finally:
+                    close = getattr(stream, "close", None)
+                    if close:
+                        close()
+                loop.call_soon_threadsafe(put, _STREAM_END)
+            except BaseException as e:
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(put, e)
+
+        reader = threading.Thread(target=read, name="docker-stream", daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
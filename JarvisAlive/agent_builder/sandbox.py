@@ -9,10 +9,12 @@ import tempfile
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator, Iterable
 from dataclasses import dataclass
 
 from .agent_spec import AgentSpec
+from .container_pool import PooledSandbox, SandboxPool
+from .docker_executor import DockerCallTimeout, DockerExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,14 @@ class SandboxConfig:
     allowed_networks: List[str] = None
     secrets_volume: str = "/app/secrets"
     logs_volume: str = "/app/logs"
+    pool_target_size: int = 2  # Warm containers kept ready; 0 creates one per agent
+    pool_max_size: int = 8
+    pool_max_uses: int = 20
+    pool_health_check_interval: float = 30.0
+    pool_idle_timeout: float = 300.0
+    docker_workers: int = 8  # Threads for blocking Docker SDK calls
+    docker_call_timeout: float = 60.0
+    image_build_timeout: float = 1800.0
     
     def __post_init__(self):
         if self.allowed_networks is None:
@@ -54,16 +64,21 @@ class SandboxTimeoutError(SandboxError):
 class SandboxManager:
     """Manages Docker sandboxes for safe agent execution."""
     
-    def __init__(self, config: Optional[SandboxConfig] = None):
+    def __init__(self, config: Optional[SandboxConfig] = None, docker_client=None):
         self.config = config or SandboxConfig()
-        self.docker_client = None
+        self.docker_client = docker_client
+        self.docker = DockerExecutor(self.config.docker_workers, self.config.docker_call_timeout)
         self.active_containers: Dict[str, docker.models.containers.Container] = {}
         self.container_logs: Dict[str, List[str]] = {}
+        self.pool: Optional[SandboxPool] = None
+        self.pooled_sandboxes: Dict[str, PooledSandbox] = {}
+        self.run_environments: Dict[str, Dict[str, str]] = {}
         
     async def initialize(self) -> None:
         """Initialize the sandbox manager."""
         try:
-            self.docker_client = docker.from_env()
+            if self.docker_client is None:
+                self.docker_client = await self.docker.run(docker.from_env)
             
             # Build base image if it doesn't exist
             await self._ensure_base_image()
@@ -71,6 +86,20 @@ class SandboxManager:
             # Create sandbox network if it doesn't exist
             await self._ensure_sandbox_network()
             
+            # Start warming containers in the background
+            if self.config.pool_target_size > 0:
+                self.pool = SandboxPool(
+                    self.docker_client,
+                    self.config,
+                    target_size=self.config.pool_target_size,
+                    max_size=self.config.pool_max_size,
+                    max_uses=self.config.pool_max_uses,
+                    health_check_interval=self.config.pool_health_check_interval,
+                    idle_timeout=self.config.pool_idle_timeout,
+                    executor=self.docker
+                )
+                await self.pool.start()
+            
             logger.info("SandboxManager initialized successfully")
             
         except Exception as e:
@@ -82,7 +111,7 @@ class SandboxManager:
         try:
             # Check if image exists
             try:
-                self.docker_client.images.get(self.config.base_image)
+                await self.docker.run(self.docker_client.images.get, self.config.base_image)
                 logger.info(f"Base image {self.config.base_image} already exists")
                 return
             except docker.errors.ImageNotFound:
@@ -93,13 +122,15 @@ class SandboxManager:
             dockerfile_dir = Path(__file__).parent / "docker"
             
             try:
-                image, logs = self.docker_client.images.build(
+                image, logs = await self.docker.run(
+                    self.docker_client.images.build,
                     path=str(dockerfile_dir),
                     dockerfile="Dockerfile.agent",
                     tag=self.config.base_image,
                     rm=True,
                     forcerm=True,
-                    nocache=False  # Allow caching for faster rebuilds
+                    nocache=False,  # Allow caching for faster rebuilds
+                    call_timeout=self.config.image_build_timeout
                 )
                 
                 # Log build output
@@ -116,12 +147,14 @@ class SandboxManager:
                 
                 # Try to get build logs even on failure
                 try:
-                    _, logs = self.docker_client.images.build(
+                    _, logs = await self.docker.run(
+                        self.docker_client.images.build,
                         path=str(dockerfile_dir),
                         dockerfile="Dockerfile.agent",
                         tag=self.config.base_image + "-debug",
                         rm=False,
-                        forcerm=False
+                        forcerm=False,
+                        call_timeout=self.config.image_build_timeout
                     )
                     
                     for log in logs:
@@ -143,13 +176,14 @@ class SandboxManager:
         """Ensure the sandbox network exists."""
         try:
             # Check if network exists
-            networks = self.docker_client.networks.list(names=[self.config.network_name])
+            networks = await self.docker.run(self.docker_client.networks.list, names=[self.config.network_name])
             if networks:
                 logger.info(f"Sandbox network {self.config.network_name} already exists")
                 return
             
             # Create isolated network
-            network = self.docker_client.networks.create(
+            network = await self.docker.run(
+                self.docker_client.networks.create,
                 self.config.network_name,
                 driver="bridge",
                 options={
@@ -187,6 +221,10 @@ class SandboxManager:
         """
         try:
             container_id = f"agent-{agent_id}-{uuid.uuid4().hex[:8]}"
+            
+            if self.pool:
+                return await self._create_pooled_sandbox(container_id, agent_code, agent_spec, requirements, secrets)
+            
             logger.info(f"Creating sandbox for agent {agent_id}: {container_id}")
             
             # Create temporary directory for agent files
@@ -243,7 +281,8 @@ class SandboxManager:
             ]
             
             # Create container
-            container = self.docker_client.containers.create(
+            container = await self.docker.run(
+                self.docker_client.containers.create,
                 image=self.config.base_image,
                 name=container_id,
                 environment=environment,
@@ -272,6 +311,56 @@ class SandboxManager:
             logger.error(f"Failed to create sandbox for {agent_id}: {e}")
             raise SandboxError(f"Sandbox creation failed: {e}")
     
+    async def _create_pooled_sandbox(
+        self,
+        container_id: str,
+        agent_code: str,
+        agent_spec: AgentSpec,
+        requirements: Optional[List[str]],
+        secrets: Optional[Dict[str, str]]
+    ) -> str:
+        """Hand a warm container from the pool to an agent."""
+        sandbox = await self.pool.acquire()
+        try:
+            with open(sandbox.agent_dir / "agent.py", 'w') as f:
+                f.write(agent_code)
+            
+            if requirements:
+                with open(sandbox.agent_dir / "additional_requirements.txt", 'w') as f:
+                    f.write('\n'.join(requirements))
+            
+            for key, value in (secrets or {}).items():
+                with open(sandbox.secrets_dir / f"{key}.txt", 'w') as f:
+                    f.write(value)
+            
+            # Warm containers keep the limits of their previous agent; apply this agent's
+            cpu_limit = min(agent_spec.resource_limits.cpu, self.config.max_cpu_cores)
+            memory_limit = min(agent_spec.resource_limits.memory, self.config.max_memory_mb)
+            if sandbox.limits != (cpu_limit, memory_limit):
+                await self.docker.run(
+                    sandbox.container.update,
+                    cpu_quota=int(cpu_limit * 100000),
+                    mem_limit=f"{memory_limit}m",
+                    memswap_limit=f"{memory_limit}m"
+                )
+                sandbox.limits = (cpu_limit, memory_limit)
+        except Exception:
+            await self.pool.release(sandbox, reuse=False)
+            raise
+        
+        self.active_containers[container_id] = sandbox.container
+        self.container_logs[container_id] = []
+        self.pooled_sandboxes[container_id] = sandbox
+        self.run_environments[container_id] = {
+            'SANDBOX_ID': container_id,
+            'AGENT_TIMEOUT': str(agent_spec.resource_limits.timeout),
+            'AGENT_MAX_MEMORY': str(agent_spec.resource_limits.memory),
+            'AGENT_FILE': '/app/agent/agent.py'
+        }
+        
+        logger.info(f"Assigned warm sandbox {sandbox.name} to {container_id}")
+        return container_id
+    
     async def execute_agent(self, container_id: str, timeout: Optional[int] = None) -> Dict[str, Any]:
         """
         Execute the agent in the sandbox.
@@ -289,18 +378,21 @@ class SandboxManager:
         container = self.active_containers[container_id]
         timeout = timeout or self.config.default_timeout
         
+        if container_id in self.pooled_sandboxes:
+            return await self._execute_pooled_agent(container_id, container, timeout)
+        
         try:
             logger.info(f"Starting agent execution in {container_id}")
             
             # Start the container
-            container.start()
+            await self.docker.run(container.start)
             
             # Wait for completion with timeout
             try:
-                exit_code = container.wait(timeout=timeout)
+                exit_code = await self.docker.run(container.wait, timeout=timeout, call_timeout=timeout + 5)
                 
                 # Get logs
-                logs = container.logs(stdout=True, stderr=True).decode('utf-8')
+                logs = (await self.docker.run(container.logs, stdout=True, stderr=True)).decode('utf-8')
                 self.container_logs[container_id].append(logs)
                 
                 # Parse results from logs (should be JSON output)
@@ -314,7 +406,7 @@ class SandboxManager:
             except Exception as e:
                 # Container didn't finish in time
                 logger.warning(f"Agent execution timeout: {container_id}")
-                container.stop(timeout=10)
+                await self.docker.run(container.stop, timeout=10)
                 
                 return {
                     'status': 'timeout',
@@ -331,6 +423,49 @@ class SandboxManager:
                 'container_id': container_id
             }
     
+    async def _execute_pooled_agent(self, container_id: str, container, timeout: int) -> Dict[str, Any]:
+        """Run the agent as a process inside an already running warm container."""
+        try:
+            logger.info(f"Starting agent execution in warm sandbox {container_id}")
+            exec_result = await self.docker.run(
+                container.exec_run,
+                ["python", "/app/base_agent.py"],
+                environment=self.run_environments[container_id],
+                user="agentuser",
+                workdir="/app",
+                call_timeout=timeout
+            )
+            
+            logs = exec_result.output.decode('utf-8') if exec_result.output else ""
+            self.container_logs[container_id].append(logs)
+            
+            result = self._parse_execution_result(logs)
+            result['exit_code'] = exec_result.exit_code
+            result['container_id'] = container_id
+            
+            logger.info(f"Agent execution completed: {container_id}")
+            return result
+            
+        except DockerCallTimeout:
+            # The agent process cannot be interrupted on its own; stop the container so it is not reused
+            logger.warning(f"Agent execution timeout: {container_id}")
+            await self.docker.run(container.stop, timeout=10)
+            
+            return {
+                'status': 'timeout',
+                'error': f'Execution timed out after {timeout} seconds',
+                'container_id': container_id,
+                'timeout': timeout
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to execute agent {container_id}: {e}")
+            return {
+                'status': 'error',
+                'error': str(e),
+                'container_id': container_id
+            }
+    
     def _parse_execution_result(self, logs: str) -> Dict[str, Any]:
         """Parse execution results from container logs."""
         try:
@@ -364,9 +499,13 @@ class SandboxManager:
         if container_id not in self.active_containers:
             raise SandboxError(f"Container {container_id} not found")
         
+        # Warm containers only log their idle command; agent output is captured per run
+        if container_id in self.pooled_sandboxes:
+            return '\n'.join(self.container_logs.get(container_id, [])).split('\n')
+        
         try:
             container = self.active_containers[container_id]
-            logs = container.logs(stdout=True, stderr=True).decode('utf-8')
+            logs = (await self.docker.run(container.logs, stdout=True, stderr=True)).decode('utf-8')
             return logs.split('\n')
             
         except Exception as e:
@@ -380,7 +519,7 @@ class SandboxManager:
         
         try:
             container = self.active_containers[container_id]
-            container.stop(timeout=timeout)
+            await self.docker.run(container.stop, timeout=timeout)
             logger.info(f"Stopped agent: {container_id}")
             return True
             
@@ -394,22 +533,24 @@ class SandboxManager:
             logger.warning(f"Container {container_id} not found for cleanup")
             return True
         
+        if container_id in self.pooled_sandboxes:
+            return await self._release_pooled_sandbox(container_id)
+        
         try:
             container = self.active_containers[container_id]
             
             # Stop container if running
             try:
-                container.stop(timeout=5)
+                await self.docker.run(container.stop, timeout=5)
             except:
                 pass
             
             # Remove container
-            container.remove(force=True)
+            await self.docker.run(container.remove, force=True)
             
             # Cleanup references
-            del self.active_containers[container_id]
-            if container_id in self.container_logs:
-                del self.container_logs[container_id]
+            self.active_containers.pop(container_id, None)
+            self.container_logs.pop(container_id, None)
             
             logger.info(f"Cleaned up sandbox: {container_id}")
             return True
@@ -418,35 +559,73 @@ class SandboxManager:
             logger.error(f"Failed to cleanup sandbox {container_id}: {e}")
             return False
     
+    async def _release_pooled_sandbox(self, container_id: str) -> bool:
+        """Return a warm container to the pool, which resets or replaces it."""
+        sandbox = self.pooled_sandboxes.pop(container_id)
+        del self.active_containers[container_id]
+        self.container_logs.pop(container_id, None)
+        self.run_environments.pop(container_id, None)
+        
+        try:
+            await self.pool.release(sandbox)
+            logger.info(f"Released sandbox {container_id} to the pool")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to release sandbox {container_id}: {e}")
+            return False
+    
+    async def stop_agents(self, container_ids: Iterable[str], timeout: int = 10) -> Dict[str, bool]:
+        """Stop several agents in parallel; maps each container ID to whether it stopped."""
+        container_ids = list(container_ids)
+        results = await asyncio.gather(
+            *(self.stop_agent(container_id, timeout) for container_id in container_ids),
+            return_exceptions=True
+        )
+        return {container_id: result is True for container_id, result in zip(container_ids, results)}
+    
+    async def cleanup_sandboxes(self, container_ids: Iterable[str]) -> Dict[str, bool]:
+        """Remove several containers in parallel; maps each container ID to whether it was cleaned up."""
+        container_ids = list(container_ids)
+        results = await asyncio.gather(
+            *(self.cleanup_sandbox(container_id) for container_id in container_ids),
+            return_exceptions=True
+        )
+        return {container_id: result is True for container_id, result in zip(container_ids, results)}
+    
     async def list_active_containers(self) -> List[Dict[str, Any]]:
         """List all active agent containers."""
-        containers = []
-        
-        for container_id, container in self.active_containers.items():
-            try:
-                container.reload()
-                status = container.status
-                
-                containers.append({
-                    'container_id': container_id,
-                    'status': status,
-                    'created': container.attrs['Created'],
-                    'image': container.attrs['Config']['Image'],
-                    'labels': container.attrs['Config'].get('Labels', {})
-                })
-                
-            except Exception as e:
-                logger.error(f"Error getting info for container {container_id}: {e}")
-        
-        return containers
+        infos = await asyncio.gather(
+            *(self._container_info(container_id, container)
+              for container_id, container in list(self.active_containers.items()))
+        )
+        return [info for info in infos if info is not None]
+    
+    async def _container_info(self, container_id: str, container) -> Optional[Dict[str, Any]]:
+        try:
+            await self.docker.run(container.reload)
+            status = container.status
+            
+            return {
+                'container_id': container_id,
+                'status': status,
+                'created': container.attrs['Created'],
+                'image': container.attrs['Config']['Image'],
+                'labels': container.attrs['Config'].get('Labels', {})
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting info for container {container_id}: {e}")
+            return None
     
     async def cleanup_all(self) -> None:
         """Cleanup all managed containers."""
         logger.info("Cleaning up all sandbox containers...")
         
         container_ids = list(self.active_containers.keys())
-        for container_id in container_ids:
-            await self.cleanup_sandbox(container_id)
+        await self.cleanup_sandboxes(container_ids)
+        
+        if self.pool:
+            await self.pool.close()
         
         logger.info(f"Cleaned up {len(container_ids)} containers")
     
@@ -457,21 +636,44 @@ class SandboxManager:
         
         try:
             container = self.active_containers[container_id]
-            stats = container.stats(stream=False)
-            
-            # Parse key metrics
-            return {
-                'cpu_usage': self._calculate_cpu_usage(stats),
-                'memory_usage_mb': stats['memory']['usage'] / (1024 * 1024),
-                'memory_limit_mb': stats['memory']['limit'] / (1024 * 1024),
-                'network_io': stats.get('networks', {}),
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            }
+            stats = await self.docker.run(container.stats, stream=False)
+            return self._format_stats(stats)
             
         except Exception as e:
             logger.error(f"Failed to get stats for {container_id}: {e}")
             return None
     
+    async def get_all_container_stats(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get stats for every active container in parallel."""
+        container_ids = list(self.active_containers.keys())
+        stats = await asyncio.gather(*(self.get_container_stats(container_id) for container_id in container_ids))
+        return dict(zip(container_ids, stats))
+    
+    async def stream_container_stats(self, container_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Subscribe to a container's stats as Docker reports them (about once a second).
+        
+        The subscription ends when the container stops or the consumer stops
+        iterating; a slow consumer receives the most recent samples.
+        """
+        if container_id not in self.active_containers:
+            raise SandboxError(f"Container {container_id} not found")
+        
+        container = self.active_containers[container_id]
+        async for stats in self.docker.iterate(lambda: container.stats(stream=True, decode=True)):
+            yield self._format_stats(stats)
+    
+    def _format_stats(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse key metrics from a Docker stats sample."""
+        memory = stats.get('memory_stats') or stats.get('memory') or {}
+        return {
+            'cpu_usage': self._calculate_cpu_usage(stats),
+            'memory_usage_mb': memory.get('usage', 0) / (1024 * 1024),
+            'memory_limit_mb': memory.get('limit', 0) / (1024 * 1024),
+            'network_io': stats.get('networks', {}),
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
+    
     def _calculate_cpu_usage(self, stats: Dict[str, Any]) -> float:
         """Calculate CPU usage percentage from container stats."""
         try:
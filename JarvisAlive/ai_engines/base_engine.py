@@ -11,6 +11,9 @@ from pydantic import BaseModel, Field
 import hashlib
 import logging
 
+from monitoring.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
+from monitoring.tracing import span
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -281,7 +284,29 @@ class BaseAIEngine(ABC):
         - Budget management
         - Retry logic
         - Error handling
+        - Latency and token metrics
         """
+        engine_type = self.get_engine_type()
+        model = kwargs.get('model', self.config.model)
+        start = time.perf_counter()
+        outcome = "error"
+        
+        with span("llm.generate", engine=engine_type, model=model) as current_span:
+            try:
+                response = await self._generate(prompt, **kwargs)
+                outcome = "cached" if response.cached else "success"
+                current_span.set_attribute("llm.cached", response.cached)
+                if not response.cached:
+                    for direction in ("input", "output"):
+                        tokens = response.usage.get(f"{direction}_tokens")
+                        if tokens:
+                            LLM_TOKENS.labels(engine_type, model, direction).observe(tokens)
+                return response
+            finally:
+                LLM_REQUEST_SECONDS.labels(engine_type, model, outcome).observe(time.perf_counter() - start)
+    
+    async def _generate(self, prompt: str, **kwargs) -> AIResponse:
+        """Cache lookup, budget check and retried API call behind generate()."""
         # Generate cache key
         cache_key = self._generate_cache_key(prompt, **kwargs)
         
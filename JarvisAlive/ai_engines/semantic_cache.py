@@ -0,0 +1,223 @@
+"""
+Semantic Cache - Offline near-duplicate cache for LLM classification results
+
+Classification prompts (intent parsing, orchestrator routing, business intent
+analysis) are re-sent for every user message, and near-duplicate requests such
+as "create a brand for my coffee shop" and "make branding for a coffee shop"
+miss the exact-match cache in BaseAIEngine. This cache vectorizes the request
+with a hashed-feature vectorizer (no model download, no network) and returns a
+prior classification when the cosine similarity clears a threshold.
+"""
+import copy
+import hashlib
+import logging
+import math
+import re
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCacheStats(BaseModel):
+    """Hit-rate statistics for a semantic cache"""
+    lookups: int = 0
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache"""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class HashedFeatureVectorizer:
+    """
+    Hashed bag-of-features vectorizer for short requests.
+
+    Words are lowercased, stripped of stopwords and filler verbs ("create",
+    "make", "need", ...) and lightly stemmed, then hashed together with their
+    character trigrams into a fixed number of buckets. Vectors are sparse dicts
+    normalized to unit length, so a dot product is the cosine similarity.
+    """
+
+    STOPWORDS = frozenset({
+        "a", "an", "the", "for", "to", "of", "in", "on", "at", "by", "with",
+        "and", "or", "my", "our", "your", "me", "i", "we", "you", "us", "it",
+        "is", "are", "be", "this", "that", "some", "any", "please", "can",
+        "could", "would", "will", "should", "do", "does", "up",
+        "create", "make", "build", "generate", "produce", "get", "give",
+        "need", "want", "like", "help", "new", "just"
+    })
+
+    _TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, n_features: int = 4096, word_weight: float = 1.0, char_ngram_weight: float = 0.35):
+        self.n_features = n_features
+        self.word_weight = word_weight
+        self.char_ngram_weight = char_ngram_weight
+
+    @staticmethod
+    def _stem(token: str) -> str:
+        """Strip common English suffixes so 'branding' and 'brand' share a feature"""
+        for suffix in ("ing", "ed", "es", "s"):
+            if len(token) > len(suffix) + 3 and token.endswith(suffix):
+                return token[:-len(suffix)]
+        return token
+
+    def tokenize(self, text: str) -> List[str]:
+        """Normalize text into content-word stems"""
+        return [
+            self._stem(token)
+            for token in self._TOKEN_PATTERN.findall(text.lower())
+            if token not in self.STOPWORDS
+        ]
+
+    def _bucket(self, feature: str) -> int:
+        return zlib.crc32(feature.encode("utf-8")) % self.n_features
+
+    def vectorize(self, text: str) -> Dict[int, float]:
+        """Return a unit-length sparse vector for the text"""
+        vector: Dict[int, float] = {}
+
+        for token in self.tokenize(text):
+            bucket = self._bucket(f"w:{token}")
+            vector[bucket] = vector.get(bucket, 0.0) + self.word_weight
+
+            padded = f"<{token}>"
+            for i in range(len(padded) - 2):
+                bucket = self._bucket(f"c:{padded[i:i + 3]}")
+                vector[bucket] = vector.get(bucket, 0.0) + self.char_ngram_weight
+
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm == 0:
+            return {}
+        return {bucket: weight / norm for bucket, weight in vector.items()}
+
+    @staticmethod
+    def similarity(left: Dict[int, float], right: Dict[int, float]) -> float:
+        """Cosine similarity of two unit-length sparse vectors"""
+        if len(left) > len(right):
+            left, right = right, left
+        return sum(weight * right.get(bucket, 0.0) for bucket, weight in left.items())
+
+
+class SemanticCache:
+    """
+    Similarity-keyed cache of classification results.
+
+    Entries are partitioned by an exact-match ``scope`` (e.g. a hash of the
+    surrounding context) and looked up by cosine similarity within a scope
+    through an inverted index over hashed features. The whole cache is
+    invalidated when the prompt fingerprint passed to ``lookup``/``store``
+    changes, so editing a classification prompt never serves stale answers.
+    Values are deep-copied on the way in and out.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        similarity_threshold: float = 0.85,
+        max_entries: int = 1024,
+        vectorizer: Optional[HashedFeatureVectorizer] = None
+    ):
+        self.name = name
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.vectorizer = vectorizer or HashedFeatureVectorizer()
+        self.stats = SemanticCacheStats()
+
+        self._prompt_fingerprint: Optional[str] = None
+        self._next_id = 0
+        # entry_id -> (scope, vector, value), in LRU order
+        self._entries: "OrderedDict[int, Tuple[str, Dict[int, float], Any]]" = OrderedDict()
+        # (scope, bucket) -> {entry_id: weight}
+        self._index: Dict[Tuple[str, int], Dict[int, float]] = {}
+
+    @staticmethod
+    def fingerprint(*parts: str) -> str:
+        """Stable fingerprint for prompt templates"""
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def _check_prompt(self, prompt_fingerprint: str):
+        if prompt_fingerprint != self._prompt_fingerprint:
+            if self._entries:
+                logger.info(f"Semantic cache '{self.name}' invalidated: prompt changed")
+                self.stats.invalidations += 1
+            self.clear()
+            self._prompt_fingerprint = prompt_fingerprint
+
+    def lookup(self, text: str, prompt_fingerprint: str, scope: str = "") -> Optional[Any]:
+        """Return a copy of the most similar cached value above the threshold"""
+        self._check_prompt(prompt_fingerprint)
+        self.stats.lookups += 1
+
+        vector = self.vectorizer.vectorize(text)
+        scores: Dict[int, float] = {}
+        for bucket, weight in vector.items():
+            postings = self._index.get((scope, bucket))
+            if postings:
+                for entry_id, entry_weight in postings.items():
+                    scores[entry_id] = scores.get(entry_id, 0.0) + weight * entry_weight
+
+        best_id, best_score = None, 0.0
+        for entry_id, score in scores.items():
+            if score > best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None or best_score < self.similarity_threshold:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        self._entries.move_to_end(best_id)
+        logger.debug(f"Semantic cache '{self.name}' hit (similarity {best_score:.3f})")
+        return copy.deepcopy(self._entries[best_id][2])
+
+    def store(self, text: str, value: Any, prompt_fingerprint: str, scope: str = ""):
+        """Cache a classification result for the text"""
+        self._check_prompt(prompt_fingerprint)
+        vector = self.vectorizer.vectorize(text)
+        if not vector:
+            return
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (scope, vector, copy.deepcopy(value))
+        for bucket, weight in vector.items():
+            self._index.setdefault((scope, bucket), {})[entry_id] = weight
+        self.stats.stores += 1
+
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)))
+            self.stats.evictions += 1
+        self.stats.entries = len(self._entries)
+
+    def _evict(self, entry_id: int):
+        scope, vector, _ = self._entries.pop(entry_id)
+        for bucket in vector:
+            postings = self._index.get((scope, bucket))
+            if postings is not None:
+                postings.pop(entry_id, None)
+                if not postings:
+                    del self._index[(scope, bucket)]
+
+    def clear(self):
+        """Drop all entries (statistics are kept)"""
+        self._entries.clear()
+        self._index.clear()
+        self.stats.entries = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistics including the derived hit rate"""
+        stats = self.stats.dict()
+        stats["hit_rate"] = self.stats.hit_rate
+        stats["similarity_threshold"] = self.similarity_threshold
+        return stats
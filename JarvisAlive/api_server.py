@@ -3,15 +3,18 @@
 import asyncio
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 from orchestration.orchestrator import HeyJarvisOrchestrator, OrchestratorConfig
+from departments.website.site_archive import ARCHIVE_MEDIA_TYPES
+from monitoring import metrics
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +26,9 @@ logger = logging.getLogger(__name__)
 # Global orchestrator instance
 orchestrator = None
 
+# Website generator for archive exports, created on first use
+website_agent = None
+
 
 class AgentRequest(BaseModel):
     """Request model for agent creation."""
@@ -38,6 +44,25 @@ class AgentResponse(BaseModel):
     execution_context: Dict[str, Any] = None
 
 
+class WebsiteExportRequest(BaseModel):
+    """Request model for website archive export."""
+    state: Dict[str, Any]  # brand_name, business_idea, pages, ... as for WebsiteGeneratorAgent.run
+    archive_format: str = "zip"
+    formats: Optional[List[str]] = None  # json, html, react
+
+
+def get_website_agent():
+    """Get the shared website generator agent."""
+    global website_agent
+    if website_agent is None:
+        from departments.website.website_generator_agent import WebsiteGeneratorAgent
+        website_agent = WebsiteGeneratorAgent({
+            'anthropic_api_key': os.getenv("ANTHROPIC_API_KEY"),
+            'export_formats': ['json', 'html', 'react']
+        })
+    return website_agent
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage app lifecycle."""
@@ -52,6 +77,9 @@ async def lifespan(app: FastAPI):
     await orchestrator.initialize()
     logger.info("HeyJarvis orchestrator initialized")
     
+    # Prometheus scrapes the dedicated metrics port (METRICS_PORT) when enabled
+    metrics.start_metrics_server_from_env()
+    
     yield
     
     # Shutdown
@@ -84,6 +112,12 @@ async def root():
     return {"message": "HeyJarvis API is running"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus metrics for this process."""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.post("/agents/create", response_model=AgentResponse)
 async def create_agent(request: AgentRequest):
     """Create a new agent."""
@@ -122,6 +156,31 @@ async def get_session_agents(session_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/websites/export")
+async def export_website(request: WebsiteExportRequest):
+    """Generate a website and stream it as a ZIP or tar.gz archive while it is rendered."""
+    if request.archive_format not in ARCHIVE_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported archive format: {request.archive_format}")
+    
+    try:
+        export = await get_website_agent().generate_website_archive(
+            request.state, request.archive_format, formats=request.formats
+        )
+    except Exception as e:
+        logger.error(f"Error generating website: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if export is None:
+        raise HTTPException(status_code=400, detail="brand_name or business_idea is required")
+    
+    filename, stream = export
+    return StreamingResponse(
+        stream,
+        media_type=ARCHIVE_MEDIA_TYPES[request.archive_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """WebSocket endpoint for real-time agent creation."""
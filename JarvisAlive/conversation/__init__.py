@@ -12,6 +12,7 @@ from .websocket_handler import (
     send_progress_update,
     send_error_message
 )
+from .websocket_fanout import SlowConsumerPolicy
 
 __all__ = [
     "ConversationContextManager",
@@ -21,6 +22,7 @@ __all__ = [
     "WebSocketMessage",
     "MessageType",
     "OperatingMode",
+    "SlowConsumerPolicy",
     "websocket_handler",
     "send_agent_created",
     "send_progress_update", 
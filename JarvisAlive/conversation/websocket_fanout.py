@@ -0,0 +1,150 @@
+"""Per-connection outbound queues for WebSocket fan-out.
+
+Each connection gets a bounded queue drained by its own writer task, so a
+broadcast only encodes the message once and enqueues it; a slow or stalled
+client backs up its own queue instead of delaying the broadcaster and every
+other client. What happens when a queue is full is set by a
+``SlowConsumerPolicy``.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's outbound queue is full."""
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued message
+    COALESCE = "coalesce"        # Replace queued progress updates with newer ones, then drop oldest
+    DISCONNECT = "disconnect"    # Close the connection
+
+
+class _Outbound:
+    """A queued, already-encoded message."""
+    __slots__ = ("data", "coalesce_key")
+
+    def __init__(self, data: str, coalesce_key: Optional[str]):
+        self.data = data
+        self.coalesce_key = coalesce_key
+
+
+class ConnectionWriter:
+    """Bounded outbound queue and writer task for one WebSocket connection."""
+
+    def __init__(self, connection_id: str, websocket, max_queue_size: int = 256,
+                 policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+                 on_error: Optional[Callable[[str, Exception], Awaitable[None]]] = None):
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.max_queue_size = max(1, max_queue_size)
+        self.policy = policy
+        self.on_error = on_error
+
+        self.queue: Deque[_Outbound] = deque()
+        self.pending: Dict[str, _Outbound] = {}  # coalesce_key -> queued message
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = asyncio.create_task(self._run())
+
+    def offer(self, data: str, coalesce_key: Optional[str] = None) -> bool:
+        """Queue an encoded message without waiting.
+
+        Returns False if the queue is full and the policy is DISCONNECT; the
+        caller is then expected to remove the connection.
+        """
+        if self.closed:
+            return False
+
+        if self.policy == SlowConsumerPolicy.COALESCE and coalesce_key is not None:
+            queued = self.pending.get(coalesce_key)
+            if queued is not None:
+                # Only the newest progress update is worth sending
+                queued.data = data
+                self.coalesced += 1
+                return True
+
+        if len(self.queue) >= self.max_queue_size:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                return False
+            self._discard(self.queue.popleft())
+            self.dropped += 1
+
+        outbound = _Outbound(data, coalesce_key)
+        self.queue.append(outbound)
+        if coalesce_key is not None:
+            self.pending[coalesce_key] = outbound
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    def _discard(self, outbound: _Outbound):
+        if outbound.coalesce_key is not None and self.pending.get(outbound.coalesce_key) is outbound:
+            del self.pending[outbound.coalesce_key]
+
+    async def _run(self):
+        while True:
+            if not self.queue:
+                self._idle.set()
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            outbound = self.queue.popleft()
+            self._discard(outbound)
+            try:
+                await self.websocket.send(outbound.data)
+                self.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error sending to connection {self.connection_id}: {e}")
+                self.close()
+                if self.on_error:
+                    await self.on_error(self.connection_id, e)
+                return
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been sent; False on timeout."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def close(self):
+        """Stop the writer task and discard queued messages."""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.clear()
+        self.pending.clear()
+        self._idle.set()
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self.queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "policy": self.policy.value
+        }
+
+
+async def drain_all(writers: List[ConnectionWriter], timeout: Optional[float] = None) -> bool:
+    """Wait for several writers to empty their queues."""
+    if not writers:
+        return True
+    results = await asyncio.gather(*(writer.drain(timeout) for writer in writers))
+    return all(results)
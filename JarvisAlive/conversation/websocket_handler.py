@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 import uuid
 from dataclasses import dataclass, asdict
 
+from .websocket_fanout import ConnectionWriter, SlowConsumerPolicy, drain_all
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,13 +68,28 @@ class WebSocketMessage:
         return cls(**data)
 
 
+# Progress messages where only the latest value matters to a client
+COALESCED_TYPES = {MessageType.PROGRESS, MessageType.WORKFLOW_PROGRESS}
+
+
 class WebSocketHandler:
-    """Handles WebSocket connections and message broadcasting."""
+    """Handles WebSocket connections and message broadcasting.
     
-    def __init__(self):
+    Broadcasts encode a message once and hand it to each connection's
+    bounded outbound queue (see ``websocket_fanout``); they never wait on
+    a client's socket.
+    """
+    
+    def __init__(self, max_queue_size: int = 256,
+                 slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.COALESCE):
         self.connections: Dict[str, Any] = {}  # connection_id -> websocket
         self.subscriptions: Dict[str, Set[str]] = {}  # session_id -> {connection_ids}
         self.connection_modes: Dict[str, OperatingMode] = {}  # connection_id -> mode
+        self.writers: Dict[str, ConnectionWriter] = {}  # connection_id -> outbound queue
+        self.max_queue_size = max_queue_size
+        self.slow_consumer_policy = SlowConsumerPolicy(slow_consumer_policy)
+        self.disconnected_slow_consumers = 0
+        self._closing: Set[asyncio.Task] = set()
         self.message_queue: asyncio.Queue = asyncio.Queue()
         self.running = False
         
@@ -85,10 +102,14 @@ class WebSocketHandler:
         """Stop the WebSocket handler."""
         self.running = False
         # Close all connections
+        for writer in self.writers.values():
+            writer.close()
         for conn_id, websocket in self.connections.items():
             await websocket.close()
         self.connections.clear()
         self.subscriptions.clear()
+        self.connection_modes.clear()
+        self.writers.clear()
         logger.info("WebSocket handler stopped")
     
     async def add_connection(self, websocket, connection_id: str = None, mode: OperatingMode = OperatingMode.AGENT_BUILDER) -> str:
@@ -96,8 +117,17 @@ class WebSocketHandler:
         if not connection_id:
             connection_id = str(uuid.uuid4())
         
+        if connection_id in self.connections:
+            self._discard_connection(connection_id)
+        
         self.connections[connection_id] = websocket
         self.connection_modes[connection_id] = mode
+        self.writers[connection_id] = ConnectionWriter(
+            connection_id, websocket,
+            max_queue_size=self.max_queue_size,
+            policy=self.slow_consumer_policy,
+            on_error=self._on_send_error
+        )
         
         # Send welcome message
         welcome_msg = WebSocketMessage(
@@ -120,9 +150,16 @@ class WebSocketHandler:
     
     async def remove_connection(self, connection_id: str):
         """Remove a WebSocket connection."""
+        self._discard_connection(connection_id)
+    
+    def _discard_connection(self, connection_id: str):
         if connection_id in self.connections:
             del self.connections[connection_id]
             
+            writer = self.writers.pop(connection_id, None)
+            if writer:
+                writer.close()
+            
             # Remove from all subscriptions
             for session_id, conn_ids in self.subscriptions.items():
                 conn_ids.discard(connection_id)
@@ -161,36 +198,71 @@ class WebSocketHandler:
         logger.info(f"Connection {connection_id} unsubscribed from session {session_id}")
     
     async def send_to_connection(self, connection_id: str, message: WebSocketMessage):
-        """Send a message to a specific connection."""
-        if connection_id in self.connections:
-            websocket = self.connections[connection_id]
-            try:
-                await websocket.send(message.to_json())
-            except Exception as e:
-                logger.error(f"Error sending to connection {connection_id}: {e}")
-                await self.remove_connection(connection_id)
+        """Queue a message for a specific connection."""
+        if connection_id in self.writers:
+            self._enqueue(connection_id, message.to_json(), self._coalesce_key(message, connection_id))
     
     async def broadcast_to_session(self, session_id: str, message: WebSocketMessage):
         """Broadcast a message to all connections in a session."""
         if session_id not in self.subscriptions:
             return
         
-        # Send to all connections subscribed to this session
-        for conn_id in list(self.subscriptions[session_id]):
-            # Check if connection should receive this message based on mode
-            conn_mode = self.connection_modes.get(conn_id, OperatingMode.AGENT_BUILDER)
-            
-            # Send if message mode matches connection mode or is hybrid
-            if message.mode == conn_mode or message.mode == OperatingMode.HYBRID:
-                await self.send_to_connection(conn_id, message)
+        self._fan_out(list(self.subscriptions[session_id]), message, self._coalesce_key(message, session_id))
     
     async def broadcast_all(self, message: WebSocketMessage):
         """Broadcast a message to all connections."""
-        for conn_id in list(self.connections.keys()):
-            # Check mode compatibility
+        self._fan_out(list(self.connections.keys()), message, self._coalesce_key(message, "*"))
+    
+    def _fan_out(self, connection_ids: List[str], message: WebSocketMessage, coalesce_key: Optional[str]):
+        data = None  # Encoded once, on the first recipient
+        for conn_id in connection_ids:
+            # Send if message mode matches connection mode or is hybrid
             conn_mode = self.connection_modes.get(conn_id, OperatingMode.AGENT_BUILDER)
             if message.mode == conn_mode or message.mode == OperatingMode.HYBRID:
-                await self.send_to_connection(conn_id, message)
+                if data is None:
+                    data = message.to_json()
+                self._enqueue(conn_id, data, coalesce_key)
+    
+    def _enqueue(self, connection_id: str, data: str, coalesce_key: Optional[str]):
+        writer = self.writers.get(connection_id)
+        if writer is None or writer.offer(data, coalesce_key):
+            return
+        
+        logger.warning(f"Disconnecting slow WebSocket consumer {connection_id} "
+                       f"({len(writer.queue)} messages queued)")
+        self.disconnected_slow_consumers += 1
+        websocket = self.connections.get(connection_id)
+        self._discard_connection(connection_id)
+        if websocket is not None:
+            # A stalled client may not complete the close handshake either
+            task = asyncio.create_task(self._close_quietly(websocket))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+    
+    @staticmethod
+    def _coalesce_key(message: WebSocketMessage, scope: str) -> Optional[str]:
+        if message.type not in COALESCED_TYPES:
+            return None
+        workflow = (message.details or {}).get("workflow", "")
+        return f"{message.type.value}:{scope}:{workflow}"
+    
+    @staticmethod
+    async def _close_quietly(websocket, timeout: float = 5.0):
+        try:
+            await asyncio.wait_for(websocket.close(), timeout)
+        except Exception:
+            pass
+    
+    async def _on_send_error(self, connection_id: str, error: Exception):
+        self._discard_connection(connection_id)
+    
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued messages have been sent; False on timeout."""
+        return await drain_all(list(self.writers.values()), timeout)
+    
+    def get_connection_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Outbound queue statistics per connection."""
+        return {conn_id: writer.stats() for conn_id, writer in self.writers.items()}
     
     # Agent Builder specific messages (backward compatible)
     
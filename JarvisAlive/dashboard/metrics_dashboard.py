@@ -15,7 +15,8 @@ from rich.align import Align
 from rich.columns import Columns
 from datetime import datetime, timedelta
 import asyncio
-from typing import Dict, Optional, List
+import time
+from typing import Dict, Optional, List, Set
 import json
 import csv
 import os
@@ -31,10 +32,30 @@ except ImportError:
     logging.warning("Redis not available - using mock data mode")
 
 
+# Panels redrawn when each session key changes
+PANEL_SOURCES = {
+    "metrics": ("stats", "performance"),
+    "workflows": ("workflows",),
+    "current_task": ("progress",)
+}
+
+# Keyspace notification classes the dashboard needs: keyspace events (K),
+# string commands (SET/SETEX) and generic ones (DEL/EXPIRE)
+NOTIFY_FLAGS = "K$g"
+
+
 class MetricsDashboard:
-    """Rich CLI Dashboard for HeyJarvis Sales Metrics"""
+    """Rich CLI Dashboard for HeyJarvis Sales Metrics
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    The live view is fed by Redis keyspace notifications on the session's
+    keys: a write marks its source dirty, dirty sources are fetched together
+    once per frame, and only the panels whose data actually changed are
+    rebuilt. When notifications cannot be enabled the dashboard falls back
+    to polling every ``poll_interval`` seconds.
+    """
+    
+    def __init__(self, redis_url: str = "redis://localhost:6379", frame_interval: float = 0.05,
+                 poll_interval: float = 5.0, resync_interval: float = 60.0):
         self.console = Console()
         self.redis_client = None
         self.redis_url = redis_url
@@ -43,6 +64,18 @@ class MetricsDashboard:
         self.start_time = datetime.now()
         self.mock_mode = not REDIS_AVAILABLE
         
+        # Change stream state
+        self.frame_interval = frame_interval  # Window in which changes are coalesced
+        self.poll_interval = poll_interval  # Fallback when keyspace notifications are off
+        self.resync_interval = resync_interval  # Catch notifications lost while disconnected
+        self.notifications_enabled = False
+        self.data: Dict[str, object] = {}
+        self._raw: Dict[str, Optional[bytes]] = {}
+        self._dirty: Set[str] = set()
+        self._changed = asyncio.Event()
+        self._watcher: Optional[asyncio.Task] = None
+        self.stats = {"fetches": 0, "events": 0, "coalesced": 0, "renders": {}}
+        
         # Mock data for testing
         self.mock_metrics = {
             "leads_generated": 47,
@@ -425,34 +458,195 @@ class MetricsDashboard:
         except Exception as e:
             return self.mock_current_task
 
-    async def update_dashboard(self, layout: Layout):
-        """Update dashboard with latest data"""
-        update_count = 0
+    def source_keys(self) -> Dict[str, str]:
+        """Redis key behind each dashboard source"""
+        return {source: f"session:{self.session_id}:{source}" for source in PANEL_SOURCES}
+
+    async def enable_keyspace_notifications(self) -> bool:
+        """Turn on the keyspace notifications the dashboard needs, keeping any already set"""
+        try:
+            config = await self.redis_client.config_get("notify-keyspace-events")
+            current = config.get("notify-keyspace-events", "") or ""
+            if isinstance(current, bytes):
+                current = current.decode()
+            
+            has_all = "A" in current  # A is every command class
+            missing = [flag for flag in NOTIFY_FLAGS if flag not in current and not (has_all and flag != "K")]
+            if missing:
+                await self.redis_client.config_set("notify-keyspace-events", current + "".join(missing))
+            return True
+        except Exception as e:
+            # Managed Redis often disables CONFIG; poll instead
+            logging.warning(f"Keyspace notifications unavailable, polling every {self.poll_interval}s: {e}")
+            return False
+
+    def mark_dirty(self, *sources: str):
+        """Queue sources for the next frame; repeat changes before then are coalesced"""
+        for source in sources:
+            if source in self._dirty:
+                self.stats["coalesced"] += 1
+            self._dirty.add(source)
+        self._changed.set()
+
+    async def _watch_changes(self):
+        """Translate keyspace notifications for this session into dirty sources"""
+        db = self.redis_client.connection_pool.connection_kwargs.get("db", 0)
+        prefix = f"__keyspace@{db}__:session:{self.session_id}:"
+        sources_by_channel = {prefix + source: source for source in PANEL_SOURCES}
         
         while self.running:
+            pubsub = self.redis_client.pubsub()
             try:
-                # Fetch latest data
-                metrics = await self.fetch_metrics()
-                workflows = await self.fetch_workflows()
-                current_task = await self.fetch_current_task()
-                
-                # Update layout components
-                layout["header"].update(self.create_header())
-                layout["stats"].update(self.create_stats_panel(metrics))
-                layout["performance"].update(self.create_performance_panel(metrics))
-                layout["workflows"].update(self.create_workflow_panel(workflows))
-                layout["progress"].update(self.create_progress_panel(current_task))
-                layout["footer"].update(self.create_footer())
-                
-                update_count += 1
-                
-                await asyncio.sleep(1)  # Update every second
-                
-            except KeyboardInterrupt:
-                break
+                await pubsub.psubscribe(prefix + "*")
+                # Writes made while we were not subscribed went unseen
+                self.mark_dirty(*PANEL_SOURCES)
+                while self.running:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if not message or message["type"] != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    source = sources_by_channel.get(channel)
+                    if source:
+                        self.stats["events"] += 1
+                        self.mark_dirty(source)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Dashboard change stream failed, resubscribing: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.punsubscribe()
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    async def refresh(self, sources: Set[str]) -> Set[str]:
+        """Fetch sources and return the panels whose data changed"""
+        if not sources:
+            return set()
+        
+        sources = [source for source in PANEL_SOURCES if source in sources]
+        if self.mock_mode:
+            fetchers = {
+                "metrics": self.fetch_metrics,
+                "workflows": self.fetch_workflows,
+                "current_task": self.fetch_current_task
+            }
+            raw_values = [json.dumps(await fetchers[source]()) for source in sources]
+        else:
+            # Every dirty key in one round trip
+            keys = self.source_keys()
+            try:
+                raw_values = await self.redis_client.mget([keys[source] for source in sources])
             except Exception as e:
-                self.console.print(f"[red]Dashboard error: {e}[/red]")
-                await asyncio.sleep(5)
+                self.console.print(f"[red]Error fetching dashboard data: {e}[/red]")
+                return set()
+        self.stats["fetches"] += 1
+        
+        panels = set()
+        for source, raw in zip(sources, raw_values):
+            if source in self._raw and raw == self._raw[source]:
+                continue
+            self._raw[source] = raw
+            self.data[source] = self._parse(source, raw)
+            panels.update(PANEL_SOURCES[source])
+        return panels
+
+    def _parse(self, source: str, raw: Optional[bytes]):
+        """Decode a source's stored JSON, with the same defaults as the fetch methods"""
+        if raw:
+            try:
+                return json.loads(raw)
+            except ValueError:
+                self.console.print(f"[red]Ignoring malformed {source} data[/red]")
+        if source == "metrics":
+            return {
+                "leads_generated": 0,
+                "messages_composed": 0,
+                "active_workflows": 0,
+                "success_rate": 100.0
+            }
+        if source == "workflows":
+            return []
+        return None
+
+    def render_panels(self, layout: Layout, panels: Set[str]):
+        """Rebuild only the given panels"""
+        builders = {
+            "header": lambda: self.create_header(),
+            "stats": lambda: self.create_stats_panel(self.data.get("metrics") or {}),
+            "performance": lambda: self.create_performance_panel(self.data.get("metrics") or {}),
+            "workflows": lambda: self.create_workflow_panel(self.data.get("workflows") or []),
+            "progress": lambda: self.create_progress_panel(self.data.get("current_task")),
+            "footer": lambda: self.create_footer()
+        }
+        renders = self.stats["renders"]
+        for panel in panels:
+            layout[panel].update(builders[panel]())
+            renders[panel] = renders.get(panel, 0) + 1
+
+    async def update_dashboard(self, layout: Layout, live: Optional[Live] = None):
+        """Update dashboard panels as their data changes"""
+        if not self.mock_mode and self._watcher is None:
+            self.notifications_enabled = await self.enable_keyspace_notifications()
+            if self.notifications_enabled:
+                self._watcher = asyncio.create_task(self._watch_changes())
+        # Mock data changes every second; without notifications Redis is polled
+        sync_interval = 1.0 if self.mock_mode else (
+            self.resync_interval if self.notifications_enabled else self.poll_interval
+        )
+        
+        self.mark_dirty(*PANEL_SOURCES)
+        next_sync = time.monotonic() + sync_interval
+        next_tick = time.monotonic()
+        
+        try:
+            while self.running:
+                try:
+                    now = time.monotonic()
+                    if now >= next_sync:
+                        self.mark_dirty(*PANEL_SOURCES)
+                        next_sync = now + sync_interval
+                    
+                    if not self._changed.is_set():
+                        try:
+                            await asyncio.wait_for(self._changed.wait(), max(0.0, min(next_tick, next_sync) - now))
+                        except asyncio.TimeoutError:
+                            pass
+                    
+                    panels = set()
+                    if self._changed.is_set():
+                        # Let the rest of this frame's changes arrive, then fetch them together
+                        await asyncio.sleep(self.frame_interval)
+                        self._changed.clear()
+                        dirty, self._dirty = self._dirty, set()
+                        panels = await self.refresh(dirty)
+                    
+                    if time.monotonic() >= next_tick:
+                        panels.add("header")  # Clock and uptime
+                        next_tick = time.monotonic() + 1.0
+                    
+                    if panels:
+                        self.render_panels(layout, panels)
+                        if live is not None:
+                            live.refresh()
+                    
+                except KeyboardInterrupt:
+                    break
+                except Exception as e:
+                    self.console.print(f"[red]Dashboard error: {e}[/red]")
+                    await asyncio.sleep(5)
+        finally:
+            if self._watcher is not None:
+                self._watcher.cancel()
+                try:
+                    await self._watcher
+                except asyncio.CancelledError:
+                    pass
+                self._watcher = None
 
     async def start_live_dashboard(self):
         """Start the live dashboard"""
@@ -467,9 +661,10 @@ class MetricsDashboard:
         layout["progress"].update(self.create_progress_panel(None))
         layout["footer"].update(self.create_footer())
         
-        with Live(layout, refresh_per_second=2, screen=True) as live:
+        # Redrawn as panels change rather than on a timer
+        with Live(layout, auto_refresh=False, screen=True) as live:
             try:
-                await self.update_dashboard(layout)
+                await self.update_dashboard(layout, live)
             except KeyboardInterrupt:
                 self.running = False
                 self.console.print("\n[yellow]Dashboard stopped by user[/yellow]")
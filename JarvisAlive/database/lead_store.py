@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Indexed In-Memory Lead Store for HeyJarvis
+
+Lead scans used to join contacts to companies with nested loops (one pass over
+every company per contact) and filter titles with a substring test against
+every contact. LeadStore builds hash indexes once and answers scans as index
+intersections:
+
+- companies by id, name, industry and size bucket (employee_range)
+- contacts by id, company id and seniority
+- an inverted index from title tokens to contact positions
+
+Title queries keep the original case-insensitive substring semantics: the
+inverted index narrows the candidates and the substring test is only run on
+them. Results are always returned in the original insertion order, so callers
+that sort stably see exactly the same output as the old linear scans.
+
+The store is duck-typed over any records exposing the attributes used below,
+so the same indexes serve the pydantic models and lightweight benchmark rows.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class LeadStore:
+    """Hash-indexed view over companies and contacts"""
+
+    _TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, companies: Sequence[Any], contacts: Sequence[Any]):
+        self._companies: List[Any] = list(companies)
+        self._contacts: List[Any] = list(contacts)
+
+        # Company indexes (values are positions into self._companies)
+        self._company_by_id: Dict[str, int] = {}
+        self._companies_by_name: Dict[str, Set[int]] = {}
+        self._companies_by_industry: Dict[str, Set[int]] = {}
+        self._companies_by_size: Dict[str, Set[int]] = {}
+
+        # Contact indexes (values are positions into self._contacts)
+        self._contact_by_id: Dict[str, int] = {}
+        self._contacts_by_company: Dict[str, List[int]] = {}
+        self._contacts_by_seniority: Dict[str, List[int]] = {}
+        self._title_index: Dict[str, Set[int]] = {}
+        self._title_lower: List[str] = []
+
+        self._build_indexes()
+
+    def _build_indexes(self):
+        for position, company in enumerate(self._companies):
+            self._company_by_id[company.id] = position
+            self._companies_by_name.setdefault(company.name, set()).add(position)
+            self._companies_by_industry.setdefault(company.industry, set()).add(position)
+            self._companies_by_size.setdefault(company.employee_range, set()).add(position)
+
+        title_index = self._title_index
+        title_tokens: Dict[str, List[str]] = {}
+        for position, contact in enumerate(self._contacts):
+            self._contact_by_id[contact.id] = position
+            self._contacts_by_company.setdefault(contact.company_id, []).append(position)
+            self._contacts_by_seniority.setdefault(contact.seniority, []).append(position)
+
+            title = contact.title.lower()
+            self._title_lower.append(title)
+            tokens = title_tokens.get(title)
+            if tokens is None:
+                tokens = title_tokens[title] = self.tokenize(title)
+            for token in tokens:
+                postings = title_index.get(token)
+                if postings is None:
+                    postings = title_index[token] = set()
+                postings.add(position)
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Lowercase alphanumeric tokens of a title"""
+        return cls._TOKEN_PATTERN.findall(text.lower())
+
+    # Size and direct lookups
+    @property
+    def company_count(self) -> int:
+        return len(self._companies)
+
+    @property
+    def contact_count(self) -> int:
+        return len(self._contacts)
+
+    def get_company(self, company_id: str) -> Optional[Any]:
+        """Return company by ID in O(1)"""
+        position = self._company_by_id.get(company_id)
+        return self._companies[position] if position is not None else None
+
+    def get_contact(self, contact_id: str) -> Optional[Any]:
+        """Return contact by ID in O(1)"""
+        position = self._contact_by_id.get(contact_id)
+        return self._contacts[position] if position is not None else None
+
+    # Company scans
+    def company_positions(
+        self,
+        industries: Optional[Iterable[str]] = None,
+        employee_ranges: Optional[Iterable[str]] = None,
+        exclude_names: Optional[Iterable[str]] = None
+    ) -> Set[int]:
+        """Positions of companies matching every given filter"""
+        candidates: Optional[Set[int]] = None
+
+        if industries is not None:
+            candidates = self._union(self._companies_by_industry, industries)
+        if employee_ranges is not None:
+            by_size = self._union(self._companies_by_size, employee_ranges)
+            candidates = by_size if candidates is None else candidates & by_size
+        if candidates is None:
+            candidates = set(range(len(self._companies)))
+        if exclude_names:
+            candidates = candidates - self._union(self._companies_by_name, exclude_names)
+
+        return candidates
+
+    def find_companies(
+        self,
+        industries: Optional[Iterable[str]] = None,
+        employee_ranges: Optional[Iterable[str]] = None,
+        exclude_names: Optional[Iterable[str]] = None
+    ) -> List[Any]:
+        """Companies matching every given filter, in insertion order"""
+        positions = self.company_positions(industries, employee_ranges, exclude_names)
+        return [self._companies[position] for position in sorted(positions)]
+
+    # Contact scans
+    def title_positions(self, title_keywords: Iterable[str]) -> Set[int]:
+        """Positions of contacts whose title contains any keyword (case-insensitive)"""
+        matches: Set[int] = set()
+        for keyword in title_keywords:
+            keyword_lower = keyword.lower()
+            tokens = self.tokenize(keyword_lower)
+            if not tokens:
+                # Pure punctuation/whitespace: nothing to index on, scan
+                matches.update(
+                    position for position, title in enumerate(self._title_lower)
+                    if keyword_lower in title
+                )
+                continue
+
+            # Every keyword token is a substring of some title token, so the
+            # intersection of the per-token candidates is a superset of the matches
+            candidates: Optional[Set[int]] = None
+            for token in tokens:
+                postings: Set[int] = set()
+                for indexed_token, token_postings in self._title_index.items():
+                    if token in indexed_token:
+                        postings |= token_postings
+                candidates = postings if candidates is None else candidates & postings
+                if not candidates:
+                    break
+
+            matches.update(
+                position for position in candidates or ()
+                if keyword_lower in self._title_lower[position]
+            )
+        return matches
+
+    def seniority_positions(self, seniority_levels: Iterable[str]) -> Set[int]:
+        """Positions of contacts at the given seniority levels"""
+        positions: Set[int] = set()
+        for level in set(seniority_levels):
+            positions.update(self._contacts_by_seniority.get(level, ()))
+        return positions
+
+    def contacts_at(self, company_positions: Iterable[int]) -> Set[int]:
+        """Positions of contacts working at the given companies"""
+        positions: Set[int] = set()
+        for company_position in company_positions:
+            positions.update(self._contacts_by_company.get(self._companies[company_position].id, ()))
+        return positions
+
+    def find_contacts(
+        self,
+        title_keywords: Optional[Iterable[str]] = None,
+        seniority_levels: Optional[Iterable[str]] = None
+    ) -> List[Any]:
+        """Contacts matching every given filter, in insertion order"""
+        candidates: Optional[Set[int]] = None
+        if title_keywords is not None:
+            candidates = self.title_positions(title_keywords)
+        if seniority_levels is not None:
+            by_seniority = self.seniority_positions(seniority_levels)
+            candidates = by_seniority if candidates is None else candidates & by_seniority
+        if candidates is None:
+            return list(self._contacts)
+        return [self._contacts[position] for position in sorted(candidates)]
+
+    def find_leads(
+        self,
+        industries: Optional[Iterable[str]] = None,
+        employee_ranges: Optional[Iterable[str]] = None,
+        exclude_names: Optional[Iterable[str]] = None,
+        title_keywords: Optional[Iterable[str]] = None,
+        seniority_levels: Optional[Iterable[str]] = None,
+        company_filter=None
+    ) -> List[Tuple[Any, Any]]:
+        """
+        (contact, company) pairs for contacts at matching companies.
+
+        ``company_filter`` is an optional predicate for company attributes that
+        are not indexed (funding stage, growth rate, ...). Pairs come back in
+        contact insertion order.
+        """
+        company_positions = self.company_positions(industries, employee_ranges, exclude_names)
+        if company_filter is not None:
+            company_positions = {
+                position for position in company_positions
+                if company_filter(self._companies[position])
+            }
+
+        # Drive the join from whichever side is smaller
+        if title_keywords is not None:
+            contact_positions = self.title_positions(title_keywords)
+            if len(company_positions) < len(self._companies):
+                contact_positions &= self.contacts_at(company_positions)
+        else:
+            contact_positions = self.contacts_at(company_positions)
+        if seniority_levels is not None:
+            contact_positions &= self.seniority_positions(seniority_levels)
+
+        pairs = []
+        for position in sorted(contact_positions):
+            contact = self._contacts[position]
+            company_position = self._company_by_id.get(contact.company_id)
+            if company_position is not None and company_position in company_positions:
+                pairs.append((contact, self._companies[company_position]))
+        return pairs
+
+    @staticmethod
+    def _union(index: Dict[str, Set[int]], keys: Iterable[str]) -> Set[int]:
+        positions: Set[int] = set()
+        for key in set(keys):
+            positions |= index.get(key, set())
+        return positions
@@ -15,6 +15,8 @@ from pydantic import BaseModel, HttpUrl, validator
 from functools import lru_cache
 import time
 
+from database.lead_store import LeadStore
+
 
 class CompanyNews(BaseModel):
     """News item for a company"""
@@ -149,6 +151,7 @@ class MockDataGenerator:
     def __init__(self):
         self._companies: List[Company] = []
         self._contacts: List[Contact] = []
+        self._store: Optional[LeadStore] = None
         self._lock = threading.Lock()
         self._generated = False
         
@@ -273,6 +276,14 @@ class MockDataGenerator:
             ]
         }
         
+        # Titles by seniority
+        self._titles_by_seniority = {
+            "C-Level": ["CEO", "CTO", "CFO", "CMO", "COO", "Chief Product Officer", "Chief Revenue Officer"],
+            "VP": ["VP of Sales", "VP of Engineering", "VP of Marketing", "VP of Product", "VP of Operations"],
+            "Director": ["Director of Sales", "Director of Engineering", "Director of Marketing", "Director of Product", "Director of Operations"],
+            "Manager": ["Sales Manager", "Engineering Manager", "Marketing Manager", "Product Manager", "Operations Manager"]
+        }
+        
         # Locations
         self._locations = [
             "San Francisco, CA", "New York, NY", "Austin, TX", "Boston, MA", "Seattle, WA",
@@ -296,6 +307,9 @@ class MockDataGenerator:
             # Generate contacts for those companies
             self._contacts = self._generate_contacts()
             
+            # Index for O(1) joins and lookups
+            self._store = LeadStore(self._companies, self._contacts)
+            
             self._generated = True
             
             # Ensure generation is under 100ms
@@ -438,7 +452,7 @@ class MockDataGenerator:
         else:
             return "1000+"
     
-    def _generate_company_description(self, name: str, industry: str, sub_industry: str) -> str:
+    def _generate_company_description(self, name: str, industry: str, sub_industry: str, rng=random) -> str:
         """Generate company description"""
         templates = [
             f"{name} is a leading {industry} company specializing in {sub_industry.lower()} solutions. We help businesses streamline operations and drive growth through innovative technology platforms.",
@@ -446,18 +460,19 @@ class MockDataGenerator:
             f"{name} provides enterprise-grade {sub_industry.lower()} solutions in the {industry.lower()} space. We empower companies to automate processes, reduce costs, and improve customer experiences through our advanced technology stack."
         ]
         
-        return random.choice(templates)
+        return rng.choice(templates)
     
-    def _generate_company_news(self, name: str, industry: str) -> List[CompanyNews]:
+    def _generate_company_news(self, name: str, industry: str, rng=random,
+                               now: Optional[datetime] = None) -> List[CompanyNews]:
         """Generate 3-5 recent news items"""
         news_items = []
         
         # Generate 3-5 news items within last 180 days
-        for i in range(random.randint(3, 5)):
-            days_ago = random.randint(1, 180)
-            news_date = datetime.now() - timedelta(days=days_ago)
+        for i in range(rng.randint(3, 5)):
+            days_ago = rng.randint(1, 180)
+            news_date = (now or datetime.now()) - timedelta(days=days_ago)
             
-            news_type = random.choice(["funding", "product", "partnership", "expansion", "acquisition"])
+            news_type = rng.choice(["funding", "product", "partnership", "expansion", "acquisition"])
             
             news_templates = {
                 "funding": [
@@ -487,31 +502,31 @@ class MockDataGenerator:
                 ]
             }
             
-            title_template = random.choice(news_templates[news_type])
+            title_template = rng.choice(news_templates[news_type])
             
             # Fill in template variables
             if news_type == "funding":
-                amount = random.choice(["$5M", "$15M", "$25M", "$50M", "$100M"])
-                series = random.choice(["A", "B", "C"])
-                stage = random.choice(["Seed", "Series A", "Series B", "Growth"])
+                amount = rng.choice(["$5M", "$15M", "$25M", "$50M", "$100M"])
+                series = rng.choice(["A", "B", "C"])
+                stage = rng.choice(["Seed", "Series A", "Series B", "Growth"])
                 title = title_template.format(amount=amount, series=series, stage=stage)
                 summary = f"Led by top-tier investors to accelerate growth and expand market presence"
             elif news_type == "product":
                 title = title_template
                 summary = f"New features enhance user experience and platform capabilities"
             elif news_type == "partnership":
-                partner = random.choice(["Microsoft", "Salesforce", "AWS", "Google Cloud"])
-                purpose = random.choice(["integration", "go-to-market", "technology"])
+                partner = rng.choice(["Microsoft", "Salesforce", "AWS", "Google Cloud"])
+                purpose = rng.choice(["integration", "go-to-market", "technology"])
                 title = title_template.format(partner=partner, purpose=purpose)
                 summary = f"Strategic collaboration to deliver enhanced value to customers"
             elif news_type == "expansion":
-                region = random.choice(["European", "Asian", "Latin American"])
-                location = random.choice(["London", "Berlin", "Tokyo", "Singapore"])
+                region = rng.choice(["European", "Asian", "Latin American"])
+                location = rng.choice(["London", "Berlin", "Tokyo", "Singapore"])
                 title = title_template.format(region=region, location=location)
                 summary = f"International expansion to serve growing customer base"
             else:  # acquisition
-                company = random.choice(["TechCorp", "DataSystems", "CloudTech", "AILabs"])
-                capability = random.choice(["analytics", "automation", "security", "integration"])
+                company = rng.choice(["TechCorp", "DataSystems", "CloudTech", "AILabs"])
+                capability = rng.choice(["analytics", "automation", "security", "integration"])
                 title = title_template.format(company=company, capability=capability)
                 summary = f"Acquisition strengthens platform and accelerates innovation"
             
@@ -606,14 +621,7 @@ class MockDataGenerator:
     
     def _generate_title(self, seniority: str) -> str:
         """Generate title based on seniority"""
-        titles_by_seniority = {
-            "C-Level": ["CEO", "CTO", "CFO", "CMO", "COO", "Chief Product Officer", "Chief Revenue Officer"],
-            "VP": ["VP of Sales", "VP of Engineering", "VP of Marketing", "VP of Product", "VP of Operations"],
-            "Director": ["Director of Sales", "Director of Engineering", "Director of Marketing", "Director of Product", "Director of Operations"],
-            "Manager": ["Sales Manager", "Engineering Manager", "Marketing Manager", "Product Manager", "Operations Manager"]
-        }
-        
-        return random.choice(titles_by_seniority[seniority])
+        return random.choice(self._titles_by_seniority[seniority])
     
     def _determine_department(self, title: str) -> str:
         """Determine department from title"""
@@ -628,7 +636,7 @@ class MockDataGenerator:
         else:
             return "Operations"
     
-    def _generate_email(self, first_name: str, last_name: str, website: HttpUrl) -> str:
+    def _generate_email(self, first_name: str, last_name: str, website: HttpUrl, rng=random) -> str:
         """Generate email address"""
         domain = str(website).replace("https://", "").replace("http://", "")
         
@@ -640,9 +648,9 @@ class MockDataGenerator:
             f"{first_name.lower()}{last_name.lower()}@{domain}"
         ]
         
-        return random.choice(formats)
+        return rng.choice(formats)
     
-    def _generate_role_pain_points(self, title: str, department: str) -> List[str]:
+    def _generate_role_pain_points(self, title: str, department: str, rng=random) -> List[str]:
         """Generate role-specific pain points"""
         pain_points_by_department = {
             "Sales": [
@@ -682,9 +690,9 @@ class MockDataGenerator:
             ]
         }
         
-        return random.sample(pain_points_by_department[department], random.randint(2, 4))
+        return rng.sample(pain_points_by_department[department], rng.randint(2, 4))
     
-    def _generate_priorities(self, title: str, department: str) -> List[str]:
+    def _generate_priorities(self, title: str, department: str, rng=random) -> List[str]:
         """Generate current priorities"""
         priorities_by_department = {
             "Sales": [
@@ -724,7 +732,7 @@ class MockDataGenerator:
             ]
         }
         
-        return random.sample(priorities_by_department[department], random.randint(2, 3))
+        return rng.sample(priorities_by_department[department], rng.randint(2, 3))
     
     def _generate_reports_to(self, seniority: str, department: str) -> Optional[str]:
         """Generate reports to title"""
@@ -748,11 +756,22 @@ class MockDataGenerator:
         self.generate_data()
         return self._contacts.copy()
     
+    def get_store(self) -> LeadStore:
+        """Get the indexed lead store"""
+        self.generate_data()
+        return self._store
+    
+    def generate_snapshot(self, path: str, companies: int = 100_000, contacts: int = 1_000_000,
+                          seed: int = 42, chunk_size: int = 65_536, overwrite: bool = False):
+        """Generate a large seeded on-disk dataset (see database.synthetic_dataset)"""
+        from database.synthetic_dataset import SyntheticDataset
+        return SyntheticDataset.generate(path, companies=companies, contacts=contacts, seed=seed,
+                                         chunk_size=chunk_size, overwrite=overwrite)
+    
     @lru_cache(maxsize=128)
     def get_companies_by_industry(self, industry: str) -> List[Company]:
         """Return all companies in specified industry"""
-        self.generate_data()
-        return [c for c in self._companies if c.industry == industry]
+        return self.get_store().find_companies(industries=[industry])
     
     @lru_cache(maxsize=128)
     def get_companies_by_size(self, min_employees: int, max_employees: int) -> List[Company]:
@@ -762,51 +781,38 @@ class MockDataGenerator:
     
     def get_contacts_by_title(self, title_keywords: List[str]) -> List[Contact]:
         """Return contacts matching any title keyword (case-insensitive)"""
-        self.generate_data()
-        keywords_lower = [kw.lower() for kw in title_keywords]
-        return [c for c in self._contacts if any(kw in c.title.lower() for kw in keywords_lower)]
+        return self.get_store().find_contacts(title_keywords=title_keywords)
     
     def get_contacts_by_seniority(self, seniority_levels: List[str]) -> List[Contact]:
         """Return contacts at specified seniority levels"""
-        self.generate_data()
-        return [c for c in self._contacts if c.seniority in seniority_levels]
+        return self.get_store().find_contacts(seniority_levels=seniority_levels)
     
     def get_qualified_leads(self, criteria: Dict[str, Any]) -> List[Lead]:
         """Return leads matching criteria"""
-        self.generate_data()
-        
-        # Filter companies based on criteria
-        companies = self._companies
-        
-        if "industries" in criteria:
-            companies = [c for c in companies if c.industry in criteria["industries"]]
-        
-        if "company_sizes" in criteria:
-            companies = [c for c in companies if c.employee_range in criteria["company_sizes"]]
-        
-        if "funding_stages" in criteria:
-            companies = [c for c in companies if c.funding_stage in criteria["funding_stages"]]
+        store = self.get_store()
         
-        if "min_growth_rate" in criteria:
+        # Non-indexed company filters
+        def company_filter(company: Company) -> bool:
+            if "funding_stages" in criteria and company.funding_stage not in criteria["funding_stages"]:
+                return False
             # Simple growth rate filtering
-            min_growth = criteria["min_growth_rate"]
-            companies = [c for c in companies if c.growth_rate >= min_growth]
-        
-        # Find contacts at these companies
-        company_ids = {c.id for c in companies}
-        contacts = [c for c in self._contacts if c.company_id in company_ids]
-        
-        # Filter by titles if specified
-        if "titles" in criteria:
-            title_keywords = criteria["titles"]
-            contacts = self.get_contacts_by_title(title_keywords)
-            contacts = [c for c in contacts if c.company_id in company_ids]
+            if "min_growth_rate" in criteria and not company.growth_rate >= criteria["min_growth_rate"]:
+                return False
+            return True
+        
+        has_company_filter = "funding_stages" in criteria or "min_growth_rate" in criteria
+        
+        # Join contacts to companies through the indexes
+        pairs = store.find_leads(
+            industries=criteria.get("industries"),
+            employee_ranges=criteria.get("company_sizes"),
+            title_keywords=criteria.get("titles"),
+            company_filter=company_filter if has_company_filter else None
+        )
         
         # Create leads
         leads = []
-        for contact in contacts:
-            company = next(c for c in companies if c.id == contact.company_id)
-            
+        for contact, company in pairs:
             # Generate qualification score
             score = self._calculate_lead_score(contact, company, criteria)
             
@@ -894,13 +900,11 @@ class MockDataGenerator:
     
     def get_company_by_id(self, company_id: str) -> Optional[Company]:
         """Return company by ID"""
-        self.generate_data()
-        return next((c for c in self._companies if c.id == company_id), None)
+        return self.get_store().get_company(company_id)
     
     def get_contact_by_id(self, contact_id: str) -> Optional[Contact]:
         """Return contact by ID"""
-        self.generate_data()
-        return next((c for c in self._contacts if c.id == contact_id), None)
+        return self.get_store().get_contact(contact_id)
 
 
 # Global instance
@@ -935,6 +939,15 @@ def get_contact_by_id(contact_id: str) -> Optional[Contact]:
     """Return contact by ID"""
     return _generator.get_contact_by_id(contact_id)
 
+def get_lead_store() -> LeadStore:
+    """Return the indexed lead store"""
+    return _generator.get_store()
+
+def open_snapshot(path: str):
+    """Open a dataset written by MockDataGenerator.generate_snapshot"""
+    from database.synthetic_dataset import SyntheticDataset
+    return SyntheticDataset.open(path)
+
 def get_all_companies() -> List[Company]:
     """Return all companies"""
     return _generator.get_companies()
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Scalable Synthetic Dataset for HeyJarvis
+
+MockDataGenerator builds 50 companies and 100 contacts as pydantic objects,
+which is right for demos but far too small (and too slow to grow) for load
+testing. SyntheticDataset generates the same kind of data at scale:
+
+- generation is seeded and chunked: every table is produced ``chunk_size``
+  rows at a time with numpy, each chunk from its own RNG stream, so the
+  same seed and chunk size always give a byte-identical snapshot and memory
+  stays bounded by one chunk
+- rows are stored column-wise (categoricals dictionary-encoded) as .npy
+  files next to a JSON manifest; opening a snapshot memory-maps the columns
+  instead of regenerating, so it takes milliseconds at any size
+- ids are served from sorted id arrays (binary search), categorical filters
+  from posting lists grouped by code, and size ranges from a sorted
+  employee_count index
+- text-heavy fields (descriptions, news, pain points, emails, ...) are not
+  stored: they are derived deterministically from the row when a Company or
+  Contact model is materialized
+
+Typical use::
+
+    dataset = SyntheticDataset.generate("/tmp/leads", companies=100_000, contacts=1_000_000)
+    dataset = SyntheticDataset.open("/tmp/leads")           # later, in another process
+    rows = dataset.find_leads(industries=["SaaS"], title_keywords=["VP"])
+    contact, company = dataset.lead(rows.contacts[0])
+"""
+
+import json
+import os
+import random
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from database.mock_data import Company, Contact, MockDataGenerator
+
+
+SNAPSHOT_FORMAT = "heyjarvis-synthetic-v1"
+
+INDUSTRY_WEIGHTS = {"SaaS": 0.4, "FinTech": 0.2, "E-commerce": 0.2, "Healthcare": 0.1, "Manufacturing": 0.1}
+SENIORITY_WEIGHTS = {"C-Level": 0.30, "VP": 0.30, "Director": 0.25, "Manager": 0.15}
+EMPLOYEE_BANDS = [  # (min, max, weight) as in MockDataGenerator._generate_employee_count
+    (1, 10, 0.15), (11, 50, 0.25), (51, 200, 0.30), (201, 500, 0.20), (501, 1000, 0.07), (1001, 5000, 0.03)
+]
+EMPLOYEE_RANGES = ["1-10", "11-50", "51-200", "201-500", "501-1000", "1000+"]
+FUNDING_STAGES = ["Seed", "Series A", "Series B", "Series C+", "Public"]
+REVENUE_RANGES = ["$0-1M", "$1-10M", "$10-50M", "$50-100M", "$100M+"]
+GROWTH_RATES = ["0-20%", "20-50%", "50-100%", "100%+"]
+
+
+@dataclass
+class LeadRows:
+    """Matching (contact row, company row) pairs, in contact row order"""
+    contacts: np.ndarray
+    companies: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.contacts)
+
+
+class SyntheticDataset:
+    """Memory-mapped columnar companies and contacts with lookup indexes"""
+
+    COMPANY_POSTINGS = ("industry", "employee_range", "funding_stage")
+    CONTACT_POSTINGS = ("seniority", "title", "company")
+
+    def __init__(self, path: str, manifest: Dict[str, Any], columns: Dict[str, np.ndarray]):
+        self.path = path
+        self.manifest = manifest
+        self.vocab: Dict[str, List[str]] = manifest["vocab"]
+        self.columns = columns
+        self.seed: int = manifest["seed"]
+        self.generated_at = datetime.fromisoformat(manifest["generated_at"])
+        self._generator = MockDataGenerator()
+        self._title_lower = [title.lower() for title in self.vocab["title"]]
+        self._departments = [self._generator._determine_department(title) for title in self.vocab["title"]]
+
+    # Generation
+    @classmethod
+    def generate(
+        cls,
+        path: str,
+        companies: int = 100_000,
+        contacts: int = 1_000_000,
+        seed: int = 42,
+        chunk_size: int = 65_536,
+        overwrite: bool = False
+    ) -> "SyntheticDataset":
+        """Generate a snapshot at ``path`` and open it"""
+        if os.path.exists(path):
+            if not overwrite:
+                raise FileExistsError(f"Snapshot already exists: {path}")
+            shutil.rmtree(path)
+        if companies < 1 or contacts < 0:
+            raise ValueError("Need at least one company and a non-negative contact count")
+
+        start_time = time.perf_counter()
+        staging = f"{path}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        try:
+            writer = _SnapshotWriter(staging, seed, chunk_size)
+            vocab = writer.write_companies(companies)
+            vocab.update(writer.write_contacts(contacts, companies))
+            writer.write_indexes(vocab)
+
+            manifest = {
+                "format": SNAPSHOT_FORMAT,
+                "seed": seed,
+                "chunk_size": chunk_size,
+                "companies": companies,
+                "contacts": contacts,
+                # Fixed reference time so materialized news dates are stable
+                "generated_at": datetime.now().replace(microsecond=0).isoformat(),
+                "generation_seconds": round(time.perf_counter() - start_time, 3),
+                "vocab": vocab,
+                "columns": sorted(writer.columns)
+            }
+            with open(os.path.join(staging, "manifest.json"), "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            # Readers never see a half-written snapshot
+            os.rename(staging, path)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: str) -> "SyntheticDataset":
+        """Open an existing snapshot without regenerating it"""
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format: {manifest.get('format')}")
+
+        columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in manifest["columns"]
+        }
+        return cls(path, manifest, columns)
+
+    # Size
+    @property
+    def company_count(self) -> int:
+        return self.manifest["companies"]
+
+    @property
+    def contact_count(self) -> int:
+        return self.manifest["contacts"]
+
+    # Id lookups
+    def company_row(self, company_id: str) -> Optional[int]:
+        """Row of a company id, by binary search over the sorted ids"""
+        return self._id_row(company_id, "comp_", "company")
+
+    def contact_row(self, contact_id: str) -> Optional[int]:
+        """Row of a contact id, by binary search over the sorted ids"""
+        return self._id_row(contact_id, "cont_", "contact")
+
+    def _id_row(self, value: str, prefix: str, table: str) -> Optional[int]:
+        if not value.startswith(prefix):
+            return None
+        try:
+            key = int(value[len(prefix):], 16)
+        except ValueError:
+            return None
+        if not 0 <= key <= 0xFFFFFFFF:
+            return None
+        sorted_ids = self.columns[f"{table}_id_sorted"]
+        # A uint32 key keeps searchsorted from casting the whole id column
+        position = int(np.searchsorted(sorted_ids, np.uint32(key)))
+        if position < len(sorted_ids) and sorted_ids[position] == key:
+            return int(self.columns[f"{table}_id_order"][position])
+        return None
+
+    def get_company(self, company_id: str) -> Optional[Company]:
+        row = self.company_row(company_id)
+        return self.company(row) if row is not None else None
+
+    def get_contact(self, contact_id: str) -> Optional[Contact]:
+        row = self.contact_row(contact_id)
+        return self.contact(row) if row is not None else None
+
+    # Filters
+    def postings(self, name: str, codes: Iterable[int]) -> np.ndarray:
+        """Sorted rows whose ``name`` column has any of the given codes"""
+        rows = self.columns[f"{name}_rows"]
+        offsets = self.columns[f"{name}_offsets"]
+        parts = [rows[offsets[code]:offsets[code + 1]] for code in sorted(set(codes))]
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        if len(parts) == 1:
+            return np.asarray(parts[0])
+        return np.sort(np.concatenate(parts))
+
+    def _codes(self, name: str, values: Iterable[str]) -> List[int]:
+        lookup = {value: code for code, value in enumerate(self.vocab[name])}
+        return [lookup[value] for value in values if value in lookup]
+
+    def company_rows(
+        self,
+        industries: Optional[Iterable[str]] = None,
+        employee_ranges: Optional[Iterable[str]] = None,
+        funding_stages: Optional[Iterable[str]] = None,
+        min_employees: Optional[int] = None,
+        max_employees: Optional[int] = None
+    ) -> np.ndarray:
+        """Sorted company rows matching every given filter"""
+        selected: Optional[np.ndarray] = None
+        for name, values in (("industry", industries), ("employee_range", employee_ranges),
+                             ("funding_stage", funding_stages)):
+            if values is None:
+                continue
+            rows = self.postings(name, self._codes(name, values))
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+
+        if min_employees is not None or max_employees is not None:
+            rows = self.companies_by_size(min_employees, max_employees)
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+
+        if selected is None:
+            return np.arange(self.company_count, dtype=np.int32)
+        return selected
+
+    def companies_by_size(self, min_employees: Optional[int] = None, max_employees: Optional[int] = None) -> np.ndarray:
+        """Sorted rows of companies with min_employees <= employee_count <= max_employees"""
+        counts = self.columns["employee_count_sorted"]
+        lo = 0 if min_employees is None else int(np.searchsorted(counts, min_employees, side="left"))
+        hi = len(counts) if max_employees is None else int(np.searchsorted(counts, max_employees, side="right"))
+        return np.sort(self.columns["employee_count_order"][lo:hi])
+
+    def title_codes(self, title_keywords: Iterable[str]) -> List[int]:
+        """Title codes containing any keyword (case-insensitive substring)"""
+        keywords = [keyword.lower() for keyword in title_keywords]
+        return [
+            code for code, title in enumerate(self._title_lower)
+            if any(keyword in title for keyword in keywords)
+        ]
+
+    def contact_rows(
+        self,
+        title_keywords: Optional[Iterable[str]] = None,
+        seniority_levels: Optional[Iterable[str]] = None,
+        company_rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Sorted contact rows matching every given filter"""
+        selected: Optional[np.ndarray] = None
+        if title_keywords is not None:
+            selected = self.postings("title", self.title_codes(title_keywords))
+        if seniority_levels is not None:
+            rows = self.postings("seniority", self._codes("seniority", seniority_levels))
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+
+        if company_rows is not None:
+            if selected is None and len(company_rows) * 20 < self.company_count:
+                # Few companies: walk their contact lists instead of the contact column
+                return self.postings("company", company_rows)
+            company_mask = np.zeros(self.company_count, dtype=bool)
+            company_mask[company_rows] = True
+            if selected is None:
+                return np.flatnonzero(company_mask[self.columns["contact_company"]]).astype(np.int32)
+            selected = selected[company_mask[self.columns["contact_company"][selected]]]
+
+        if selected is None:
+            return np.arange(self.contact_count, dtype=np.int32)
+        return selected
+
+    def find_leads(
+        self,
+        industries: Optional[Iterable[str]] = None,
+        employee_ranges: Optional[Iterable[str]] = None,
+        funding_stages: Optional[Iterable[str]] = None,
+        title_keywords: Optional[Iterable[str]] = None,
+        seniority_levels: Optional[Iterable[str]] = None
+    ) -> LeadRows:
+        """Contacts (and their companies) matching every given filter"""
+        company_filtered = any(values is not None for values in (industries, employee_ranges, funding_stages))
+        companies = self.company_rows(industries, employee_ranges, funding_stages) if company_filtered else None
+        contacts = self.contact_rows(title_keywords, seniority_levels, companies)
+        return LeadRows(contacts=contacts, companies=np.asarray(self.columns["contact_company"][contacts]))
+
+    # Materialization
+    def company_id(self, row: int) -> str:
+        return f"comp_{int(self.columns['company_id'][row]):08x}"
+
+    def contact_id(self, row: int) -> str:
+        return f"cont_{int(self.columns['contact_id'][row]):08x}"
+
+    def _company_name(self, row: int) -> str:
+        industry = self.vocab["industry"][self.columns["company_industry"][row]]
+        names = self._generator._company_names[industry]
+        return f"{names[self.columns['company_name'][row] % len(names)]} {row + 1}"
+
+    def company(self, row: int) -> Company:
+        """Company model for a row; derived fields are the same on every call"""
+        columns = self.columns
+        rng = random.Random(self.seed * 1_000_003 + int(columns["company_id"][row]))
+        generator = self._generator
+
+        industry = self.vocab["industry"][columns["company_industry"][row]]
+        industry_info = generator._industry_data[industry]
+        sub_industries = industry_info["sub_industries"]
+        sub_industry = sub_industries[columns["company_sub_industry"][row] % len(sub_industries)]
+        name = self._company_name(row)
+        location = self.vocab["location"][columns["company_location"][row]]
+
+        return Company(
+            id=self.company_id(row),
+            name=name,
+            website=f"https://{name.lower().replace(' ', '').replace('-', '')}.com",
+            industry=industry,
+            sub_industry=sub_industry,
+            employee_count=int(columns["company_employee_count"][row]),
+            employee_range=self.vocab["employee_range"][columns["company_employee_range"][row]],
+            location=location,
+            headquarters=location,
+            founded_year=int(columns["company_founded_year"][row]),
+            description=generator._generate_company_description(name, industry, sub_industry, rng=rng),
+            recent_news=generator._generate_company_news(name, industry, rng=rng, now=self.generated_at),
+            pain_points=rng.sample(industry_info["pain_points"], rng.randint(3, 5)),
+            technologies=rng.sample(industry_info["technologies"], rng.randint(4, 6)),
+            funding_stage=self.vocab["funding_stage"][columns["company_funding_stage"][row]],
+            revenue_range=self.vocab["revenue_range"][columns["company_revenue_range"][row]],
+            growth_rate=self.vocab["growth_rate"][columns["company_growth_rate"][row]]
+        )
+
+    def contact(self, row: int) -> Contact:
+        """Contact model for a row; derived fields are the same on every call"""
+        columns = self.columns
+        rng = random.Random(self.seed * 1_000_033 + int(columns["contact_id"][row]))
+        generator = self._generator
+
+        company_row = int(columns["contact_company"][row])
+        company_name = self._company_name(company_row)
+        first_name = self.vocab["first_name"][columns["contact_first_name"][row]]
+        last_name = self.vocab["last_name"][columns["contact_last_name"][row]]
+        title_code = int(columns["contact_title"][row])
+        title = self.vocab["title"][title_code]
+        department = self._departments[title_code]
+        seniority = self.vocab["seniority"][columns["contact_seniority"][row]]
+        website = f"https://{company_name.lower().replace(' ', '').replace('-', '')}.com"
+
+        phone = f"+1-{rng.randint(555, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        return Contact(
+            id=self.contact_id(row),
+            first_name=first_name,
+            last_name=last_name,
+            full_name=f"{first_name} {last_name}",
+            title=title,
+            department=department,
+            seniority=seniority,
+            company_id=self.company_id(company_row),
+            company_name=company_name,
+            email=generator._generate_email(first_name, last_name, website, rng=rng),
+            linkedin_url=f"https://linkedin.com/in/{first_name.lower()}-{last_name.lower()}-{rng.randint(100, 999)}",
+            phone=phone if rng.random() > 0.3 else None,
+            location=self.vocab["location"][columns["company_location"][company_row]],
+            years_in_role=int(columns["contact_years_in_role"][row]) / 10,
+            pain_points=generator._generate_role_pain_points(title, department, rng=rng),
+            priorities=generator._generate_priorities(title, department, rng=rng),
+            reports_to=generator._generate_reports_to(seniority, department)
+        )
+
+    def lead(self, contact_row: int) -> Tuple[Contact, Company]:
+        """(contact, company) models for a contact row"""
+        return self.contact(contact_row), self.company(int(self.columns["contact_company"][contact_row]))
+
+    def iter_leads(self, rows: LeadRows, limit: Optional[int] = None) -> Iterator[Tuple[Contact, Company]]:
+        """Materialize matched leads lazily"""
+        for contact_row in rows.contacts[:limit]:
+            yield self.lead(int(contact_row))
+
+
+class _SnapshotWriter:
+    """Writes one snapshot's columns chunk by chunk"""
+
+    def __init__(self, path: str, seed: int, chunk_size: int):
+        self.path = path
+        self.seed = seed
+        self.chunk_size = max(1, chunk_size)
+        self.columns: List[str] = []
+        self.generator = MockDataGenerator()
+
+    def _rng(self, table: int, chunk: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, table, chunk])
+
+    def _column(self, name: str, dtype, length: int) -> np.ndarray:
+        self.columns.append(name)
+        return np.lib.format.open_memmap(os.path.join(self.path, f"{name}.npy"), mode="w+",
+                                         dtype=dtype, shape=(length,))
+
+    def _save(self, name: str, values: np.ndarray):
+        self.columns.append(name)
+        np.save(os.path.join(self.path, f"{name}.npy"), values)
+
+    def _chunks(self, length: int) -> Iterator[Tuple[int, int, int]]:
+        for chunk, start in enumerate(range(0, length, self.chunk_size)):
+            yield chunk, start, min(length, start + self.chunk_size)
+
+    def _ids(self, table: int, length: int) -> Tuple[int, int]:
+        # row -> (row * multiplier + offset) mod 2**32 is a bijection for odd
+        # multipliers: unique, scrambled 8-hex-digit ids without a uniqueness check
+        rng = self._rng(table, -1 & 0xFFFF)
+        return int(rng.integers(1 << 30)) * 2 + 1, int(rng.integers(1 << 32))
+
+    def write_companies(self, length: int) -> Dict[str, List[str]]:
+        generator = self.generator
+        industries = list(INDUSTRY_WEIGHTS)
+        industry_p = np.array(list(INDUSTRY_WEIGHTS.values()))
+        band_p = np.array([weight for _, _, weight in EMPLOYEE_BANDS])
+        band_p = band_p / band_p.sum()
+        band_lo = np.array([low for low, _, _ in EMPLOYEE_BANDS])
+        band_hi = np.array([high for _, high, _ in EMPLOYEE_BANDS])
+        range_edges = np.array([10, 50, 200, 500, 1000])
+        multiplier, offset = self._ids(0, length)
+
+        ids = self._column("company_id", np.uint32, length)
+        industry = self._column("company_industry", np.uint8, length)
+        sub_industry = self._column("company_sub_industry", np.uint8, length)
+        name = self._column("company_name", np.uint8, length)
+        employees = self._column("company_employee_count", np.int32, length)
+        employee_range = self._column("company_employee_range", np.uint8, length)
+        location = self._column("company_location", np.uint8, length)
+        founded = self._column("company_founded_year", np.int16, length)
+        funding = self._column("company_funding_stage", np.uint8, length)
+        revenue = self._column("company_revenue_range", np.uint8, length)
+        growth = self._column("company_growth_rate", np.uint8, length)
+
+        for chunk, start, stop in self._chunks(length):
+            rng = self._rng(0, chunk)
+            n = stop - start
+            rows = np.arange(start, stop, dtype=np.uint64)
+            ids[start:stop] = (rows * multiplier + offset) & 0xFFFFFFFF
+            industry[start:stop] = rng.choice(len(industries), size=n, p=industry_p)
+            sub_industry[start:stop] = rng.integers(0, 5, size=n)
+            name[start:stop] = rng.integers(0, 255, size=n)
+            band = rng.choice(len(EMPLOYEE_BANDS), size=n, p=band_p)
+            counts = rng.integers(band_lo[band], band_hi[band] + 1)
+            employees[start:stop] = counts
+            employee_range[start:stop] = np.searchsorted(range_edges, counts, side="left")
+            location[start:stop] = rng.integers(0, len(generator._locations), size=n)
+            founded[start:stop] = rng.integers(2010, 2023, size=n)
+            funding[start:stop] = rng.integers(0, len(FUNDING_STAGES), size=n)
+            revenue[start:stop] = rng.integers(0, len(REVENUE_RANGES), size=n)
+            growth[start:stop] = rng.integers(0, len(GROWTH_RATES), size=n)
+
+        for column in (ids, industry, sub_industry, name, employees, employee_range,
+                       location, founded, funding, revenue, growth):
+            column.flush()
+
+        return {
+            "industry": industries,
+            "employee_range": EMPLOYEE_RANGES,
+            "location": list(generator._locations),
+            "funding_stage": FUNDING_STAGES,
+            "revenue_range": REVENUE_RANGES,
+            "growth_rate": GROWTH_RATES,
+        }
+
+    def write_contacts(self, length: int, company_count: int) -> Dict[str, List[str]]:
+        generator = self.generator
+        seniorities = list(SENIORITY_WEIGHTS)
+        seniority_p = np.array(list(SENIORITY_WEIGHTS.values()))
+        titles: List[str] = []
+        title_start, title_len = [], []
+        for level in seniorities:
+            title_start.append(len(titles))
+            title_len.append(len(generator._titles_by_seniority[level]))
+            titles.extend(generator._titles_by_seniority[level])
+        title_start_arr, title_len_arr = np.array(title_start), np.array(title_len)
+        multiplier, offset = self._ids(1, length)
+
+        ids = self._column("contact_id", np.uint32, length)
+        company = self._column("contact_company", np.int32, length)
+        seniority = self._column("contact_seniority", np.uint8, length)
+        title = self._column("contact_title", np.uint8, length)
+        first_name = self._column("contact_first_name", np.uint8, length)
+        last_name = self._column("contact_last_name", np.uint8, length)
+        years = self._column("contact_years_in_role", np.uint8, length)
+
+        for chunk, start, stop in self._chunks(length):
+            rng = self._rng(1, chunk)
+            n = stop - start
+            rows = np.arange(start, stop, dtype=np.uint64)
+            ids[start:stop] = (rows * multiplier + offset) & 0xFFFFFFFF
+            company[start:stop] = rng.integers(0, company_count, size=n)
+            levels = rng.choice(len(seniorities), size=n, p=seniority_p)
+            seniority[start:stop] = levels
+            title[start:stop] = title_start_arr[levels] + (rng.random(n) * title_len_arr[levels]).astype(np.int64)
+            first_name[start:stop] = rng.integers(0, len(generator._first_names), size=n)
+            last_name[start:stop] = rng.integers(0, len(generator._last_names), size=n)
+            years[start:stop] = rng.integers(5, 81, size=n)  # Tenths of a year, 0.5-8.0
+
+        for column in (ids, company, seniority, title, first_name, last_name, years):
+            column.flush()
+
+        return {
+            "seniority": seniorities,
+            "title": titles,
+            "first_name": list(generator._first_names),
+            "last_name": list(generator._last_names),
+        }
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+
+    def _write_id_index(self, table: str):
+        ids = np.asarray(self._load(f"{table}_id"))
+        order = np.argsort(ids, kind="stable").astype(np.int32)
+        self._save(f"{table}_id_order", order)
+        self._save(f"{table}_id_sorted", ids[order])
+
+    def _write_postings(self, name: str, codes: np.ndarray, size: int):
+        # Rows grouped by code (ascending within each code) plus group offsets
+        codes = np.asarray(codes)
+        self._save(f"{name}_rows", np.argsort(codes, kind="stable").astype(np.int32))
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=size), out=offsets[1:])
+        self._save(f"{name}_offsets", offsets)
+
+    def write_indexes(self, vocab: Dict[str, List[str]]):
+        self._write_id_index("company")
+        self._write_id_index("contact")
+
+        for name in SyntheticDataset.COMPANY_POSTINGS:
+            self._write_postings(name, self._load(f"company_{name}"), len(vocab[name]))
+        self._write_postings("seniority", self._load("contact_seniority"), len(vocab["seniority"]))
+        self._write_postings("title", self._load("contact_title"), len(vocab["title"]))
+        companies = self._load("company_id")
+        self._write_postings("company", self._load("contact_company"), len(companies))
+
+        employees = np.asarray(self._load("company_employee_count"))
+        order = np.argsort(employees, kind="stable").astype(np.int32)
+        self._save("employee_count_order", order)
+        self._save("employee_count_sorted", employees[order])
@@ -0,0 +1,203 @@
+"""
+Streaming A/B testing for the adaptive learning system.
+
+Results are folded into per-variant sufficient statistics as they arrive,
+so analysis costs the same after ten results or ten million. Each variant
+is compared with the control by a mixture sequential probability ratio
+test (mSPRT), whose always-valid p-values may be checked after every
+result without inflating the false-positive rate; a test stops as soon as
+a variant is shown to beat the control, and variants shown to be worse
+stop receiving traffic. Traffic is allocated by Thompson sampling over
+the surviving variants.
+"""
+import math
+import random
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class VariantStats:
+    """Sufficient statistics for one variant and metric"""
+    __slots__ = ("records", "mean", "m2", "trials", "successes", "is_rate")
+
+    def __init__(self):
+        self.records = 0       # record_ab_result calls
+        self.mean = 0.0        # Mean of recorded values (Welford)
+        self.m2 = 0.0
+        self.trials = 0.0      # Sum of sample sizes
+        self.successes = 0.0   # Sum of value * sample_size
+        self.is_rate = True    # Every value so far was a proportion in [0, 1]
+
+    def add(self, value: float, sample_size: int = 1):
+        self.records += 1
+        delta = value - self.mean
+        self.mean += delta / self.records
+        self.m2 += delta * (value - self.mean)
+
+        self.trials += sample_size
+        self.successes += value * sample_size
+        if not 0.0 <= value <= 1.0:
+            self.is_rate = False
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(max(0.0, self.m2 / (self.records - 1))) if self.records > 1 else 0.0
+
+    @property
+    def observations(self) -> float:
+        """Sample count behind estimate(): trials for rates, records otherwise"""
+        return self.trials if self.is_rate else self.records
+
+    def estimate(self) -> Tuple[float, float]:
+        """(estimate, variance of the estimate) for the sequential test"""
+        if self.is_rate:
+            if self.trials <= 0:
+                return 0.0, math.inf
+            rate = self.successes / self.trials
+            return rate, rate * (1 - rate) / self.trials
+        if self.records < 2:
+            return self.mean, math.inf
+        return self.mean, self.m2 / (self.records - 1) / self.records
+
+    def sample_posterior(self, rng: random.Random) -> float:
+        """One Thompson draw: Beta posterior for rates, normal approximation otherwise"""
+        if self.is_rate:
+            return rng.betavariate(1 + self.successes, 1 + self.trials - self.successes)
+        estimate, variance = self.estimate()
+        if math.isinf(variance):
+            return rng.gauss(estimate, 1e9)
+        return rng.gauss(estimate, math.sqrt(variance))
+
+
+def msprt_p_value(difference: float, variance: float, mixing_variance: float) -> float:
+    """
+    Always-valid p-value 1 / Lambda of the normal-mixture SPRT.
+
+    ``difference`` is the estimated treatment effect, ``variance`` its
+    variance and ``mixing_variance`` the variance of the normal prior over
+    effect sizes (Johari et al., "Always Valid Inference").
+    """
+    if variance <= 0 or math.isinf(variance) or mixing_variance <= 0:
+        return 1.0
+    total = variance + mixing_variance
+    log_lambda = 0.5 * math.log(variance / total) + (
+        mixing_variance * difference * difference / (2 * variance * total)
+    )
+    if log_lambda <= 0:
+        return 1.0
+    return math.exp(-log_lambda) if log_lambda < 700 else 0.0
+
+
+class SequentialABTest:
+    """
+    Sequential state of one A/B test's primary metric.
+
+    ``update`` is called after every result for a variant and costs O(number
+    of variants); ``choose_variant`` is a Thompson draw over the surviving
+    variants (or the winner once the test has stopped).
+    """
+
+    def __init__(self, variants: List[str], alpha: float = 0.05, min_samples: int = 100,
+                 mixing_sd: float = 0.1):
+        self.variants = list(variants)
+        self.control = self.variants[0] if self.variants else None
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.mixing_sd = mixing_sd  # Prior effect size, in pooled standard deviations
+        self.stats: Dict[str, VariantStats] = {variant: VariantStats() for variant in self.variants}
+        self.p_values: Dict[str, float] = {}  # Running minimum per non-control variant
+        self.eliminated: Set[str] = set()
+        self.winner: Optional[str] = None
+        self.stopped = False
+
+    def variant_stats(self, variant: str) -> VariantStats:
+        stats = self.stats.get(variant)
+        if stats is None:
+            stats = self.stats[variant] = VariantStats()
+            self.variants.append(variant)
+            if self.control is None:
+                self.control = variant
+        return stats
+
+    @property
+    def corrected_alpha(self) -> float:
+        # Bonferroni over the comparisons with the control
+        return self.alpha / max(1, len(self.variants) - 1)
+
+    def _compare(self, variant: str):
+        control, treatment = self.stats[self.control], self.stats[variant]
+        if control.observations < self.min_samples or treatment.observations < self.min_samples:
+            return
+
+        control_mean, control_variance = control.estimate()
+        treatment_mean, treatment_variance = treatment.estimate()
+        if control.is_rate and treatment.is_rate:
+            pooled = (control.successes + treatment.successes) / (control.trials + treatment.trials)
+            pooled_variance = pooled * (1 - pooled)
+        else:
+            pooled_variance = 0.5 * (control.std_dev ** 2 + treatment.std_dev ** 2)
+        p_value = msprt_p_value(
+            treatment_mean - control_mean,
+            control_variance + treatment_variance,
+            self.mixing_sd * self.mixing_sd * pooled_variance
+        )
+        self.p_values[variant] = min(self.p_values.get(variant, 1.0), p_value)
+
+    def update(self, variant: str) -> Optional[str]:
+        """Re-test after a result for ``variant``; returns the winner if the test just stopped"""
+        if self.stopped or self.control is None:
+            return None
+
+        for other in ([v for v in self.variants if v != self.control] if variant == self.control else [variant]):
+            if other not in self.eliminated:
+                self._compare(other)
+
+        threshold = self.corrected_alpha
+        control_mean = self.stats[self.control].estimate()[0]
+        better = []
+        for other, p_value in self.p_values.items():
+            if other in self.eliminated or p_value >= threshold:
+                continue
+            mean = self.stats[other].estimate()[0]
+            if mean > control_mean:
+                better.append((mean, other))
+            else:
+                self.eliminated.add(other)
+
+        if better:
+            self.winner = max(better)[1]
+        elif self.eliminated and len(self.eliminated) >= len(self.variants) - 1:
+            self.winner = self.control
+        if self.winner is not None:
+            self.stopped = True
+        return self.winner
+
+    def choose_variant(self, rng: random.Random = random) -> Optional[str]:
+        """Variant for the next send"""
+        if self.stopped:
+            return self.winner
+        best, best_draw = None, -math.inf
+        for variant in self.variants:
+            if variant in self.eliminated:
+                continue
+            draw = self.stats[variant].sample_posterior(rng)
+            if draw > best_draw:
+                best, best_draw = variant, draw
+        return best
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-variant statistics, independent of the number of results"""
+        summary = {}
+        for variant in self.variants:
+            stats = self.stats[variant]
+            if not stats.records:
+                continue
+            summary[variant] = {
+                "mean": stats.mean,
+                "sample_size": stats.records,
+                "std_dev": stats.std_dev,
+                "trials": stats.trials,
+                "estimate": stats.estimate()[0],
+                "p_value": self.p_values.get(variant),
+                "eliminated": variant in self.eliminated
+            }
+        return summary
@@ -2,21 +2,24 @@
 Adaptive Learning System - Pattern Recognition and Workflow Intelligence
 Provides machine learning-driven insights, pattern recognition, and adaptive optimization
 """
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Deque, Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 from pydantic import BaseModel, validator
 from enum import Enum
 import uuid
+import random
 import asyncio
 import logging
 import json
 import numpy as np
-from collections import defaultdict, Counter
-import statistics
+from collections import defaultdict, Counter, deque
 from dataclasses import dataclass
 import pickle
 import hashlib
 
+from .ab_testing import SequentialABTest, VariantStats
+from .metric_series import MetricSeries, SubsequenceCounter
+
 
 class PatternType(str, Enum):
     PERFORMANCE = "performance"
@@ -171,18 +174,34 @@ class AdaptiveSystem:
         self.insights: Dict[str, LearningInsight] = {}
         self.recommendations: Dict[str, Recommendation] = {}
         
-        # A/B testing
+        # A/B testing: sequential state for each test's primary metric and
+        # sufficient statistics for its other metrics
         self.ab_tests: Dict[str, ABTest] = {}
-        self.ab_results: Dict[str, List[ABTestResult]] = defaultdict(list)
-        
-        # Data storage
-        self.historical_data: List[DataPoint] = []
+        self.ab_sequential: Dict[str, SequentialABTest] = {}
+        self.ab_metric_stats: Dict[str, Dict[Tuple[str, str], VariantStats]] = defaultdict(dict)
+        self.ab_alpha = self.config.get("ab_alpha", 0.05)
+        self.ab_min_samples = self.config.get("ab_min_samples", 100)
+        self.ab_mixing_sd = self.config.get("ab_mixing_sd", 0.1)
+        
+        # Data storage: points in arrival order, bounded by age and count
+        self.historical_data: Deque[DataPoint] = deque()
         self.feature_cache: Dict[str, Any] = {}
         
         # Learning parameters
         self.min_pattern_frequency = self.config.get("min_pattern_frequency", 5)
         self.min_confidence_threshold = self.config.get("min_confidence_threshold", 0.6)
         self.data_retention_days = self.config.get("data_retention_days", 90)
+        self.max_data_points = self.config.get("max_data_points", 1_000_000)
+        self.pattern_detection_interval = self.config.get("pattern_detection_interval", 100)
+        self.anomaly_z_threshold = self.config.get("anomaly_z_threshold", 3.0)
+        self.ewma_alpha = self.config.get("ewma_alpha", 0.1)
+        
+        # Summaries maintained on insert and expiry, read by the pattern detectors
+        self.metric_series: Dict[Tuple[str, str, str], MetricSeries] = {}
+        self.step_sequences: Dict[str, SubsequenceCounter] = {}
+        self.hourly_durations: Dict[int, List[float]] = defaultdict(lambda: [0, 0.0])  # hour -> [count, sum]
+        self.points_recorded = 0
+        self._retention = (self.data_retention_days, timedelta(days=self.data_retention_days))
         
         # Initialize pattern detectors
         self._setup_pattern_detectors()
@@ -198,10 +217,22 @@ class AdaptiveSystem:
         }
     
     def record_data_point(self, workflow_id: str, step_id: str, metric_name: str, 
-                         value: float, context: Dict[str, Any] = None):
-        """Record a new data point for analysis"""
+                         value: float, context: Dict[str, Any] = None,
+                         timestamp: Optional[datetime] = None):
+        """
+        Record a new data point for analysis (O(1) amortized, including expiry).
+        
+        Points must arrive in time order: a timestamp before the newest recorded
+        point or in the future raises ValueError.
+        """
+        now = datetime.now()
+        if timestamp is None:
+            timestamp = now
+        elif timestamp > now or (self.historical_data and timestamp < self.historical_data[-1].timestamp):
+            raise ValueError(f"Data point timestamp out of order: {timestamp.isoformat()}")
+        
         data_point = DataPoint(
-            timestamp=datetime.now(),
+            timestamp=timestamp,
             workflow_id=workflow_id,
             step_id=step_id,
             metric_name=metric_name,
@@ -210,14 +241,81 @@ class AdaptiveSystem:
         )
         
         self.historical_data.append(data_point)
+        self._index_data_point(data_point)
+        self.points_recorded += 1
+        
+        # Cleanup old data: points arrive in time order, so expired ones are at the front
+        if self._retention[0] != self.data_retention_days:
+            self._retention = (self.data_retention_days, timedelta(days=self.data_retention_days))
+        cutoff_date = max(data_point.timestamp, now) - self._retention[1]
+        while self.historical_data and (
+            len(self.historical_data) > self.max_data_points
+            or self.historical_data[0].timestamp <= cutoff_date
+        ):
+            self._expire_data_point(self.historical_data.popleft())
+        
+        # Trigger pattern detection periodically (only when called from an event loop)
+        if self.points_recorded % self.pattern_detection_interval == 0:
+            try:
+                asyncio.get_running_loop().create_task(self.detect_patterns())
+            except RuntimeError:
+                pass
+    
+    def _index_data_point(self, dp: DataPoint):
+        """Add a point to the per-metric series and the sequence/hourly summaries"""
+        key = (dp.workflow_id, dp.step_id, dp.metric_name)
+        series = self.metric_series.get(key)
+        if series is None:
+            series = self.metric_series[key] = MetricSeries(
+                anomaly_threshold=self.anomaly_z_threshold, ewma_alpha=self.ewma_alpha
+            )
+        series.append(dp)
         
-        # Cleanup old data
-        cutoff_date = datetime.now() - timedelta(days=self.data_retention_days)
-        self.historical_data = [dp for dp in self.historical_data if dp.timestamp > cutoff_date]
+        sequence = self.step_sequences.get(dp.workflow_id)
+        if sequence is None:
+            sequence = self.step_sequences[dp.workflow_id] = SubsequenceCounter()
+        sequence.append(dp.step_id)
         
-        # Trigger pattern detection periodically
-        if len(self.historical_data) % 100 == 0:
-            asyncio.create_task(self.detect_patterns())
+        if dp.metric_name == 'duration':
+            bucket = self.hourly_durations[dp.timestamp.hour]
+            bucket[0] += 1
+            bucket[1] += dp.value
+    
+    def _expire_data_point(self, dp: DataPoint):
+        """Remove the oldest point from every summary it was added to"""
+        key = (dp.workflow_id, dp.step_id, dp.metric_name)
+        series = self.metric_series[key]
+        series.popleft()
+        if not series:
+            del self.metric_series[key]
+        
+        sequence = self.step_sequences[dp.workflow_id]
+        sequence.popleft()
+        if not sequence:
+            del self.step_sequences[dp.workflow_id]
+        
+        if dp.metric_name == 'duration':
+            bucket = self.hourly_durations[dp.timestamp.hour]
+            bucket[0] -= 1
+            bucket[1] -= dp.value
+            if not bucket[0]:
+                del self.hourly_durations[dp.timestamp.hour]
+    
+    def get_metric_summary(self, workflow_id: str, step_id: str, metric_name: str) -> Optional[Dict[str, Any]]:
+        """Running statistics for one metric of a workflow step"""
+        series = self.metric_series.get((workflow_id, step_id, metric_name))
+        if series is None:
+            return None
+        stats = series.stats
+        return {
+            "count": stats.count,
+            "mean": stats.mean,
+            "std_dev": stats.std_dev,
+            "ewma": stats.ewma,
+            "trend": stats.trend(),
+            "anomalies": series.anomaly_summary(),
+            "last_seen": series.last_seen
+        }
     
     async def detect_patterns(self) -> List[Pattern]:
         """Run pattern detection across all types"""
@@ -247,56 +345,57 @@ class AdaptiveSystem:
         """Detect performance-related patterns"""
         patterns = []
         
-        # Group data by workflow and step
-        workflow_data = defaultdict(lambda: defaultdict(list))
-        for dp in self.historical_data:
-            if dp.metric_name in ['duration', 'cost', 'success_rate']:
-                workflow_data[dp.workflow_id][dp.step_id].append(dp)
+        # Group the maintained series by workflow and step
+        workflow_data = defaultdict(dict)
+        for (workflow_id, step_id, metric_name), series in self.metric_series.items():
+            if metric_name in ['duration', 'cost', 'success_rate']:
+                workflow_data[(workflow_id, step_id)][metric_name] = series
         
-        for workflow_id, steps in workflow_data.items():
-            for step_id, data_points in steps.items():
-                if len(data_points) < self.min_pattern_frequency:
-                    continue
-                
-                # Detect duration trends
-                duration_values = [dp.value for dp in data_points if dp.metric_name == 'duration']
-                if len(duration_values) >= 10:
-                    trend_pattern = self._analyze_trend(duration_values, 'duration')
-                    if trend_pattern:
-                        pattern = Pattern(
-                            pattern_id=f"perf_{workflow_id}_{step_id}_{hashlib.md5(str(duration_values).encode()).hexdigest()[:8]}",
-                            pattern_type=PatternType.PERFORMANCE,
-                            name=f"Duration Trend in {step_id}",
-                            description=f"Detected {trend_pattern['direction']} trend in step duration",
-                            confidence=trend_pattern['confidence'],
-                            discovered_at=datetime.now(),
-                            last_seen=max(dp.timestamp for dp in data_points),
-                            frequency=len(duration_values),
-                            context_conditions={"workflow_id": workflow_id, "step_id": step_id},
-                            impact_metrics={"duration_change": trend_pattern['magnitude']},
-                            recommendations=[f"Investigate {trend_pattern['direction']} trend in {step_id}"]
-                        )
-                        patterns.append(pattern)
-                
-                # Detect cost anomalies
-                cost_values = [dp.value for dp in data_points if dp.metric_name == 'cost']
-                if len(cost_values) >= 5:
-                    anomalies = self._detect_statistical_anomalies(cost_values)
-                    if anomalies['count'] > 0:
-                        pattern = Pattern(
-                            pattern_id=f"cost_anom_{workflow_id}_{step_id}_{uuid.uuid4().hex[:8]}",
-                            pattern_type=PatternType.PERFORMANCE,
-                            name=f"Cost Anomalies in {step_id}",
-                            description=f"Detected {anomalies['count']} cost anomalies",
-                            confidence=anomalies['confidence'],
-                            discovered_at=datetime.now(),
-                            last_seen=max(dp.timestamp for dp in data_points),
-                            frequency=anomalies['count'],
-                            context_conditions={"workflow_id": workflow_id, "step_id": step_id},
-                            impact_metrics={"anomaly_magnitude": anomalies['magnitude']},
-                            recommendations=["Review cost drivers for this step"]
-                        )
-                        patterns.append(pattern)
+        for (workflow_id, step_id), metrics in workflow_data.items():
+            if sum(len(series) for series in metrics.values()) < self.min_pattern_frequency:
+                continue
+            last_seen = max(series.last_seen for series in metrics.values())
+            
+            # Detect duration trends
+            duration = metrics.get('duration')
+            if duration is not None and len(duration) >= 10:
+                trend_pattern = duration.stats.trend()
+                if trend_pattern:
+                    window_id = f"{duration.first_x}:{duration.next_x}"
+                    pattern = Pattern(
+                        pattern_id=f"perf_{workflow_id}_{step_id}_{hashlib.md5(window_id.encode()).hexdigest()[:8]}",
+                        pattern_type=PatternType.PERFORMANCE,
+                        name=f"Duration Trend in {step_id}",
+                        description=f"Detected {trend_pattern['direction']} trend in step duration",
+                        confidence=trend_pattern['confidence'],
+                        discovered_at=datetime.now(),
+                        last_seen=last_seen,
+                        frequency=len(duration),
+                        context_conditions={"workflow_id": workflow_id, "step_id": step_id},
+                        impact_metrics={"duration_change": trend_pattern['magnitude']},
+                        recommendations=[f"Investigate {trend_pattern['direction']} trend in {step_id}"]
+                    )
+                    patterns.append(pattern)
+            
+            # Detect cost anomalies
+            cost = metrics.get('cost')
+            if cost is not None and len(cost) >= 5:
+                anomalies = cost.anomaly_summary()
+                if anomalies['count'] > 0:
+                    pattern = Pattern(
+                        pattern_id=f"cost_anom_{workflow_id}_{step_id}_{uuid.uuid4().hex[:8]}",
+                        pattern_type=PatternType.PERFORMANCE,
+                        name=f"Cost Anomalies in {step_id}",
+                        description=f"Detected {anomalies['count']} cost anomalies",
+                        confidence=anomalies['confidence'],
+                        discovered_at=datetime.now(),
+                        last_seen=last_seen,
+                        frequency=anomalies['count'],
+                        context_conditions={"workflow_id": workflow_id, "step_id": step_id},
+                        impact_metrics={"anomaly_magnitude": anomalies['magnitude']},
+                        recommendations=["Review cost drivers for this step"]
+                    )
+                    patterns.append(pattern)
         
         return patterns
     
@@ -304,32 +403,20 @@ class AdaptiveSystem:
         """Detect behavioral patterns in workflow execution"""
         patterns = []
         
-        # Analyze workflow execution patterns
-        execution_sequences = defaultdict(list)
-        for dp in self.historical_data:
-            execution_sequences[dp.workflow_id].append((dp.step_id, dp.timestamp))
-        
-        for workflow_id, sequences in execution_sequences.items():
-            if len(sequences) < 20:  # Need sufficient data
+        # Step sequences per workflow, with subsequence counts kept up to date on insert
+        for workflow_id, sequence in self.step_sequences.items():
+            if len(sequence) < 20:  # Need sufficient data
                 continue
             
-            # Sort by timestamp
-            sequences.sort(key=lambda x: x[1])
-            
-            # Extract step sequences
-            step_sequences = [step_id for step_id, _ in sequences]
-            
-            # Find common subsequences
-            common_patterns = self._find_common_subsequences(step_sequences)
-            
-            for subsequence, frequency in common_patterns.items():
+            for steps, frequency in sequence.counts.items():
                 if frequency >= self.min_pattern_frequency:
+                    subsequence = " -> ".join(steps)
                     pattern = Pattern(
                         pattern_id=f"behav_{workflow_id}_{hashlib.md5(subsequence.encode()).hexdigest()[:8]}",
                         pattern_type=PatternType.BEHAVIORAL,
                         name=f"Common Execution Pattern",
                         description=f"Frequent execution sequence: {subsequence}",
-                        confidence=min(0.9, frequency / len(step_sequences)),
+                        confidence=min(0.9, frequency / len(sequence)),
                         discovered_at=datetime.now(),
                         last_seen=datetime.now(),
                         frequency=frequency,
@@ -345,24 +432,13 @@ class AdaptiveSystem:
         """Detect time-based patterns"""
         patterns = []
         
-        # Group data by hour of day and day of week
-        hourly_performance = defaultdict(list)
-        daily_performance = defaultdict(list)
-        
-        for dp in self.historical_data:
-            if dp.metric_name == 'duration':
-                hour = dp.timestamp.hour
-                day = dp.timestamp.weekday()
-                hourly_performance[hour].append(dp.value)
-                daily_performance[day].append(dp.value)
-        
-        # Analyze hourly patterns
+        # Analyze hourly patterns from the maintained per-hour duration totals
         best_hours = []
         worst_hours = []
         
-        for hour, durations in hourly_performance.items():
-            if len(durations) >= 5:
-                avg_duration = statistics.mean(durations)
+        for hour, (count, total) in self.hourly_durations.items():
+            if count >= 5:
+                avg_duration = total / count
                 best_hours.append((hour, avg_duration))
                 worst_hours.append((hour, avg_duration))
         
@@ -396,27 +472,19 @@ class AdaptiveSystem:
         """Detect patterns related to workflow outcomes"""
         patterns = []
         
-        # Analyze success/failure patterns
-        outcome_data = defaultdict(lambda: {"success": 0, "failure": 0, "contexts": []})
-        
-        for dp in self.historical_data:
-            if dp.metric_name == 'success_rate':
-                key = f"{dp.workflow_id}_{dp.step_id}"
-                if dp.value > 0.8:
-                    outcome_data[key]["success"] += 1
-                else:
-                    outcome_data[key]["failure"] += 1
-                outcome_data[key]["contexts"].append(dp.context)
-        
-        for key, data in outcome_data.items():
-            total = data["success"] + data["failure"]
+        # Analyze success/failure patterns (successes are counted as points arrive)
+        for (workflow_id, step_id, metric_name), series in self.metric_series.items():
+            if metric_name != 'success_rate':
+                continue
+            key = f"{workflow_id}_{step_id}"
+            total = len(series)
+            failures = total - series.high_count
             if total >= 10:
-                success_rate = data["success"] / total
+                success_rate = series.high_count / total
                 
                 if success_rate < 0.7:  # Poor success rate
                     # Analyze context patterns for failures
-                    failure_contexts = [ctx for i, ctx in enumerate(data["contexts"]) 
-                                      if i >= data["success"]]
+                    failure_contexts = [dp.context for dp in series.points if dp.value <= 0.8]
                     
                     common_factors = self._find_common_context_factors(failure_contexts)
                     
@@ -428,7 +496,7 @@ class AdaptiveSystem:
                         confidence=0.7,
                         discovered_at=datetime.now(),
                         last_seen=datetime.now(),
-                        frequency=data["failure"],
+                        frequency=failures,
                         context_conditions=common_factors,
                         impact_metrics={"success_rate": success_rate},
                         recommendations=["Address common failure factors"]
@@ -441,17 +509,13 @@ class AdaptiveSystem:
         """Detect anomalous patterns that deviate from normal behavior"""
         patterns = []
         
-        # Statistical anomaly detection
-        metric_groups = defaultdict(list)
-        for dp in self.historical_data:
-            metric_groups[f"{dp.workflow_id}_{dp.step_id}_{dp.metric_name}"].append(dp.value)
-        
-        for group_key, values in metric_groups.items():
-            if len(values) >= 20:
-                anomalies = self._detect_statistical_anomalies(values)
+        # Statistical anomaly detection: outliers are flagged per series as they arrive
+        for (workflow_id, step_id, metric_name), series in self.metric_series.items():
+            if len(series) >= 20:
+                anomalies = series.anomaly_summary()
                 
                 if anomalies['count'] >= 3 and anomalies['confidence'] > 0.7:
-                    workflow_id, step_id, metric_name = group_key.split('_', 2)
+                    group_key = f"{workflow_id}_{step_id}_{metric_name}"
                     
                     pattern = Pattern(
                         pattern_id=f"anomaly_{group_key}_{uuid.uuid4().hex[:8]}",
@@ -460,7 +524,7 @@ class AdaptiveSystem:
                         description=f"Detected {anomalies['count']} statistical anomalies",
                         confidence=anomalies['confidence'],
                         discovered_at=datetime.now(),
-                        last_seen=datetime.now(),
+                        last_seen=series.last_seen,
                         frequency=anomalies['count'],
                         context_conditions={"workflow_id": workflow_id, "step_id": step_id, "metric": metric_name},
                         impact_metrics={"anomaly_magnitude": anomalies['magnitude']},
@@ -470,103 +534,6 @@ class AdaptiveSystem:
         
         return patterns
     
-    def _analyze_trend(self, values: List[float], metric_name: str) -> Optional[Dict[str, Any]]:
-        """Analyze trend in a series of values"""
-        if len(values) < 5:
-            return None
-        
-        # Simple linear regression
-        x = list(range(len(values)))
-        y = values
-        
-        n = len(values)
-        sum_x = sum(x)
-        sum_y = sum(y)
-        sum_xy = sum(x[i] * y[i] for i in range(n))
-        sum_x2 = sum(x[i] * x[i] for i in range(n))
-        
-        # Calculate slope
-        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
-        
-        # Calculate correlation coefficient
-        mean_x = sum_x / n
-        mean_y = sum_y / n
-        
-        numerator = sum((x[i] - mean_x) * (y[i] - mean_y) for i in range(n))
-        denominator = (sum((x[i] - mean_x)**2 for i in range(n)) * 
-                      sum((y[i] - mean_y)**2 for i in range(n)))**0.5
-        
-        if denominator == 0:
-            return None
-        
-        correlation = numerator / denominator
-        confidence = abs(correlation)
-        
-        if confidence < 0.6:
-            return None
-        
-        direction = "increasing" if slope > 0 else "decreasing"
-        magnitude = abs(slope)
-        
-        return {
-            "direction": direction,
-            "magnitude": magnitude,
-            "confidence": confidence,
-            "slope": slope
-        }
-    
-    def _detect_statistical_anomalies(self, values: List[float]) -> Dict[str, Any]:
-        """Detect statistical anomalies using IQR method"""
-        if len(values) < 5:
-            return {"count": 0, "confidence": 0, "magnitude": 0}
-        
-        sorted_values = sorted(values)
-        n = len(sorted_values)
-        
-        q1 = sorted_values[n // 4]
-        q3 = sorted_values[3 * n // 4]
-        iqr = q3 - q1
-        
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-        
-        anomalies = [v for v in values if v < lower_bound or v > upper_bound]
-        anomaly_count = len(anomalies)
-        
-        if anomaly_count == 0:
-            return {"count": 0, "confidence": 0, "magnitude": 0}
-        
-        # Calculate confidence based on how far anomalies are from bounds
-        max_deviation = 0
-        for anomaly in anomalies:
-            if anomaly < lower_bound:
-                deviation = (lower_bound - anomaly) / iqr if iqr > 0 else 0
-            else:
-                deviation = (anomaly - upper_bound) / iqr if iqr > 0 else 0
-            max_deviation = max(max_deviation, deviation)
-        
-        confidence = min(0.95, 0.5 + (max_deviation * 0.1))
-        
-        return {
-            "count": anomaly_count,
-            "confidence": confidence,
-            "magnitude": max_deviation,
-            "lower_bound": lower_bound,
-            "upper_bound": upper_bound
-        }
-    
-    def _find_common_subsequences(self, sequences: List[str], min_length: int = 2) -> Dict[str, int]:
-        """Find common subsequences in a list of sequences"""
-        subsequence_counts = Counter()
-        
-        for i in range(len(sequences) - min_length + 1):
-            for length in range(min_length, min(6, len(sequences) - i + 1)):
-                subseq = " -> ".join(sequences[i:i+length])
-                subsequence_counts[subseq] += 1
-        
-        # Return only subsequences that appear multiple times
-        return {subseq: count for subseq, count in subsequence_counts.items() if count > 1}
-    
     def _find_common_context_factors(self, contexts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Find common factors in failure contexts"""
         if not contexts:
@@ -720,75 +687,95 @@ class AdaptiveSystem:
         return recommendations
     
     def create_ab_test(self, test: ABTest) -> str:
-        """Create a new A/B test"""
+        """Create a new A/B test (the first variant is the control)"""
         self.ab_tests[test.test_id] = test
+        self.ab_sequential[test.test_id] = SequentialABTest(
+            list(test.variants), alpha=self.ab_alpha,
+            min_samples=self.ab_min_samples, mixing_sd=self.ab_mixing_sd
+        )
+        self.ab_metric_stats.pop(test.test_id, None)
         self.logger.info(f"Created A/B test: {test.name}")
         return test.test_id
     
+    def _primary_metric(self, test: ABTest) -> str:
+        return test.success_metrics[0] if test.success_metrics else "conversion_rate"
+    
     def record_ab_result(self, test_id: str, variant: str, metric: str, 
-                        value: float, sample_size: int):
-        """Record A/B test result"""
+                        value: float, sample_size: int = 1):
+        """
+        Record an A/B test result in O(number of variants).
+        
+        ``value`` is the metric over ``sample_size`` sends (e.g. a reply rate
+        of 0.12 over 50 sends, or 1.0/0.0 for a single send). Results for the
+        primary metric update the sequential test, which may stop the test.
+        """
         if test_id not in self.ab_tests:
             raise ValueError(f"A/B test not found: {test_id}")
         
-        # Calculate confidence interval (simplified)
-        margin_of_error = 1.96 * (value * 0.1)  # Simplified calculation
-        confidence_interval = (value - margin_of_error, value + margin_of_error)
-        
-        result = ABTestResult(
-            test_id=test_id,
-            variant=variant,
-            metric=metric,
-            value=value,
-            sample_size=sample_size,
-            confidence_interval=confidence_interval
-        )
-        
-        self.ab_results[test_id].append(result)
+        test = self.ab_tests[test_id]
+        if metric != self._primary_metric(test):
+            stats = self.ab_metric_stats[test_id].get((variant, metric))
+            if stats is None:
+                stats = self.ab_metric_stats[test_id][(variant, metric)] = VariantStats()
+            stats.add(value, sample_size)
+            return
+        
+        sequential = self.ab_sequential[test_id]
+        sequential.variant_stats(variant).add(value, sample_size)
+        if sequential.update(variant) is not None:
+            p_values = list(sequential.p_values.values())
+            test.status = "completed"
+            test.winner = sequential.winner
+            test.end_date = datetime.now()
+            test.statistical_significance = 1 - min(p_values) if p_values else None
+            self.logger.info(f"A/B test {test.name} stopped early: winner {test.winner}")
+    
+    def choose_ab_variant(self, test_id: str, rng: Optional[Any] = None) -> Optional[str]:
+        """
+        Variant for the next send: Thompson sampling over the variants still in
+        play, or the winner once the test has stopped. O(number of variants).
+        """
+        if test_id not in self.ab_tests:
+            raise ValueError(f"A/B test not found: {test_id}")
+        return self.ab_sequential[test_id].choose_variant(rng or random)
     
     def analyze_ab_test(self, test_id: str) -> Dict[str, Any]:
-        """Analyze A/B test results and determine winner"""
+        """Analyze A/B test results from the running statistics (constant time per variant)"""
         if test_id not in self.ab_tests:
             raise ValueError(f"A/B test not found: {test_id}")
         
         test = self.ab_tests[test_id]
-        results = self.ab_results[test_id]
+        sequential = self.ab_sequential[test_id]
+        variants = sequential.summary()
         
-        if not results:
+        if not variants and not self.ab_metric_stats.get(test_id):
             return {"status": "no_data", "message": "No results recorded yet"}
         
-        # Group results by variant and metric
-        variant_metrics = defaultdict(lambda: defaultdict(list))
-        for result in results:
-            variant_metrics[result.variant][result.metric].append(result.value)
-        
-        # Calculate statistical significance (simplified)
+        p_values = list(sequential.p_values.values())
         analysis = {
             "test_id": test_id,
-            "variants": {},
-            "winner": None,
-            "confidence": 0,
+            "primary_metric": self._primary_metric(test),
+            "status": test.status,
+            "variants": variants,
+            "control": sequential.control,
+            "leader": max(variants, key=lambda v: variants[v]["estimate"]) if variants else None,
+            "winner": sequential.winner,
+            "stopped_early": sequential.stopped,
+            "confidence": 1 - min(p_values) if p_values else 0,
+            "eliminated": sorted(sequential.eliminated),
+            "secondary_metrics": {
+                f"{variant}:{metric}": {"mean": stats.mean, "sample_size": stats.records, "std_dev": stats.std_dev}
+                for (variant, metric), stats in self.ab_metric_stats.get(test_id, {}).items()
+            },
             "recommendation": ""
         }
         
-        primary_metric = test.success_metrics[0] if test.success_metrics else "conversion_rate"
-        
-        for variant, metrics in variant_metrics.items():
-            if primary_metric in metrics:
-                values = metrics[primary_metric]
-                analysis["variants"][variant] = {
-                    "mean": statistics.mean(values),
-                    "sample_size": len(values),
-                    "std_dev": statistics.stdev(values) if len(values) > 1 else 0
-                }
-        
-        # Determine winner (simplified - needs proper statistical testing)
-        if len(analysis["variants"]) >= 2:
-            best_variant = max(analysis["variants"].items(), 
-                             key=lambda x: x[1]["mean"])
-            analysis["winner"] = best_variant[0]
-            analysis["confidence"] = 0.85  # Simplified
-            analysis["recommendation"] = f"Variant {best_variant[0]} shows best performance"
+        if sequential.winner is not None:
+            analysis["recommendation"] = f"Variant {sequential.winner} shows best performance"
+        elif analysis["leader"] is not None:
+            analysis["recommendation"] = (
+                f"Variant {analysis['leader']} leads; keep allocating traffic until the result is significant"
+            )
         
         return analysis
     
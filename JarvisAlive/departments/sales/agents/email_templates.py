@@ -1,6 +1,8 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from enum import Enum
+import re
+from operator import itemgetter
 
 
 class ToneStyle(str, Enum):
@@ -21,9 +23,89 @@ class EmailTemplate(BaseModel):
     industry_variants: Dict[str, str]  # Industry-specific versions
 
 
+class CompiledTemplate:
+    """
+    EmailTemplate parsed once into literal text and placeholder names.
+
+    fill() produces exactly what replacing each ``{{variable}}`` in turn
+    produces, in a single join. Texts with nested braces, and values that
+    contain braces themselves, go through the sequential replace instead.
+    """
+
+    _PLACEHOLDER_PATTERN = re.compile(r"\{\{(.*?)\}\}", re.DOTALL)
+
+    def __init__(self, template: EmailTemplate):
+        self.template = template
+        self._segments: Dict[str, Optional[Tuple[Tuple[str, ...], str, Callable]]] = {}
+        for text in template.subject_lines + [template.body_template]:
+            self._segments[text] = self._compile(text)
+
+    @classmethod
+    def _compile(cls, text: str) -> Optional[Tuple[Tuple[str, ...], str, Callable]]:
+        literals, names = [], []
+        position = 0
+        for match in cls._PLACEHOLDER_PATTERN.finditer(text):
+            name = match.group(1)
+            if "{" in name or "}" in name:
+                return None
+            literals.append(text[position:match.start()])
+            names.append(name)
+            position = match.end()
+        literals.append(text[position:])
+
+        # Literal text becomes a str.format pattern with one {} per placeholder
+        pattern = "{}".join(literal.replace("{", "{{").replace("}", "}}") for literal in literals)
+        if not names:
+            getter = lambda variables: ()
+        elif len(names) == 1:
+            getter = lambda variables, name=names[0]: (variables[name],)
+        else:
+            getter = itemgetter(*names)
+        return tuple(names), pattern, getter
+
+    @staticmethod
+    def fill_sequential(text: str, variables: Dict[str, str]) -> str:
+        """Reference fill: replace each variable's placeholder in turn"""
+        result = text
+        for var, value in variables.items():
+            placeholder = f"{{{{{var}}}}}"
+            result = result.replace(placeholder, str(value))
+        return result
+
+    def fill(self, text: str, variables: Dict[str, str]) -> str:
+        """Fill a subject line or body of this template"""
+        segments = self._segments.get(text)
+        if segments is None:
+            if text in self._segments:
+                return self.fill_sequential(text, variables)
+            segments = self._segments[text] = self._compile(text)
+            if segments is None:
+                return self.fill_sequential(text, variables)
+
+        names, pattern, getter = segments
+        try:
+            values = [str(value) for value in getter(variables)]
+        except KeyError:
+            # Unknown placeholders are left as they are
+            values = [str(variables[name]) for name in names if name in variables]
+            joined = "".join(values)
+            if "{" in joined or "}" in joined:
+                return self.fill_sequential(text, variables)
+            return pattern.format(*[
+                str(variables[name]) if name in variables else "{{" + name + "}}"
+                for name in names
+            ])
+
+        joined = "".join(values)
+        if "{" in joined or "}" in joined:
+            return self.fill_sequential(text, variables)
+        return pattern.format(*values)
+
+
 class EmailTemplateLibrary:
     def __init__(self):
         self.templates = self._load_templates()
+        self._compiled: Dict[str, CompiledTemplate] = {}
     
     def _load_templates(self) -> Dict[str, EmailTemplate]:
         """Load all email templates"""
@@ -428,6 +510,16 @@ Best regards,
         """Get a specific template by ID"""
         return self.templates.get(template_id)
     
+    def compile_template(self, template_id: str) -> Optional[CompiledTemplate]:
+        """Get the compiled form of a template, parsing it on first use"""
+        template = self.templates.get(template_id)
+        if template is None:
+            return None
+        compiled = self._compiled.get(template_id)
+        if compiled is None or compiled.template is not template:
+            compiled = self._compiled[template_id] = CompiledTemplate(template)
+        return compiled
+    
     def get_templates_by_category(self, category: str) -> List[EmailTemplate]:
         """Get all templates in a specific category"""
         return [t for t in self.templates.values() if t.category == category]
@@ -1,5 +1,6 @@
-from typing import List, Dict, Optional, Literal
+from typing import List, Dict, Optional, Literal, Sequence, Tuple, Union
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from pydantic import BaseModel, validator
 import logging
 import uuid
@@ -10,10 +11,12 @@ import json
 import sys
 import os
 
+import numpy as np
+
 # Add ai_engines to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from database.mock_data import Company, Contact, get_qualified_leads, get_all_companies, get_all_contacts
+from database.mock_data import Company, Contact, get_qualified_leads, get_lead_store
 from ai_engines.base_engine import BaseAIEngine, AIEngineConfig
 from ai_engines.anthropic_engine import AnthropicEngine
 from ai_engines.mock_engine import MockAIEngine
@@ -72,6 +75,157 @@ class ScanCriteria(BaseModel):
         return max(1, min(v, 1000))
 
 
+class LeadTable:
+    """
+    Columnar (struct-of-arrays) view of contact/company pairs for batch scoring.
+
+    String columns that drive scoring (industry, title) are dictionary-encoded:
+    each row stores an integer code into a small list of unique values, so the
+    scoring rules run once per distinct value instead of once per lead.
+    Numeric and presence columns are NumPy arrays. Rows whose fields cannot be
+    encoded (e.g. a missing employee count) are flagged in ``fallback`` and
+    scored through the per-lead path.
+    """
+
+    def __init__(self, pairs: Sequence[Tuple[Contact, Company]]):
+        size = len(pairs)
+        self.contacts: List[Contact] = []
+        self.companies: List[Company] = []
+
+        self.industry_values: List[str] = []
+        self.title_values: List[str] = []
+        self.industry_codes = np.empty(size, dtype=np.int32)
+        self.title_codes = np.empty(size, dtype=np.int32)
+        self.employee_count = np.zeros(size, dtype=np.float64)
+        self.latest_news = np.full(size, np.datetime64("NaT"), dtype="datetime64[us]")
+        self.completeness = np.zeros(size, dtype=np.int8)
+        self.fallback = np.zeros(size, dtype=bool)
+
+        industry_lookup: Dict[str, int] = {}
+        title_lookup: Dict[str, int] = {}
+        # Companies repeat across contacts, so encode each one once
+        company_rows: Dict[int, Tuple[int, float, Optional[datetime], int, bool]] = {}
+
+        for row, (contact, company) in enumerate(pairs):
+            self.contacts.append(contact)
+            self.companies.append(company)
+
+            encoded = company_rows.get(id(company))
+            if encoded is None:
+                encoded = company_rows[id(company)] = self._encode_company(company, industry_lookup)
+            industry_code, employees, latest, company_complete, row_fallback = encoded
+
+            try:
+                title_code = self._encode(contact.title, title_lookup, self.title_values)
+                contact_complete = bool(contact.email) + bool(contact.phone) + bool(contact.linkedin_url)
+            except Exception:
+                title_code, contact_complete = None, 0
+
+            self.industry_codes[row] = industry_code or 0
+            self.title_codes[row] = title_code or 0
+            self.employee_count[row] = employees
+            if latest is not None:
+                self.latest_news[row] = latest
+            self.completeness[row] = company_complete + contact_complete
+            self.fallback[row] = row_fallback or title_code is None
+
+    @staticmethod
+    def _encode(value, lookup: Dict[str, int], values: List[str]) -> Optional[int]:
+        """Dictionary-encode a string column value (None if not a string)"""
+        if not isinstance(value, str):
+            return None
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(values)
+            values.append(value)
+        return code
+
+    def _encode_company(self, company: Company, industry_lookup: Dict[str, int]):
+        try:
+            industry_code = self._encode(company.industry, industry_lookup, self.industry_values)
+            employees = float(company.employee_count)
+
+            # Only the newest item matters: recency points fall as news ages
+            news = getattr(company, 'recent_news', None) or []
+            latest = None
+            for news_item in news:
+                date = getattr(news_item, 'date', None)
+                if not isinstance(date, datetime) or date.tzinfo is not None:
+                    raise ValueError(f"Unsupported news date: {date!r}")
+                if latest is None or date > latest:
+                    latest = date
+
+            company_complete = bool(company.website) + bool(news)
+            return industry_code, employees, latest, company_complete, industry_code is None
+        except Exception:
+            return None, 0.0, None, 0, True
+
+    def __len__(self) -> int:
+        return len(self.contacts)
+
+
+class LeadScoreBatch:
+    """Scores for every row of a LeadTable, stored as NumPy columns"""
+
+    def __init__(self, table: LeadTable, industry_match: np.ndarray, title_relevance: np.ndarray,
+                 company_size_fit: np.ndarray, recent_activity: np.ndarray, confidence: np.ndarray,
+                 explain, overrides: Optional[Dict[int, LeadScore]] = None):
+        self.table = table
+        self.industry_match = industry_match
+        self.title_relevance = title_relevance
+        self.company_size_fit = company_size_fit
+        self.recent_activity = recent_activity
+        self.total_score = np.clip(industry_match + title_relevance + company_size_fit + recent_activity, 0, 100)
+        self.confidence = confidence
+        self._explain = explain
+        # Rows scored through the per-lead path (unencodable fields)
+        self.overrides = overrides or {}
+        for row, score in self.overrides.items():
+            self.total_score[row] = score.total_score
+            self.industry_match[row] = score.industry_match
+            self.title_relevance[row] = score.title_relevance
+            self.company_size_fit[row] = score.company_size_fit
+            self.recent_activity[row] = score.recent_activity
+            self.confidence[row] = score.confidence
+
+    def __len__(self) -> int:
+        return len(self.total_score)
+
+    def __getitem__(self, row: int) -> LeadScore:
+        return self.lead_score(row)
+
+    def explanation(self, row: int) -> str:
+        """Human-readable explanation, built on demand"""
+        if row in self.overrides:
+            return self.overrides[row].explanation
+        return self._explain(
+            int(self.industry_match[row]), int(self.title_relevance[row]),
+            int(self.company_size_fit[row]), int(self.recent_activity[row]),
+            self.table.contacts[row], self.table.companies[row]
+        )
+
+    def lead_score(self, row: int) -> LeadScore:
+        """Materialize one row as the LeadScore the per-lead path returns"""
+        if row in self.overrides:
+            return self.overrides[row]
+        return LeadScore(
+            total_score=int(self.total_score[row]),
+            industry_match=int(self.industry_match[row]),
+            title_relevance=int(self.title_relevance[row]),
+            company_size_fit=int(self.company_size_fit[row]),
+            recent_activity=int(self.recent_activity[row]),
+            explanation=self.explanation(row),
+            confidence=float(self.confidence[row])
+        )
+
+    def ranked(self, min_score: int = 0, limit: Optional[int] = None) -> np.ndarray:
+        """Row indices at or above min_score, highest score first (ties keep input order)"""
+        rows = np.flatnonzero(self.total_score >= min_score)
+        order = np.argsort(-self.total_score[rows], kind='stable')
+        rows = rows[order]
+        return rows[:limit] if limit is not None else rows
+
+
 class LeadScannerAgent:
     def __init__(self, mode: Literal["mock", "hybrid", "ai"] = "mock", config: Optional[Dict] = None):
         self.mode = mode
@@ -84,6 +238,7 @@ class LeadScannerAgent:
         
         # Initialize AI engine if needed
         self.ai_engine = None
+        self.last_enrichment_stats: Dict = {}
         if mode in ["hybrid", "ai"]:
             self._initialize_ai_engine()
 
@@ -308,6 +463,87 @@ class LeadScannerAgent:
                 confidence=0.0
             )
 
+    def score_leads_batch(self, leads: Union[LeadTable, Sequence[Tuple[Contact, Company]]],
+                          criteria: ScanCriteria) -> LeadScoreBatch:
+        """
+        Score a whole candidate set in one call.
+
+        Produces the same scores and breakdowns as calling score_lead on every
+        pair. Industry and title rules run once per distinct value and are
+        gathered by code; size fit, recency and confidence are array
+        expressions. Build the LeadTable once and pass it in to score the same
+        candidates against several criteria.
+        """
+        table = leads if isinstance(leads, LeadTable) else LeadTable(leads)
+        fallback = table.fallback.copy()
+
+        industry_by_code = np.zeros(max(1, len(table.industry_values)), dtype=np.int64)
+        for code, industry in enumerate(table.industry_values):
+            try:
+                industry_by_code[code] = self._calculate_industry_match(SimpleNamespace(industry=industry), criteria)
+            except Exception:
+                fallback |= table.industry_codes == code
+
+        title_by_code = np.zeros(max(1, len(table.title_values)), dtype=np.int64)
+        for code, title in enumerate(table.title_values):
+            try:
+                title_by_code[code] = self._calculate_title_relevance(SimpleNamespace(title=title), criteria)
+            except Exception:
+                fallback |= table.title_codes == code
+
+        industry_match = industry_by_code[table.industry_codes]
+        title_relevance = title_by_code[table.title_codes]
+        company_size_fit = self._batch_company_size_fit(table.employee_count, criteria)
+        recent_activity = self._batch_recent_activity(table.latest_news)
+        confidence = table.completeness / 5.0
+
+        overrides = {
+            int(row): self.score_lead(table.contacts[row], table.companies[row], criteria)
+            for row in np.flatnonzero(fallback)
+        }
+
+        return LeadScoreBatch(
+            table, industry_match, title_relevance, company_size_fit, recent_activity, confidence,
+            self._generate_score_explanation, overrides
+        )
+
+    def _batch_company_size_fit(self, employees: np.ndarray, criteria: ScanCriteria) -> np.ndarray:
+        """Vectorized _calculate_company_size_fit: first matching target size wins"""
+        if not criteria.company_sizes:
+            return np.full(len(employees), 10, dtype=np.int64)
+
+        scores = np.zeros(len(employees), dtype=np.int64)
+        decided = np.zeros(len(employees), dtype=bool)
+        for target_size in criteria.company_sizes:
+            target_lower = target_size.lower()
+            if target_lower not in self.size_mappings:
+                continue
+            min_emp, max_emp = self.size_mappings[target_lower]
+            range_size = max_emp - min_emp if max_emp != float('inf') else 1000
+            tolerance = range_size * 0.5
+
+            exact = (min_emp <= employees) & (employees <= max_emp)
+            adjacent = (min_emp - tolerance <= employees) & (employees <= max_emp + tolerance)
+            target_scores = np.where(exact, 20, np.where(adjacent, 10, 0))
+
+            newly_decided = ~decided & (target_scores > 0)
+            scores[newly_decided] = target_scores[newly_decided]
+            decided |= newly_decided
+        return scores
+
+    def _batch_recent_activity(self, latest_news: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_recent_activity over each company's newest item"""
+        scores = np.zeros(len(latest_news), dtype=np.int64)
+        has_news = ~np.isnat(latest_news)
+        if not has_news.any():
+            return scores
+
+        now = np.datetime64(datetime.now(), 'us')
+        # Floor division matches timedelta.days
+        days_ago = np.maximum(1, (now - latest_news[has_news]) // np.timedelta64(1, 'D'))
+        scores[has_news] = np.select([days_ago <= 30, days_ago <= 90, days_ago <= 180], [20, 10, 5], 0)
+        return scores
+
     def _calculate_industry_match(self, company: Company, criteria: ScanCriteria) -> int:
         """Calculate industry match score with nuanced logic"""
         if not criteria.industries:
@@ -510,39 +746,15 @@ class LeadScannerAgent:
     async def _get_raw_leads(self, criteria: ScanCriteria) -> List[tuple]:
         """Get raw leads from mock data source"""
         try:
-            # Get all companies and contacts
-            companies = get_all_companies()
-            contacts = get_all_contacts()
-            
-            # Filter companies
-            if criteria.industries:
-                companies = [c for c in companies if c.industry in criteria.industries]
-            
-            if criteria.exclude_companies:
-                companies = [c for c in companies if c.name not in criteria.exclude_companies]
-            
-            # Filter contacts
-            if criteria.titles:
-                filtered_contacts = []
-                for contact in contacts:
-                    for title in criteria.titles:
-                        if title.lower() in contact.title.lower():
-                            filtered_contacts.append(contact)
-                            break
-                contacts = filtered_contacts
-            
-            # Create lead pairs
-            lead_pairs = []
-            for contact in contacts:
-                # Find matching company
-                matching_company = None
-                for company in companies:
-                    if company.id == contact.company_id:
-                        matching_company = company
-                        break
-                
-                if matching_company:
-                    lead_pairs.append((contact, matching_company))
+            # Join contacts to companies through the store's hash indexes
+            # instead of scanning every company for each contact
+            store = get_lead_store()
+            
+            lead_pairs = store.find_leads(
+                industries=criteria.industries or None,
+                exclude_names=criteria.exclude_companies or None,
+                title_keywords=criteria.titles or None
+            )
             
             return lead_pairs
             
@@ -638,57 +850,112 @@ class LeadScannerAgent:
         
         return dict(priority_count)
 
-    async def _enrich_with_ai(self, leads: List[Lead], max_enrichment: int = 10) -> List[Lead]:
+    async def _enrich_with_ai(self, leads: List[Lead], max_enrichment: int = 10,
+                              concurrency: Optional[int] = None,
+                              deadline_seconds: Optional[float] = None) -> List[Lead]:
         """
         Enrich leads with AI-powered insights.
         
         Process:
         1. Select top leads for enrichment
-        2. Batch similar companies for efficiency
-        3. Analyze companies and contacts
+        2. Analyze each distinct company once, shared by all its contacts
+        3. Analyze contacts and recalculate scores with AI input
         4. Add insights to lead data
-        5. Recalculate scores with AI input
+        
+        AI calls run concurrently, at most ``concurrency`` at a time
+        (config 'enrichment_concurrency'). If ``deadline_seconds`` (config
+        'enrichment_deadline_seconds') elapses, unfinished leads are returned
+        un-enriched. A failure enriching one lead never fails the others.
         """
         if not self.ai_engine:
             self.logger.warning("AI engine not initialized, skipping enrichment")
             return leads
         
+        concurrency = max(1, concurrency or self.config.get('enrichment_concurrency', 8))
+        if deadline_seconds is None:
+            deadline_seconds = self.config.get('enrichment_deadline_seconds')
+        
         # Sort by score and take top leads
         sorted_leads = sorted(leads, key=lambda x: x.score.total_score, reverse=True)
         leads_to_enrich = sorted_leads[:max_enrichment]
         
-        enriched_leads = []
+        semaphore = asyncio.Semaphore(concurrency)
+        company_tasks: Dict[str, asyncio.Task] = {}
+        start_time = asyncio.get_running_loop().time()
+        
+        async def limited(call):
+            async with semaphore:
+                return await call()
+        
+        def company_insights_for(company: Company) -> asyncio.Task:
+            # One analysis per company, however many contacts work there
+            task = company_tasks.get(company.id)
+            if task is None:
+                task = asyncio.ensure_future(limited(lambda: self._analyze_company_with_ai(company)))
+                company_tasks[company.id] = task
+            return task
+        
+        async def enrich(lead: Lead):
+            company_insights, contact_insights = await asyncio.gather(
+                asyncio.shield(company_insights_for(lead.company)),
+                limited(lambda: self._analyze_contact_with_ai(lead.contact, lead.company))
+            )
+            
+            # Recalculate score with AI insights
+            score = await limited(lambda: self._ai_score_lead(lead, company_insights, contact_insights))
+            
+            # Update lead only once every step has succeeded
+            lead.enrichment_data = {
+                "company_insights": company_insights,
+                "contact_insights": contact_insights,
+                "enriched_at": datetime.now().isoformat(),
+                "ai_provider": self.ai_engine.get_engine_type()
+            }
+            lead.score = score
+        
+        # A worker per concurrency slot takes leads best-first, so each lead
+        # finishes before the next starts and a deadline leaves whole leads done
+        queue = list(reversed(leads_to_enrich))
+        enriched, failures = [], []
+        
+        async def worker():
+            while queue:
+                lead = queue.pop()
+                try:
+                    await enrich(lead)
+                    enriched.append(lead)
+                except Exception as e:
+                    failures.append(lead)
+                    self.logger.error(f"Failed to enrich lead {lead.lead_id}: {e}")
+        
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(concurrency, len(leads_to_enrich)))]
+        _, pending = await asyncio.wait(workers, timeout=deadline_seconds) if workers else (set(), set())
+        
+        # Deadline hit: keep what finished, leave the rest un-enriched
+        for task in list(pending) + list(company_tasks.values()):
+            task.cancel()
+        await asyncio.gather(*pending, *company_tasks.values(), return_exceptions=True)
+        timed_out = len(leads_to_enrich) - len(enriched) - len(failures)
+        if timed_out:
+            self.logger.warning(f"Enrichment deadline of {deadline_seconds}s hit: "
+                                f"{timed_out} leads returned without AI insights")
+        
+        self.last_enrichment_stats = {
+            "requested": len(leads_to_enrich),
+            "enriched": len(enriched),
+            "failed": len(failures),
+            "timed_out": timed_out,
+            "companies_analyzed": len(company_tasks),
+            "concurrency": concurrency,
+            "elapsed_seconds": asyncio.get_running_loop().time() - start_time
+        }
+        self.logger.info(f"AI enrichment: {self.last_enrichment_stats}")
         
-        for lead in leads_to_enrich:
-            try:
-                # Enrich company insights
-                company_insights = await self._analyze_company_with_ai(lead.company)
-                
-                # Enrich contact insights
-                contact_insights = await self._analyze_contact_with_ai(lead.contact, lead.company)
-                
-                # Update lead with insights
-                lead.enrichment_data = {
-                    "company_insights": company_insights,
-                    "contact_insights": contact_insights,
-                    "enriched_at": datetime.now().isoformat(),
-                    "ai_provider": self.ai_engine.get_engine_type()
-                }
-                
-                # Recalculate score with AI insights
-                lead.score = await self._ai_score_lead(lead, company_insights, contact_insights)
-                
-                enriched_leads.append(lead)
-                
-            except Exception as e:
-                self.logger.error(f"Failed to enrich lead {lead.lead_id}: {e}")
-                enriched_leads.append(lead)  # Keep original
-                
         # Combine enriched and non-enriched leads
-        enriched_ids = {l.lead_id for l in enriched_leads}
+        enriched_ids = {l.lead_id for l in leads_to_enrich}
         remaining_leads = [l for l in leads if l.lead_id not in enriched_ids]
         
-        return enriched_leads + remaining_leads
+        return leads_to_enrich + remaining_leads
     
     async def _analyze_company_with_ai(self, company: Company) -> Dict:
         """Use AI to analyze company deeply"""
@@ -815,22 +1082,38 @@ Provide a score (0-100) and brief explanation. Format as JSON with keys: score,
             # Fallback to base score
             return base_score
 
-    async def _batch_analyze_companies(self, companies: List[Company]) -> Dict[str, Dict]:
-        """Analyze multiple similar companies in one request for cost efficiency"""
+    async def _batch_analyze_companies(self, companies: List[Company],
+                                       concurrency: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Analyze multiple similar companies in one request for cost efficiency.
+        
+        Industry batches and individual analyses run concurrently, at most
+        ``concurrency`` AI calls at a time. Companies whose analysis fails are
+        left out of the result instead of failing the whole batch.
+        """
+        concurrency = max(1, concurrency or self.config.get('enrichment_concurrency', 8))
+        semaphore = asyncio.Semaphore(concurrency)
         
-        # Group by industry
+        # Group by industry (each company once, even if listed repeatedly)
+        unique_companies = list({company.id: company for company in companies}.values())
         industry_groups = {}
-        for company in companies:
+        for company in unique_companies:
             if company.industry not in industry_groups:
                 industry_groups[company.industry] = []
             industry_groups[company.industry].append(company)
             
         results = {}
         
-        for industry, industry_companies in industry_groups.items():
-            if len(industry_companies) > 3:
-                # Batch analysis for cost efficiency
-                prompt = f"""Analyze these {len(industry_companies)} {industry} companies for common patterns:
+        async def analyze_individually(company: Company):
+            try:
+                async with semaphore:
+                    results[company.id] = await self._analyze_company_with_ai(company)
+            except Exception as e:
+                self.logger.error(f"Failed to analyze company {company.name}: {e}")
+        
+        async def analyze_group(industry: str, industry_companies: List[Company]):
+            # Batch analysis for cost efficiency
+            prompt = f"""Analyze these {len(industry_companies)} {industry} companies for common patterns:
 
 Companies:
 {self._format_companies_for_batch(industry_companies)}
@@ -844,28 +1127,33 @@ Identify:
 Then provide brief individual insights for each company.
 Format as JSON with keys: industry_insights, company_insights (dict with company names as keys)"""
 
-                response = await self.ai_engine.generate(prompt, max_tokens=1500)
+            try:
+                async with semaphore:
+                    response = await self.ai_engine.generate(prompt, max_tokens=1500)
+                batch_insights = json.loads(response.content)
                 
-                try:
-                    batch_insights = json.loads(response.content)
-                    
-                    # Apply insights to each company
-                    for company in industry_companies:
-                        company_specific = batch_insights.get("company_insights", {}).get(company.name, {})
-                        results[company.id] = {
-                            **batch_insights.get("industry_insights", {}),
-                            **company_specific
-                        }
-                except:
-                    # Fallback to individual analysis
-                    for company in industry_companies:
-                        results[company.id] = await self._analyze_company_with_ai(company)
+                # Apply insights to each company
+                for company in industry_companies:
+                    company_specific = batch_insights.get("company_insights", {}).get(company.name, {})
+                    results[company.id] = {
+                        **batch_insights.get("industry_insights", {}),
+                        **company_specific
+                    }
+            except Exception:
+                # Fallback to individual analysis
+                await asyncio.gather(*(analyze_individually(company) for company in industry_companies))
+        
+        jobs = []
+        for industry, industry_companies in industry_groups.items():
+            if len(industry_companies) > 3:
+                jobs.append(analyze_group(industry, industry_companies))
             else:
                 # Individual analysis for small groups
-                for company in industry_companies:
-                    results[company.id] = await self._analyze_company_with_ai(company)
-                    
-        return results
+                jobs.extend(analyze_individually(company) for company in industry_companies)
+        await asyncio.gather(*jobs)
+        
+        # Keep input order regardless of completion order
+        return {company.id: results[company.id] for company in unique_companies if company.id in results}
 
     def _format_companies_for_batch(self, companies: List[Company]) -> str:
         """Format companies for batch analysis"""
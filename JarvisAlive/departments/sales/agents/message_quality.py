@@ -0,0 +1,289 @@
+"""
+Single-pass quality analysis for outreach messages.
+
+The composer's spam, tone, sensitive-topic, CTA, personalization and response
+heuristics all test the same message for fixed phrases. MessageQualityAnalyzer
+lowercases a message once, finds every known phrase in it as a bitmask, and
+reads all the scores off that scan.
+"""
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+from dataclasses import dataclass
+
+
+# Phrase lists used by OutreachComposerAgent's quality checks. Matching is a
+# substring test against the lowercased message, exactly like the original
+# ``phrase in message.lower()`` checks (so mixed-case entries never match).
+SPAM_TRIGGERS = [
+    "free", "guarantee", "no obligation", "act now", "limited time",
+    "click here", "buy now", "special offer", "!!!!", "$$",
+    "100% guaranteed", "risk-free", "urgent", "winner"
+]
+
+UNPROFESSIONAL_PHRASES = [
+    "guarantee success", "100% guaranteed", "no risk", "act now",
+    "limited time", "once in a lifetime", "don't miss out", "urgent"
+]
+
+SENSITIVE_TERMS = [
+    "layoff", "fired", "bankruptcy", "lawsuit", "scandal",
+    "controversy", "failure", "crisis", "problem"
+]
+
+CTA_PHRASES = ["call", "meeting", "discuss", "chat", "connect", "schedule"]
+
+INDUSTRY_TERMS = {
+    "SaaS": ["churn", "ARR", "MRR", "onboarding", "activation"],
+    "FinTech": ["compliance", "security", "fraud", "transaction", "regulatory"],
+    "E-commerce": ["conversion", "cart", "checkout", "fulfillment", "retention"],
+    "Healthcare": ["patient", "HIPAA", "clinical", "outcomes", "care"],
+    "Manufacturing": ["production", "efficiency", "quality", "automation", "supply chain"]
+}
+
+# Response probability heuristic
+SUBJECT_POSITIVE_WORDS = ["question", "opportunity", "partnership"]
+SUBJECT_SPAM_WORDS = ["free", "guarantee", "urgent", "!!!"]
+BODY_QUALITY_PHRASES = ["noticed", "congratulations", "brief call", "discuss"]
+BODY_QUESTION_PHRASES = ["would you be", "are you interested"]
+BODY_SPAM_PHRASES = ["guarantee", "100%", "free", "limited time", "act now", "click here"]
+
+_ASCII_UPPERCASE = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class PhraseMatcher:
+    """
+    Finds which of a fixed set of phrases occur in a text, as a bitmask.
+
+    Every phrase has a bit (see ``bits``). Phrases are tested shortest first
+    with ``phrase in text``, and a phrase that contains shorter known phrases
+    is only tested once all of them were found ("risk-free" cannot occur
+    without "free"). Nothing is kept between calls.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: Tuple[str, ...] = tuple(sorted({phrase for phrase in phrases if phrase}))
+        self.bits: Dict[str, int] = {phrase: 1 << index for index, phrase in enumerate(self.phrases)}
+
+        tests = []
+        for phrase in sorted(self.phrases, key=len):
+            gate = 0
+            for other in self.phrases:
+                if len(other) < len(phrase) and other in phrase:
+                    gate |= self.bits[other]
+            tests.append((phrase, self.bits[phrase], gate))
+        self._tests: Tuple[Tuple[str, int, int], ...] = tuple(tests)
+
+    def mask_of(self, phrases: Iterable[str]) -> int:
+        """Bits of the given phrases (phrases the matcher does not know are ignored)"""
+        mask = 0
+        for phrase in phrases:
+            mask |= self.bits.get(phrase, 0)
+        return mask
+
+    def match(self, text: str) -> int:
+        """Bits of the phrases that occur anywhere in text"""
+        mask = 0
+        for phrase, bit, gate in self._tests:
+            if mask & gate == gate and phrase in text:
+                mask |= bit
+        return mask
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Phrases that occur anywhere in text"""
+        mask = self.match(text)
+        return frozenset(phrase for phrase, bit in self.bits.items() if mask & bit)
+
+
+class TextScan:
+    """Everything the quality checks need from one pass over a text"""
+    __slots__ = ("lower", "phrases", "word_count", "caps_ratio", "exclamation_count")
+
+    def __init__(self, lower: str, phrases: int, word_count: int,
+                 caps_ratio: float, exclamation_count: int):
+        self.lower = lower
+        self.phrases = phrases  # PhraseMatcher bitmask
+        self.word_count = word_count
+        self.caps_ratio = caps_ratio
+        self.exclamation_count = exclamation_count
+
+
+@dataclass
+class MessageQuality:
+    """All quality scores for one message"""
+    word_count: int
+    caps_ratio: float
+    exclamation_count: int
+    spam_score: float
+    professional_tone: bool
+    no_sensitive_topics: bool
+    has_clear_cta: bool
+    personalization_score: Optional[float] = None  # Needs a lead
+    response_probability: Optional[float] = None  # Needs a lead
+
+
+class MessageQualityAnalyzer:
+    """
+    Single-pass quality analysis for outreach messages.
+
+    A text is lowercased once and matched against every known phrase
+    (spam triggers, tone and sensitive-topic lists, CTAs, industry terms and
+    the response heuristic's markers) in the same pass. The lead-specific
+    checks are substring tests on that same lowercased text, and all scores
+    are read off the scan with bitmask tests.
+    """
+
+    def __init__(self):
+        self.matcher = PhraseMatcher(
+            SPAM_TRIGGERS + UNPROFESSIONAL_PHRASES + SENSITIVE_TERMS + CTA_PHRASES
+            + [term for terms in INDUSTRY_TERMS.values() for term in terms]
+            + BODY_QUALITY_PHRASES + BODY_QUESTION_PHRASES + BODY_SPAM_PHRASES
+        )
+        mask_of = self.matcher.mask_of
+        self._spam_triggers = mask_of(SPAM_TRIGGERS)
+        self._unprofessional = mask_of(UNPROFESSIONAL_PHRASES)
+        self._sensitive = mask_of(SENSITIVE_TERMS)
+        self._cta = mask_of(CTA_PHRASES)
+        self._industry_terms = {industry: mask_of(terms) for industry, terms in INDUSTRY_TERMS.items()}
+        self._body_quality = mask_of(BODY_QUALITY_PHRASES)
+        self._body_question = mask_of(BODY_QUESTION_PHRASES)
+        self._body_spam = mask_of(BODY_SPAM_PHRASES)
+
+    def scan(self, text: str) -> TextScan:
+        """Lowercase, count and phrase-match text once"""
+        lower = text.lower()
+        return TextScan(
+            lower, self.matcher.match(lower), len(lower.split()),
+            self._count_uppercase(text) / max(1, len(text)), text.count("!")
+        )
+
+    @staticmethod
+    def _count_uppercase(text: str) -> int:
+        if text.isascii():
+            data = text.encode("ascii")
+            return len(data) - len(data.translate(None, _ASCII_UPPERCASE))
+        return sum(map(str.isupper, text))
+
+    def analyze(self, message: str, lead: Any = None, subject: str = "") -> MessageQuality:
+        """
+        Score a message body.
+
+        personalization_score and response_probability are only filled in
+        when a lead is given; ``subject`` is used by the response heuristic.
+        """
+        scan = self.scan(message)
+        phrases = scan.phrases
+        quality = MessageQuality(
+            word_count=scan.word_count,
+            caps_ratio=scan.caps_ratio,
+            exclamation_count=scan.exclamation_count,
+            spam_score=self.spam_score(scan),
+            professional_tone=not phrases & self._unprofessional,
+            no_sensitive_topics=not phrases & self._sensitive,
+            has_clear_cta=bool(phrases & self._cta)
+        )
+        if lead is not None:
+            quality.personalization_score = self.personalization_score(scan, lead)
+            quality.response_probability = self.response_probability(message, scan, lead, subject)
+        return quality
+
+    def spam_score(self, scan: TextScan) -> float:
+        # Each trigger present adds 0.5 (exact in binary floating point)
+        score = (scan.phrases & self._spam_triggers).bit_count() * 0.5
+
+        # Excessive caps
+        if scan.caps_ratio > 0.3:
+            score += 2.0
+
+        return score
+
+    def personalization_score(self, scan: TextScan, lead: Any) -> float:
+        score = 0.0
+        message_lower = scan.lower
+        contact, company = lead.contact, lead.company
+
+        # Check for personalized elements
+        if contact.first_name.lower() in message_lower:
+            score += 0.15
+
+        if company.name.lower() in message_lower:
+            score += 0.20
+
+        if company.industry.lower() in message_lower:
+            score += 0.15
+
+        if contact.title.lower() in message_lower:
+            score += 0.10
+
+        # Check for specific company references
+        for news in getattr(company, 'recent_news', None) or ():
+            if _any_in(news.title.lower().split()[:3], message_lower):
+                score += 0.15
+                break
+
+        # Check for pain point relevance
+        for pain_point in getattr(company, 'pain_points', None) or ():
+            if pain_point.lower() in message_lower:
+                score += 0.15
+                break
+
+        # Check for industry-specific terminology
+        if scan.phrases & self._industry_terms.get(company.industry, 0):
+            score += 0.05
+
+        return min(score, 1.0)
+
+    def response_probability(self, body: str, scan: TextScan, lead: Any, subject: str = "") -> float:
+        score = 0.3  # Lower base score
+
+        # Lead quality bonus (reduced impact)
+        score += (lead.score.total_score / 100) * 0.2
+
+        # Subject line quality
+        # (subject lines are short enough that direct checks beat a scan)
+        subject_lower = subject.lower()
+        if 30 < len(subject) < 60:  # Optimal length
+            score += 0.1
+        if _any_in(SUBJECT_POSITIVE_WORDS, subject_lower):
+            score += 0.05
+        if _any_in(SUBJECT_SPAM_WORDS, subject_lower):
+            score -= 0.2
+
+        # Body quality
+        word_count = scan.word_count
+        if 50 < word_count < 150:  # Optimal length
+            score += 0.15
+        elif word_count > 200:  # Too long
+            score -= 0.1
+        elif word_count < 30:  # Too short
+            score -= 0.1
+
+        # Personalization (higher weight)
+        if lead.contact.first_name in body:
+            score += 0.15
+        if lead.company.name in body:
+            score += 0.1
+
+        # Professional quality indicators
+        phrases = scan.phrases
+        if phrases & self._body_quality:
+            score += 0.1
+        if phrases & self._body_question:
+            score += 0.05
+
+        # Negative quality indicators
+        spam_count = (phrases & self._body_spam).bit_count()
+        score -= spam_count * 0.1
+
+        # Excessive punctuation or caps
+        if scan.exclamation_count > 2:
+            score -= 0.1
+        if scan.caps_ratio > 0.1:
+            score -= 0.15
+
+        return min(0.9, max(0.05, score))
+
+
+def _any_in(words: Iterable[str], text: str) -> bool:
+    for word in words:
+        if word in text:
+            return True
+    return False
@@ -8,12 +8,15 @@ import random
 import json
 import sys
 import os
+import time
+import asyncio
 from collections import defaultdict
 
 # Add ai_engines to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from email_templates import EmailTemplateLibrary, ToneStyle, EmailTemplate
+from email_templates import EmailTemplateLibrary, ToneStyle, EmailTemplate, CompiledTemplate
+from message_quality import MessageQualityAnalyzer, MessageQuality
 from ai_engines.base_engine import BaseAIEngine, AIEngineConfig
 from ai_engines.anthropic_engine import AnthropicEngine
 from ai_engines.mock_engine import MockAIEngine
@@ -69,11 +72,30 @@ class OutreachConfig(BaseModel):
         return max(50, min(v, 1000))
 
 
+class OutreachCampaign(BaseModel):
+    """Messages and throughput for one compose_outreach_many call"""
+    messages: List[OutreachMessage]  # Input order, failed leads omitted
+    failed_lead_ids: List[str] = []
+    template_messages: int = 0
+    ai_messages: int = 0
+    elapsed_seconds: float = 0.0
+    template_seconds: float = 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        return len(self.messages) / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def template_messages_per_second(self) -> float:
+        return self.template_messages / self.template_seconds if self.template_seconds else 0.0
+
+
 class OutreachComposerAgent:
     def __init__(self, mode: Literal["template", "ai", "hybrid"] = "template", config: Optional[Dict] = None):
         self.mode = mode
         self.config = config or {}
         self.template_library = EmailTemplateLibrary()
+        self.quality_analyzer = MessageQualityAnalyzer()
         self.logger = logging.getLogger(__name__)
         self._setup_personalization_data()
         self._setup_industry_insights()
@@ -202,6 +224,115 @@ class OutreachComposerAgent:
         else:
             raise ValueError(f"Unknown mode: {self.mode}")
 
+    async def compose_outreach_many(self, leads: List[Lead], config: OutreachConfig,
+                                    concurrency: Optional[int] = None) -> OutreachCampaign:
+        """
+        Compose messages for a whole campaign.
+        
+        Leads that compose_outreach would send to the AI path (every lead in
+        "ai" mode; score >= 80 or enriched leads in "hybrid" mode) fan out
+        concurrently, at most ``concurrency`` at a time (config
+        'compose_concurrency'). All other leads are composed in-process from
+        compiled templates, with template and subject line choices memoized
+        per campaign on the lead features they depend on. Messages match what
+        compose_outreach returns for each lead; a lead that fails is logged
+        and reported in failed_lead_ids.
+        """
+        start_time = time.perf_counter()
+        concurrency = max(1, concurrency or self.config.get('compose_concurrency', 10))
+        results: List[Optional[OutreachMessage]] = [None] * len(leads)
+        failed: List[str] = []
+        
+        ai_rows = [
+            row for row, lead in enumerate(leads)
+            if self.mode == "ai" or (
+                self.mode == "hybrid" and (lead.score.total_score >= 80 or lead.enrichment_data)
+            )
+        ]
+        ai_row_set = set(ai_rows)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def compose_ai(row: int):
+            async with semaphore:
+                try:
+                    results[row] = await self.compose_outreach(leads[row], config)
+                except Exception as e:
+                    failed.append(leads[row].lead_id)
+                    self.logger.error(f"Failed to compose outreach for lead {leads[row].lead_id}: {e}")
+        
+        ai_tasks = [asyncio.ensure_future(compose_ai(row)) for row in ai_rows]
+        
+        # Template leads: batched in-process, yielding now and then so the AI
+        # requests keep moving
+        template_start = time.perf_counter()
+        template_count = 0
+        template_choices: Dict[tuple, str] = {}
+        subject_choices: Dict[tuple, str] = {}
+        for row, lead in enumerate(leads):
+            if row in ai_row_set:
+                continue
+            try:
+                template_key = self._template_selection_key(lead)
+                template_id = template_choices.get(template_key)
+                if template_id is None:
+                    template_id = template_choices[template_key] = self.select_template(lead, config)
+                
+                subject_key = (template_id,) + self._subject_selection_key(lead)
+                subject_line = subject_choices.get(subject_key)
+                if subject_line is None:
+                    template = self.template_library.get_template(template_id)
+                    subject_line = subject_choices[subject_key] = self.optimize_subject_line(
+                        template.subject_lines if template else [], lead
+                    )
+                
+                message = self._compose_with_template(lead, template_id, config, subject_line=subject_line)
+                if self.mode == "hybrid":
+                    message.generation_mode = "template"
+                results[row] = message
+                template_count += 1
+            except Exception as e:
+                failed.append(lead.lead_id)
+                self.logger.error(f"Failed to compose outreach for lead {lead.lead_id}: {e}")
+            
+            if ai_tasks and template_count % 256 == 0:
+                await asyncio.sleep(0)
+        template_seconds = time.perf_counter() - template_start
+        
+        if ai_tasks:
+            await asyncio.gather(*ai_tasks)
+        
+        campaign = OutreachCampaign(
+            messages=[message for message in results if message is not None],
+            failed_lead_ids=failed,
+            template_messages=template_count,
+            ai_messages=sum(1 for row in ai_rows if results[row] is not None),
+            elapsed_seconds=time.perf_counter() - start_time,
+            template_seconds=template_seconds
+        )
+        self.logger.info(
+            f"Composed {len(campaign.messages)} messages ({campaign.template_messages} template, "
+            f"{campaign.ai_messages} AI, {len(failed)} failed) in {campaign.elapsed_seconds:.3f}s - "
+            f"{campaign.messages_per_second:,.0f} msgs/s, "
+            f"{campaign.template_messages_per_second:,.0f} template msgs/s"
+        )
+        return campaign
+
+    def _template_selection_key(self, lead: Lead) -> tuple:
+        """Every lead feature select_template reads (the config is fixed per campaign)"""
+        score = lead.score.total_score
+        return (
+            score >= 80, score >= 60, lead.company.industry,
+            "C-Level" in lead.contact.seniority, "VP" in lead.contact.title, "Director" in lead.contact.title,
+            lead.company.employee_count > 1000, lead.company.employee_count < 100
+        )
+
+    def _subject_selection_key(self, lead: Lead) -> tuple:
+        """Every lead feature optimize_subject_line reads"""
+        return (
+            lead.company.industry, "C-Level" in lead.contact.seniority, "VP" in lead.contact.title,
+            lead.company.employee_count > 1000, lead.company.employee_count < 100
+        )
+
     async def _compose_with_ai(self, lead: Lead, style_guide: Dict, config: OutreachConfig) -> OutreachMessage:
         """Generate message using AI with deep personalization"""
         
@@ -497,69 +628,23 @@ Format as JSON with keys: probability, strengths, weaknesses, improvement"""
             
     def _calculate_response_probability_heuristic(self, message: Dict, lead: Lead) -> float:
         """Enhanced heuristic-based response prediction with quality correlation"""
-        score = 0.3  # Lower base score
-        
-        # Lead quality bonus (reduced impact)
-        score += (lead.score.total_score / 100) * 0.2
-        
-        # Message quality factors (more discriminating)
-        subject = message.get("subject", "")
         body = message.get("body", "")
-        body_words = body.split()
-        
-        # Subject line quality
-        if 30 < len(subject) < 60:  # Optimal length
-            score += 0.1
-        if any(word in subject.lower() for word in ["question", "opportunity", "partnership"]):
-            score += 0.05
-        if any(spam in subject.lower() for spam in ["free", "guarantee", "urgent", "!!!"]):
-            score -= 0.2
-            
-        # Body quality
-        if 50 < len(body_words) < 150:  # Optimal length
-            score += 0.15
-        elif len(body_words) > 200:  # Too long
-            score -= 0.1
-        elif len(body_words) < 30:  # Too short
-            score -= 0.1
-            
-        # Personalization (higher weight)
-        if lead.contact.first_name in body:
-            score += 0.15
-        if lead.company.name in body:
-            score += 0.1
-            
-        # Professional quality indicators
-        if any(word in body.lower() for word in ["noticed", "congratulations", "brief call", "discuss"]):
-            score += 0.1
-        if "would you be" in body.lower() or "are you interested" in body.lower():
-            score += 0.05
-            
-        # Negative quality indicators
-        spam_phrases = ["guarantee", "100%", "free", "limited time", "act now", "click here"]
-        spam_count = sum(1 for phrase in spam_phrases if phrase in body.lower())
-        score -= spam_count * 0.1
-        
-        # Excessive punctuation or caps
-        if body.count("!") > 2:
-            score -= 0.1
-        caps_ratio = sum(1 for c in body if c.isupper()) / max(1, len(body))
-        if caps_ratio > 0.1:
-            score -= 0.15
-            
-        return min(0.9, max(0.05, score))
+        return self.quality_analyzer.response_probability(
+            body, self.quality_analyzer.scan(body), lead, message.get("subject", "")
+        )
 
     async def _quality_check_ai_message(self, message: str, lead: Lead) -> Dict[str, Any]:
         """Ensure AI-generated message meets quality standards"""
         
+        quality = self.quality_analyzer.analyze(message)
         checks = {
-            "length_appropriate": 50 < len(message.split()) < 300,
+            "length_appropriate": 50 < quality.word_count < 300,
             "no_hallucinations": self._check_no_hallucinations(message, lead),
-            "professional_tone": await self._check_professional_tone(message),
-            "no_spam_triggers": self._check_spam_score(message) < 3.0,
+            "professional_tone": quality.professional_tone,
+            "no_spam_triggers": quality.spam_score < 3.0,
             "has_personalization": lead.contact.first_name in message or lead.company.name in message,
-            "has_clear_cta": any(phrase in message.lower() for phrase in ["call", "meeting", "discuss", "chat", "connect", "schedule"]),
-            "no_sensitive_topics": self._check_no_sensitive_topics(message)
+            "has_clear_cta": quality.has_clear_cta,
+            "no_sensitive_topics": quality.no_sensitive_topics
         }
         
         passed = all(checks.values())
@@ -593,61 +678,40 @@ Format as JSON with keys: probability, strengths, weaknesses, improvement"""
     
     async def _check_professional_tone(self, message: str) -> bool:
         """Check if message maintains professional tone"""
-        unprofessional_phrases = [
-            "guarantee success", "100% guaranteed", "no risk", "act now",
-            "limited time", "once in a lifetime", "don't miss out", "urgent"
-        ]
-        
-        message_lower = message.lower()
-        return not any(phrase in message_lower for phrase in unprofessional_phrases)
+        return self.quality_analyzer.analyze(message).professional_tone
     
     def _check_spam_score(self, message: str) -> float:
         """Simple spam score calculation"""
-        spam_triggers = [
-            "free", "guarantee", "no obligation", "act now", "limited time",
-            "click here", "buy now", "special offer", "!!!!", "$$",
-            "100% guaranteed", "risk-free", "urgent", "winner"
-        ]
-        
-        message_lower = message.lower()
-        score = 0.0
-        
-        for trigger in spam_triggers:
-            if trigger in message_lower:
-                score += 0.5
-                
-        # Excessive caps
-        caps_ratio = sum(1 for c in message if c.isupper()) / max(1, len(message))
-        if caps_ratio > 0.3:
-            score += 2.0
-            
-        return score
+        return self.quality_analyzer.analyze(message).spam_score
 
     def _check_no_sensitive_topics(self, message: str) -> bool:
         """Ensure message avoids sensitive topics"""
-        sensitive_terms = [
-            "layoff", "fired", "bankruptcy", "lawsuit", "scandal",
-            "controversy", "failure", "crisis", "problem"
-        ]
-        
-        message_lower = message.lower()
-        return not any(term in message_lower for term in sensitive_terms)
+        return self.quality_analyzer.analyze(message).no_sensitive_topics
 
-    def _compose_with_template(self, lead: Lead, template_id: str, config: OutreachConfig) -> OutreachMessage:
+    def analyze_message_quality(self, message: OutreachMessage, lead: Lead) -> MessageQuality:
+        """Every quality score for a composed message from a single scan of its body"""
+        return self.quality_analyzer.analyze(message.body, lead, subject=message.subject)
+
+    def _compose_with_template(self, lead: Lead, template_id: str, config: OutreachConfig,
+                               subject_line: Optional[str] = None) -> OutreachMessage:
         """
         Generate message using template system.
         
         Steps:
-        1. Load template
+        1. Load template (parsed once, then reused)
         2. Extract variables from lead data
         3. Fill in missing variables with smart defaults
         4. Apply industry-specific variants
         5. Personalize based on depth setting
+        
+        ``subject_line`` skips subject selection when the caller already
+        picked one with optimize_subject_line.
         """
         try:
-            template = self.template_library.get_template(template_id)
-            if not template:
+            compiled = self.template_library.compile_template(template_id)
+            if not compiled:
                 raise ValueError(f"Template {template_id} not found")
+            template = compiled.template
             
             # Extract personalization variables
             variables = self._extract_personalization_variables(lead)
@@ -664,11 +728,12 @@ Format as JSON with keys: probability, strengths, weaknesses, improvement"""
                 variables["industry_specific"] = industry_variant
             
             # Select and personalize subject line
-            subject = self.optimize_subject_line(template.subject_lines, lead)
-            subject = self._fill_template_variables(subject, variables)
+            if subject_line is None:
+                subject_line = self.optimize_subject_line(template.subject_lines, lead)
+            subject = compiled.fill(subject_line, variables)
             
             # Fill template body
-            body = self._fill_template_variables(template.body_template, variables)
+            body = compiled.fill(template.body_template, variables)
             
             # Apply personalization depth
             if config.personalization_depth == "deep":
@@ -856,11 +921,7 @@ Format as JSON with keys: probability, strengths, weaknesses, improvement"""
 
     def _fill_template_variables(self, template: str, variables: Dict[str, str]) -> str:
         """Fill template variables with actual values"""
-        result = template
-        for var, value in variables.items():
-            placeholder = f"{{{{{var}}}}}"
-            result = result.replace(placeholder, str(value))
-        return result
+        return CompiledTemplate.fill_sequential(template, variables)
 
     def _enhance_personalization(self, body: str, lead: Lead, variables: Dict[str, str]) -> str:
         """Add deep personalization touches"""
@@ -1032,52 +1093,7 @@ Format as JSON with keys: probability, strengths, weaknesses, improvement"""
         
         Returns: 0.0 (generic) to 1.0 (highly personalized)
         """
-        score = 0.0
-        message_lower = message.lower()
-        
-        # Check for personalized elements
-        if lead.contact.first_name.lower() in message_lower:
-            score += 0.15
-        
-        if lead.company.name.lower() in message_lower:
-            score += 0.20
-        
-        if lead.company.industry.lower() in message_lower:
-            score += 0.15
-        
-        if lead.contact.title.lower() in message_lower:
-            score += 0.10
-        
-        # Check for specific company references
-        if hasattr(lead.company, 'recent_news') and lead.company.recent_news:
-            for news in lead.company.recent_news:
-                if any(word in message_lower for word in news.title.lower().split()[:3]):
-                    score += 0.15
-                    break
-        
-        # Check for pain point relevance
-        if hasattr(lead.company, 'pain_points') and lead.company.pain_points:
-            for pain_point in lead.company.pain_points:
-                if pain_point.lower() in message_lower:
-                    score += 0.15
-                    break
-        
-        # Check for industry-specific terminology
-        industry_terms = {
-            "SaaS": ["churn", "ARR", "MRR", "onboarding", "activation"],
-            "FinTech": ["compliance", "security", "fraud", "transaction", "regulatory"],
-            "E-commerce": ["conversion", "cart", "checkout", "fulfillment", "retention"],
-            "Healthcare": ["patient", "HIPAA", "clinical", "outcomes", "care"],
-            "Manufacturing": ["production", "efficiency", "quality", "automation", "supply chain"]
-        }
-        
-        terms = industry_terms.get(lead.company.industry, [])
-        for term in terms:
-            if term in message_lower:
-                score += 0.05
-                break
-        
-        return min(score, 1.0)
+        return self.quality_analyzer.personalization_score(self.quality_analyzer.scan(message), lead)
 
     def predict_response_rate(self, message: OutreachMessage, lead: Lead) -> float:
         """
@@ -0,0 +1,197 @@
+"""
+Incrementally maintained metric series for the adaptive learning system.
+
+Each (workflow, step, metric) series keeps its points in arrival order and a
+RunningStats summary that is updated in O(1) as points are appended and as
+the oldest points expire, so pattern detection reads summaries instead of
+regrouping and rescanning the whole history.
+"""
+import math
+from collections import deque
+from itertools import islice
+from datetime import datetime
+from typing import Any, Deque, Dict, Hashable, Optional, Tuple
+
+
+class RunningStats:
+    """
+    Sliding-window mean, variance and least-squares trend, plus an EWMA.
+
+    Mean and variance use Welford's update (and its inverse when the oldest
+    point is removed). The trend regresses values against their position in
+    the series using the same streaming co-moment, so slope and correlation
+    match a batch regression over the current window. The EWMA runs over the
+    full stream: old points already carry negligible weight, so it is not
+    rewound on removal.
+    """
+    __slots__ = ("count", "mean", "m2", "x_mean", "x_m2", "co_moment", "ewma", "alpha")
+
+    def __init__(self, alpha: float = 0.1):
+        self.alpha = alpha
+        self.ewma: Optional[float] = None
+        self._reset()
+
+    def _reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.x_mean = 0.0
+        self.x_m2 = 0.0
+        self.co_moment = 0.0
+
+    def add(self, x: float, value: float):
+        self.count += 1
+        n = self.count
+        dx = x - self.x_mean
+        dy = value - self.mean
+        self.x_mean += dx / n
+        self.mean += dy / n
+        self.x_m2 += dx * (x - self.x_mean)
+        self.m2 += dy * (value - self.mean)
+        self.co_moment += dx * (value - self.mean)
+        self.ewma = value if self.ewma is None else self.ewma + self.alpha * (value - self.ewma)
+
+    def remove(self, x: float, value: float):
+        if self.count <= 1:
+            self._reset()
+            return
+        n = self.count
+        x_mean_old = (n * self.x_mean - x) / (n - 1)
+        mean_old = (n * self.mean - value) / (n - 1)
+        self.co_moment -= (x - x_mean_old) * (value - self.mean)
+        self.x_m2 -= (x - x_mean_old) * (x - self.x_mean)
+        self.m2 -= (value - mean_old) * (value - self.mean)
+        self.x_mean, self.mean = x_mean_old, mean_old
+        self.count = n - 1
+
+    @property
+    def variance(self) -> float:
+        return max(0.0, self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def trend(self) -> Optional[Dict[str, Any]]:
+        """Least-squares trend over the window, or None below 5 points or |r| < 0.6"""
+        if self.count < 5 or self.x_m2 <= 0 or self.m2 <= 0:
+            return None
+
+        slope = self.co_moment / self.x_m2
+        correlation = self.co_moment / math.sqrt(self.x_m2 * self.m2)
+        confidence = min(1.0, abs(correlation))
+        if confidence < 0.6:
+            return None
+
+        return {
+            "direction": "increasing" if slope > 0 else "decreasing",
+            "magnitude": abs(slope),
+            "confidence": confidence,
+            "slope": slope
+        }
+
+
+class MetricSeries:
+    """Points of one (workflow, step, metric) in arrival order, with running statistics"""
+
+    def __init__(self, anomaly_threshold: float = 3.0, anomaly_min_points: int = 5, ewma_alpha: float = 0.1):
+        self.points: Deque[Any] = deque()
+        self.stats = RunningStats(ewma_alpha)
+        self.anomaly_threshold = anomaly_threshold
+        self.anomaly_min_points = anomaly_min_points
+        self.first_x = 0
+        self.next_x = 0
+        self.last_seen: Optional[datetime] = None
+        self.high_count = 0  # Values above 0.8 (successes, for success_rate series)
+        # (x, |z|) of points that were outliers against the window they arrived in
+        self.anomalies: Deque[Tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def append(self, point: Any):
+        value = point.value
+        stats = self.stats
+        if stats.count >= self.anomaly_min_points and stats.m2 > 0:
+            z = abs(value - stats.mean) / math.sqrt(stats.m2 / (stats.count - 1))
+            if z > self.anomaly_threshold:
+                self.anomalies.append((self.next_x, z))
+
+        stats.add(self.next_x, value)
+        self.next_x += 1
+        self.points.append(point)
+        if value > 0.8:
+            self.high_count += 1
+        if self.last_seen is None or point.timestamp > self.last_seen:
+            self.last_seen = point.timestamp
+
+    def popleft(self) -> Any:
+        point = self.points.popleft()
+        x = self.first_x
+        self.first_x += 1
+        self.stats.remove(x, point.value)
+        if point.value > 0.8:
+            self.high_count -= 1
+        if self.anomalies and self.anomalies[0][0] == x:
+            self.anomalies.popleft()
+        return point
+
+    def anomaly_summary(self) -> Dict[str, Any]:
+        """Outliers in the current window (z-score beyond the threshold on arrival)"""
+        if not self.anomalies:
+            return {"count": 0, "confidence": 0, "magnitude": 0}
+
+        max_deviation = max(z for _, z in self.anomalies) - self.anomaly_threshold
+        return {
+            "count": len(self.anomalies),
+            "confidence": min(0.95, 0.5 + (max_deviation * 0.1)),
+            "magnitude": max_deviation
+        }
+
+
+class SubsequenceCounter:
+    """
+    Counts of every run of 2-5 consecutive items in a sliding sequence.
+
+    Appending counts the runs that end at the new item and removing the
+    oldest item uncounts the runs that start at it, so the counts always
+    equal a full recount of the current sequence.
+    """
+
+    def __init__(self, min_length: int = 2, max_length: int = 5):
+        self.min_length = min_length
+        self.max_length = max_length
+        self.items: Deque[Hashable] = deque()
+        self.counts: Dict[Tuple[Hashable, ...], int] = {}
+        self._tail: Tuple[Hashable, ...] = ()  # Last max_length items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def append(self, item: Hashable):
+        self.items.append(item)
+        tail = self._tail + (item,)
+        if len(tail) > self.max_length:
+            tail = tail[1:]
+        self._tail = tail
+
+        counts = self.counts
+        for start in range(len(tail) - self.min_length + 1):
+            run = tail[start:]
+            counts[run] = counts.get(run, 0) + 1
+
+    def popleft(self) -> Hashable:
+        items = self.items
+        head = tuple(islice(items, self.max_length))
+        counts = self.counts
+        for length in range(self.min_length, len(head) + 1):
+            run = head[:length]
+            remaining = counts[run] - 1
+            if remaining:
+                counts[run] = remaining
+            else:
+                del counts[run]
+        item = items.popleft()
+        if len(self._tail) > len(items):
+            self._tail = self._tail[1:]
+        return item
@@ -865,9 +865,14 @@ class SalesDepartment(Department):
                 }
             )
             
+            campaign = await self.outreach_composer.compose_outreach_many(leads, outreach_config)
+            messages = {message.lead_id: message for message in campaign.messages}
+            
             for lead in leads:
+                message = messages.get(lead.lead_id)
+                if message is None:
+                    continue  # already logged by compose_outreach_many
                 try:
-                    message = await self.outreach_composer.compose_outreach(lead, outreach_config)
                     outreach_results.append({
                         "lead": lead.dict(),
                         "message": {
@@ -963,10 +968,14 @@ class SalesDepartment(Department):
             total_personalization = 0
             total_response_rate = 0
             
+            campaign = await self.outreach_composer.compose_outreach_many(leads, outreach_config)
+            messages = {message.lead_id: message for message in campaign.messages}
+            
             for lead in leads:
+                message = messages.get(lead.lead_id)
+                if message is None:
+                    continue  # already logged by compose_outreach_many
                 try:
-                    message = await self.outreach_composer.compose_outreach(lead, outreach_config)
-                    
                     campaign_messages.append({
                         "lead_id": lead.lead_id,
                         "contact_name": lead.contact.full_name,
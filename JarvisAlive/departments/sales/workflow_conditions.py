@@ -0,0 +1,275 @@
+"""
+Workflow step conditions - a small, sandboxed expression language.
+
+Conditions are parsed once (with Python's own parser, then checked against
+the grammar below) and compiled into nested closures, so evaluating one is
+a handful of function calls and never executes arbitrary code.
+
+Grammar::
+
+    expr     := expr "or" expr | expr "and" expr | "not" expr | comparison
+    comparison := operand (("==" | "!=" | "<" | "<=" | ">" | ">=" | "in" | "not in"
+                            | "is" | "is not") operand)*
+    operand  := literal | lookup | "len(" operand ")" | "-" operand | "(" expr ")"
+                | "[" operand, ... "]" | "(" operand, ... ")"
+    lookup   := name ("." name)*        e.g. lead.company.industry
+    literal  := number | string | True | False | None
+
+A lookup reads the context dict; each further name reads a dict key or a
+public attribute. Missing names resolve to None, and an ordering
+comparison with None is False, so ``responses > 0`` is simply False until
+a step has produced ``responses``.
+"""
+import ast
+import operator
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class ConditionError(ValueError):
+    """A condition is not valid in the workflow condition language"""
+
+
+MAX_CONDITION_LENGTH = 1000
+
+Evaluator = Callable[[Mapping], Any]
+
+
+def _ordering(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def ordered(left, right):
+        if left is None or right is None:
+            return False
+        return compare(left, right)
+    return ordered
+
+
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: _ordering(operator.lt),
+    ast.LtE: _ordering(operator.le),
+    ast.Gt: _ordering(operator.gt),
+    ast.GtE: _ordering(operator.ge),
+    ast.In: lambda left, right: right is not None and left in right,
+    ast.NotIn: lambda left, right: right is None or left not in right,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+_FUNCTIONS = {
+    "len": lambda value: 0 if value is None else len(value),
+}
+
+_CONSTANT_TYPES = (str, int, float, bool, type(None))
+
+
+class _Constant:
+    """Marks a compiled node whose value is known at compile time"""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _lookup_path(path: Tuple[str, ...]) -> Evaluator:
+    root, rest = path[0], path[1:]
+
+    if not rest:
+        return lambda context: context.get(root)
+
+    def lookup(context):
+        value = context.get(root)
+        for name in rest:
+            if value is None:
+                return None
+            if isinstance(value, Mapping):
+                value = value.get(name)
+            else:
+                value = getattr(value, name, None)
+        return value
+    return lookup
+
+
+class _Compiler:
+
+    def __init__(self, expression: str):
+        self.expression = expression
+
+    def error(self, node: ast.AST, message: str) -> ConditionError:
+        column = getattr(node, "col_offset", None)
+        where = f" at column {column + 1}" if column is not None else ""
+        return ConditionError(f"{message}{where} in condition {self.expression!r}")
+
+    def evaluator(self, node: ast.AST) -> Evaluator:
+        compiled = self.compile(node)
+        if isinstance(compiled, _Constant):
+            value = compiled.value
+            return lambda context: value
+        return compiled
+
+    def compile(self, node: ast.AST):
+        method = getattr(self, f"compile_{type(node).__name__}", None)
+        if method is None:
+            raise self.error(node, f"Unsupported syntax '{type(node).__name__}'")
+        return method(node)
+
+    def compile_Constant(self, node: ast.Constant):
+        if not isinstance(node.value, _CONSTANT_TYPES):
+            raise self.error(node, f"Unsupported literal {node.value!r}")
+        return _Constant(node.value)
+
+    def compile_Name(self, node: ast.Name):
+        return _lookup_path((self._check_name(node, node.id),))
+
+    def compile_Attribute(self, node: ast.Attribute):
+        path: List[str] = []
+        current = node
+        while isinstance(current, ast.Attribute):
+            path.append(self._check_name(current, current.attr))
+            current = current.value
+        if not isinstance(current, ast.Name):
+            raise self.error(node, "Lookups must be dotted names")
+        path.append(self._check_name(current, current.id))
+        return _lookup_path(tuple(reversed(path)))
+
+    def _check_name(self, node: ast.AST, name: str) -> str:
+        if name.startswith("_"):
+            raise self.error(node, f"Private name '{name}' is not allowed")
+        return name
+
+    def compile_Call(self, node: ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS:
+            raise self.error(node, f"Only {', '.join(sorted(_FUNCTIONS))}() may be called")
+        if len(node.args) != 1 or node.keywords:
+            raise self.error(node, f"{node.func.id}() takes exactly one argument")
+        function = _FUNCTIONS[node.func.id]
+        argument = self.evaluator(node.args[0])
+        return lambda context: function(argument(context))
+
+    def compile_UnaryOp(self, node: ast.UnaryOp):
+        operand = self.compile(node.operand)
+        if isinstance(node.op, ast.Not):
+            if isinstance(operand, _Constant):
+                return _Constant(not operand.value)
+            return lambda context: not operand(context)
+        if isinstance(node.op, ast.USub):
+            if isinstance(operand, _Constant) and isinstance(operand.value, (int, float)):
+                return _Constant(-operand.value)
+            evaluate = self.evaluator(node.operand)
+            return lambda context: -evaluate(context)
+        raise self.error(node, f"Unsupported operator '{type(node.op).__name__}'")
+
+    def compile_BoolOp(self, node: ast.BoolOp):
+        operands = tuple(self.evaluator(value) for value in node.values)
+        if isinstance(node.op, ast.And):
+            if len(operands) == 2:
+                first, second = operands
+                return lambda context: first(context) and second(context)
+
+            def all_of(context):
+                value = True
+                for operand in operands:
+                    value = operand(context)
+                    if not value:
+                        return value
+                return value
+            return all_of
+
+        if len(operands) == 2:
+            first, second = operands
+            return lambda context: first(context) or second(context)
+
+        def any_of(context):
+            value = False
+            for operand in operands:
+                value = operand(context)
+                if value:
+                    return value
+            return value
+        return any_of
+
+    def compile_Compare(self, node: ast.Compare):
+        comparisons = []
+        for op in node.ops:
+            compare = _COMPARISONS.get(type(op))
+            if compare is None:
+                raise self.error(node, f"Unsupported comparison '{type(op).__name__}'")
+            comparisons.append(compare)
+
+        operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+        if len(comparisons) == 1:
+            compare = comparisons[0]
+            left, right = operands
+            if isinstance(right, _Constant):
+                # The common shape: lookup <op> literal
+                value = right.value
+                left = self.evaluator(node.left)
+                return lambda context: compare(left(context), value)
+            left, right = self.evaluator(node.left), self.evaluator(node.comparators[0])
+            return lambda context: compare(left(context), right(context))
+
+        evaluators = [self.evaluator(n) for n in [node.left] + node.comparators]
+
+        def chained(context):
+            left = evaluators[0](context)
+            for compare, evaluate in zip(comparisons, evaluators[1:]):
+                right = evaluate(context)
+                if not compare(left, right):
+                    return False
+                left = right
+            return True
+        return chained
+
+    def _sequence(self, node, build):
+        items = [self.compile(element) for element in node.elts]
+        if all(isinstance(item, _Constant) for item in items):
+            return _Constant(build(item.value for item in items))
+        evaluators = [self.evaluator(element) for element in node.elts]
+        return lambda context: build(evaluate(context) for evaluate in evaluators)
+
+    def compile_List(self, node: ast.List):
+        # Lists are only ever membership targets, so an immutable tuple is equivalent
+        return self._sequence(node, tuple)
+
+    def compile_Tuple(self, node: ast.Tuple):
+        return self._sequence(node, tuple)
+
+    def compile_Set(self, node: ast.Set):
+        return self._sequence(node, frozenset)
+
+
+def compile_condition(expression: str) -> Callable[[Mapping], bool]:
+    """
+    Compile a condition into a function of the context dict.
+
+    Raises ConditionError if the expression is not in the condition grammar.
+    """
+    if not isinstance(expression, str) or not expression.strip():
+        raise ConditionError("Condition must be a non-empty string")
+    if len(expression) > MAX_CONDITION_LENGTH:
+        raise ConditionError(f"Condition longer than {MAX_CONDITION_LENGTH} characters")
+
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ConditionError(f"Invalid condition {expression!r}: {e.msg}") from None
+
+    compiled = _Compiler(expression).compile(tree.body)
+    if isinstance(compiled, _Constant):
+        result = bool(compiled.value)
+        return lambda context: result
+    return lambda context: bool(compiled(context))
+
+
+_compiled_conditions: Dict[str, Callable[[Mapping], bool]] = {}
+
+
+def get_condition(expression: str) -> Callable[[Mapping], bool]:
+    """compile_condition with a process-wide cache keyed by the expression text"""
+    condition = _compiled_conditions.get(expression)
+    if condition is None:
+        condition = compile_condition(expression)
+        if len(_compiled_conditions) >= 1024:
+            _compiled_conditions.clear()
+        _compiled_conditions[expression] = condition
+    return condition
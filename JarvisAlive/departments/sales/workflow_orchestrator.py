@@ -10,9 +10,12 @@ import uuid
 import asyncio
 import logging
 import json
+import heapq
 from collections import defaultdict, deque
 import time
 
+from .workflow_conditions import ConditionError, compile_condition, get_condition
+
 
 class WorkflowStepType(str, Enum):
     SCAN_LEADS = "scan_leads"
@@ -43,6 +46,14 @@ class WorkflowPriority(str, Enum):
     CRITICAL = "critical"
 
 
+STEP_PRIORITY_RANK = {
+    WorkflowPriority.LOW: 0,
+    WorkflowPriority.MEDIUM: 1,
+    WorkflowPriority.HIGH: 2,
+    WorkflowPriority.CRITICAL: 3
+}
+
+
 class WorkflowStep(BaseModel):
     step_id: str
     name: str
@@ -93,6 +104,7 @@ class WorkflowTemplate(BaseModel):
     estimated_total_cost: float = 0.0  # Auto-calculated
     success_rate: float = 0.95  # Historical success rate
     last_optimized: Optional[datetime] = None
+    max_concurrent_steps: Optional[int] = None  # None: orchestrator default (unbounded)
     
     def __init__(self, **data):
         super().__init__(**data)
@@ -114,30 +126,43 @@ class WorkflowTemplate(BaseModel):
     
     def _calculate_critical_path(self, dependency_graph: Dict[str, List[str]]) -> int:
         """Calculate critical path duration considering parallelization"""
+        return max(self.calculate_remaining_paths(dependency_graph).values(), default=0)
+    
+    def calculate_remaining_paths(self, dependency_graph: Optional[Dict[str, List[str]]] = None) -> Dict[str, int]:
+        """
+        Longest estimated duration from the start of each step to the end of
+        the workflow (the step plus its slowest chain of dependents).
+        
+        Steps on a dependency cycle are left out; they can never run.
+        """
+        dependency_graph = dependency_graph if dependency_graph is not None else self._build_dependency_graph()
         step_map = {step.step_id: step for step in self.steps}
         
-        def calculate_path_duration(step_id: str, memo: Dict[str, int] = None) -> int:
-            if memo is None:
-                memo = {}
-            
-            if step_id in memo:
-                return memo[step_id]
-            
-            step = step_map[step_id]
-            dependencies = dependency_graph.get(step_id, [])
-            
-            if not dependencies:
-                duration = step.estimated_duration
-            else:
-                # Max duration of dependencies (they can run in parallel)
-                max_dep_duration = max(calculate_path_duration(dep_id, memo) for dep_id in dependencies)
-                duration = max_dep_duration + step.estimated_duration
-            
-            memo[step_id] = duration
-            return duration
-        
-        # Calculate for all steps and return maximum
-        return max(calculate_path_duration(step.step_id) for step in self.steps)
+        # Topological order (dependencies first), O(steps + dependencies)
+        dependents = defaultdict(list)
+        in_degree = {}
+        for step_id, dependencies in dependency_graph.items():
+            known = {dep for dep in dependencies if dep in step_map}
+            in_degree[step_id] = len(known)
+            for dep in known:
+                dependents[dep].append(step_id)
+        
+        queue = deque(step_id for step_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while queue:
+            step_id = queue.popleft()
+            order.append(step_id)
+            for dependent in dependents[step_id]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+        
+        remaining = {}
+        for step_id in reversed(order):
+            remaining[step_id] = step_map[step_id].estimated_duration + max(
+                (remaining[dependent] for dependent in dependents[step_id]), default=0
+            )
+        return remaining
 
 
 class WorkflowExecution(BaseModel):
@@ -183,6 +208,7 @@ class WorkflowOrchestrator:
         
         # Template and execution storage
         self.templates: Dict[str, WorkflowTemplate] = {}
+        self.compiled_conditions: Dict[str, Dict[str, Callable[[Dict[str, Any]], bool]]] = {}
         self.executions: Dict[str, WorkflowExecution] = {}
         self.active_executions: Dict[str, asyncio.Task] = {}
         
@@ -202,8 +228,17 @@ class WorkflowOrchestrator:
         self.logger.info(f"Registered agent: {agent_class_name}")
     
     def create_template(self, template: WorkflowTemplate) -> str:
-        """Create a new workflow template"""
+        """Create a new workflow template; raises ConditionError for an invalid step condition"""
+        conditions = {}
+        for step in template.steps:
+            if step.condition:
+                try:
+                    conditions[step.step_id] = compile_condition(step.condition)
+                except ConditionError as e:
+                    raise ConditionError(f"Step '{step.step_id}' of template '{template.template_id}': {e}") from None
+
         self.templates[template.template_id] = template
+        self.compiled_conditions[template.template_id] = conditions
         self.metrics[template.template_id] = WorkflowMetrics()
         self.logger.info(f"Created workflow template: {template.name}")
         return template.template_id
@@ -247,56 +282,71 @@ class WorkflowOrchestrator:
         return execution_id
     
     async def _execute_workflow_internal(self, execution_id: str):
-        """Internal workflow execution logic"""
+        """
+        Internal workflow execution logic.
+        
+        Event-driven: each step starts as soon as its last dependency has
+        finished, up to the workflow's concurrency cap. When more steps are
+        ready than slots are free, the step with the longest remaining
+        critical path goes first (then explicit priority, then template order).
+        """
         execution = self.executions[execution_id]
         template = self.templates[execution.template_id]
+        running: Dict[asyncio.Task, str] = {}
         
         try:
             execution.status = WorkflowStepStatus.RUNNING
             
-            # Build execution graph
+            # Build execution graph: unmet dependency counts and reverse edges
             dependency_graph = self._build_execution_graph(template.steps)
+            steps = {step.step_id: step for step in template.steps}
+            remaining_paths = template.calculate_remaining_paths(dependency_graph)
+            pending_dependencies = {}
+            dependents = defaultdict(list)
+            for step_id, dependencies in dependency_graph.items():
+                unique = set(dependencies)
+                pending_dependencies[step_id] = len(unique)
+                for dep in unique:
+                    dependents[dep].append(step_id)
             
-            # Execute steps in dependency order with parallelization
-            completed_steps = set()
+            order = {step.step_id: index for index, step in enumerate(template.steps)}
             
-            while len(completed_steps) < len(template.steps):
-                # Find ready steps (dependencies completed)
-                ready_steps = []
-                for step in template.steps:
-                    if (step.step_id not in completed_steps and
-                        all(dep in completed_steps for dep in step.dependencies)):
-                        ready_steps.append(step)
-                
-                if not ready_steps:
-                    break  # No more steps can be executed
-                
-                # Group steps by parallel_group for concurrent execution
-                parallel_groups = defaultdict(list)
-                for step in ready_steps:
-                    group_key = step.parallel_group or step.step_id
-                    parallel_groups[group_key].append(step)
-                
-                # Execute parallel groups
-                tasks = []
-                for group_steps in parallel_groups.values():
-                    if len(group_steps) == 1:
-                        task = self._execute_step(execution_id, group_steps[0])
-                    else:
-                        task = self._execute_parallel_steps(execution_id, group_steps)
-                    tasks.append(task)
-                
-                # Wait for all parallel groups to complete
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+            def ready_entry(step_id: str) -> Tuple[int, int, int, str]:
+                step = steps[step_id]
+                return (
+                    -remaining_paths.get(step_id, step.estimated_duration),
+                    -STEP_PRIORITY_RANK[step.priority],
+                    order[step_id],
+                    step_id
+                )
+            
+            ready = [ready_entry(step_id) for step_id, count in pending_dependencies.items() if count == 0]
+            heapq.heapify(ready)
+            max_concurrent = (template.max_concurrent_steps
+                              or self.config.get("max_concurrent_steps")
+                              or max(1, len(steps)))
+            
+            while ready or running:
+                while ready and len(running) < max_concurrent:
+                    step_id = heapq.heappop(ready)[-1]
+                    task = asyncio.create_task(self._execute_step(execution_id, steps[step_id]))
+                    running[task] = step_id
                 
-                # Process results
-                for i, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        self.logger.error(f"Parallel group failed: {result}")
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step_id = running.pop(task)
+                    if task.exception() is not None:
+                        self.logger.error(f"Step {step_id} failed: {task.exception()}")
                         execution.status = WorkflowStepStatus.FAILED
                         return
-                    else:
-                        completed_steps.update(result)
+                    
+                    # Finished (completed, failed or skipped): release dependents
+                    for dependent in dependents.get(step_id, ()):
+                        pending_dependencies[dependent] -= 1
+                        if pending_dependencies[dependent] == 0:
+                            heapq.heappush(ready, ready_entry(dependent))
+            
+            # Steps with unknown or cyclic dependencies never become ready
             
             # Mark execution as completed
             execution.status = WorkflowStepStatus.COMPLETED
@@ -312,6 +362,12 @@ class WorkflowOrchestrator:
             execution.end_time = datetime.now()
             
         finally:
+            # Stop steps still in flight after a failure or cancellation, and
+            # let them unwind before the workflow counts as finished
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            
             # Clean up active execution
             if execution_id in self.active_executions:
                 del self.active_executions[execution_id]
@@ -321,7 +377,7 @@ class WorkflowOrchestrator:
         execution = self.executions[execution_id]
         
         # Check condition if specified
-        if step.condition and not self._evaluate_condition(step.condition, execution.context_data):
+        if step.condition and not self._check_condition(execution.template_id, step, execution.context_data):
             result = WorkflowStepResult(
                 step_id=step.step_id,
                 status=WorkflowStepStatus.SKIPPED,
@@ -370,17 +426,6 @@ class WorkflowOrchestrator:
         
         return {step.step_id}
     
-    async def _execute_parallel_steps(self, execution_id: str, steps: List[WorkflowStep]) -> set:
-        """Execute multiple steps in parallel"""
-        tasks = [self._execute_step(execution_id, step) for step in steps]
-        results = await asyncio.gather(*tasks)
-        
-        completed = set()
-        for result_set in results:
-            completed.update(result_set)
-        
-        return completed
-    
     async def _call_step_function(self, step: WorkflowStep, execution: WorkflowExecution) -> Any:
         """Call the actual function for a workflow step"""
         # Get agent instance
@@ -417,13 +462,25 @@ class WorkflowOrchestrator:
             "parameters": step.parameters
         }
     
+    def _check_condition(self, template_id: str, step: WorkflowStep, context: Dict[str, Any]) -> bool:
+        """Evaluate a step condition compiled when its template was registered"""
+        condition = self.compiled_conditions.get(template_id, {}).get(step.step_id)
+        if condition is None:
+            return self._evaluate_condition(step.condition, context)
+        try:
+            return condition(context)
+        except Exception as e:
+            self.logger.warning(f"Condition for step {step.step_id} failed: {e}")
+            return True  # Default to true if evaluation fails
+
     def _evaluate_condition(self, condition: str, context: Dict[str, Any]) -> bool:
-        """Evaluate a condition expression safely"""
+        """Evaluate a condition expression with the workflow condition language"""
         try:
-            # Simple and safe evaluation of conditions
-            # In production, use a proper expression evaluator
-            return eval(condition, {"__builtins__": {}}, context)
-        except:
+            return get_condition(condition)(context)
+        except ConditionError:
+            raise
+        except Exception as e:
+            self.logger.warning(f"Condition {condition!r} failed: {e}")
             return True  # Default to true if evaluation fails
     
     def _build_execution_graph(self, steps: List[WorkflowStep]) -> Dict[str, List[str]]:
@@ -558,7 +615,7 @@ class WorkflowOrchestrator:
                     agent_class="LeadScannerAgent", 
                     function_name="enrich_leads",
                     dependencies=["scan_leads"],
-                    condition="len(context.get('leads', [])) > 0",
+                    condition="len(leads) > 0",
                     estimated_duration=180,
                     cost_estimate=0.50
                 )
@@ -622,7 +679,7 @@ class WorkflowOrchestrator:
                     name="Schedule Meetings",
                     step_type=WorkflowStepType.SCHEDULE_MEETING,
                     dependencies=["track_responses"],
-                    condition="context.get('responses', 0) > 0",
+                    condition="responses > 0",
                     estimated_duration=90,
                     cost_estimate=0.10
                 ),
@@ -0,0 +1,161 @@
+"""
+ArtifactWriter - non-blocking file output for generated websites
+
+Generated sites are written through a bounded thread pool so file I/O never
+runs on the event loop. Each file is written to a temporary file next to
+its destination and renamed into place, so readers never see a partially
+written page, and each output directory is created once per writer.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterable, Dict, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+Content = Union[str, bytes]
+
+
+class ArtifactWriter:
+    """Writes files concurrently off the event loop with atomic temp-then-rename."""
+
+    def __init__(self, max_workers: int = 8, fsync: bool = False):
+        """
+        Initialize the ArtifactWriter.
+
+        Args:
+            max_workers: Number of writer threads (and the cap on in-flight writes)
+            fsync: Flush each file to disk before renaming it into place
+        """
+        self.max_workers = max(1, max_workers)
+        self.fsync = fsync
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._created_dirs: Set[Path] = set()
+        self._lock = threading.Lock()
+        self.files_written = 0
+        self.bytes_written = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="artifact-writer")
+        return self._executor
+
+    def _ensure_dir(self, directory: Path):
+        if directory in self._created_dirs:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._created_dirs.add(directory)
+
+    def _write_file(self, path: Path, content: Content) -> Path:
+        """Blocking write of one file; runs on a worker thread."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        self._ensure_dir(path.parent)
+
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self.files_written += 1
+            self.bytes_written += len(data)
+        return path
+
+    def write_sync(self, path: Union[str, Path], content: Content) -> Path:
+        """Write one file atomically from code already running on a worker thread."""
+        return self._write_file(Path(path), content)
+
+    def submit(self, path: Union[str, Path], content: Content) -> "asyncio.Future[Path]":
+        """Start writing one file and return a future for it, without waiting."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.executor, self._write_file, Path(path), content)
+
+    async def write(self, path: Union[str, Path], content: Content) -> Path:
+        """Write one file atomically without blocking the event loop."""
+        return await self.submit(path, content)
+
+    async def write_many(self, files: Dict[Union[str, Path], Content]) -> List[Path]:
+        """Write several files concurrently; raises the first error after all writes finish."""
+        return await self.wait([self.submit(path, content) for path, content in files.items()])
+
+    @staticmethod
+    async def wait(writes: List["asyncio.Future[Path]"]) -> List[Path]:
+        """Wait for submitted writes; raises the first error after all of them finish."""
+        results = await asyncio.gather(*writes, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+        return results
+
+    async def write_stream(self, path: Union[str, Path], chunks: AsyncIterable[bytes]) -> Path:
+        """Write a file from an async stream of chunks, atomically, holding one chunk at a time."""
+        path = Path(path)
+        loop = asyncio.get_running_loop()
+
+        def open_temp():
+            self._ensure_dir(path.parent)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            return os.fdopen(fd, "wb"), temp_path
+
+        def commit(f, temp_path):
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+            f.close()
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+
+        def discard(f, temp_path):
+            f.close()
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+        f, temp_path = await loop.run_in_executor(self.executor, open_temp)
+        size = 0
+        try:
+            async for chunk in chunks:
+                if chunk:
+                    await loop.run_in_executor(self.executor, f.write, chunk)
+                    size += len(chunk)
+            await loop.run_in_executor(self.executor, commit, f, temp_path)
+        except BaseException:
+            await loop.run_in_executor(self.executor, discard, f, temp_path)
+            raise
+
+        with self._lock:
+            self.files_written += 1
+            self.bytes_written += size
+        return path
+
+    async def make_dirs(self, *directories: Union[str, Path]):
+        """Create directories that will not receive files from this writer."""
+        loop = asyncio.get_running_loop()
+        for directory in directories:
+            await loop.run_in_executor(self.executor, self._ensure_dir, Path(directory))
+
+    def close(self):
+        """Shut down the worker threads; the writer can be used again afterwards."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
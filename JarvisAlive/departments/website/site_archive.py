@@ -0,0 +1,107 @@
+"""
+SiteArchive - incremental ZIP and tar.gz encoding for generated websites
+
+Files are added one at a time and each call returns the archive bytes
+produced so far, so an export can be streamed (to an HTTP response or to
+disk) while later pages are still being rendered. Nothing but the entry
+being encoded is held in memory; ZIP entries use data descriptors, so the
+output never needs to be seekable.
+"""
+
+import gzip
+import io
+import tarfile
+import time
+import zipfile
+from typing import List, Union
+
+ARCHIVE_MEDIA_TYPES = {
+    "zip": "application/zip",
+    "tar.gz": "application/gzip",
+}
+
+Content = Union[str, bytes]
+
+
+class _ChunkSink:
+    """Write-only file object that collects output until it is drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class SiteArchive:
+    """Streaming archive writer; ``add`` and ``close`` return the bytes to emit next."""
+
+    def __init__(self, archive_format: str = "zip", compresslevel: int = 6):
+        if archive_format not in ARCHIVE_MEDIA_TYPES:
+            raise ValueError(f"Unsupported archive format: {archive_format}")
+        self.archive_format = archive_format
+        self.media_type = ARCHIVE_MEDIA_TYPES[archive_format]
+        self.entries = 0
+        self.bytes_out = 0
+        self._sink = _ChunkSink()
+        self._mtime = time.time()
+        self._closed = False
+
+        if archive_format == "zip":
+            self._zip = zipfile.ZipFile(self._sink, mode="w", compression=zipfile.ZIP_DEFLATED,
+                                        compresslevel=compresslevel)
+        else:
+            # Stream mode ("w|") never seeks; gzip is layered on top so the level can be set
+            self._gzip = gzip.GzipFile(fileobj=self._sink, mode="wb", compresslevel=compresslevel, mtime=int(self._mtime))
+            self._tar = tarfile.open(fileobj=self._gzip, mode="w|")
+
+    @property
+    def extension(self) -> str:
+        return self.archive_format
+
+    def add(self, path: str, content: Content) -> bytes:
+        """Append one file and return the archive bytes it produced."""
+        if self._closed:
+            raise ValueError("Archive is closed")
+        data = content.encode("utf-8") if isinstance(content, str) else content
+
+        if self.archive_format == "zip":
+            info = zipfile.ZipInfo(path, date_time=time.localtime(self._mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            self._zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(path)
+            info.size = len(data)
+            info.mtime = int(self._mtime)
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+
+        self.entries += 1
+        return self._drain()
+
+    def close(self) -> bytes:
+        """Finish the archive (central directory or gzip trailer) and return the last bytes."""
+        if self._closed:
+            return b""
+        self._closed = True
+        if self.archive_format == "zip":
+            self._zip.close()
+        else:
+            self._tar.close()
+            self._gzip.close()
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._sink.drain()
+        self.bytes_out += len(data)
+        return data
@@ -0,0 +1,228 @@
+"""
+SiteBuild - content-hashed, incremental output for generated websites
+
+Every output file is declared with a fingerprint of the inputs it is
+rendered from (style guide, page data, sitemap, ...). In incremental mode a
+build compares those fingerprints with the manifest left by the previous
+build in the same directory: unchanged files are neither rendered nor
+written, rendered files whose bytes match what is already on disk are not
+rewritten, and files that are no longer part of the site are removed.
+Rendered fragments are also memoized in memory by input fingerprint, so
+regenerating the same content for another site skips the render as well.
+
+Rendering is CPU work, so a build declares its files on the event loop and
+renders, hashes and writes them on one of the writer's threads in
+``finish``; the loop only waits.
+"""
+
+import asyncio
+import hashlib
+import json
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .artifact_writer import ArtifactWriter
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Called by the build thread between files. A thread that only gives up the
+# GIL for a syscall usually takes it straight back, leaving the event loop
+# waiting out the whole switch interval (5ms); yielding the CPU hands it over.
+_yield_to_loop = getattr(os, "sched_yield", lambda: time.sleep(0))
+
+
+def fingerprint(*inputs: Any) -> str:
+    """Stable content hash of JSON-serializable inputs."""
+    encoded = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class SiteFile(NamedTuple):
+    """A generated output file, declared before it is rendered."""
+    path: str                    # Relative to the output root
+    kind: str                    # Renderer name; fragments are memoized per (kind, inputs)
+    inputs: str                  # Fingerprint of everything ``render`` reads
+    render: Callable[[], str]    # Produces the file content
+
+
+class FragmentCache:
+    """LRU of rendered fragments keyed by (kind, input fingerprint); safe to share between threads."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, inputs: str) -> Optional[str]:
+        key = (kind, inputs)
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
+
+    def put(self, kind: str, inputs: str, content: str):
+        key = (kind, inputs)
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_render(self, kind: str, inputs: str, render: Callable[[], str]) -> Tuple[str, bool]:
+        """(content, rendered): the memoized fragment, or a fresh render that is then memoized"""
+        content = self.get(kind, inputs)
+        if content is not None:
+            return content, False
+        content = render()
+        self.put(kind, inputs, content)
+        return content, True
+
+
+class SiteBuild:
+    """One build of a set of generated files into a directory."""
+
+    def __init__(self, root: Path, writer: ArtifactWriter, incremental: bool = False,
+                 fragment_cache: Optional[FragmentCache] = None, manifest_name: str = ".build-manifest.json"):
+        """
+        Initialize the SiteBuild.
+
+        Args:
+            root: Directory the declared paths are relative to
+            writer: ArtifactWriter used for all file output
+            incremental: Skip files whose inputs are unchanged since the last build
+            fragment_cache: Memo of rendered fragments shared across builds
+            manifest_name: Manifest file name inside ``root``
+        """
+        self.root = Path(root)
+        self.writer = writer
+        self.incremental = incremental
+        self.fragment_cache = fragment_cache
+        self.manifest_path = self.root / manifest_name
+
+        self._previous: Dict[str, Dict[str, Any]] = {}
+        self._existing: set = set()
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._declared: List[Iterable[SiteFile]] = []
+        self.rendered: List[str] = []
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+
+    async def start(self):
+        """Load the previous manifest and check which of its files still exist."""
+        if self.incremental:
+            loop = asyncio.get_running_loop()
+            self._previous, self._existing = await loop.run_in_executor(
+                self.writer.executor, self._load_previous
+            )
+
+    def _load_previous(self) -> Tuple[Dict[str, Dict[str, Any]], set]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}, set()
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}, set()
+        files = manifest.get("files", {})
+        existing = {path for path in files if (self.root / path).is_file()}
+        return files, existing
+
+    def add(self, path: str, kind: str, inputs: str, render: Callable[[], str]):
+        """
+        Declare an output file; it is rendered and written by ``finish``.
+
+        Args:
+            path: Path relative to the build root
+            kind: Renderer name; fragments are memoized per (kind, inputs)
+            inputs: Fingerprint of everything ``render`` reads
+            render: Produces the file content
+        """
+        self._declared.append([SiteFile(path, kind, inputs, render)])
+
+    def add_all(self, site_files: Iterable[SiteFile]):
+        """Declare files from an iterable, which is only consumed by ``finish`` on the build thread."""
+        self._declared.append(site_files)
+
+    def _build(self):
+        """Render, hash and write every declared file; runs on a writer thread."""
+        for site_file in itertools.chain.from_iterable(self._declared):
+            self._build_file(*site_file)
+            _yield_to_loop()
+
+    def _build_file(self, path: str, kind: str, inputs: str, render: Callable[[], str]):
+        previous = self._previous.get(path)
+        if previous and previous.get("inputs") == inputs and path in self._existing:
+            self._files[path] = previous
+            self.unchanged.append(path)
+            return
+
+        if self.fragment_cache:
+            content, rendered = self.fragment_cache.get_or_render(kind, inputs, render)
+        else:
+            content, rendered = render(), True
+        if rendered:
+            self.rendered.append(path)
+
+        digest = content_hash(content)
+        self._files[path] = {"inputs": inputs, "sha256": digest}
+        if previous and previous.get("sha256") == digest and path in self._existing:
+            self.unchanged.append(path)
+            return
+
+        self.writer.write_sync(self.root / path, content)
+        self.written.append(path)
+
+    async def finish(self) -> Dict[str, Any]:
+        """Render and write the declared files, remove stale ones and record the manifest; returns the change report."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.writer.executor, self._build)
+
+        removed = sorted(path for path in self._previous if path not in self._files)
+        report = {
+            "root": str(self.root),
+            "incremental": self.incremental,
+            "rendered": sorted(self.rendered),
+            "written": sorted(self.written),
+            "unchanged": sorted(self.unchanged),
+            "removed": removed
+        }
+        if not self.incremental:
+            return report
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "built_at": datetime.now().isoformat(),
+            "files": self._files,
+            "last_build": {key: report[key] for key in ("rendered", "written", "removed")}
+        }
+        await loop.run_in_executor(self.writer.executor, self._remove, removed)
+        await self.writer.write(self.manifest_path, json.dumps(manifest, indent=2, sort_keys=True))
+        return report
+
+    def _remove(self, paths: List[str]):
+        for path in paths:
+            try:
+                os.unlink(self.root / path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove stale output {path}: {e}")
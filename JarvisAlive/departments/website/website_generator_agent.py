@@ -9,8 +9,9 @@ website blueprints ready for development or no-code implementation.
 import asyncio
 import json
 import logging
+import itertools
 import re
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Any
 from datetime import datetime
 from pathlib import Path
 
@@ -18,6 +19,10 @@ from pathlib import Path
 from ai_engines.anthropic_engine import AnthropicEngine
 from ai_engines.base_engine import AIEngineConfig
 
+from .artifact_writer import ArtifactWriter
+from .site_archive import SiteArchive
+from .site_build import FragmentCache, SiteBuild, SiteFile, fingerprint
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +50,9 @@ class WebsiteGeneratorAgent:
     Follows the contract: run(state: dict) -> dict
     """
     
+    # Part of every output fingerprint; bump when a renderer's template changes
+    RENDER_VERSION = "1"
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the WebsiteGeneratorAgent.
@@ -66,9 +74,16 @@ class WebsiteGeneratorAgent:
         # Output configuration
         self.outputs_dir = Path(self.config.get('website_outputs_dir', './website_outputs'))
         self.outputs_dir.mkdir(exist_ok=True)
+        self.artifact_writer = ArtifactWriter(max_workers=self.config.get('artifact_write_workers', 8))
+        
+        # Incremental regeneration: stable output directories, unchanged files skipped
+        self.incremental_builds = self.config.get('incremental_builds', False)
+        self.fragment_cache = FragmentCache(self.config.get('fragment_cache_size', 2048))
+        self.last_build_report: Dict[str, Dict[str, Any]] = {}
         
         # Export formats
-        self.export_formats = self.config.get('export_formats', ['json', 'html'])  # json, html, react
+        self.export_formats = self.config.get('export_formats', ['json', 'html'])  # json, html, react, archive
+        self.archive_format = self.config.get('archive_format', 'zip')  # zip, tar.gz
         self.generate_full_site = self.config.get('generate_full_site', True)
         
         self.logger.info("WebsiteGeneratorAgent initialized successfully")
@@ -142,6 +157,7 @@ class WebsiteGeneratorAgent:
                 "website_generated_at": datetime.now().isoformat(),
                 "analysis_type": "website_generation",
                 "saved_paths": saved_paths,
+                "build_report": self.last_build_report,
                 "export_formats": self.export_formats
             })
             
@@ -738,12 +754,8 @@ Make the content specific to the business type and target audience. Avoid generi
     async def _save_website_outputs(self, website_result: WebsiteResult, requirements: Dict[str, Any]) -> Dict[str, str]:
         """Save website output in multiple formats (JSON, HTML, React)."""
         saved_paths = {}
-        
-        # Create base filename
-        brand_name = requirements.get('brand_name', 'website')
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        clean_name = re.sub(r'[^a-zA-Z0-9]+', '_', brand_name.lower()).strip('_')[:30]
-        base_name = f"website_{clean_name}_{timestamp}"
+        self.last_build_report = {}
+        base_name = self._output_base_name(requirements)
         
         try:
             # Save JSON (for developers/integration)
@@ -764,6 +776,12 @@ Make the content specific to the business type and target audience. Avoid generi
                 if react_path:
                     saved_paths['react'] = react_path
             
+            # Save a single archive of the other formats (for shipping)
+            if 'archive' in self.export_formats:
+                archive_path = await self._save_archive_output(website_result, requirements, base_name)
+                if archive_path:
+                    saved_paths['archive'] = archive_path
+            
             self.logger.info(f"Website saved in {len(saved_paths)} formats: {list(saved_paths.keys())}")
             return saved_paths
             
@@ -771,88 +789,114 @@ Make the content specific to the business type and target audience. Avoid generi
             self.logger.error(f"Failed to save website outputs: {e}")
             return {}
     
+    def _output_base_name(self, requirements: Dict[str, Any]) -> str:
+        """Base file name; incremental builds regenerate into the same place every run."""
+        brand_name = requirements.get('brand_name', 'website')
+        clean_name = re.sub(r'[^a-zA-Z0-9]+', '_', brand_name.lower()).strip('_')[:30]
+        if self.incremental_builds:
+            return f"website_{clean_name}"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"website_{clean_name}_{timestamp}"
+    
+    def _fingerprint(self, *inputs: Any) -> str:
+        """Fingerprint of a renderer's inputs, tied to the renderer version."""
+        return fingerprint(self.RENDER_VERSION, *inputs)
+    
+    async def _start_build(self, root: Path, **kwargs) -> SiteBuild:
+        build = SiteBuild(root, self.artifact_writer, incremental=self.incremental_builds,
+                          fragment_cache=self.fragment_cache, **kwargs)
+        await build.start()
+        return build
+    
     async def _save_json_output(self, website_result: WebsiteResult, requirements: Dict[str, Any], base_name: str) -> str:
         """Save JSON blueprint for developers."""
         try:
-            json_path = self.outputs_dir / f"{base_name}.json"
+            build = await self._start_build(self.outputs_dir, manifest_name=f".{base_name}.manifest.json")
+            build.add(*self._blueprint_file(website_result, requirements, f"{base_name}.json"))
+            self.last_build_report['json'] = await build.finish()
+            
+            return str(self.outputs_dir / f"{base_name}.json")
             
+        except Exception as e:
+            self.logger.error(f"Failed to save JSON output: {e}")
+            return ""
+    
+    def _blueprint_file(self, website_result: WebsiteResult, requirements: Dict[str, Any], path: str) -> SiteFile:
+        """The JSON blueprint for developers/integration."""
+        website_results = {
+            'sitemap': website_result.sitemap,
+            'website_structure': website_result.website_structure,
+            'homepage': website_result.homepage,
+            'style_guide': website_result.style_guide,
+            'seo_recommendations': website_result.seo_recommendations
+        }
+        # An input like any other, so every build writes its own timestamp
+        generated_at = datetime.now().isoformat()
+        
+        def render() -> str:
             website_data = {
                 'generation_parameters': requirements,
-                'website_results': {
-                    'sitemap': website_result.sitemap,
-                    'website_structure': website_result.website_structure,
-                    'homepage': website_result.homepage,
-                    'style_guide': website_result.style_guide,
-                    'seo_recommendations': website_result.seo_recommendations
-                },
+                'website_results': website_results,
                 'metadata': {
-                    'generated_at': datetime.now().isoformat(),
+                    'generated_at': generated_at,
                     'agent_version': 'WebsiteGeneratorAgent_v1.0',
                     'ai_engine_used': self.ai_engine is not None,
                     'total_pages': len(website_result.sitemap),
                     'generation_mode': 'ai' if self.ai_engine else 'fallback'
                 }
             }
-            
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(website_data, f, indent=2, ensure_ascii=False, default=str)
-            
-            return str(json_path)
-            
-        except Exception as e:
-            self.logger.error(f"Failed to save JSON output: {e}")
-            return ""
+            return json.dumps(website_data, indent=2, ensure_ascii=False, default=str)
+        
+        return SiteFile(path, "blueprint", self._fingerprint(requirements, website_results, generated_at), render)
     
     async def _save_html_output(self, website_result: WebsiteResult, requirements: Dict[str, Any], base_name: str) -> str:
         """Generate and save actual HTML website."""
         try:
-            # Create website directory
+            # Website directory is created by the writer with the first file
             site_dir = self.outputs_dir / f"{base_name}_site"
-            site_dir.mkdir(exist_ok=True)
-            
-            # Generate CSS from style guide
-            css_content = self._generate_css(website_result.style_guide)
-            css_path = site_dir / "styles.css"
-            with open(css_path, 'w', encoding='utf-8') as f:
-                f.write(css_content)
+            build = await self._start_build(site_dir)
             
-            # Generate HTML pages
-            html_files = []
-            for page_data in website_result.website_structure:
-                page_name = page_data.get('page', 'Unknown')
-                html_content = self._generate_html_page(page_data, website_result)
-                
-                # Save HTML file
-                html_filename = f"{page_name.lower().replace(' ', '_')}.html"
-                html_path = site_dir / html_filename
-                with open(html_path, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                html_files.append(str(html_path))
-            
-            # Generate index.html (homepage)
-            if website_result.homepage:
-                index_content = self._generate_index_html(website_result)
-                index_path = site_dir / "index.html"
-                with open(index_path, 'w', encoding='utf-8') as f:
-                    f.write(index_content)
-                html_files.append(str(index_path))
-            
-            self.logger.info(f"Generated {len(html_files)} HTML files in {site_dir}")
+            # Pages are rendered and written on a writer thread, keeping the loop free for other agents
+            build.add_all(self._site_files(website_result))
+            report = self.last_build_report['html'] = await build.finish()
+            self.logger.info(f"Wrote {len(report['written'])} of {len(report['written']) + len(report['unchanged'])} "
+                             f"HTML site files in {site_dir}")
             return str(site_dir)
             
         except Exception as e:
             self.logger.error(f"Failed to save HTML output: {e}")
             return ""
     
+    def _site_files(self, website_result: WebsiteResult) -> Iterator[SiteFile]:
+        """Files of the static HTML site, relative to the site directory."""
+        # Pages read the brand name and sitemap besides their own data
+        style_guide = website_result.style_guide
+        shared = (style_guide.get('brand_name'), website_result.sitemap)
+        
+        # Generate CSS from style guide
+        yield SiteFile("styles.css", "css", self._fingerprint(style_guide),
+                       lambda: self._generate_css(style_guide))
+        
+        # Generate HTML pages
+        for page_data in website_result.website_structure:
+            page_name = page_data.get('page', 'Unknown')
+            html_filename = f"{page_name.lower().replace(' ', '_')}.html"
+            yield SiteFile(html_filename, "page", self._fingerprint(page_data, *shared),
+                           lambda page_data=page_data: self._generate_html_page(page_data, website_result))
+        
+        # Generate index.html (homepage)
+        if website_result.homepage:
+            yield SiteFile("index.html", "index", self._fingerprint(website_result.homepage, *shared),
+                           lambda: self._generate_index_html(website_result))
+    
     async def _save_react_output(self, website_result: WebsiteResult, requirements: Dict[str, Any], base_name: str) -> str:
         """Generate and save React/Vite project."""
         try:
             # Create React project directory
             react_dir = self.outputs_dir / f"{base_name}_react"
-            react_dir.mkdir(exist_ok=True)
             
             # Create basic Vite project structure
-            await self._create_vite_structure(react_dir, website_result, requirements)
+            self.last_build_report['react'] = await self._create_vite_structure(react_dir, website_result, requirements)
             
             self.logger.info(f"Generated React/Vite project in {react_dir}")
             return str(react_dir)
@@ -861,6 +905,97 @@ Make the content specific to the business type and target audience. Avoid generi
             self.logger.error(f"Failed to save React output: {e}")
             return ""
     
+    async def _save_archive_output(self, website_result: WebsiteResult, requirements: Dict[str, Any], base_name: str) -> str:
+        """Stream an archive of the site to disk without holding it in memory."""
+        try:
+            archive_path = self.outputs_dir / f"{base_name}.{self.archive_format}"
+            await self.artifact_writer.write_stream(
+                archive_path, self.stream_website_archive(website_result, requirements, base_name=base_name)
+            )
+            return str(archive_path)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save archive output: {e}")
+            return ""
+    
+    async def generate_website_archive(self, state: Dict[str, Any], archive_format: Optional[str] = None,
+                                       formats: Optional[List[str]] = None) -> Optional[Tuple[str, AsyncIterator[bytes]]]:
+        """
+        Generate a website from state and return it as an archive stream.
+        
+        The site is generated before this returns, so generation errors are
+        raised here rather than from the stream.
+        
+        Args:
+            state: Input state, as for ``run``
+            archive_format: "zip" or "tar.gz"; defaults to the configured archive_format
+            formats: Any of "json", "html" and "react"; defaults to the configured export formats
+            
+        Returns:
+            (archive file name, archive bytes) or None if state lacks a brand name or business idea
+        """
+        requirements = self._extract_website_requirements(state)
+        if not requirements:
+            return None
+        
+        website_result = await self._generate_website(requirements)
+        archive_format = archive_format or self.archive_format
+        base_name = self._output_base_name(requirements)
+        stream = self.stream_website_archive(website_result, requirements, archive_format,
+                                             base_name=base_name, formats=formats)
+        return f"{base_name}.{archive_format}", stream
+    
+    async def stream_website_archive(self, website_result: WebsiteResult, requirements: Dict[str, Any],
+                                     archive_format: Optional[str] = None, base_name: Optional[str] = None,
+                                     formats: Optional[List[str]] = None) -> AsyncIterator[bytes]:
+        """
+        Render the site into a ZIP or tar.gz archive, yielding bytes as each file is added.
+        
+        Entries mirror the on-disk layout of ``_save_website_outputs``. Only the
+        file being encoded is held in memory, and the first bytes are available
+        as soon as the first file is rendered. Each file is rendered and
+        compressed on the artifact writer's executor, off the event loop.
+        
+        Args:
+            website_result: Generated website content
+            requirements: Website requirements (recorded in the JSON blueprint)
+            archive_format: "zip" or "tar.gz"; defaults to the configured archive_format
+            base_name: Top-level name for the entries; derived from the brand name if omitted
+            formats: Any of "json", "html" and "react"; defaults to the configured export formats
+        """
+        archive = SiteArchive(archive_format or self.archive_format)
+        base_name = base_name or self._output_base_name(requirements)
+        formats = formats or [f for f in self.export_formats if f in ('json', 'html', 'react')]
+        
+        site_files = []
+        if 'json' in formats:
+            site_files.append([self._blueprint_file(website_result, requirements, f"{base_name}.json")])
+        if 'html' in formats:
+            site_files.append(SiteFile(f"{base_name}_site/{path}", *rest) for path, *rest in self._site_files(website_result))
+        if 'react' in formats:
+            site_files.append(SiteFile(f"{base_name}_react/{path}", *rest) for path, *rest in self._react_files(website_result))
+        
+        files = itertools.chain.from_iterable(site_files)
+        
+        def add_next_file() -> Optional[bytes]:
+            """Render and compress the next file; None once all files are in"""
+            for path, kind, inputs, render in files:
+                content, _ = self.fragment_cache.get_or_render(kind, inputs, render)
+                return archive.add(path, content)
+            return None
+        
+        loop = asyncio.get_running_loop()
+        executor = self.artifact_writer.executor
+        while True:
+            chunk = await loop.run_in_executor(executor, add_next_file)
+            if chunk is None:
+                break
+            if chunk:
+                yield chunk
+        
+        yield await loop.run_in_executor(executor, archive.close)
+        self.logger.info(f"Streamed {archive.entries} files as {archive.archive_format} ({archive.bytes_out} bytes)")
+    
     def _generate_css(self, style_guide: Dict[str, Any]) -> str:
         """Generate professional CSS based on the sample template."""
         colors = style_guide.get('colors', ['#271c17', '#b25a2f', '#faf7f2'])
@@ -1429,15 +1564,19 @@ footer {{
         
         return features_html
     
-    async def _create_vite_structure(self, react_dir: Path, website_result: WebsiteResult, requirements: Dict[str, Any]):
-        """Create a complete Vite/React project structure."""
-        brand_name = website_result.style_guide.get('brand_name', 'Website')
+    async def _create_vite_structure(self, react_dir: Path, website_result: WebsiteResult, requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a complete Vite/React project structure; returns the build report."""
+        build = await self._start_build(react_dir)
+        build.add_all(self._react_files(website_result))
         
-        # Create directories
-        src_dir = react_dir / "src"
-        components_dir = src_dir / "components"
-        src_dir.mkdir(exist_ok=True)
-        components_dir.mkdir(exist_ok=True)
+        # Directories are created by the writer as files land in them
+        await self.artifact_writer.make_dirs(react_dir / "src" / "components")
+        return await build.finish()
+    
+    def _react_files(self, website_result: WebsiteResult) -> Iterator[SiteFile]:
+        """Files of the Vite/React project, relative to the project directory."""
+        brand_name = website_result.style_guide.get('brand_name', 'Website')
+        homepage = website_result.homepage
         
         # Generate package.json
         package_json = {
@@ -1462,8 +1601,8 @@ footer {{
             }
         }
         
-        with open(react_dir / "package.json", 'w') as f:
-            json.dump(package_json, f, indent=2)
+        yield SiteFile("package.json", "react_package", self._fingerprint(package_json),
+                  lambda: json.dumps(package_json, indent=2))
         
         # Generate vite.config.js
         vite_config = """import { defineConfig } from 'vite'
@@ -1473,25 +1612,23 @@ export default defineConfig({
   plugins: [react()],
 })
 """
-        with open(react_dir / "vite.config.js", 'w') as f:
-            f.write(vite_config)
+        yield SiteFile("vite.config.js", "react_vite_config", self._fingerprint(vite_config), lambda: vite_config)
         
         # Generate index.html
-        index_html = f"""<!doctype html>
+        render_index = lambda: f"""<!doctype html>
 <html lang="en">
   <head>
     <meta charset="UTF-8" />
     <link rel="icon" type="image/svg+xml" href="/vite.svg" />
     <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-    <title>{website_result.homepage.get('seo_title', f'{brand_name} - Home')}</title>
+    <title>{homepage.get('seo_title', f'{brand_name} - Home')}</title>
   </head>
   <body>
     <div id="root"></div>
     <script type="module" src="/src/main.jsx"></script>
   </body>
 </html>"""
-        with open(react_dir / "index.html", 'w') as f:
-            f.write(index_html)
+        yield SiteFile("index.html", "react_index", self._fingerprint(homepage.get('seo_title'), brand_name), render_index)
         
         # Generate main.jsx
         main_jsx = """import React from 'react'
@@ -1505,21 +1642,19 @@ ReactDOM.createRoot(document.getElementById('root')).render(
   </React.StrictMode>,
 )
 """
-        with open(src_dir / "main.jsx", 'w') as f:
-            f.write(main_jsx)
+        yield SiteFile("src/main.jsx", "react_main", self._fingerprint(main_jsx), lambda: main_jsx)
         
         # Generate App.jsx
-        app_jsx = self._generate_react_app(website_result)
-        with open(src_dir / "App.jsx", 'w') as f:
-            f.write(app_jsx)
+        yield SiteFile("src/App.jsx", "react_app", self._fingerprint(homepage, brand_name),
+                  lambda: self._generate_react_app(website_result))
         
         # Generate CSS
-        css_content = self._generate_react_css(website_result.style_guide)
-        with open(src_dir / "index.css", 'w') as f:
-            f.write(css_content)
+        yield SiteFile("src/index.css", "react_css", self._fingerprint(website_result.style_guide),
+                  lambda: self._generate_react_css(website_result.style_guide))
         
         # Generate README
-        readme = f"""# {brand_name} Website
+        generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        render_readme = lambda: f"""# {brand_name} Website
 
 Generated by WebsiteGeneratorAgent
 
@@ -1543,10 +1678,9 @@ npm run build
 - Modern React/Vite setup
 - Brand colors and typography integrated
 
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated on: {generated_on}
 """
-        with open(react_dir / "README.md", 'w') as f:
-            f.write(readme)
+        yield SiteFile("README.md", "react_readme", self._fingerprint(brand_name, generated_on), render_readme)
     
     def _generate_react_app(self, website_result: WebsiteResult) -> str:
         """Generate React App.jsx component."""
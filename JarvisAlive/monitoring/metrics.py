@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""In-process Prometheus metrics for HeyJarvis hot paths.
+
+A small, dependency-free registry of counters, gauges and histograms
+rendered in the Prometheus text exposition format. Updating a metric is a
+dict lookup for the label values plus a few additions under a lock, so it
+can sit on per-call paths (LLM requests, bus messages, agent tasks).
+Gauges for values that already live elsewhere, such as queue sizes, read
+them through a callback at scrape time and cost nothing in between.
+
+``render()`` produces the /metrics payload. ``start_metrics_server`` serves
+it from a background thread, for processes without the FastAPI app.
+"""
+
+import abc
+import bisect
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans sub-millisecond cache hits up to multi-minute agent tasks
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(abc.ABC):
+    """A metric family; label values select a child that holds the numbers."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values, **labels):
+        """Child for the given label values, created on first use."""
+        if not labels:
+            # Hot path: callers on request paths pass string values that already form the key
+            child = self._children.get(values)
+            if child is not None:
+                return child
+        key = tuple(str(labels[name]) for name in self.labelnames) if labels else tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def remove(self, *values):
+        with self._lock:
+            self._children.pop(tuple(str(v) for v in values), None)
+
+    def clear(self):
+        with self._lock:
+            self._children.clear()
+            if not self.labelnames:
+                self._default = self.labels()
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """A fresh child holding one label combination's numbers."""
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in list(self._children.items()):
+            lines.extend(self._sample_lines(key, child))
+        return lines
+
+    @abc.abstractmethod
+    def _sample_lines(self, key, child) -> Iterable[str]:
+        """Exposition lines for one child."""
+
+
+class _Value:
+    __slots__ = ("value", "function", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self.lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from ``function`` at scrape time instead."""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count; exported with a ``_total`` suffix."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def _sample_lines(self, key, child):
+        yield f"{self.name}_total{_labels(self.labelnames, key)} {_format_value(child.get())}"
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default.set_function(function)
+
+    def _sample_lines(self, key, child):
+        yield f"{self.name}{_labels(self.labelnames, key)} {_format_value(child.get())}"
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum", "lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.upper_bounds, value)
+        with self.lock:
+            self.counts[i] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative ``le`` buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.upper_bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def _sample_lines(self, key, child):
+        with child.lock:
+            counts, total = list(child.counts), child.sum
+        cumulative = 0
+        for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+        yield f"{self.name}_sum{_labels(self.labelnames, key)} {_format_value(total)}"
+        yield f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}"
+
+
+class MetricsRegistry:
+    """Named metric families, rendered together for a scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop every recorded value, keeping the metric definitions."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# Hot-path metrics, registered once so instrumented modules share them
+
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "heyjarvis_llm_request_duration_seconds", "Latency of BaseAIEngine.generate calls",
+    ["engine", "model", "outcome"]
+)
+LLM_TOKENS = REGISTRY.histogram(
+    "heyjarvis_llm_tokens", "Tokens per LLM response that reached the provider",
+    ["engine", "model", "direction"], buckets=TOKEN_BUCKETS
+)
+AGENT_QUEUE_DEPTH = REGISTRY.gauge(
+    "heyjarvis_agent_queue_depth", "Tasks waiting in a persistent agent's queue", ["agent"]
+)
+AGENT_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "heyjarvis_agent_queue_wait_seconds", "Time tasks spend queued before an agent picks them up", ["agent"]
+)
+AGENT_TASK_SECONDS = REGISTRY.histogram(
+    "heyjarvis_agent_task_duration_seconds", "Persistent agent task processing time", ["agent", "outcome"]
+)
+BUS_PUBLISHED = REGISTRY.counter(
+    "heyjarvis_message_bus_published", "Messages published on the message bus", ["type"]
+)
+BUS_DELIVERED = REGISTRY.counter(
+    "heyjarvis_message_bus_delivered", "Messages delivered to message bus subscribers", ["type"]
+)
+BATCH_SECONDS = REGISTRY.histogram(
+    "heyjarvis_orchestrator_batch_duration_seconds", "ConcurrentOrchestrator batch execution time", ["status"]
+)
+BATCH_TASKS = REGISTRY.histogram(
+    "heyjarvis_orchestrator_batch_tasks", "Tasks per ConcurrentOrchestrator batch", buckets=SIZE_BUCKETS
+)
+ORCHESTRATOR_TASK_SECONDS = REGISTRY.histogram(
+    "heyjarvis_orchestrator_task_duration_seconds", "Task time from dispatch to completion, including approval",
+    ["task_type", "outcome"]
+)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the logs
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: int = 8080, host: str = "0.0.0.0",
+                         registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    Serve ``/metrics`` from a daemon thread; one server per process.
+
+    Args:
+        port: Port to listen on; 0 picks a free one
+        host: Interface to bind
+        registry: Registry to expose
+    """
+    global _server
+    if _server is None:
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        _server = server
+        logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return _server
+
+
+def start_metrics_server_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the server when METRICS_ENABLED is true, on METRICS_PORT (default 8080)."""
+    if os.getenv("METRICS_ENABLED", "false").lower() != "true":
+        return None
+    try:
+        return start_metrics_server(int(os.getenv("METRICS_PORT", "8080")))
+    except OSError as e:
+        logger.warning(f"Could not start metrics server: {e}")
+        return None
+
+
+def stop_metrics_server():
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""Embedded time-series store with fixed-width rollup tiers.
+
+Every series keeps one ring buffer per resolution (1s, 1m and 1h by
+default). A sample updates the current bucket of each tier in place, so
+the coarser tiers are rollups of the finer ones, and each bucket holds
+min, max, sum, count and last. A tier holds at most ``capacity`` buckets:
+memory per series is bounded no matter how long the process runs, and a
+sparse series only allocates the buckets it has used.
+
+Range queries and window aggregates binary-search the ring and then touch
+only the buckets in the window. The whole store can be snapshotted to a
+local file and restored on startup. The store is meant for one event loop
+and is not thread-safe.
+"""
+
+import json
+import logging
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# (bucket seconds, buckets kept): 15 minutes at 1s, 1 day at 1m, 30 days at 1h
+DEFAULT_TIERS: Tuple[Tuple[int, int], ...] = ((1, 900), (60, 1440), (3600, 720))
+
+SNAPSHOT_MAGIC = b"HJTS1\n"
+
+# Bytes per bucket: bucket id and count (int64), min, max, sum and last (float64)
+BUCKET_BYTES = 6 * 8
+
+
+class Bucket(namedtuple("Bucket", ["timestamp", "min", "max", "sum", "count", "last"])):
+    """One bucket of a series; ``timestamp`` is the Unix time the bucket starts."""
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class Summary(namedtuple("Summary", ["min", "max", "sum", "count", "last"])):
+    """Aggregate of the buckets in a window."""
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class _Ring:
+    """Buckets of one series at one resolution, oldest first, at most ``capacity`` of them."""
+
+    __slots__ = ("capacity", "start", "ids", "mins", "maxs", "sums", "counts", "lasts")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.start = 0  # Physical index of the oldest bucket once the ring is full
+        self.ids = array("q")
+        self.mins = array("d")
+        self.maxs = array("d")
+        self.sums = array("d")
+        self.counts = array("q")
+        self.lasts = array("d")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _physical(self, i: int) -> int:
+        return (self.start + i) % self.capacity if len(self.ids) == self.capacity else i
+
+    def bucket_id(self, i: int) -> int:
+        return self.ids[self._physical(i)]
+
+    def bisect_left(self, bucket_id: int) -> int:
+        """Logical index of the first bucket at or after ``bucket_id``."""
+        lo, hi = 0, len(self.ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.bucket_id(mid) < bucket_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def add(self, bucket_id: int, value: float) -> bool:
+        """Fold ``value`` into its bucket; False if the bucket has already left the ring."""
+        size = len(self.ids)
+        if size:
+            newest = self._physical(size - 1)
+            newest_id = self.ids[newest]
+            if bucket_id == newest_id:
+                self._merge(newest, value)
+                return True
+            if bucket_id < newest_id:
+                i = self.bisect_left(bucket_id)
+                if i < size and self.bucket_id(i) == bucket_id:
+                    self._merge(self._physical(i), value)
+                    return True
+                return False  # Buckets are only ever appended in order
+
+        if size < self.capacity:
+            for column, initial in self._columns(bucket_id, value):
+                column.append(initial)
+        else:
+            p = self.start
+            for column, initial in self._columns(bucket_id, value):
+                column[p] = initial
+            self.start = (p + 1) % self.capacity
+        return True
+
+    def _columns(self, bucket_id: int, value: float):
+        return ((self.ids, bucket_id), (self.mins, value), (self.maxs, value),
+                (self.sums, value), (self.counts, 1), (self.lasts, value))
+
+    def _merge(self, p: int, value: float):
+        if value < self.mins[p]:
+            self.mins[p] = value
+        if value > self.maxs[p]:
+            self.maxs[p] = value
+        self.sums[p] += value
+        self.counts[p] += 1
+        self.lasts[p] = value
+
+    def iter_range(self, first_id: int, end_id: int) -> Iterator[int]:
+        """Physical indexes of buckets with ``first_id <= id < end_id``."""
+        for i in range(self.bisect_left(first_id), len(self.ids)):
+            p = self._physical(i)
+            if self.ids[p] >= end_id:
+                return
+            yield p
+
+    def ordered(self) -> Tuple[array, ...]:
+        """Columns unrolled oldest first, for snapshots."""
+        columns = (self.ids, self.mins, self.maxs, self.sums, self.counts, self.lasts)
+        if len(self.ids) < self.capacity or self.start == 0:
+            return columns
+        return tuple(column[self.start:] + column[:self.start] for column in columns)
+
+
+class TimeSeriesStore:
+    """Named series of numeric samples, each with fixed-width 1s/1m/1h rollup tiers."""
+
+    def __init__(self, tiers: Sequence[Tuple[int, int]] = DEFAULT_TIERS, max_series: int = 10000):
+        """
+        Initialize the TimeSeriesStore.
+
+        Args:
+            tiers: (bucket seconds, buckets kept) per resolution, finest first
+            max_series: Samples for new series beyond this many are dropped
+        """
+        self.tiers = tuple((int(resolution), int(capacity)) for resolution, capacity in sorted(tiers))
+        self.max_series = max_series
+        self._series: Dict[str, List[_Ring]] = {}
+        self.stats = {"samples": 0, "late_samples": 0, "dropped_series": 0}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._series
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def series(self) -> List[str]:
+        return list(self._series)
+
+    def record(self, name: str, value: Union[int, float], timestamp: Optional[float] = None) -> bool:
+        """
+        Add a sample to every tier of a series, creating the series if needed.
+
+        Args:
+            name: Series name, e.g. ``agent.sales-1.processing_time_ms``
+            value: Sample value
+            timestamp: Unix time of the sample; defaults to now
+
+        Returns:
+            False if the sample was dropped (too many series, or older than every tier keeps)
+        """
+        rings = self._series.get(name)
+        if rings is None:
+            if len(self._series) >= self.max_series:
+                self.stats["dropped_series"] += 1
+                return False
+            rings = self._series[name] = [_Ring(capacity) for _, capacity in self.tiers]
+
+        ts = time.time() if timestamp is None else timestamp
+        value = float(value)
+        added = False
+        for (resolution, _), ring in zip(self.tiers, rings):
+            added = ring.add(int(ts // resolution), value) or added
+        self.stats["samples" if added else "late_samples"] += 1
+        return added
+
+    def record_many(self, samples: Dict[str, Union[int, float]], timestamp: Optional[float] = None):
+        """Record numeric values from a metrics dict at one timestamp; other values are skipped."""
+        ts = time.time() if timestamp is None else timestamp
+        for name, value in samples.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+                self.record(name, value, ts)
+
+    def resolution_for(self, start: float, end: Optional[float] = None) -> int:
+        """Finest resolution whose tier still holds ``start``, or the coarsest one."""
+        end = time.time() if end is None else end
+        for resolution, capacity in self.tiers:
+            if end - start <= resolution * capacity:
+                return resolution
+        return self.tiers[-1][0]
+
+    def query(self, name: str, start: float, end: Optional[float] = None,
+              resolution: Optional[int] = None) -> List[Bucket]:
+        """
+        Buckets of a series between ``start`` and ``end`` (Unix times), oldest first.
+
+        Args:
+            resolution: Bucket seconds of the tier to read; defaults to the finest covering the range
+        """
+        end = time.time() if end is None else end
+        rings = self._series.get(name)
+        if rings is None:
+            return []
+        resolution = resolution or self.resolution_for(start, end)
+        ring = rings[self._tier_index(resolution)]
+        return [
+            Bucket(ring.ids[p] * resolution, ring.mins[p], ring.maxs[p], ring.sums[p], ring.counts[p], ring.lasts[p])
+            for p in ring.iter_range(int(start // resolution), int(end // resolution) + 1)
+        ]
+
+    def aggregate(self, name: str, window: float, end: Optional[float] = None,
+                  resolution: Optional[int] = None) -> Optional[Summary]:
+        """Summary of the last ``window`` seconds before ``end``, in O(buckets in the window); None if empty."""
+        end = time.time() if end is None else end
+        start = end - window
+        rings = self._series.get(name)
+        if rings is None:
+            return None
+        resolution = resolution or self.resolution_for(start, end)
+        ring = rings[self._tier_index(resolution)]
+
+        lo, hi, total, count, last = math.inf, -math.inf, 0.0, 0, None
+        # Buckets that start inside the window
+        for p in ring.iter_range(math.ceil(start / resolution), math.ceil(end / resolution)):
+            lo = min(lo, ring.mins[p])
+            hi = max(hi, ring.maxs[p])
+            total += ring.sums[p]
+            count += ring.counts[p]
+            last = ring.lasts[p]
+        if not count:
+            return None
+        return Summary(lo, hi, total, count, last)
+
+    def trend(self, name: str, window: float, end: Optional[float] = None, threshold_pct: float = 5.0) -> str:
+        """
+        Compare the mean of the last ``window`` seconds with the window before it.
+
+        Returns:
+            ``increasing``, ``decreasing``, ``stable`` or ``insufficient_data``
+        """
+        end = time.time() if end is None else end
+        resolution = self.resolution_for(end - 2 * window, end)
+        recent = self.aggregate(name, window, end, resolution)
+        older = self.aggregate(name, window, end - window, resolution)
+        if recent is None or older is None:
+            return "insufficient_data"
+
+        change_pct = (recent.mean - older.mean) / abs(older.mean) * 100 if older.mean != 0 else 0
+        if abs(change_pct) < threshold_pct:
+            return "stable"
+        return "increasing" if change_pct > 0 else "decreasing"
+
+    def latest(self, name: str) -> Optional[float]:
+        rings = self._series.get(name)
+        if not rings or not len(rings[0]):
+            return None
+        ring = rings[0]
+        return ring.lasts[ring._physical(len(ring) - 1)]
+
+    def drop(self, name: str):
+        self._series.pop(name, None)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by bucket data (excluding per-object overhead)."""
+        return sum(len(ring) for rings in self._series.values() for ring in rings) * BUCKET_BYTES
+
+    def max_memory_bytes(self) -> int:
+        """Upper bound on bucket data once every tier of every allowed series is full."""
+        return self.max_series * sum(capacity for _, capacity in self.tiers) * BUCKET_BYTES
+
+    def _tier_index(self, resolution: int) -> int:
+        for i, (tier_resolution, _) in enumerate(self.tiers):
+            if tier_resolution == resolution:
+                return i
+        raise ValueError(f"No tier with {resolution}s buckets; tiers are {[r for r, _ in self.tiers]}")
+
+    def snapshot(self, path: Union[str, Path]):
+        """
+        Write every series to ``path`` atomically.
+
+        The file is a JSON header (tiers, series names and bucket counts)
+        followed by the raw bucket columns of each tier.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "tiers": self.tiers,
+            "byteorder": sys.byteorder,
+            "series": [[name, [len(ring) for ring in rings]] for name, rings in self._series.items()]
+        }
+        encoded = json.dumps(header).encode("utf-8")
+
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(SNAPSHOT_MAGIC)
+                f.write(struct.pack("<I", len(encoded)))
+                f.write(encoded)
+                for rings in self._series.values():
+                    for ring in rings:
+                        for column in ring.ordered():
+                            column.tofile(f)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def restore(cls, path: Union[str, Path], max_series: int = 10000) -> "TimeSeriesStore":
+        """Load a store written by ``snapshot``."""
+        with open(path, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a time-series snapshot")
+            (header_length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_length).decode("utf-8"))
+
+            store = cls(tiers=[tuple(tier) for tier in header["tiers"]],
+                        max_series=max(max_series, len(header["series"])))
+            swap = header["byteorder"] != sys.byteorder
+            for name, sizes in header["series"]:
+                rings = []
+                for (_, capacity), size in zip(store.tiers, sizes):
+                    ring = _Ring(capacity)
+                    for column in (ring.ids, ring.mins, ring.maxs, ring.sums, ring.counts, ring.lasts):
+                        column.fromfile(f, size)
+                        if swap:
+                            column.byteswap()
+                    rings.append(ring)
+                store._series[name] = rings
+        return store
+
+
+_default_store: Optional[TimeSeriesStore] = None
+
+
+def get_default_store() -> TimeSeriesStore:
+    """Process-wide store used by components that are not given one."""
+    global _default_store
+    if _default_store is None:
+        _default_store = TimeSeriesStore()
+    return _default_store
+
+
+def set_default_store(store: TimeSeriesStore):
+    """Replace the process-wide store, e.g. with one restored from a snapshot."""
+    global _default_store
+    _default_store = store
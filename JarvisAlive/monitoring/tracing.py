@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Trace spans for a task's path from submission to completion.
+
+Spans go through the OpenTelemetry API once an SDK tracer provider is
+installed. Until then, or without the package at all, every helper here
+is a no-op, so instrumentation costs close to nothing until an exporter is
+set up.
+
+A task crosses asyncio tasks on its way from the orchestrator to an
+agent's queue, so its context travels on the request as a plain dict:
+``inject_context()`` where the task is submitted, ``span(parent=...)``
+where it is processed.
+"""
+
+import logging
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional OpenTelemetry support
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import Status, StatusCode
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+TRACER_NAME = "heyjarvis"
+
+
+class _NoopSpan:
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, exception: BaseException):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_NOOP_CONTEXT = nullcontext(_NOOP_SPAN)
+
+
+def tracing_enabled() -> bool:
+    """
+    Whether spans go anywhere.
+
+    Until an SDK tracer provider is installed the API only hands out
+    non-recording spans, which still cost a context attach and detach each;
+    those are skipped entirely.
+    """
+    if not OTEL_AVAILABLE:
+        return False
+    provider = trace.get_tracer_provider()
+    return not isinstance(provider, (trace.ProxyTracerProvider, trace.NoOpTracerProvider))
+
+
+def span(name: str, parent: Optional[Dict[str, str]] = None, **attributes) -> ContextManager[Any]:
+    """
+    Context manager running the block inside a span named ``name``.
+
+    Args:
+        parent: Carrier from ``inject_context`` to continue a trace started elsewhere
+        attributes: Span attributes; None values are skipped
+    """
+    if not tracing_enabled():
+        return _NOOP_CONTEXT
+    return _otel_span(name, parent, attributes)
+
+
+@contextmanager
+def _otel_span(name: str, parent: Optional[Dict[str, str]], attributes: Dict[str, Any]) -> Iterator[Any]:
+    token = otel_context.attach(propagate.extract(parent)) if parent else None
+    try:
+        tracer = trace.get_tracer(TRACER_NAME)
+        with tracer.start_as_current_span(name, record_exception=False, set_status_on_exception=False) as current:
+            if current.is_recording():
+                for key, value in attributes.items():
+                    if value is not None:
+                        current.set_attribute(key, value)
+            try:
+                yield current
+            except BaseException as e:
+                current.record_exception(e)
+                current.set_status(Status(StatusCode.ERROR, str(e)))
+                raise
+    finally:
+        if token is not None:
+            otel_context.detach(token)
+
+
+def inject_context() -> Optional[Dict[str, str]]:
+    """The current trace context as a carrier dict, or None when there is nothing to propagate."""
+    if not tracing_enabled():
+        return None
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier or None
@@ -1,8 +1,12 @@
 """Business context layer for HeyJarvis to understand company operations."""
 
+import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Optional, Union
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass
@@ -83,20 +87,159 @@ class ResourceConstraints:
     time_constraints: Optional[Dict[str, Any]] = None
 
 
+CONTEXT_TTL = 86400  # 24 hours
+CONTEXT_FIELDS = ("profile", "metrics", "goals", "constraints", "metadata")
+INVALIDATION_CHANNEL = "business_context:invalidate"
+
+
+def _decode(value: Union[str, bytes]) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class BusinessContextCache:
+    """
+    In-process read-through cache of stored business context fields.
+
+    Entries hold the raw JSON of each hash field, so every BusinessContext
+    built from the cache gets its own objects. Writers publish the session
+    id on INVALIDATION_CHANNEL in the same round trip as the write; every
+    other process listening on the channel drops its entry. Pub/sub
+    delivery is at most once, so entries also expire after ``ttl`` seconds
+    and the whole cache is cleared whenever the listener (re)subscribes.
+    """
+
+    def __init__(self, redis_client, ttl: float = 60.0, max_entries: int = 1024,
+                 channel: str = INVALIDATION_CHANNEL):
+        """
+        Initialize the BusinessContextCache.
+
+        Args:
+            redis_client: redis.asyncio client used for the invalidation subscription
+            ttl: Seconds an entry is served without hearing from other processes
+            max_entries: Size of the in-process LRU
+            channel: Pub/sub channel carrying invalidations
+        """
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, str]]]" = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, session_id: str) -> Optional[Dict[str, str]]:
+        entry = self._entries.get(session_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self._entries.pop(session_id, None)
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(session_id)
+        self.stats["hits"] += 1
+        return dict(entry[1])
+
+    def put(self, session_id: str, fields: Dict[str, str]):
+        self._entries[session_id] = (time.monotonic(), dict(fields))
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def update(self, session_id: str, fields: Dict[str, str]):
+        """Merge fields this process just wrote into a cached entry."""
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self.put(session_id, {**entry[1], **fields})
+
+    def invalidate(self, session_id: Optional[str] = None):
+        """Drop one session's entry, or every entry."""
+        if session_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(session_id, None)
+        self.stats["invalidations"] += 1
+
+    def invalidation_message(self, session_id: str) -> str:
+        return json.dumps({"session_id": session_id, "origin": self.origin})
+
+    async def start(self):
+        """Subscribe to invalidations from other processes."""
+        if self._listener is None or self._listener.done():
+            self._subscribed.clear()
+            self._listener = asyncio.create_task(self._listen())
+        await self._subscribed.wait()
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._entries.clear()
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything published while we were not subscribed is lost
+                self.invalidate()
+                self._subscribed.set()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "message":
+                        self._handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Business context invalidation listener failed, resubscribing: {e}")
+                self._subscribed.set()  # Do not hold up start(); entries still expire after ttl
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.unsubscribe(self.channel)
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    def _handle(self, data: Union[str, bytes]):
+        try:
+            message = json.loads(_decode(data))
+        except ValueError:
+            logger.warning(f"Ignoring malformed business context invalidation: {data!r}")
+            return
+        if message.get("origin") != self.origin:
+            self.invalidate(message.get("session_id"))
+
+
 class BusinessContext:
     """HeyJarvis's understanding of the company context."""
     
-    def __init__(self, redis_client, session_id: str):
-        """Initialize business context with Redis client and session ID."""
+    def __init__(self, redis_client, session_id: str, cache: Optional[BusinessContextCache] = None):
+        """
+        Initialize business context with Redis client and session ID.
+
+        Args:
+            redis_client: redis.asyncio client
+            session_id: Session the context belongs to
+            cache: Shared read-through cache; None reads Redis on every load
+        """
         self.redis_client = redis_client
         self.session_id = session_id
+        self.cache = cache
         self.company_profile: Optional[CompanyProfile] = None
         self.key_metrics: Optional[KeyMetrics] = None
         self.active_goals: List[BusinessGoal] = []
         self.resource_constraints: Optional[ResourceConstraints] = None
         self.last_updated: Optional[datetime] = None
         
-        # Redis key patterns
+        # Redis key: one hash with a JSON field per CONTEXT_FIELDS entry
+        self.context_key = f"business:{session_id}:context"
+
+        # Per-part keys written by earlier versions, copied into the hash when it is missing
         self.profile_key = f"business:{session_id}:profile"
         self.metrics_key = f"business:{session_id}:metrics"
         self.goals_key = f"business:{session_id}:goals"
@@ -104,50 +247,14 @@ class BusinessContext:
         self.metadata_key = f"business:{session_id}:metadata"
     
     async def load_context(self) -> bool:
-        """Load business context from Redis."""
+        """Load business context from the cache, or from Redis in one round trip."""
         try:
-            # Load company profile
-            profile_data = await self.redis_client.get(self.profile_key)
-            if profile_data:
-                profile_dict = json.loads(profile_data)
-                self.company_profile = CompanyProfile(
-                    stage=CompanyStage(profile_dict["stage"]),
-                    industry=Industry(profile_dict["industry"]),
-                    team_size=profile_dict["team_size"],
-                    founded_year=profile_dict.get("founded_year"),
-                    company_name=profile_dict.get("company_name"),
-                    description=profile_dict.get("description")
-                )
-            
-            # Load key metrics
-            metrics_data = await self.redis_client.get(self.metrics_key)
-            if metrics_data:
-                metrics_dict = json.loads(metrics_data)
-                self.key_metrics = KeyMetrics(**metrics_dict)
-            
-            # Load active goals
-            goals_data = await self.redis_client.get(self.goals_key)
-            if goals_data:
-                goals_list = json.loads(goals_data)
-                self.active_goals = []
-                for goal_dict in goals_list:
-                    # Convert datetime strings back to datetime objects
-                    if goal_dict.get("due_date"):
-                        goal_dict["due_date"] = datetime.fromisoformat(goal_dict["due_date"])
-                    self.active_goals.append(BusinessGoal(**goal_dict))
-            
-            # Load resource constraints
-            constraints_data = await self.redis_client.get(self.constraints_key)
-            if constraints_data:
-                constraints_dict = json.loads(constraints_data)
-                self.resource_constraints = ResourceConstraints(**constraints_dict)
-            
-            # Load metadata
-            metadata_data = await self.redis_client.get(self.metadata_key)
-            if metadata_data:
-                metadata_dict = json.loads(metadata_data)
-                if metadata_dict.get("last_updated"):
-                    self.last_updated = datetime.fromisoformat(metadata_dict["last_updated"])
+            fields = self.cache.get(self.session_id) if self.cache else None
+            if fields is None:
+                fields = await self._read_fields()
+                if self.cache:
+                    self.cache.put(self.session_id, fields)
+            self._apply_fields(fields)
             
             logger.info(f"Successfully loaded business context for session {self.session_id}")
             return True
@@ -159,88 +266,7 @@ class BusinessContext:
     async def save_context(self) -> bool:
         """Save business context to Redis."""
         try:
-            # Save company profile
-            if self.company_profile:
-                profile_dict = {
-                    "stage": self.company_profile.stage.value,
-                    "industry": self.company_profile.industry.value,
-                    "team_size": self.company_profile.team_size,
-                    "founded_year": self.company_profile.founded_year,
-                    "company_name": self.company_profile.company_name,
-                    "description": self.company_profile.description
-                }
-                await self.redis_client.setex(
-                    self.profile_key,
-                    86400,  # 24 hours TTL
-                    json.dumps(profile_dict)
-                )
-            
-            # Save key metrics
-            if self.key_metrics:
-                metrics_dict = {
-                    "mrr": self.key_metrics.mrr,
-                    "arr": self.key_metrics.arr,
-                    "burn_rate": self.key_metrics.burn_rate,
-                    "runway": self.key_metrics.runway,
-                    "cac": self.key_metrics.cac,
-                    "ltv": self.key_metrics.ltv,
-                    "churn_rate": self.key_metrics.churn_rate,
-                    "growth_rate": self.key_metrics.growth_rate,
-                    "cash_balance": self.key_metrics.cash_balance
-                }
-                await self.redis_client.setex(
-                    self.metrics_key,
-                    86400,  # 24 hours TTL
-                    json.dumps(metrics_dict)
-                )
-            
-            # Save active goals
-            if self.active_goals:
-                goals_list = []
-                for goal in self.active_goals:
-                    goal_dict = {
-                        "title": goal.title,
-                        "description": goal.description,
-                        "target_value": goal.target_value,
-                        "current_value": goal.current_value,
-                        "due_date": goal.due_date.isoformat() if goal.due_date else None,
-                        "priority": goal.priority,
-                        "category": goal.category,
-                        "progress": goal.progress
-                    }
-                    goals_list.append(goal_dict)
-                
-                await self.redis_client.setex(
-                    self.goals_key,
-                    86400,  # 24 hours TTL
-                    json.dumps(goals_list)
-                )
-            
-            # Save resource constraints
-            if self.resource_constraints:
-                constraints_dict = {
-                    "budget": self.resource_constraints.budget,
-                    "headcount_limit": self.resource_constraints.headcount_limit,
-                    "tech_stack_constraints": self.resource_constraints.tech_stack_constraints,
-                    "compliance_requirements": self.resource_constraints.compliance_requirements,
-                    "time_constraints": self.resource_constraints.time_constraints
-                }
-                await self.redis_client.setex(
-                    self.constraints_key,
-                    86400,  # 24 hours TTL
-                    json.dumps(constraints_dict)
-                )
-            
-            # Save metadata
-            self.last_updated = datetime.utcnow()
-            metadata_dict = {
-                "last_updated": self.last_updated.isoformat()
-            }
-            await self.redis_client.setex(
-                self.metadata_key,
-                86400,  # 24 hours TTL
-                json.dumps(metadata_dict)
-            )
+            await self._write_fields(*CONTEXT_FIELDS)
             
             logger.info(f"Successfully saved business context for session {self.session_id}")
             return True
@@ -248,6 +274,136 @@ class BusinessContext:
         except Exception as e:
             logger.error(f"Error saving business context for session {self.session_id}: {e}")
             return False
+
+    async def _read_fields(self) -> Dict[str, str]:
+        fields = await self.redis_client.hgetall(self.context_key)
+        if fields:
+            return {_decode(name): _decode(value) for name, value in fields.items()}
+
+        legacy_keys = [self.profile_key, self.metrics_key, self.goals_key,
+                       self.constraints_key, self.metadata_key]
+        values = await self.redis_client.mget(legacy_keys)
+        fields = {name: _decode(value) for name, value in zip(CONTEXT_FIELDS, values) if value}
+        if fields:
+            # Move the legacy parts into the hash now: field updates only write
+            # their own fields, and once the hash exists it is all that is read
+            pipe = self.redis_client.pipeline()
+            pipe.hset(self.context_key, mapping=fields)
+            pipe.expire(self.context_key, CONTEXT_TTL)
+            await pipe.execute()
+        return fields
+
+    async def _write_fields(self, *names: str):
+        """
+        Write the named fields in one pipelined round trip.
+
+        Only those hash fields change, so concurrent writers updating
+        different parts of the context do not overwrite each other.
+        """
+        self.last_updated = datetime.utcnow()
+        serialized = self._serialize_fields()
+        fields = {name: serialized[name] for name in names if name in serialized}
+
+        pipe = self.redis_client.pipeline()
+        pipe.hset(self.context_key, mapping=fields)
+        pipe.expire(self.context_key, CONTEXT_TTL)
+        if self.cache:
+            pipe.publish(self.cache.channel, self.cache.invalidation_message(self.session_id))
+        await pipe.execute()
+
+        if self.cache:
+            self.cache.update(self.session_id, fields)
+
+    def _serialize_fields(self) -> Dict[str, str]:
+        """JSON for each part of the context that is set."""
+        fields = {}
+        if self.company_profile:
+            fields["profile"] = json.dumps({
+                "stage": self.company_profile.stage.value,
+                "industry": self.company_profile.industry.value,
+                "team_size": self.company_profile.team_size,
+                "founded_year": self.company_profile.founded_year,
+                "company_name": self.company_profile.company_name,
+                "description": self.company_profile.description
+            })
+        
+        if self.key_metrics:
+            fields["metrics"] = json.dumps({
+                "mrr": self.key_metrics.mrr,
+                "arr": self.key_metrics.arr,
+                "burn_rate": self.key_metrics.burn_rate,
+                "runway": self.key_metrics.runway,
+                "cac": self.key_metrics.cac,
+                "ltv": self.key_metrics.ltv,
+                "churn_rate": self.key_metrics.churn_rate,
+                "growth_rate": self.key_metrics.growth_rate,
+                "cash_balance": self.key_metrics.cash_balance
+            })
+        
+        if self.active_goals:
+            fields["goals"] = json.dumps([
+                {
+                    "title": goal.title,
+                    "description": goal.description,
+                    "target_value": goal.target_value,
+                    "current_value": goal.current_value,
+                    "due_date": goal.due_date.isoformat() if goal.due_date else None,
+                    "priority": goal.priority,
+                    "category": goal.category,
+                    "progress": goal.progress
+                }
+                for goal in self.active_goals
+            ])
+        
+        if self.resource_constraints:
+            fields["constraints"] = json.dumps({
+                "budget": self.resource_constraints.budget,
+                "headcount_limit": self.resource_constraints.headcount_limit,
+                "tech_stack_constraints": self.resource_constraints.tech_stack_constraints,
+                "compliance_requirements": self.resource_constraints.compliance_requirements,
+                "time_constraints": self.resource_constraints.time_constraints
+            })
+        
+        if self.last_updated:
+            fields["metadata"] = json.dumps({"last_updated": self.last_updated.isoformat()})
+        return fields
+
+    def _apply_fields(self, fields: Dict[str, str]):
+        """Populate the context from stored JSON fields."""
+        profile_data = fields.get("profile")
+        if profile_data:
+            profile_dict = json.loads(profile_data)
+            self.company_profile = CompanyProfile(
+                stage=CompanyStage(profile_dict["stage"]),
+                industry=Industry(profile_dict["industry"]),
+                team_size=profile_dict["team_size"],
+                founded_year=profile_dict.get("founded_year"),
+                company_name=profile_dict.get("company_name"),
+                description=profile_dict.get("description")
+            )
+        
+        metrics_data = fields.get("metrics")
+        if metrics_data:
+            self.key_metrics = KeyMetrics(**json.loads(metrics_data))
+        
+        goals_data = fields.get("goals")
+        if goals_data:
+            self.active_goals = []
+            for goal_dict in json.loads(goals_data):
+                # Convert datetime strings back to datetime objects
+                if goal_dict.get("due_date"):
+                    goal_dict["due_date"] = datetime.fromisoformat(goal_dict["due_date"])
+                self.active_goals.append(BusinessGoal(**goal_dict))
+        
+        constraints_data = fields.get("constraints")
+        if constraints_data:
+            self.resource_constraints = ResourceConstraints(**json.loads(constraints_data))
+        
+        metadata_data = fields.get("metadata")
+        if metadata_data:
+            metadata_dict = json.loads(metadata_data)
+            if metadata_dict.get("last_updated"):
+                self.last_updated = datetime.fromisoformat(metadata_dict["last_updated"])
     
     async def update_metric(self, metric_name: str, value: Union[float, int]) -> bool:
         """Update a specific business metric."""
@@ -268,7 +424,7 @@ class BusinessContext:
                 self._calculate_derived_metrics()
             
             # Save to Redis
-            await self.save_context()
+            await self._write_fields("metrics", "metadata")
             
             logger.info(f"Updated metric {metric_name} to {value} for session {self.session_id}")
             return True
@@ -469,7 +625,7 @@ class BusinessContext:
             )
             
             self.active_goals.append(goal)
-            await self.save_context()
+            await self._write_fields("goals", "metadata")
             
             logger.info(f"Added new goal '{title}' for session {self.session_id}")
             return True
@@ -488,7 +644,7 @@ class BusinessContext:
                     if current_value is not None:
                         goal.current_value = current_value
                     
-                    await self.save_context()
+                    await self._write_fields("goals", "metadata")
                     logger.info(f"Updated goal '{goal_title}' progress to {progress*100:.1f}%")
                     return True
             
@@ -8,6 +8,7 @@ semantic understanding rather than keyword matching.
 import json
 import logging
 import re
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple, Literal
 from datetime import datetime
 from dataclasses import dataclass
@@ -15,6 +16,7 @@ from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from ai_engines.anthropic_engine import AnthropicEngine
 from ai_engines.base_engine import AIEngineConfig
+from ai_engines.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +75,27 @@ class IntentParser:
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
         
+        # Rule results at or above this score are decisive and skip the LLM
+        self.rule_confidence_threshold = self.config.get('rule_confidence_threshold', 0.7)
+        
+        # LRU of normalized request -> ParsedIntent
+        self.intent_cache_size = self.config.get('intent_cache_size', 256)
+        self._intent_cache: "OrderedDict[str, ParsedIntent]" = OrderedDict()
+        self.parser_stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "rule_fast_path": 0,
+            "ai_calls": 0
+        }
+        
+        # Near-duplicate cache of AI classifications
+        self.semantic_cache: Optional[SemanticCache] = None
+        if self.config.get('enable_semantic_cache', True):
+            self.semantic_cache = SemanticCache(
+                "intent_parser",
+                similarity_threshold=self.config.get('semantic_cache_threshold', 0.85)
+            )
+        
         # Initialize AI engine for semantic understanding
         self._initialize_ai_engine()
         
@@ -268,6 +291,15 @@ class IntentParser:
                 confidence_boost=0.15
             )
         ]
+        
+        self._compile_intent_matcher()
+    
+    def _compile_intent_matcher(self):
+        """Precompile every intent pattern once so parsing does no regex compilation."""
+        self._compiled_patterns: List[List[Tuple[str, "re.Pattern[str]"]]] = [
+            [(pattern_text, re.compile(pattern_text)) for pattern_text in pattern.patterns]
+            for pattern in self.intent_patterns
+        ]
     
     async def parse_intent(self, user_request: str, context: Optional[Dict[str, Any]] = None) -> ParsedIntent:
         """
@@ -282,18 +314,28 @@ class IntentParser:
         """
         self.logger.info(f"Parsing intent for request: {user_request[:100]}...")
         
+        self.parser_stats["requests"] += 1
+        
         try:
-            # Step 1: Rule-based pattern matching
-            rule_based_result = self._rule_based_parsing(user_request)
+            cache_key = self._intent_cache_key(user_request, context)
+            final_result = self._get_cached_intent(cache_key)
             
-            # Step 2: AI-powered semantic understanding (if available)
-            if self.ai_engine:
-                ai_result = await self._ai_semantic_parsing(user_request, context)
+            if final_result is None:
+                # Step 1: Rule-based pattern matching
+                rule_based_result = self._rule_based_parsing(user_request)
                 
-                # Combine results
-                final_result = self._combine_parsing_results(rule_based_result, ai_result)
-            else:
-                final_result = rule_based_result
+                # Step 2: AI-powered semantic understanding (if available and rules are not decisive)
+                if self.ai_engine and rule_based_result.confidence_score < self.rule_confidence_threshold:
+                    self.parser_stats["ai_calls"] += 1
+                    ai_result = await self._ai_semantic_parsing(user_request, context)
+                    
+                    # Combine results
+                    final_result = self._combine_parsing_results(rule_based_result, ai_result)
+                else:
+                    self.parser_stats["rule_fast_path"] += 1
+                    final_result = rule_based_result
+                
+                self._cache_intent(cache_key, final_result)
             
             # Step 3: Post-processing
             final_result = self._post_process_intent(final_result, user_request, context)
@@ -305,21 +347,64 @@ class IntentParser:
             self.logger.error(f"Error parsing intent: {e}")
             return self._create_fallback_intent(user_request)
     
+    def _intent_cache_key(self, user_request: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """Build the LRU key from the normalized request and context."""
+        normalized = " ".join(user_request.lower().split())
+        if not context:
+            return normalized
+        return f"{normalized}|{json.dumps(context, sort_keys=True, default=str)}"
+    
+    def _get_cached_intent(self, cache_key: str) -> Optional[ParsedIntent]:
+        """Return a fresh copy of a cached intent, if present."""
+        cached = self._intent_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        self._intent_cache.move_to_end(cache_key)
+        self.parser_stats["cache_hits"] += 1
+        return cached.model_copy(deep=True, update={"timestamp": datetime.utcnow()})
+    
+    def _cache_intent(self, cache_key: str, intent: ParsedIntent):
+        """Store an intent in the LRU, evicting the least recently used entry."""
+        if self.intent_cache_size <= 0:
+            return
+        
+        # Post-processing mutates the returned intent, so keep a private copy
+        self._intent_cache[cache_key] = intent.model_copy(deep=True)
+        self._intent_cache.move_to_end(cache_key)
+        while len(self._intent_cache) > self.intent_cache_size:
+            self._intent_cache.popitem(last=False)
+    
+    def clear_intent_cache(self):
+        """Clear the recent-intent LRU."""
+        self._intent_cache.clear()
+    
+    def get_parser_stats(self) -> Dict[str, Any]:
+        """Get cache and fast-path statistics."""
+        stats = dict(self.parser_stats)
+        requests = stats["requests"]
+        stats["cache_size"] = len(self._intent_cache)
+        stats["cache_hit_rate"] = stats["cache_hits"] / requests if requests else 0.0
+        stats["ai_call_rate"] = stats["ai_calls"] / requests if requests else 0.0
+        if self.semantic_cache:
+            stats["semantic_cache"] = self.semantic_cache.get_stats()
+        return stats
+    
     def _rule_based_parsing(self, user_request: str) -> ParsedIntent:
         """Perform rule-based pattern matching."""
         request_lower = user_request.lower()
         best_match = None
         best_score = 0.0
+        best_matched_patterns: List[str] = []
         extracted_params = {}
         
-        for pattern in self.intent_patterns:
-            score = 0.0
-            matched_patterns = []
-            
-            for pattern_text in pattern.patterns:
-                if re.search(pattern_text, request_lower):
-                    score += 1.0
-                    matched_patterns.append(pattern_text)
+        for pattern, compiled_patterns in zip(self.intent_patterns, self._compiled_patterns):
+            matched_patterns = [
+                pattern_text
+                for pattern_text, compiled in compiled_patterns
+                if compiled.search(request_lower)
+            ]
+            score = float(len(matched_patterns))
             
             if score > 0:
                 # Apply priority and confidence boost
@@ -328,6 +413,7 @@ class IntentParser:
                 if score > best_score:
                     best_score = score
                     best_match = pattern
+                    best_matched_patterns = matched_patterns
                     
                     # Extract parameters if specified
                     for param in pattern.parameters:
@@ -345,7 +431,7 @@ class IntentParser:
                 confidence_score=confidence_score,
                 suggested_agents=self.agent_mapping.get(best_match.category, []),
                 extracted_parameters=extracted_params,
-                reasoning=f"Matched patterns: {', '.join(matched_patterns)}"
+                reasoning=f"Matched patterns: {', '.join(best_matched_patterns)}"
             )
         else:
             return ParsedIntent(
@@ -359,6 +445,19 @@ class IntentParser:
     async def _ai_semantic_parsing(self, user_request: str, context: Optional[Dict[str, Any]] = None) -> ParsedIntent:
         """Use AI for semantic understanding of complex requests."""
         try:
+            # Near-duplicates of earlier requests reuse the prior classification;
+            # parameters belong to the request, so they are extracted again
+            prompt_fingerprint = SemanticCache.fingerprint(self._create_classification_prompt("", None))
+            scope = json.dumps(context, sort_keys=True, default=str) if context else ""
+            if self.semantic_cache:
+                cached = self.semantic_cache.lookup(user_request, prompt_fingerprint, scope)
+                if cached is not None:
+                    return ParsedIntent(
+                        **cached,
+                        suggested_agents=self.agent_mapping.get(cached["primary_intent"], []),
+                        extracted_parameters=self._extract_parameters(user_request, cached["primary_intent"])
+                    )
+            
             # Create prompt for AI classification
             prompt = self._create_classification_prompt(user_request, context)
             
@@ -368,6 +467,10 @@ class IntentParser:
             # Parse AI response
             ai_result = self._parse_ai_classification(response.content)
             
+            if self.semantic_cache:
+                classification = ai_result.dict(include={"primary_intent", "confidence", "confidence_score", "reasoning"})
+                self.semantic_cache.store(user_request, classification, prompt_fingerprint, scope)
+            
             return ai_result
             
         except Exception as e:
@@ -478,24 +581,37 @@ Ensure the response is valid JSON and all fields are properly filled.
         
         return intent
     
+    _PARAMETER_PATTERNS = {
+        "business_type": re.compile(r"(?:business|company|startup|venture|enterprise)"),
+        "industry": re.compile(r"(?:tech|software|ecommerce|healthcare|finance|education|retail)"),
+        "target_audience": re.compile(r"(?:customers|users|clients|consumers|professionals)"),
+        "budget": re.compile(r"(?:budget|cost|price|investment|funding)"),
+        "urgency": re.compile(r"(?:urgent|asap|immediately|soon|quickly)")
+    }
+    
     def _extract_parameter(self, text: str, param_name: str) -> Optional[str]:
         """Extract parameter value from text."""
         # Simple parameter extraction - could be enhanced with NLP
-        param_patterns = {
-            "business_type": r"(?:business|company|startup|venture|enterprise)",
-            "industry": r"(?:tech|software|ecommerce|healthcare|finance|education|retail)",
-            "target_audience": r"(?:customers|users|clients|consumers|professionals)",
-            "budget": r"(?:budget|cost|price|investment|funding)",
-            "urgency": r"(?:urgent|asap|immediately|soon|quickly)"
-        }
-        
-        if param_name in param_patterns:
-            match = re.search(param_patterns[param_name], text)
+        param_pattern = self._PARAMETER_PATTERNS.get(param_name)
+        if param_pattern:
+            match = param_pattern.search(text)
             if match:
                 return match.group(0)
         
         return None
     
+    def _extract_parameters(self, user_request: str, category: str) -> Dict[str, str]:
+        """Extract the parameters declared by a category's patterns."""
+        request_lower = user_request.lower()
+        extracted_params = {}
+        for pattern in self.intent_patterns:
+            if pattern.category == category:
+                for param in pattern.parameters:
+                    param_value = self._extract_parameter(request_lower, param)
+                    if param_value:
+                        extracted_params[param] = param_value
+        return extracted_params
+    
     def _score_to_confidence(self, score: float) -> IntentConfidence:
         """Convert numeric score to confidence level."""
         if score >= 0.7:
@@ -31,8 +31,9 @@ from pydantic import BaseModel, Field
 
 # Import existing orchestration components
 from .orchestrator import HeyJarvisOrchestrator, OrchestratorConfig
-from .business_context import BusinessContext, CompanyStage, Industry
+from .business_context import BusinessContext, BusinessContextCache, CompanyStage, Industry
 from .agent_communication import AgentMessageBus
+from ai_engines.semantic_cache import SemanticCache
 from .state import (
     DeploymentStatus, 
     DepartmentStatus, 
@@ -82,6 +83,26 @@ class BusinessIntent(BaseModel):
     )
 
 
+# Category- and complexity-level guidance from the intent prompt, used to
+# rebuild an intent around a classification reused from the semantic cache
+CATEGORY_METRICS = {
+    "GROW_REVENUE": ["MRR", "ARR", "CAC", "LTV", "conversion rates", "pipeline value"],
+    "REDUCE_COSTS": ["burn rate", "cost per acquisition", "operational costs", "efficiency ratios"],
+    "IMPROVE_EFFICIENCY": ["cycle time", "throughput", "error rates", "productivity metrics"],
+    "LAUNCH_PRODUCT": ["time to market", "adoption rates", "feature usage", "customer feedback"],
+    "CUSTOM_AUTOMATION": ["automation coverage", "error reduction", "time savings", "system uptime"]
+}
+
+COMPLEXITY_TIMELINES = {
+    "simple": "1-4 weeks",
+    "moderate": "1-3 months",
+    "complex": "3-12 months"
+}
+
+# BusinessIntent fields that depend on the category alone, not the wording of the request
+CLASSIFICATION_FIELDS = {"category", "confidence", "suggested_departments", "complexity_level"}
+
+
 @dataclass
 class JarvisConfig:
     """Configuration for Jarvis meta-orchestrator."""
@@ -98,6 +119,10 @@ class JarvisConfig:
     # AI model settings for business-level decisions
     business_model: str = "claude-3-5-sonnet-20241022"
     business_temperature: float = 0.2  # More conservative for business decisions
+    
+    # Reuse business intent analysis for near-duplicate requests
+    enable_semantic_cache: bool = True
+    semantic_cache_threshold: float = 0.85
 
 
 class JarvisDepartment:
@@ -296,6 +321,7 @@ class Jarvis:
         
         # Initialize business context (will be set per session)
         self.business_context: Optional[BusinessContext] = None
+        self.business_context_cache: Optional[BusinessContextCache] = None
         
         # Initialize message bus (will be set after Redis client)
         self.message_bus: Optional[AgentMessageBus] = None
@@ -310,6 +336,14 @@ class Jarvis:
             temperature=config.business_temperature
         )
         
+        # Near-duplicate cache of business intent analyses
+        self.intent_cache: Optional[SemanticCache] = None
+        if config.enable_semantic_cache:
+            self.intent_cache = SemanticCache(
+                "jarvis_business_intent",
+                similarity_threshold=config.semantic_cache_threshold
+            )
+        
         # State tracking
         self.last_business_context_refresh = None
         self.session_contexts: Dict[str, BusinessContext] = {}
@@ -328,6 +362,10 @@ class Jarvis:
             # Initialize message bus
             self.message_bus = AgentMessageBus(self.redis_client)
             
+            # Business context reads are served locally until another process writes
+            self.business_context_cache = BusinessContextCache(self.redis_client)
+            await self.business_context_cache.start()
+            
             logger.info("Jarvis initialization completed successfully")
             
         except Exception as e:
@@ -429,6 +467,15 @@ Return a JSON object with the exact structure:
 
 Be specific and actionable in your analysis. Consider the business context provided."""
 
+            # Near-duplicates under the same company context reuse the prior analysis
+            prompt_fingerprint = SemanticCache.fingerprint(self.config.business_model, system_prompt)
+            scope = context_info.strip()
+            if self.intent_cache:
+                classification = self.intent_cache.lookup(request, prompt_fingerprint, scope)
+                if classification is not None:
+                    logger.info(f"Business intent served from semantic cache: {classification['category']}")
+                    return self._intent_from_classification(request, classification)
+
             user_context = f"""Business Request: {request}
 
 {context_info.strip() if context_info.strip() else "No company context available yet."}
@@ -469,6 +516,10 @@ Analyze this request and categorize it strategically."""
             # Create BusinessIntent object
             business_intent = BusinessIntent(**intent_data)
             
+            if self.intent_cache:
+                self.intent_cache.store(request, business_intent.dict(include=CLASSIFICATION_FIELDS),
+                                        prompt_fingerprint, scope)
+            
             logger.info(f"Business intent analyzed: {business_intent.category} (confidence: {business_intent.confidence:.2f})")
             
             return business_intent
@@ -489,6 +540,22 @@ Analyze this request and categorize it strategically."""
                 success_criteria=["Agent successfully deployed", "User requirements met"]
             )
 
+    def _intent_from_classification(self, request: str, classification: Dict[str, Any]) -> BusinessIntent:
+        """
+        Business intent for a request from a classification cached for a near-duplicate.
+        
+        Only the classification is shared; metrics and timeline come from the
+        category and complexity guidance, and the success criterion is the
+        request itself rather than targets written for another request.
+        """
+        return BusinessIntent(
+            **classification,
+            key_metrics_to_track=CATEGORY_METRICS.get(classification["category"], []),
+            reasoning=f"Classified as {classification['category']}, as for a near-duplicate earlier request",
+            estimated_timeline=COMPLEXITY_TIMELINES.get(classification["complexity_level"]),
+            success_criteria=[f"Achieve the stated goal: {request.strip()}"]
+        )
+
     async def process_business_request(
         self, 
         request: str, 
@@ -855,7 +922,9 @@ Original Request: {request}
                 self._should_refresh_business_context()):
                 
                 # Create new business context
-                business_context = BusinessContext(self.redis_client, session_id)
+                business_context = BusinessContext(
+                    self.redis_client, session_id, cache=self.business_context_cache
+                )
                 
                 # Try to load existing context
                 await business_context.load_context()
@@ -873,7 +942,9 @@ Original Request: {request}
         except Exception as e:
             logger.error(f"Error ensuring business context for session {session_id}: {e}")
             # Create empty context as fallback
-            self.business_context = BusinessContext(self.redis_client, session_id)
+            self.business_context = BusinessContext(
+                self.redis_client, session_id, cache=self.business_context_cache
+            )
     
     def _should_refresh_business_context(self) -> bool:
         """Check if business context should be refreshed."""
@@ -910,6 +981,9 @@ Original Request: {request}
     async def close(self) -> None:
         """Clean up Jarvis resources."""
         try:
+            if self.business_context_cache:
+                await self.business_context_cache.close()
+            
             # Close existing orchestrator
             if self.agent_orchestrator:
                 await self.agent_orchestrator.close()
@@ -30,6 +30,7 @@ from agent_builder.agent_spec import (
     IntegrationConfig
 )
 from agent_builder.code_generator import generate_agent_code
+from agent_builder.code_cache import AgentCodeCache
 from agent_builder.sandbox import SandboxManager, SandboxConfig
 from conversation.context_manager import ConversationContextManager
 from templates.template_engine import TemplateEngine, TemplateValidationError
@@ -62,6 +63,7 @@ class HeyJarvisOrchestrator:
         self.progress_callback: Optional[Callable[[str, int, str], None]] = None
         self.context_manager: Optional[ConversationContextManager] = None
         self.sandbox_manager: Optional[SandboxManager] = None
+        self.code_cache: Optional[AgentCodeCache] = None
         
         # Initialize template system
         self.template_engine = TemplateEngine()
@@ -85,6 +87,9 @@ class HeyJarvisOrchestrator:
         self.redis_client = redis.from_url(self.config.redis_url)
         self.checkpointer = MemorySaver()
         
+        # Generated agent code is shared with other processes through Redis
+        self.code_cache = AgentCodeCache(redis_client=self.redis_client)
+        
         # Initialize sandbox manager
         sandbox_config = SandboxConfig()
         self.sandbox_manager = SandboxManager(sandbox_config)
@@ -968,7 +973,9 @@ class HeyJarvisOrchestrator:
                     pydantic_spec = PydanticAgentSpecClass.from_json(pydantic_spec_json)
                     
                     # Generate the Python code
-                    generated_code = await generate_agent_code(pydantic_spec, self.config.anthropic_api_key)
+                    generated_code = await generate_agent_code(
+                        pydantic_spec, self.config.anthropic_api_key, cache=self.code_cache
+                    )
                     
                     # Store the generated code
                     agent_spec["code"] = generated_code
@@ -19,6 +19,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 import statistics
 
+from monitoring.timeseries import TimeSeriesStore, get_default_store
 from .message_bus import MessageBus, MessageType, Message
 from .persistent_system import PersistentSystem
 
@@ -646,10 +647,18 @@ class WorkflowTemplateManager:
 class PerformanceAnalyticsEngine:
     """Advanced performance analytics and monitoring."""
     
-    def __init__(self):
+    def __init__(self, timeseries: Optional[TimeSeriesStore] = None, trend_window: float = 300.0):
+        """
+        Initialize the PerformanceAnalyticsEngine.
+
+        Args:
+            timeseries: Store for metric history; the process-wide store (snapshotted by PersistentSystem) by default
+            trend_window: Seconds compared with the window before them when detecting trends
+        """
         self.logger = logging.getLogger(__name__)
         self.alerts: List[PerformanceAlert] = []
-        self.metrics_history: Dict[str, List[Dict[str, Any]]] = {}
+        self.metrics_history = timeseries if timeseries is not None else get_default_store()
+        self.trend_window = trend_window
         self.alert_rules: Dict[str, Dict[str, Any]] = {}
         
         # Initialize alert rules
@@ -694,28 +703,9 @@ class PerformanceAnalyticsEngine:
     async def analyze_system_performance(self, metrics: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze system performance and generate insights."""
         
-        # Record metrics
+        # Record metrics; the store's tiers bound how much history is kept
         timestamp = datetime.utcnow()
-        metric_record = {
-            **metrics,
-            'timestamp': timestamp
-        }
-        
-        for metric_name, value in metrics.items():
-            if metric_name not in self.metrics_history:
-                self.metrics_history[metric_name] = []
-            
-            self.metrics_history[metric_name].append({
-                'value': value,
-                'timestamp': timestamp
-            })
-            
-            # Keep only recent history
-            cutoff_time = timestamp - timedelta(hours=24)
-            self.metrics_history[metric_name] = [
-                record for record in self.metrics_history[metric_name]
-                if record['timestamp'] > cutoff_time
-            ]
+        self.metrics_history.record_many(metrics)
         
         # Check for alerts
         new_alerts = []
@@ -778,36 +768,12 @@ class PerformanceAnalyticsEngine:
         return max(0.0, base_score)
     
     def _analyze_trends(self) -> Dict[str, str]:
-        """Analyze performance trends."""
-        
-        trends = {}
+        """Analyze performance trends over the last trend window."""
         
-        for metric_name, history in self.metrics_history.items():
-            if len(history) < 2:
-                trends[metric_name] = 'insufficient_data'
-                continue
-            
-            # Calculate trend
-            recent_values = [record['value'] for record in history[-5:]]  # Last 5 values
-            older_values = [record['value'] for record in history[-10:-5]]  # Previous 5 values
-            
-            if not older_values:
-                trends[metric_name] = 'insufficient_data'
-                continue
-            
-            recent_avg = statistics.mean(recent_values)
-            older_avg = statistics.mean(older_values)
-            
-            change_pct = ((recent_avg - older_avg) / older_avg) * 100 if older_avg != 0 else 0
-            
-            if abs(change_pct) < 5:
-                trends[metric_name] = 'stable'
-            elif change_pct > 5:
-                trends[metric_name] = 'increasing'
-            else:
-                trends[metric_name] = 'decreasing'
-        
-        return trends
+        return {
+            metric_name: self.metrics_history.trend(metric_name, self.trend_window)
+            for metric_name in self.metrics_history.series()
+        }
     
     def _generate_recommendations(self, metrics: Dict[str, Any]) -> List[str]:
         """Generate performance optimization recommendations."""
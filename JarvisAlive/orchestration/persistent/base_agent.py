@@ -17,6 +17,9 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, Any, Optional, Callable, List
 from dataclasses import dataclass, field
+from monitoring.metrics import AGENT_QUEUE_DEPTH, AGENT_QUEUE_WAIT_SECONDS, AGENT_TASK_SECONDS
+from monitoring.timeseries import TimeSeriesStore, get_default_store
+from monitoring.tracing import span
 from .message_bus import MessageType
 
 
@@ -74,6 +77,7 @@ class TaskRequest:
     timeout_seconds: int = 300
     callback: Optional[Callable] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
+    trace_context: Optional[Dict[str, str]] = None  # Carrier from monitoring.tracing.inject_context
     
     def __post_init__(self):
         if not self.task_id:
@@ -103,12 +107,16 @@ class PersistentAgent(ABC):
     - State persistence
     """
     
-    def __init__(self, agent_id: str, config: Optional[Dict[str, Any]] = None):
+    def __init__(self, agent_id: str, config: Optional[Dict[str, Any]] = None,
+                 timeseries: Optional[TimeSeriesStore] = None):
         """Initialize the persistent agent."""
         self.agent_id = agent_id
         self.config = config or {}
         self.logger = logging.getLogger(f"agent.{agent_id}")
         
+        # Per-task history; health keeps only running totals
+        self.timeseries = timeseries if timeseries is not None else get_default_store()
+        
         # Agent state
         self.state = AgentState.INITIALIZING
         self.health = AgentHealth(
@@ -143,6 +151,9 @@ class PersistentAgent(ABC):
         self.state = AgentState.READY
         self._update_health()
         
+        # Queue depth is read when metrics are scraped
+        AGENT_QUEUE_DEPTH.labels(self.agent_id).set_function(self.task_queue.qsize)
+        
         # Start main processing loop
         self._main_task = asyncio.create_task(self._main_loop())
         
@@ -175,6 +186,7 @@ class PersistentAgent(ABC):
         self._running = False
         self.state = AgentState.STOPPED
         self._update_health()
+        AGENT_QUEUE_DEPTH.remove(self.agent_id)
         
         # Call agent-specific cleanup
         await self.on_stop()
@@ -254,6 +266,9 @@ class PersistentAgent(ABC):
         self.logger.debug(f"Processing task {task_request.task_id}")
         
         start_time = datetime.utcnow()
+        AGENT_QUEUE_WAIT_SECONDS.labels(self.agent_id).observe(
+            max(0.0, (start_time - task_request.created_at).total_seconds())
+        )
         self.state = AgentState.BUSY
         self.current_task = task_request
         self.health.current_task_id = task_request.task_id
@@ -263,11 +278,13 @@ class PersistentAgent(ABC):
             # Add to processing tasks
             self.processing_tasks[task_request.task_id] = task_request
             
-            # Execute the actual task processing
-            result_data = await asyncio.wait_for(
-                self.process_task(task_request.task_type, task_request.input_data),
-                timeout=task_request.timeout_seconds
-            )
+            # Execute the actual task processing, continuing the submitter's trace
+            with span("agent.process_task", parent=task_request.trace_context, agent=self.agent_id,
+                      task_id=task_request.task_id, task_type=task_request.task_type):
+                result_data = await asyncio.wait_for(
+                    self.process_task(task_request.task_type, task_request.input_data),
+                    timeout=task_request.timeout_seconds
+                )
             
             # Calculate processing time
             processing_time = (datetime.utcnow() - start_time).total_seconds() * 1000
@@ -326,6 +343,13 @@ class PersistentAgent(ABC):
             self.state = AgentState.READY
             self._update_health()
             
+            # Record the task in the agent's metrics and time series
+            AGENT_TASK_SECONDS.labels(self.agent_id, "success" if response.success else "error").observe(
+                response.processing_time_ms / 1000
+            )
+            self.timeseries.record(f"agent.{self.agent_id}.processing_time_ms", response.processing_time_ms)
+            self.timeseries.record(f"agent.{self.agent_id}.task_success", 1.0 if response.success else 0.0)
+            
             # Call completion callback
             if self.task_completed_callback:
                 try:
@@ -12,12 +12,15 @@ This orchestrator provides:
 
 import asyncio
 import logging
+import time
 import uuid
 from typing import Dict, List, Optional, Any, Callable, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 
+from monitoring.metrics import BATCH_SECONDS, BATCH_TASKS, ORCHESTRATOR_TASK_SECONDS
+from monitoring.tracing import inject_context, span
 from .base_agent import PersistentAgent, TaskRequest, TaskResponse, AgentState
 from .agent_pool import AgentPool, PoolHealth, AgentRegistration
 from .message_bus import MessageBus, MessageType, Message, AgentMessageBusInterface
@@ -251,8 +254,10 @@ class ConcurrentOrchestrator:
         
         self.active_batches[batch_id] = batch
         
-        # Start execution process
-        asyncio.create_task(self._execute_batch(batch))
+        # Start execution process; the task inherits the submission span
+        with span("orchestrator.submit_batch", batch_id=batch_id, task_count=len(tasks),
+                  session_id=session_id, workflow_id=workflow_id):
+            asyncio.create_task(self._execute_batch(batch))
         
         # Publish batch created event
         await self.message_bus.publish(
@@ -369,115 +374,128 @@ class ConcurrentOrchestrator:
     
     async def _execute_batch(self, batch: ExecutionBatch):
         """Execute a batch of tasks concurrently."""
-        self.logger.info(f"Executing batch {batch.batch_id} with {len(batch.tasks)} tasks")
-        batch.status = ExecutionStatus.EXECUTING
+        start = time.perf_counter()
+        with span("orchestrator.batch", batch_id=batch.batch_id, task_count=len(batch.tasks)):
+            self.logger.info(f"Executing batch {batch.batch_id} with {len(batch.tasks)} tasks")
+            batch.status = ExecutionStatus.EXECUTING
         
-        try:
-            # Process tasks with dependency resolution
-            execution_tasks = []
-            for task in batch.tasks:
-                execution_tasks.append(self._execute_single_task(task, batch))
+            try:
+                # Process tasks with dependency resolution
+                execution_tasks = []
+                for task in batch.tasks:
+                    execution_tasks.append(self._execute_single_task(task, batch))
             
-            # Execute all tasks concurrently
-            await asyncio.gather(*execution_tasks, return_exceptions=True)
+                # Execute all tasks concurrently
+                await asyncio.gather(*execution_tasks, return_exceptions=True)
             
-            # Update batch status
-            if batch.failed_tasks > 0:
-                batch.status = ExecutionStatus.FAILED
-            else:
-                batch.status = ExecutionStatus.COMPLETED
+                # Update batch status
+                if batch.failed_tasks > 0:
+                    batch.status = ExecutionStatus.FAILED
+                else:
+                    batch.status = ExecutionStatus.COMPLETED
             
-            # Move to history
-            self.execution_history[batch.batch_id] = batch
-            self.active_batches.pop(batch.batch_id, None)
+                # Move to history
+                self.execution_history[batch.batch_id] = batch
+                self.active_batches.pop(batch.batch_id, None)
             
-            # Call completion callback
-            if self.completion_callback:
-                try:
-                    await self.completion_callback(batch)
-                except Exception as e:
-                    self.logger.error(f"Error in completion callback: {e}")
+                # Call completion callback
+                if self.completion_callback:
+                    try:
+                        await self.completion_callback(batch)
+                    except Exception as e:
+                        self.logger.error(f"Error in completion callback: {e}")
             
-            self.logger.info(f"Batch {batch.batch_id} execution completed")
+                self.logger.info(f"Batch {batch.batch_id} execution completed")
             
-        except Exception as e:
-            self.logger.error(f"Batch execution failed: {e}")
-            batch.status = ExecutionStatus.FAILED
+            except Exception as e:
+                self.logger.error(f"Batch execution failed: {e}")
+                batch.status = ExecutionStatus.FAILED
+        
+        BATCH_SECONDS.labels(batch.status.value).observe(time.perf_counter() - start)
+        BATCH_TASKS.observe(len(batch.tasks))
     
     async def _execute_single_task(self, task: ConcurrentTask, batch: ExecutionBatch):
         """Execute a single task with approval flow."""
-        try:
-            # Wait for dependencies
-            await self._wait_for_dependencies(task)
+        start = time.perf_counter()
+        with span("orchestrator.task", task_id=task.task_id, task_type=task.task_type, batch_id=batch.batch_id):
+            try:
+                # Wait for dependencies
+                await self._wait_for_dependencies(task)
             
-            # Request approval if required
-            if task.requires_approval and not self.skip_approvals:
-                approved = await self._request_approval(task, batch)
-                if not approved:
-                    task.status = ExecutionStatus.CANCELLED
-                    return
+                # Request approval if required
+                if task.requires_approval and not self.skip_approvals:
+                    approved = await self._request_approval(task, batch)
+                    if not approved:
+                        task.status = ExecutionStatus.CANCELLED
+                        ORCHESTRATOR_TASK_SECONDS.labels(task.task_type, task.status.value).observe(
+                            time.perf_counter() - start
+                        )
+                        return
             
-            task.status = ExecutionStatus.EXECUTING
-            task.started_at = datetime.utcnow()
+                task.status = ExecutionStatus.EXECUTING
+                task.started_at = datetime.utcnow()
             
-            # Submit to agent pool
-            self.logger.info(f"Submitting task {task.task_id} (type: {task.task_type}) to agent pool with preferred_agent: {task.preferred_agent}")
+                # Submit to agent pool
+                self.logger.info(f"Submitting task {task.task_id} (type: {task.task_type}) to agent pool with preferred_agent: {task.preferred_agent}")
             
-            agent_id = await self.agent_pool.submit_task(
-                TaskRequest(
-                    task_id=task.task_id,
-                    task_type=task.task_type,
-                    input_data=task.input_data,
-                    timeout_seconds=task.timeout_seconds
-                ),
-                preferred_agent=task.preferred_agent
-            )
+                agent_id = await self.agent_pool.submit_task(
+                    TaskRequest(
+                        task_id=task.task_id,
+                        task_type=task.task_type,
+                        input_data=task.input_data,
+                        timeout_seconds=task.timeout_seconds,
+                        trace_context=inject_context()
+                    ),
+                    preferred_agent=task.preferred_agent
+                )
             
-            if not agent_id:
-                self.logger.error(f"No available agents for task execution. Task: {task.task_type}, Preferred: {task.preferred_agent}")
-                raise Exception("No available agents for task execution")
+                if not agent_id:
+                    self.logger.error(f"No available agents for task execution. Task: {task.task_type}, Preferred: {task.preferred_agent}")
+                    raise Exception("No available agents for task execution")
             
-            task.assigned_agent = agent_id
+                task.assigned_agent = agent_id
             
-            # Wait for task completion (polling agent pool)
-            result = await self._wait_for_task_completion(task, agent_id)
+                # Wait for task completion (polling agent pool)
+                result = await self._wait_for_task_completion(task, agent_id)
             
-            if result.success:
-                task.status = ExecutionStatus.COMPLETED
-                task.result_data = result.result_data
-                batch.completed_tasks += 1
-                self.total_tasks_executed += 1
-            else:
-                task.status = ExecutionStatus.FAILED
-                task.error_message = result.error_message
-                batch.failed_tasks += 1
+                if result.success:
+                    task.status = ExecutionStatus.COMPLETED
+                    task.result_data = result.result_data
+                    batch.completed_tasks += 1
+                    self.total_tasks_executed += 1
+                else:
+                    task.status = ExecutionStatus.FAILED
+                    task.error_message = result.error_message
+                    batch.failed_tasks += 1
             
-            task.completed_at = datetime.utcnow()
-            self.completed_tasks[task.task_id] = task
+                task.completed_at = datetime.utcnow()
+                self.completed_tasks[task.task_id] = task
             
-            # Publish task completion event
-            await self.message_bus.publish(
-                topic=f"orchestrator:task:{task.task_id}",
-                message_type=MessageType.TASK_COMPLETED if result.success else MessageType.TASK_FAILED,
-                source="concurrent_orchestrator",
-                payload={
-                    'task_id': task.task_id,
-                    'batch_id': batch.batch_id,
-                    'success': result.success,
-                    'agent_id': agent_id,
-                    'result_data': task.result_data,
-                    'error_message': task.error_message,
-                    'started_at': task.started_at.isoformat() if task.started_at else None,
-                    'completed_at': task.completed_at.isoformat() if task.completed_at else None
-                }
-            )
+                # Publish task completion event
+                await self.message_bus.publish(
+                    topic=f"orchestrator:task:{task.task_id}",
+                    message_type=MessageType.TASK_COMPLETED if result.success else MessageType.TASK_FAILED,
+                    source="concurrent_orchestrator",
+                    payload={
+                        'task_id': task.task_id,
+                        'batch_id': batch.batch_id,
+                        'success': result.success,
+                        'agent_id': agent_id,
+                        'result_data': task.result_data,
+                        'error_message': task.error_message,
+                        'started_at': task.started_at.isoformat() if task.started_at else None,
+                        'completed_at': task.completed_at.isoformat() if task.completed_at else None
+                    }
+                )
             
-        except Exception as e:
-            self.logger.error(f"Task execution failed: {e}")
-            task.status = ExecutionStatus.FAILED
-            task.error_message = str(e)
-            task.completed_at = datetime.utcnow()
-            batch.failed_tasks += 1
+            except Exception as e:
+                self.logger.error(f"Task execution failed: {e}")
+                task.status = ExecutionStatus.FAILED
+                task.error_message = str(e)
+                task.completed_at = datetime.utcnow()
+                batch.failed_tasks += 1
+        
+        ORCHESTRATOR_TASK_SECONDS.labels(task.task_type, task.status.value).observe(time.perf_counter() - start)
     
     async def _request_approval(self, task: ConcurrentTask, batch: ExecutionBatch) -> bool:
         """Request human approval for task execution."""
@@ -18,6 +18,8 @@ from typing import Dict, Any, List, Optional, Callable, Set
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from monitoring.metrics import BUS_DELIVERED, BUS_PUBLISHED
+
 
 class MessageType(str, Enum):
     """Message types for the message bus."""
@@ -196,6 +198,7 @@ class MessageBus:
         await self.redis_client.publish(topic, message_data)
         
         self.messages_published += 1
+        BUS_PUBLISHED.labels(message.type.value if isinstance(message.type, Enum) else message.type).inc()
         self.logger.debug(f"Published message {message.id} to topic {topic}")
         
         return message.id
@@ -351,6 +354,7 @@ class MessageBus:
                                 callback(parsed_message)
                                 
                             self.messages_received += 1
+                            BUS_DELIVERED.labels(parsed_message.type.value).inc()
                             
                         except Exception as e:
                             self.logger.error(f"Error processing pattern message: {e}")
@@ -397,6 +401,7 @@ class MessageBus:
                         self.logger.error(f"Error in message callback: {e}")
             
             self.messages_received += 1
+            BUS_DELIVERED.labels(message.type.value).inc()
             
         except Exception as e:
             self.logger.error(f"Error processing message: {e}")
@@ -16,6 +16,8 @@ from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime
 import uuid
 
+from monitoring.metrics import start_metrics_server_from_env
+from monitoring.timeseries import TimeSeriesStore, get_default_store, set_default_store
 from .agent_pool import AgentPool, AgentRegistration, PoolHealth
 from .message_bus import MessageBus, MessageType
 from .concurrent_orchestrator import ConcurrentOrchestrator, ExecutionBatch, ApprovalRequest
@@ -37,7 +39,8 @@ class PersistentSystemConfig:
         approval_timeout_minutes: int = 5,
         health_check_interval: int = 15,
         enable_message_bus: bool = True,
-        skip_approvals: bool = True
+        skip_approvals: bool = True,
+        timeseries_snapshot_path: Optional[str] = None
     ):
         self.redis_url = redis_url
         self.anthropic_api_key = anthropic_api_key or os.getenv('ANTHROPIC_API_KEY')
@@ -47,6 +50,8 @@ class PersistentSystemConfig:
         self.health_check_interval = health_check_interval
         self.enable_message_bus = enable_message_bus
         self.skip_approvals = skip_approvals
+        # Metric history survives restarts when set
+        self.timeseries_snapshot_path = timeseries_snapshot_path or os.getenv('TIMESERIES_SNAPSHOT_PATH')
 
 
 class PersistentSystem:
@@ -99,6 +104,12 @@ class PersistentSystem:
         self.logger.info("Starting PersistentSystem...")
         
         try:
+            # Restore metric history before agents start recording
+            await self._restore_timeseries()
+            
+            # Expose /metrics when METRICS_ENABLED is set
+            start_metrics_server_from_env()
+            
             # Initialize message bus
             if self.config.enable_message_bus:
                 await self._initialize_message_bus()
@@ -151,12 +162,36 @@ class PersistentSystem:
             if self.message_bus:
                 await self.message_bus.disconnect()
             
+            await self._snapshot_timeseries()
+            
             self.is_running = False
             self.logger.info("PersistentSystem stopped successfully")
             
         except Exception as e:
             self.logger.error(f"Error stopping PersistentSystem: {e}")
     
+    async def _restore_timeseries(self):
+        """Load the metric history snapshot, if configured and present."""
+        path = self.config.timeseries_snapshot_path
+        if not path or not os.path.exists(path):
+            return
+        try:
+            store = await asyncio.to_thread(TimeSeriesStore.restore, path)
+            set_default_store(store)
+            self.logger.info(f"Restored {len(store)} metric series from {path}")
+        except Exception as e:
+            self.logger.warning(f"Could not restore metric history from {path}: {e}")
+    
+    async def _snapshot_timeseries(self):
+        """Write the metric history snapshot, if configured."""
+        path = self.config.timeseries_snapshot_path
+        if not path:
+            return
+        try:
+            await asyncio.to_thread(get_default_store().snapshot, path)
+        except Exception as e:
+            self.logger.warning(f"Could not snapshot metric history to {path}: {e}")
+    
     async def submit_concurrent_tasks(
         self,
         tasks: List[Dict[str, Any]],
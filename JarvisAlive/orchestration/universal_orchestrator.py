@@ -36,6 +36,7 @@ from .orchestrator import HeyJarvisOrchestrator, OrchestratorConfig
 # Import AI components
 from ai_engines.anthropic_engine import AnthropicEngine
 from ai_engines.base_engine import AIEngineConfig
+from ai_engines.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +74,8 @@ class UniversalOrchestratorConfig(BaseModel):
     routing_confidence_threshold: float = Field(default=0.7, description="Minimum confidence for routing")
     enable_caching: bool = Field(default=True, description="Enable response caching")
     cache_ttl_minutes: int = Field(default=30, description="Cache TTL in minutes")
+    enable_semantic_cache: bool = Field(default=True, description="Reuse routing decisions for near-duplicate queries")
+    semantic_cache_threshold: float = Field(default=0.85, description="Minimum similarity for a semantic cache hit")
 
 
 class UniversalOrchestrator:
@@ -104,6 +107,12 @@ class UniversalOrchestrator:
         # Routing state
         self.conversation_context: Dict[str, Any] = {}
         self.routing_history: Dict[str, RoutingDecision] = {}
+        self.routing_cache: Optional[SemanticCache] = None
+        if config.enable_semantic_cache:
+            self.routing_cache = SemanticCache(
+                "universal_routing",
+                similarity_threshold=config.semantic_cache_threshold
+            )
         
         self.logger.info("UniversalOrchestrator initialized")
     
@@ -235,10 +244,26 @@ class UniversalOrchestrator:
             )
         
         try:
+            # Near-duplicate queries with the same history reuse the prior decision
+            prompt_fingerprint = SemanticCache.fingerprint(self._create_classification_prompt("", {}, None))
+            scope = json.dumps(
+                {"history": conversation_history.get("recent_interactions"), "context": context},
+                sort_keys=True,
+                cls=DateTimeEncoder
+            )
+            if self.routing_cache:
+                cached = self.routing_cache.lookup(user_query, prompt_fingerprint, scope)
+                if cached is not None:
+                    return cached
+            
             prompt = self._create_classification_prompt(user_query, conversation_history, context)
             response = await self.ai_engine.generate(prompt)
             
-            return self._parse_classification_response(response.content)
+            routing_decision = self._parse_classification_response(response.content)
+            if self.routing_cache and routing_decision.intent != RoutingIntent.UNKNOWN:
+                self.routing_cache.store(user_query, routing_decision, prompt_fingerprint, scope)
+            
+            return routing_decision
             
         except Exception as e:
             self.logger.error(f"AI classification failed: {e}")
@@ -3,8 +3,8 @@
 
 import re
 import logging
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Any, Pattern
+from dataclasses import dataclass, field
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -19,6 +19,11 @@ class IntentPattern:
     optional_entities: List[str]
     patterns: List[str]
     confidence_boost: float = 0.0
+    compiled_patterns: List[Pattern] = field(default_factory=list, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not self.compiled_patterns:
+            self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
 
 
 @dataclass
@@ -44,6 +49,45 @@ class ParameterExtractionResult:
 class ParameterExtractor:
     """Extract parameters from user requests and match to templates."""
     
+    # Entity patterns, compiled once at class load
+    EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE)
+    DOMAIN_PATTERN = re.compile(r'from\s+(\S+\.\w+)', re.IGNORECASE)
+    SUBJECT_PATTERNS = [
+        re.compile(r'subject[:\s]+["\']([^"\']+)["\']', re.IGNORECASE),
+        re.compile(r'with\s+subject\s+["\']([^"\']+)["\']', re.IGNORECASE),
+        re.compile(r'titled\s+["\']([^"\']+)["\']', re.IGNORECASE)
+    ]
+    CHANNEL_PATTERN = re.compile(r'([#@]\w+)')
+    CHANNEL_NAME_PATTERN = re.compile(r'channel\s+(\w+)', re.IGNORECASE)
+    URL_PATTERN = re.compile(
+        r'https?://[^\s<>"\']+|www\.[^\s<>"\']+|[^\s<>"\']+\.[a-z]{2,}(?:/[^\s<>"\']*)?',
+        re.IGNORECASE
+    )
+    FROM_TO_PATTERN = re.compile(r'from\s+([^\s]+)\s+to\s+([^\s]+)', re.IGNORECASE)
+    UNIX_PATH_PATTERN = re.compile(r'/[^\s<>"\']+|~/[^\s<>"\']*|\./[^\s<>"\']*')
+    WINDOWS_PATH_PATTERN = re.compile(r'[A-Za-z]:\\[^\s<>"\']+|\\\\[^\s<>"\']+|\.[/\\][^\s<>"\']*')
+    OPERATIONS = ['copy', 'move', 'compress', 'backup', 'organize', 'cleanup', 'transform', 'analyze']
+    OPERATION_PATTERN = re.compile(rf'\b({"|".join(OPERATIONS)})\b', re.IGNORECASE)
+    ANALYSIS_TYPES = {
+        'statistics': 'descriptive',
+        'stats': 'descriptive', 
+        'trends': 'trend',
+        'patterns': 'trend',
+        'anomalies': 'anomaly',
+        'outliers': 'anomaly',
+        'correlation': 'correlation',
+        'distribution': 'distribution',
+        'time series': 'time_series',
+        'comparison': 'comparison'
+    }
+    ANALYSIS_TYPE_PATTERN = re.compile(
+        rf'\b({"|".join(re.escape(keyword) for keyword in ANALYSIS_TYPES)})\b',
+        re.IGNORECASE
+    )
+    TIME_INTERVAL_PATTERN = re.compile(r'(?:every\s+)?(\d+)\s*(seconds?|minutes?|hours?|days?)', re.IGNORECASE)
+    DOMAIN_HINT_PATTERN = re.compile(r'from\s+(\w+)', re.IGNORECASE)
+    GENERAL_CHANNEL_PATTERN = re.compile(r'\b(general|random|alerts?|notifications?)\b', re.IGNORECASE)
+    
     def __init__(self):
         self.intent_patterns = self._initialize_patterns()
         self.entity_extractors = self._initialize_extractors()
@@ -162,8 +206,7 @@ class ParameterExtractor:
         entities = []
         
         # Email addresses
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        for match in re.finditer(email_pattern, text, re.IGNORECASE):
+        for match in self.EMAIL_PATTERN.finditer(text):
             entities.append(ExtractedEntity(
                 name="email_filter",
                 value=f"from:{match.group()}",
@@ -172,8 +215,7 @@ class ParameterExtractor:
             ))
         
         # Domain patterns
-        domain_pattern = r'from\s+(\S+\.\w+)'
-        for match in re.finditer(domain_pattern, text, re.IGNORECASE):
+        for match in self.DOMAIN_PATTERN.finditer(text):
             entities.append(ExtractedEntity(
                 name="email_filter",
                 value=f"from:{match.group(1)}",
@@ -186,8 +228,7 @@ class ParameterExtractor:
     def _extract_email_address(self, text: str) -> List[ExtractedEntity]:
         """Extract email addresses."""
         entities = []
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        for match in re.finditer(email_pattern, text, re.IGNORECASE):
+        for match in self.EMAIL_PATTERN.finditer(text):
             entities.append(ExtractedEntity(
                 name="sender_filter",
                 value=match.group(),
@@ -201,14 +242,8 @@ class ParameterExtractor:
         entities = []
         
         # Subject line patterns
-        patterns = [
-            r'subject[:\s]+["\']([^"\']+)["\']',
-            r'with\s+subject\s+["\']([^"\']+)["\']',
-            r'titled\s+["\']([^"\']+)["\']'
-        ]
-        
-        for pattern in patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        for pattern in self.SUBJECT_PATTERNS:
+            for match in pattern.finditer(text):
                 entities.append(ExtractedEntity(
                     name="subject_filter",
                     value=match.group(1),
@@ -223,8 +258,7 @@ class ParameterExtractor:
         entities = []
         
         # Channel patterns (#channel, @user)
-        channel_pattern = r'([#@]\w+)'
-        for match in re.finditer(channel_pattern, text):
+        for match in self.CHANNEL_PATTERN.finditer(text):
             entities.append(ExtractedEntity(
                 name="channel",
                 value=match.group(1),
@@ -233,8 +267,7 @@ class ParameterExtractor:
             ))
         
         # Channel name without #
-        channel_name_pattern = r'channel\s+(\w+)'
-        for match in re.finditer(channel_name_pattern, text, re.IGNORECASE):
+        for match in self.CHANNEL_NAME_PATTERN.finditer(text):
             entities.append(ExtractedEntity(
                 name="channel",
                 value=f"#{match.group(1)}",
@@ -247,9 +280,8 @@ class ParameterExtractor:
     def _extract_url(self, text: str) -> List[ExtractedEntity]:
         """Extract URLs."""
         entities = []
-        url_pattern = r'https?://[^\s<>"\']+|www\.[^\s<>"\']+|[^\s<>"\']+\.[a-z]{2,}(?:/[^\s<>"\']*)?'
         
-        for match in re.finditer(url_pattern, text, re.IGNORECASE):
+        for match in self.URL_PATTERN.finditer(text):
             url = match.group()
             if not url.startswith(('http://', 'https://')):
                 if url.startswith('www.'):
@@ -271,8 +303,7 @@ class ParameterExtractor:
         entities = []
         
         # Handle "from X to Y" pattern for file operations
-        from_to_pattern = r'from\s+([^\s]+)\s+to\s+([^\s]+)'
-        for match in re.finditer(from_to_pattern, text, re.IGNORECASE):
+        for match in self.FROM_TO_PATTERN.finditer(text):
             entities.append(ExtractedEntity(
                 name="input_path",
                 value=match.group(1),
@@ -287,8 +318,7 @@ class ParameterExtractor:
             ))
         
         # Unix/Linux paths
-        unix_path_pattern = r'/[^\s<>"\']+|~/[^\s<>"\']*|\./[^\s<>"\']*'
-        for match in re.finditer(unix_path_pattern, text):
+        for match in self.UNIX_PATH_PATTERN.finditer(text):
             # Skip if already captured in from_to pattern
             if not any(entity.position[0] <= match.start() <= entity.position[1] for entity in entities):
                 entities.append(ExtractedEntity(
@@ -299,8 +329,7 @@ class ParameterExtractor:
                 ))
         
         # Windows paths
-        windows_path_pattern = r'[A-Za-z]:\\[^\s<>"\']+|\\\\[^\s<>"\']+|\.[/\\][^\s<>"\']*'
-        for match in re.finditer(windows_path_pattern, text):
+        for match in self.WINDOWS_PATH_PATTERN.finditer(text):
             # Skip if already captured in from_to pattern
             if not any(entity.position[0] <= match.start() <= entity.position[1] for entity in entities):
                 entities.append(ExtractedEntity(
@@ -315,26 +344,33 @@ class ParameterExtractor:
     def _extract_operation(self, text: str) -> List[ExtractedEntity]:
         """Extract file operations."""
         entities = []
-        operations = ['copy', 'move', 'compress', 'backup', 'organize', 'cleanup', 'transform', 'analyze']
         
-        for operation in operations:
-            pattern = rf'\b{operation}\b'
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                entities.append(ExtractedEntity(
-                    name="operation",
-                    value=operation.lower(),
-                    confidence=0.9,
-                    position=(match.start(), match.end())
-                ))
+        # One scan for all operations; grouped in OPERATIONS order like per-operation scans
+        for match in self.OPERATION_PATTERN.finditer(text):
+            entities.append(ExtractedEntity(
+                name="operation",
+                value=match.group(1).lower(),
+                confidence=0.9,
+                position=(match.start(), match.end())
+            ))
         
+        order = {operation: index for index, operation in enumerate(self.OPERATIONS)}
+        entities.sort(key=lambda entity: order[entity.value])
         return entities
     
     def _extract_data_source(self, text: str) -> List[ExtractedEntity]:
         """Extract data sources."""
+        return self._data_source_entities(self._extract_url(text), self._extract_file_path(text))
+    
+    def _data_source_entities(
+        self,
+        url_entities: List[ExtractedEntity],
+        path_entities: List[ExtractedEntity]
+    ) -> List[ExtractedEntity]:
+        """Build data source entities from already extracted URLs and paths."""
         entities = []
         
         # URLs
-        url_entities = self._extract_url(text)
         for entity in url_entities:
             entities.append(ExtractedEntity(
                 name="data_source",
@@ -344,7 +380,6 @@ class ParameterExtractor:
             ))
         
         # File paths
-        path_entities = self._extract_file_path(text)
         for entity in path_entities:
             entities.append(ExtractedEntity(
                 name="data_source",
@@ -358,38 +393,29 @@ class ParameterExtractor:
     def _extract_analysis_type(self, text: str) -> List[ExtractedEntity]:
         """Extract analysis types."""
         entities = []
-        analysis_types = {
-            'statistics': 'descriptive',
-            'stats': 'descriptive', 
-            'trends': 'trend',
-            'patterns': 'trend',
-            'anomalies': 'anomaly',
-            'outliers': 'anomaly',
-            'correlation': 'correlation',
-            'distribution': 'distribution',
-            'time series': 'time_series',
-            'comparison': 'comparison'
-        }
+        keywords = []
         
-        for keyword, analysis_type in analysis_types.items():
-            pattern = rf'\b{re.escape(keyword)}\b'
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                entities.append(ExtractedEntity(
-                    name="analysis_type",
-                    value=analysis_type,
-                    confidence=0.8,
-                    position=(match.start(), match.end())
-                ))
+        # One scan for all keywords; grouped in ANALYSIS_TYPES order like per-keyword scans
+        for match in self.ANALYSIS_TYPE_PATTERN.finditer(text):
+            keyword = match.group(1).lower()
+            keywords.append(keyword)
+            entities.append(ExtractedEntity(
+                name="analysis_type",
+                value=self.ANALYSIS_TYPES[keyword],
+                confidence=0.8,
+                position=(match.start(), match.end())
+            ))
         
-        return entities
+        order = {keyword: index for index, keyword in enumerate(self.ANALYSIS_TYPES)}
+        ranked = sorted(zip(keywords, entities), key=lambda pair: order[pair[0]])
+        return [entity for _, entity in ranked]
     
     def _extract_time_interval(self, text: str) -> List[ExtractedEntity]:
         """Extract time intervals."""
         entities = []
         
         # Pattern for time intervals (e.g., "every 5 minutes", "30 seconds", "1 hour")
-        time_pattern = r'(?:every\s+)?(\d+)\s*(seconds?|minutes?|hours?|days?)'
-        for match in re.finditer(time_pattern, text, re.IGNORECASE):
+        for match in self.TIME_INTERVAL_PATTERN.finditer(text):
             value = int(match.group(1))
             unit = match.group(2).lower()
             
@@ -412,10 +438,50 @@ class ParameterExtractor:
         
         return entities
     
-    def calculate_intent_confidence(self, text: str, intent_pattern: IntentPattern) -> float:
-        """Calculate confidence score for an intent pattern."""
+    def extract_all_entities(self, text: str) -> Dict[str, List[ExtractedEntity]]:
+        """
+        Run every entity extractor once over the text.
+        
+        Extractors shared by several entity names (e.g. file paths, time
+        intervals) run once, and data sources reuse the URL and path results.
+        
+        Returns:
+            Entities keyed by extractor entity name
+        """
+        results_by_extractor: Dict[Any, List[ExtractedEntity]] = {}
+        
+        def run(extractor) -> List[ExtractedEntity]:
+            if extractor not in results_by_extractor:
+                results_by_extractor[extractor] = extractor(text)
+            return results_by_extractor[extractor]
+        
+        entities_by_name = {}
+        for entity_name, extractor in self.entity_extractors.items():
+            if extractor == self._extract_data_source:
+                entities_by_name[entity_name] = self._data_source_entities(
+                    run(self._extract_url), run(self._extract_file_path)
+                )
+            else:
+                entities_by_name[entity_name] = run(extractor)
+        
+        return entities_by_name
+    
+    def calculate_intent_confidence(
+        self,
+        text: str,
+        intent_pattern: IntentPattern,
+        entities_by_name: Optional[Dict[str, List[ExtractedEntity]]] = None
+    ) -> float:
+        """
+        Calculate confidence score for an intent pattern.
+        
+        Args:
+            text: User request
+            intent_pattern: Template intent pattern to score
+            entities_by_name: Shared result of extract_all_entities; extractors
+                are run for this pattern alone when omitted
+        """
         text_lower = text.lower()
-        words = text_lower.split()
         
         # Base score from keyword matching
         keyword_matches = sum(1 for keyword in intent_pattern.keywords if keyword in text_lower)
@@ -423,8 +489,8 @@ class ParameterExtractor:
         
         # Pattern matching score
         pattern_score = 0
-        for pattern in intent_pattern.patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in intent_pattern.compiled_patterns:
+            if pattern.search(text):
                 pattern_score = 0.3
                 break
         
@@ -432,7 +498,10 @@ class ParameterExtractor:
         entity_score = 0
         for entity_name in intent_pattern.required_entities:
             if entity_name in self.entity_extractors:
-                entities = self.entity_extractors[entity_name](text)
+                if entities_by_name is not None:
+                    entities = entities_by_name[entity_name]
+                else:
+                    entities = self.entity_extractors[entity_name](text)
                 if entities:
                     entity_score += 0.2
         
@@ -440,13 +509,21 @@ class ParameterExtractor:
         total_score = (keyword_score * 0.4) + pattern_score + entity_score + intent_pattern.confidence_boost
         return min(total_score, 1.0)
     
-    def extract_entities(self, text: str, entity_names: List[str]) -> List[ExtractedEntity]:
-        """Extract specified entities from text."""
+    def extract_entities(
+        self,
+        text: str,
+        entity_names: List[str],
+        entities_by_name: Optional[Dict[str, List[ExtractedEntity]]] = None
+    ) -> List[ExtractedEntity]:
+        """Extract specified entities from text, reusing extract_all_entities output if given."""
         all_entities = []
         
         for entity_name in entity_names:
             if entity_name in self.entity_extractors:
-                entities = self.entity_extractors[entity_name](text)
+                if entities_by_name is not None:
+                    entities = entities_by_name[entity_name]
+                else:
+                    entities = self.entity_extractors[entity_name](text)
                 all_entities.extend(entities)
         
         # Remove duplicates and sort by position
@@ -472,10 +549,13 @@ class ParameterExtractor:
         """
         logger.info(f"Extracting parameters from: {user_request}")
         
+        # Single pass: every extractor runs once and all templates share the result
+        entities_by_name = self.extract_all_entities(user_request)
+        
         # Calculate confidence for each template
         template_scores = {}
         for template_name, pattern in self.intent_patterns.items():
-            confidence = self.calculate_intent_confidence(user_request, pattern)
+            confidence = self.calculate_intent_confidence(user_request, pattern, entities_by_name)
             template_scores[template_name] = confidence
             logger.debug(f"Template {template_name}: confidence {confidence:.3f}")
         
@@ -499,7 +579,7 @@ class ParameterExtractor:
         # Extract entities for the best template
         pattern = self.intent_patterns[best_template_name]
         all_entity_names = pattern.required_entities + pattern.optional_entities
-        entities = self.extract_entities(user_request, all_entity_names)
+        entities = self.extract_entities(user_request, all_entity_names, entities_by_name)
         
         # Convert entities to parameters (take the first/best match for each entity type)
         extracted_parameters = {}
@@ -553,14 +633,14 @@ class ParameterExtractor:
             # Infer email filter from context if missing
             if "email_filter" not in result:
                 # Look for company domains or common patterns
-                domain_hints = re.findall(r'from\s+(\w+)', original_text, re.IGNORECASE)
+                domain_hints = self.DOMAIN_HINT_PATTERN.findall(original_text)
                 if domain_hints:
                     result["email_filter"] = f"from:{domain_hints[0]}"
         
         elif template_name == "slack_notifier":
             if "channel" not in result:
                 # Look for general channel references
-                general_refs = re.findall(r'\b(general|random|alerts?|notifications?)\b', original_text, re.IGNORECASE)
+                general_refs = self.GENERAL_CHANNEL_PATTERN.findall(original_text)
                 if general_refs:
                     result["channel"] = f"#{general_refs[0].lower()}"
         
@@ -4,14 +4,21 @@
 import os
 import re
 import ast
+import json
+import hashlib
 import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Union
 import jinja2
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Per-process engine used by render_many workers
+_worker_engine: Optional["TemplateEngine"] = None
+
 
 @dataclass
 class TemplateInfo:
@@ -42,19 +49,41 @@ class TemplateValidationError(Exception):
 class TemplateEngine:
     """Jinja2-based template engine for agent code generation."""
     
-    def __init__(self, templates_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        templates_dir: Optional[Path] = None,
+        bytecode_cache_dir: Optional[Path] = None,
+        validation_cache_size: int = 1024
+    ):
         self.templates_dir = templates_dir or Path(__file__).parent / "library"
         self.templates_dir.mkdir(exist_ok=True)
         
+        # Compiled template bytecode is cached on disk and shared across
+        # processes; defaults to a per-user directory under the system temp dir
+        self.bytecode_cache_dir = bytecode_cache_dir
+        if bytecode_cache_dir is not None:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = jinja2.FileSystemBytecodeCache(str(bytecode_cache_dir))
+        else:
+            bytecode_cache = jinja2.FileSystemBytecodeCache()
+        
         # Initialize Jinja2 environment
         self.jinja_env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(str(self.templates_dir)),
             autoescape=False,  # We're generating Python code
             trim_blocks=True,
             lstrip_blocks=True,
-            undefined=jinja2.StrictUndefined  # Fail on undefined variables
+            undefined=jinja2.StrictUndefined,  # Fail on undefined variables
+            bytecode_cache=bytecode_cache
         )
         
+        # Loaded templates by name, so rendering skips the loader entirely
+        self._compiled_templates: Dict[str, jinja2.Template] = {}
+        
+        # Validation outcome by hash of rendered code: None if valid, else the error message
+        self.validation_cache_size = validation_cache_size
+        self._validation_cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        
         # Add custom filters
         self.jinja_env.filters['snake_case'] = self._snake_case
         self.jinja_env.filters['camel_case'] = self._camel_case
@@ -176,7 +205,7 @@ class TemplateEngine:
         try:
             # Load and render template
             template_file = f"{template_name}_template.j2"
-            template = self.jinja_env.get_template(template_file)
+            template = self._get_compiled_template(template_name)
             
             # Add template metadata to parameters
             render_params = parameters.copy()
@@ -207,16 +236,36 @@ class TemplateEngine:
         except jinja2.TemplateError as e:
             raise TemplateValidationError(f"Template rendering failed: {e}")
     
+    def _get_compiled_template(self, template_name: str) -> jinja2.Template:
+        """Get a loaded template, going through the loader only on first use."""
+        template = self._compiled_templates.get(template_name)
+        if template is None:
+            template = self.jinja_env.get_template(f"{template_name}_template.j2")
+            self._compiled_templates[template_name] = template
+        return template
+    
     def _validate_code(self, code: str) -> None:
         """
         Validate that the rendered code is syntactically correct Python.
         
+        Results are memoized by a hash of the code, so identical renders are
+        only parsed once.
+        
         Args:
             code: Python code to validate
             
         Raises:
             TemplateValidationError: If code is invalid
         """
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        if code_hash in self._validation_cache:
+            self._validation_cache.move_to_end(code_hash)
+            error_message = self._validation_cache[code_hash]
+            if error_message is not None:
+                raise TemplateValidationError(error_message)
+            return
+        
+        error_message = None
         try:
             # Parse the code to check syntax
             ast.parse(code)
@@ -225,9 +274,102 @@ class TemplateEngine:
             self._validate_agent_class(code)
             
         except SyntaxError as e:
-            raise TemplateValidationError(f"Invalid Python syntax: {e}")
+            error_message = f"Invalid Python syntax: {e}"
         except Exception as e:
-            raise TemplateValidationError(f"Code validation failed: {e}")
+            error_message = f"Code validation failed: {e}"
+        
+        if self.validation_cache_size > 0:
+            self._validation_cache[code_hash] = error_message
+            while len(self._validation_cache) > self.validation_cache_size:
+                self._validation_cache.popitem(last=False)
+        
+        if error_message is not None:
+            raise TemplateValidationError(error_message)
+    
+    def render_many(
+        self,
+        template_name: str,
+        parameter_sets: List[Dict[str, Any]],
+        validate: bool = True,
+        max_workers: Optional[int] = None,
+        chunksize: int = 64,
+        return_exceptions: bool = False
+    ) -> List[Union[str, TemplateValidationError]]:
+        """
+        Render a template for many parameter sets.
+        
+        Identical parameter sets are rendered once. Unique sets are split into
+        chunks and rendered across a process pool; small batches (a single
+        chunk) or ``max_workers=1`` render in-process.
+        
+        Args:
+            template_name: Name of the template to render
+            parameter_sets: One parameter dict per agent
+            validate: Whether to validate the rendered code
+            max_workers: Process pool size (defaults to the CPU count)
+            chunksize: Parameter sets per worker task
+            return_exceptions: Return TemplateValidationError instances in
+                place of failed renders instead of raising the first one
+            
+        Returns:
+            Rendered code (or errors) in the order of ``parameter_sets``
+            
+        Raises:
+            TemplateValidationError: On the first failed render, unless
+                ``return_exceptions`` is set
+        """
+        if template_name not in self.templates:
+            raise TemplateValidationError(f"Template '{template_name}' not found")
+        
+        # Deduplicate identical parameter sets
+        unique_params: List[Dict[str, Any]] = []
+        positions: List[int] = []
+        seen: Dict[str, int] = {}
+        for params in parameter_sets:
+            key = json.dumps(params, sort_keys=True, default=str)
+            if key not in seen:
+                seen[key] = len(unique_params)
+                unique_params.append(params)
+            positions.append(seen[key])
+        
+        chunks = [
+            unique_params[i:i + chunksize]
+            for i in range(0, len(unique_params), chunksize)
+        ]
+        workers = max_workers or os.cpu_count() or 1
+        
+        if workers == 1 or len(chunks) <= 1:
+            chunk_results = [
+                _render_chunk_with(self, template_name, chunk, validate)
+                for chunk in chunks
+            ]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                initializer=_init_render_worker,
+                initargs=(self.templates_dir, self.bytecode_cache_dir, self.templates)
+            ) as executor:
+                chunk_results = list(executor.map(
+                    _render_chunk,
+                    [(template_name, chunk, validate) for chunk in chunks]
+                ))
+        
+        unique_results: List[Union[str, TemplateValidationError]] = []
+        for chunk_result in chunk_results:
+            for success, value in chunk_result:
+                unique_results.append(value if success else TemplateValidationError(value))
+        
+        results = [unique_results[position] for position in positions]
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, TemplateValidationError):
+                    raise result
+        
+        logger.info(
+            f"Rendered {len(parameter_sets)} agents from template {template_name} "
+            f"({len(unique_params)} unique)"
+        )
+        return results
     
     def _validate_agent_class(self, code: str) -> None:
         """
@@ -290,8 +432,9 @@ class TemplateEngine:
             with open(template_file, 'w') as f:
                 f.write(template_content)
             
-            # Register template
+            # Register template, dropping any previously loaded version
             self.templates[template_name] = template_info
+            self._compiled_templates.pop(template_name, None)
             
             logger.info(f"Created custom template: {template_name}")
             
@@ -323,4 +466,39 @@ class TemplateEngine:
             )
             return True, rendered_code
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+
+
+def _render_chunk_with(
+    engine: TemplateEngine,
+    template_name: str,
+    parameter_sets: List[Dict[str, Any]],
+    validate: bool
+) -> List[Tuple[bool, str]]:
+    """Render a chunk of parameter sets, capturing failures as messages."""
+    results = []
+    for params in parameter_sets:
+        try:
+            results.append((True, engine.render_template(template_name, params, validate=validate)))
+        except TemplateValidationError as e:
+            results.append((False, str(e)))
+    return results
+
+
+def _init_render_worker(
+    templates_dir: Path,
+    bytecode_cache_dir: Optional[Path],
+    templates: Dict[str, TemplateInfo]
+) -> None:
+    """Process pool initializer: build one engine per worker process."""
+    global _worker_engine
+    # Per-agent INFO logs from every worker would swamp bulk runs
+    logger.setLevel(logging.WARNING)
+    _worker_engine = TemplateEngine(templates_dir, bytecode_cache_dir)
+    _worker_engine.templates.update(templates)
+
+
+def _render_chunk(args: Tuple[str, List[Dict[str, Any]], bool]) -> List[Tuple[bool, str]]:
+    """Process pool task: render a chunk with the worker's engine."""
+    template_name, parameter_sets, validate = args
+    return _render_chunk_with(_worker_engine, template_name, parameter_sets, validate)
@@ -0,0 +1,156 @@
+"""In-memory stand-in for the docker SDK client used by the sandbox tests."""
+
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Dict, List, Tuple
+
+import docker
+
+ExecResult = namedtuple("ExecResult", ["exit_code", "output"])
+
+
+class FakeContainer:
+
+    def __init__(self, client: "FakeDockerClient", name: str, kwargs: Dict[str, Any]):
+        self.client = client
+        self.name = name
+        self.id = f"id-{name}"
+        self.kwargs = kwargs
+        self.status = "created"
+        self.attrs = {
+            "Created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "Config": {"Image": kwargs.get("image"), "Labels": kwargs.get("labels", {})}
+        }
+        self.exec_calls: List[Dict[str, Any]] = []
+        self.updates: List[Dict[str, Any]] = []
+        self.exec_output = b'{"status": "success"}'
+        self.samples = 0
+        # (user, command) of processes running besides PID 1, e.g. left in the background by an agent
+        self.processes: List[Tuple[str, str]] = []
+
+    def start(self):
+        self.client.sleep("start")
+        self.status = "running"
+
+    def stop(self, timeout=10):
+        self.client.sleep("stop")
+        self.status = "exited"
+
+    def remove(self, force=False):
+        self.client.sleep("remove")
+        with self.client.lock:
+            self.client.containers.by_name.pop(self.name, None)
+            self.client.removed.append(self.name)
+        self.status = "removed"
+
+    def reload(self):
+        self.client.sleep("reload")
+        if self.name not in self.client.containers.by_name:
+            raise docker.errors.NotFound(f"No such container: {self.name}")
+
+    def wait(self, timeout=None):
+        self.client.sleep("wait")
+        self.status = "exited"
+        return {"StatusCode": 0}
+
+    def logs(self, stdout=True, stderr=True):
+        self.client.sleep("logs")
+        return self.exec_output
+
+    def exec_run(self, cmd, **kwargs):
+        self.client.sleep("exec_run")
+        self.exec_calls.append({"cmd": cmd, **kwargs})
+        if self.status != "running":
+            raise docker.errors.APIError(f"Container {self.name} is not running")
+        if "kill -9 -1" in cmd[-1]:
+            # A user can only kill its own processes; the script fails if any survive
+            user = kwargs.get("user", self.kwargs.get("user"))
+            self.processes = [p for p in self.processes if user != "root" and p[0] != user]
+            return ExecResult(1 if self.processes else 0, b"")
+        return ExecResult(0, self.exec_output)
+
+    def update(self, **kwargs):
+        self.client.sleep("update")
+        self.updates.append(kwargs)
+
+    def stats(self, stream=False, decode=False):
+        if stream:
+            return self._stream_stats()
+        self.client.sleep("stats")
+        return self._sample()
+
+    def _stream_stats(self):
+        """Like the daemon: one sample per interval until the container stops"""
+        while self.status == "running":
+            self.client.sleep("stats")
+            yield self._sample()
+
+    def _sample(self):
+        self.samples += 1
+        return {
+            "cpu_stats": {"cpu_usage": {"total_usage": 200, "percpu_usage": [1, 1]}, "system_cpu_usage": 2000},
+            "precpu_stats": {"cpu_usage": {"total_usage": 100}, "system_cpu_usage": 1000},
+            "memory_stats": {"usage": 64 * 1024 * 1024, "limit": 256 * 1024 * 1024},
+            "networks": {}
+        }
+
+
+class FakeContainers:
+
+    def __init__(self, client: "FakeDockerClient"):
+        self.client = client
+        self.by_name: Dict[str, FakeContainer] = {}
+        self.created = 0
+
+    def create(self, **kwargs) -> FakeContainer:
+        self.client.sleep("create")
+        container = FakeContainer(self.client, kwargs["name"], kwargs)
+        with self.client.lock:
+            self.by_name[container.name] = container
+            self.created += 1
+        return container
+
+    def get(self, name: str) -> FakeContainer:
+        try:
+            return self.by_name[name]
+        except KeyError:
+            raise docker.errors.NotFound(f"No such container: {name}")
+
+
+class FakeImages:
+
+    def get(self, name):
+        return {"name": name}
+
+
+class FakeNetworks:
+
+    def list(self, names=None):
+        return list(names or [])
+
+
+class FakeDockerClient:
+    """Records containers in memory; ``latency`` maps an operation name to seconds of blocking sleep."""
+
+    def __init__(self, latency: Dict[str, float] = None):
+        self.latency = latency or {}
+        self.lock = threading.Lock()
+        self.containers = FakeContainers(self)
+        self.images = FakeImages()
+        self.networks = FakeNetworks()
+        self.removed: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def sleep(self, operation: str):
+        delay = self.latency.get(operation, 0)
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if delay:
+                time.sleep(delay)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
@@ -0,0 +1,187 @@
+"""In-memory stand-in for the redis.asyncio client that counts commands and round trips."""
+
+import asyncio
+import fnmatch
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+
+class FakeRedisServer:
+    """Data and pub/sub channels shared by every FakeRedis connected to it, like one Redis server."""
+
+    def __init__(self):
+        self.strings: Dict[str, str] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.ttls: Dict[str, int] = {}
+        self.subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self.pattern_subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self.config: Dict[str, str] = {"notify-keyspace-events": ""}
+
+    def deliver(self, channel: str, message: str) -> int:
+        queues = self.subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait({"type": "message", "pattern": None, "channel": channel, "data": message})
+        delivered = len(queues)
+        for pattern, queues in self.pattern_subscribers.items():
+            if fnmatch.fnmatchcase(channel, pattern):
+                for queue in queues:
+                    queue.put_nowait({"type": "pmessage", "pattern": pattern, "channel": channel, "data": message})
+                delivered += len(queues)
+        return delivered
+
+    def notify(self, key: str, event: str, event_class: str):
+        """Keyspace notification for a write, when notify-keyspace-events enables it"""
+        flags = self.config["notify-keyspace-events"]
+        if "K" in flags and (event_class in flags or "A" in flags):
+            self.deliver(f"__keyspace@0__:{key}", event)
+
+
+class FakePipeline:
+
+    def __init__(self, client: "FakeRedis"):
+        self.client = client
+        self.queued: List[tuple] = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        self.client.round_trips += 1
+        queued, self.queued = self.queued, []
+        return [self.client.run(name, *args, **kwargs) for name, args, kwargs in queued]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.queued = []
+
+
+class FakePubSub:
+
+    def __init__(self, server: FakeRedisServer):
+        self.server = server
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.channels: List[str] = []
+        self.patterns: List[str] = []
+
+    async def subscribe(self, channel: str):
+        self.server.subscribers.setdefault(channel, []).append(self.queue)
+        self.channels.append(channel)
+
+    async def unsubscribe(self, channel: str):
+        if channel in self.channels:
+            self.server.subscribers[channel].remove(self.queue)
+            self.channels.remove(channel)
+
+    async def psubscribe(self, pattern: str):
+        self.server.pattern_subscribers.setdefault(pattern, []).append(self.queue)
+        self.patterns.append(pattern)
+
+    async def punsubscribe(self, *patterns: str):
+        for pattern in list(patterns or self.patterns):
+            if pattern in self.patterns:
+                self.server.pattern_subscribers[pattern].remove(self.queue)
+                self.patterns.remove(pattern)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout: Optional[float] = 0.0):
+        try:
+            async with asyncio.timeout(timeout):
+                return await self.queue.get()
+        except TimeoutError:
+            return None
+
+    async def close(self):
+        for channel in list(self.channels):
+            await self.unsubscribe(channel)
+        await self.punsubscribe()
+
+
+class FakeRedis:
+    """One client connection; ``commands`` counts every command, ``round_trips`` every network exchange."""
+
+    def __init__(self, server: Optional[FakeRedisServer] = None):
+        self.server = server or FakeRedisServer()
+        self.commands: Counter = Counter()
+        self.round_trips = 0
+        self.connection_pool = SimpleNamespace(connection_kwargs={"db": 0})
+
+    def reset_counts(self):
+        self.commands.clear()
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self.server)
+
+    def __getattr__(self, name):
+        if not hasattr(FakeRedis, f"_{name}"):
+            raise AttributeError(name)
+
+        async def command(*args, **kwargs):
+            self.round_trips += 1
+            return self.run(name, *args, **kwargs)
+        return command
+
+    def run(self, name: str, *args, **kwargs) -> Any:
+        self.commands[name] += 1
+        return getattr(self, f"_{name}")(*args, **kwargs)
+
+    def _get(self, key):
+        return self.server.strings.get(key)
+
+    def _mget(self, keys):
+        return [self.server.strings.get(key) for key in keys]
+
+    def _set(self, key, value, ex=None):
+        self.server.strings[key] = value
+        if ex:
+            self.server.ttls[key] = ex
+        self.server.notify(key, "set", "$")
+        return True
+
+    def _setex(self, key, ttl, value):
+        self.server.strings[key] = value
+        self.server.ttls[key] = ttl
+        self.server.notify(key, "setex", "$")
+        return True
+
+    def _delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self.server.strings.pop(key, None) is not None or self.server.hashes.pop(key, None) is not None:
+                deleted += 1
+                self.server.notify(key, "del", "g")
+        return deleted
+
+    def _hgetall(self, key):
+        return dict(self.server.hashes.get(key, {}))
+
+    def _hset(self, key, field=None, value=None, mapping=None):
+        fields = dict(mapping or {})
+        if field is not None:
+            fields[field] = value
+        stored = self.server.hashes.setdefault(key, {})
+        added = len(set(fields) - set(stored))
+        stored.update(fields)
+        return added
+
+    def _expire(self, key, ttl):
+        self.server.ttls[key] = ttl
+        return key in self.server.hashes or key in self.server.strings
+
+    def _publish(self, channel, message):
+        return self.server.deliver(channel, message)
+
+    def _config_get(self, name):
+        return {name: self.server.config.get(name, "")}
+
+    def _config_set(self, name, value):
+        self.server.config[name] = value
+        return True
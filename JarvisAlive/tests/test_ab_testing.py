@@ -0,0 +1,164 @@
+"""Tests for streaming, sequential A/B testing and Thompson-sampling allocation in AdaptiveSystem."""
+
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from departments.sales.ab_testing import SequentialABTest, msprt_p_value
+from departments.sales.adaptive_system import ABTest, AdaptiveSystem
+
+
+def make_test(system, variants, test_id="subject_test"):
+    test = ABTest(
+        test_id=test_id,
+        name="Subject line test",
+        description="Question vs statement subject lines",
+        hypothesis="Question subject lines get more replies",
+        workflow_id="outreach",
+        variants={variant: {} for variant in variants},
+        traffic_allocation={variant: 1 / len(variants) for variant in variants},
+        success_metrics=["reply_rate", "open_rate"],
+        start_date=datetime.now()
+    )
+    system.create_ab_test(test)
+    return test
+
+
+def run_campaign(system, test, reply_rates, sends, rng):
+    """Send up to ``sends`` messages, one result per send, until the test stops"""
+    sent = {variant: 0 for variant in reply_rates}
+    for _ in range(sends):
+        variant = system.choose_ab_variant(test.test_id, rng)
+        sent[variant] += 1
+        system.record_ab_result(test.test_id, variant, "reply_rate",
+                                1.0 if rng.random() < reply_rates[variant] else 0.0)
+        if test.status == "completed":
+            break
+    return sent
+
+
+class TestStreamingStatistics:
+
+    def test_summary_matches_recorded_values(self):
+        system = AdaptiveSystem()
+        make_test(system, ["A", "B"])
+        rng = random.Random(3)
+        recorded = {"A": [], "B": []}
+        for _ in range(300):
+            variant = rng.choice("AB")
+            value = rng.random() * 0.3
+            recorded[variant].append(value)
+            system.record_ab_result("subject_test", variant, "reply_rate", value, sample_size=20)
+            system.record_ab_result("subject_test", variant, "open_rate", value * 2, sample_size=20)
+
+        analysis = system.analyze_ab_test("subject_test")
+        for variant, values in recorded.items():
+            summary = analysis["variants"][variant]
+            assert summary["mean"] == pytest.approx(statistics.mean(values))
+            assert summary["std_dev"] == pytest.approx(statistics.stdev(values))
+            assert summary["sample_size"] == len(values)
+            assert summary["trials"] == 20 * len(values)
+            assert analysis["secondary_metrics"][f"{variant}:open_rate"]["mean"] == pytest.approx(2 * statistics.mean(values))
+        assert analysis["primary_metric"] == "reply_rate"
+
+    def test_no_data_and_unknown_test(self):
+        system = AdaptiveSystem()
+        make_test(system, ["A", "B"])
+        assert system.analyze_ab_test("subject_test")["status"] == "no_data"
+        with pytest.raises(ValueError):
+            system.record_ab_result("missing", "A", "reply_rate", 1.0, 1)
+        with pytest.raises(ValueError):
+            system.choose_ab_variant("missing")
+
+    def test_msprt_p_value(self):
+        assert msprt_p_value(0.0, 1e-4, 1e-4) == 1.0
+        assert msprt_p_value(0.05, 1e-4, 1e-4) < 0.01
+        assert msprt_p_value(0.05, 0.0, 1e-4) == 1.0
+
+
+class TestSequentialTesting:
+
+    def test_false_positive_rate_with_continuous_peeking(self):
+        """A/A tests checked after every send stay within alpha."""
+        rng = random.Random(11)
+        simulations, false_positives = 120, 0
+        for i in range(simulations):
+            system = AdaptiveSystem({"ab_alpha": 0.05})
+            test = make_test(system, ["A", "B"])
+            run_campaign(system, test, {"A": 0.1, "B": 0.1}, 3_000, rng)
+            false_positives += test.status == "completed"
+        print(f"✅ A/A false positives: {false_positives}/{simulations}")
+        assert false_positives / simulations <= 0.08
+
+    def test_stops_early_and_cuts_wasted_sends(self):
+        rng = random.Random(5)
+        reply_rates = {"A": 0.10, "B": 0.15}
+        # Fixed 50/50 design: 80% power, alpha 0.05 needs ~690 sends per arm
+        fixed_losing_sends = 690
+
+        results, stopped = [], None
+        for _ in range(30):
+            system = AdaptiveSystem()
+            test = make_test(system, ["A", "B"])
+            sent = run_campaign(system, test, reply_rates, 30_000, rng)
+            results.append((test.winner, sent["A"]))
+            if test.winner is not None:
+                stopped = (system, test)
+
+        winners = [winner for winner, _ in results]
+        losing_sends = statistics.median(sends for _, sends in results)
+        print(f"✅ Winner B in {winners.count('B')}/{len(results)} tests; median sends to losing variant "
+              f"{losing_sends:.0f} (fixed 50/50 design: {fixed_losing_sends})")
+        assert winners.count("B") >= 27
+        assert winners.count("A") <= 1
+        assert losing_sends < fixed_losing_sends
+
+        system, test = stopped
+        analysis = system.analyze_ab_test("subject_test")
+        assert analysis["stopped_early"] and analysis["winner"] == test.winner
+        assert test.statistical_significance > 0.95
+        # A stopped test always serves the winner
+        assert {system.choose_ab_variant("subject_test", rng) for _ in range(50)} == {test.winner}
+
+    def test_losing_variant_is_eliminated(self):
+        sequential = SequentialABTest(["A", "B", "C"], min_samples=50)
+        rng = random.Random(8)
+        rates = {"A": 0.3, "B": 0.3, "C": 0.05}
+        for _ in range(2_000):
+            for variant in ("A", "B", "C"):
+                if variant in sequential.eliminated:
+                    continue
+                sequential.variant_stats(variant).add(1.0 if rng.random() < rates[variant] else 0.0)
+                sequential.update(variant)
+            if "C" in sequential.eliminated:
+                break
+
+        assert "C" in sequential.eliminated
+        assert not sequential.stopped
+        assert "C" not in {sequential.choose_variant(rng) for _ in range(200)}
+
+
+class TestConstantTimeAnalysis:
+
+    def test_analysis_cost_independent_of_results(self):
+        def analysis_time(results):
+            system = AdaptiveSystem({"ab_min_samples": 10 ** 9})  # Never stop
+            make_test(system, ["A", "B", "C"])
+            rng = random.Random(1)
+            for i in range(results):
+                system.record_ab_result("subject_test", "ABC"[i % 3], "reply_rate", rng.random(), 10)
+            start = time.perf_counter()
+            for _ in range(1_000):
+                system.analyze_ab_test("subject_test")
+            return (time.perf_counter() - start) / 1_000
+
+        small, large = analysis_time(300), analysis_time(300_000)
+        print(f"✅ analyze_ab_test: {small * 1e6:.0f}µs at 300 results, {large * 1e6:.0f}µs at 300,000")
+        assert large < small * 3
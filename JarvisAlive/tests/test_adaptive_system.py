@@ -0,0 +1,270 @@
+"""Tests and ingestion benchmark for the incrementally maintained AdaptiveSystem summaries."""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from departments.sales.adaptive_system import AdaptiveSystem, PatternType
+from departments.sales.metric_series import MetricSeries, RunningStats, SubsequenceCounter
+
+
+T0 = datetime(2026, 1, 5, 9, 0)
+
+
+def brute_force_summaries(system):
+    """Per-series values, sequences and hourly durations recomputed from historical_data"""
+    series, sequences, hourly = {}, {}, {}
+    for dp in system.historical_data:
+        series.setdefault((dp.workflow_id, dp.step_id, dp.metric_name), []).append(dp.value)
+        sequences.setdefault(dp.workflow_id, []).append(dp.step_id)
+        if dp.metric_name == "duration":
+            count, total = hourly.get(dp.timestamp.hour, (0, 0.0))
+            hourly[dp.timestamp.hour] = (count + 1, total + dp.value)
+    return series, sequences, hourly
+
+
+# The batch computations the running summaries replace
+def reference_trend(values):
+    if len(values) < 5:
+        return None
+    n = len(values)
+    x = list(range(n))
+    sum_x, sum_y = sum(x), sum(values)
+    sum_xy = sum(x[i] * values[i] for i in range(n))
+    sum_x2 = sum(x[i] * x[i] for i in range(n))
+    slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
+
+    mean_x, mean_y = sum_x / n, sum_y / n
+    numerator = sum((x[i] - mean_x) * (values[i] - mean_y) for i in range(n))
+    denominator = (sum((x[i] - mean_x) ** 2 for i in range(n)) *
+                   sum((values[i] - mean_y) ** 2 for i in range(n))) ** 0.5
+    if denominator == 0:
+        return None
+    confidence = abs(numerator / denominator)
+    if confidence < 0.6:
+        return None
+    return {
+        "direction": "increasing" if slope > 0 else "decreasing",
+        "magnitude": abs(slope),
+        "confidence": confidence,
+        "slope": slope
+    }
+
+
+def reference_common_subsequences(sequences, min_length=2):
+    counts = Counter()
+    for i in range(len(sequences) - min_length + 1):
+        for length in range(min_length, min(6, len(sequences) - i + 1)):
+            counts[" -> ".join(sequences[i:i + length])] += 1
+    return {subseq: count for subseq, count in counts.items() if count > 1}
+
+
+class TestRunningStats:
+
+    def test_sliding_window_matches_batch(self):
+        rng = random.Random(2)
+        stats = RunningStats()
+        values, first_x = [], 0
+        for step in range(5_000):
+            if values and rng.random() < 0.4:
+                stats.remove(first_x, values.pop(0))
+                first_x += 1
+            else:
+                value = rng.gauss(100, 15) + step * rng.choice([0, 0.05])
+                stats.add(first_x + len(values), value)
+                values.append(value)
+
+            if len(values) >= 2:
+                assert stats.mean == pytest.approx(statistics.mean(values), rel=1e-9, abs=1e-9)
+                assert stats.variance == pytest.approx(statistics.variance(values), rel=1e-6, abs=1e-9)
+            expected = reference_trend(values)
+            actual = stats.trend()
+            assert (actual is None) == (expected is None)
+            if expected:
+                assert actual["direction"] == expected["direction"]
+                assert actual["slope"] == pytest.approx(expected["slope"], rel=1e-6, abs=1e-9)
+                assert actual["confidence"] == pytest.approx(expected["confidence"], rel=1e-6)
+
+    def test_ewma(self):
+        stats = RunningStats(alpha=0.5)
+        for x, value in enumerate([10.0, 20.0, 20.0]):
+            stats.add(x, value)
+        assert stats.ewma == 17.5
+
+    def test_anomalies_expire_with_their_points(self):
+        series = MetricSeries(anomaly_threshold=3.0)
+        points = [type("P", (), {"value": v, "timestamp": T0})() for v in [10, 11, 9, 10, 11, 9, 10, 500, 10]]
+        for point in points:
+            series.append(point)
+        assert series.anomaly_summary()["count"] == 1
+        for _ in range(7):
+            series.popleft()
+        assert series.anomaly_summary()["count"] == 1
+        series.popleft()
+        assert series.anomaly_summary() == {"count": 0, "confidence": 0, "magnitude": 0}
+
+
+class TestSubsequenceCounter:
+
+    def test_matches_full_recount(self):
+        rng = random.Random(5)
+        counter, items = SubsequenceCounter(), []
+        for _ in range(3_000):
+            if items and rng.random() < 0.45:
+                assert counter.popleft() == items.pop(0)
+            else:
+                item = rng.choice("abc")
+                counter.append(item)
+                items.append(item)
+            recount = reference_common_subsequences(items)
+            assert {" -> ".join(run): count for run, count in counter.counts.items() if count > 1} == recount
+
+
+class TestRetention:
+
+    def test_expiry_by_age_and_count(self):
+        system = AdaptiveSystem({"data_retention_days": 1, "max_data_points": 500})
+        rng = random.Random(9)
+        start = datetime.now() - timedelta(minutes=3_000)
+        for i in range(3_000):
+            system.record_data_point(f"wf_{i % 3}", f"step_{i % 4}", rng.choice(["duration", "cost", "success_rate"]),
+                                     rng.random() * 10, timestamp=start + timedelta(minutes=i))
+            if i % 97 == 0:
+                assert len(system.historical_data) <= 500
+                cutoff = start + timedelta(minutes=i) - timedelta(days=1)
+                assert all(dp.timestamp > cutoff for dp in system.historical_data)
+
+        series, sequences, hourly = brute_force_summaries(system)
+        assert set(system.metric_series) == set(series)
+        for key, values in series.items():
+            stats = system.metric_series[key].stats
+            assert stats.count == len(values)
+            assert stats.mean == pytest.approx(statistics.mean(values))
+        assert {wf: list(counter.items) for wf, counter in system.step_sequences.items()} == sequences
+        assert {hour: bucket[0] for hour, bucket in system.hourly_durations.items()} == {
+            hour: count for hour, (count, _) in hourly.items()
+        }
+
+    def test_retention_window_follows_time(self):
+        system = AdaptiveSystem({"data_retention_days": 2})
+        start = datetime.now() - timedelta(days=9)
+        for day in range(10):
+            system.record_data_point("wf", "step", "duration", day, timestamp=start + timedelta(days=day))
+        assert [dp.value for dp in system.historical_data] == [8, 9]
+        assert system.get_metric_summary("wf", "step", "duration")["mean"] == 8.5
+
+    def test_out_of_order_points_are_rejected(self):
+        system = AdaptiveSystem({"data_retention_days": 2})
+        now = datetime.now()
+        system.record_data_point("wf", "step", "duration", 1.0, timestamp=now - timedelta(days=1))
+        with pytest.raises(ValueError):
+            system.record_data_point("wf", "step", "duration", 2.0, timestamp=now - timedelta(days=1, hours=1))
+        with pytest.raises(ValueError):
+            system.record_data_point("wf", "step", "duration", 3.0, timestamp=now + timedelta(days=5))
+        system.record_data_point("wf", "step", "duration", 4.0)
+        assert [dp.value for dp in system.historical_data] == [1.0, 4.0]
+        assert system.get_metric_summary("wf", "step", "duration")["count"] == 2
+
+    def test_cutoff_follows_the_clock(self):
+        system = AdaptiveSystem({"data_retention_days": 2})
+        system.record_data_point("wf", "step", "duration", 1.0, timestamp=datetime.now() - timedelta(days=3))
+        assert not system.historical_data
+        assert system.get_metric_summary("wf", "step", "duration") is None
+
+    def test_record_outside_event_loop(self):
+        system = AdaptiveSystem({"pattern_detection_interval": 10})
+        for i in range(25):
+            system.record_data_point("wf", "step", "duration", float(i))
+        assert system.points_recorded == 25
+
+    @pytest.mark.asyncio
+    async def test_record_schedules_detection_inside_event_loop(self):
+        system = AdaptiveSystem({"pattern_detection_interval": 50})
+        start = datetime.now() - timedelta(minutes=50)
+        for i in range(50):
+            system.record_data_point("wf", "step", "duration", float(i), timestamp=start + timedelta(minutes=i))
+        await asyncio.sleep(0.05)
+        assert any(p.pattern_type == PatternType.PERFORMANCE for p in system.patterns.values())
+
+
+class TestPatternDetection:
+
+    @pytest.mark.asyncio
+    async def test_patterns_from_summaries(self):
+        system = AdaptiveSystem()
+        rng = random.Random(4)
+        start = datetime.now() - timedelta(minutes=15 * 400)
+        for i in range(400):
+            ts = start + timedelta(minutes=15 * i)
+            slow_hour = ts.hour in (14, 15)
+            system.record_data_point("wf", "enrich", "duration", (30 if slow_hour else 10) + i * 0.5 + rng.random(), timestamp=ts)
+            cost = 1000.0 if i in (150, 250, 350) else 1.0 + rng.random() * 0.1
+            system.record_data_point("wf", "enrich", "cost", cost, timestamp=ts)
+            system.record_data_point("wf", "send", "success_rate", 0.2 if i % 2 else 0.9,
+                                     {"region": "emea"}, timestamp=ts)
+
+        patterns = await system.detect_patterns()
+        by_type = {}
+        for pattern in patterns:
+            by_type.setdefault(pattern.pattern_type, []).append(pattern)
+
+        trend = [p for p in by_type[PatternType.PERFORMANCE] if p.name == "Duration Trend in enrich"]
+        assert trend and "increasing" in trend[0].description
+        assert any(p.name == "Cost Anomalies in enrich" for p in by_type[PatternType.PERFORMANCE])
+        assert any(p.context_conditions.get("metric") == "cost" for p in by_type[PatternType.ANOMALY])
+        assert by_type[PatternType.TEMPORAL]
+        outcome = by_type[PatternType.OUTCOME][0]
+        assert outcome.impact_metrics["success_rate"] == 0.5
+        assert outcome.context_conditions == {"region": "emea"}
+        assert by_type[PatternType.BEHAVIORAL]
+
+
+class TestIngestionBenchmark:
+
+    def test_million_points_flat_latency(self):
+        """1M points with a 30-day window (expiry active for most of the run)."""
+        count, block = 1_000_000, 100_000
+        system = AdaptiveSystem({"data_retention_days": 30})
+        metrics = ("duration", "cost", "success_rate")
+        workflows = [f"wf_{i}" for i in range(20)]
+        steps = [f"step_{i}" for i in range(8)]
+        rng = np.random.default_rng(0)
+        values = rng.random(count).tolist()
+        minute = timedelta(minutes=1)
+
+        block_rates = []
+        timestamp = datetime.now() - minute * count
+        start = time.perf_counter()
+        block_start = start
+        for i in range(count):
+            timestamp += minute
+            system.record_data_point(workflows[i % 20], steps[i % 8], metrics[i % 3], values[i], timestamp=timestamp)
+            if (i + 1) % block == 0:
+                now = time.perf_counter()
+                block_rates.append((now - block_start) / block * 1e6)
+                block_start = now
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        asyncio.run(system.detect_patterns())
+        detection_time = time.perf_counter() - start
+
+        print(f"✅ Ingested {count:,} points ({len(system.historical_data):,} retained) in {elapsed:.1f}s:")
+        print(f"   - Per-insert latency by 100k block (µs): {', '.join(f'{r:.1f}' for r in block_rates)}")
+        print(f"   - Pattern detection over {len(system.metric_series)} series: {detection_time * 1000:.0f}ms")
+
+        assert len(system.historical_data) == 30 * 24 * 60
+        # Flat: the last blocks (full window, expiring every insert) are no slower
+        # than the first block beyond noise
+        assert max(block_rates[2:]) < min(block_rates[:2]) * 2.5
+        assert detection_time < 1.0
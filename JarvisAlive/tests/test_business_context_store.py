@@ -0,0 +1,222 @@
+"""Tests for single-hash, pipelined business context storage and its read-through cache."""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orchestration.business_context import (
+    BusinessContext, BusinessContextCache, CompanyProfile, CompanyStage, Industry,
+    ResourceConstraints
+)
+from tests.fake_redis import FakeRedis, FakeRedisServer
+
+
+async def wait_for(condition, timeout=1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.005)
+
+
+async def seed(redis_client, session_id="s1"):
+    context = BusinessContext(redis_client, session_id)
+    context.company_profile = CompanyProfile(stage=CompanyStage.GROWTH, industry=Industry.SAAS, team_size=12)
+    context.resource_constraints = ResourceConstraints(budget=50000)
+    await context.update_metric("mrr", 10000)
+    await context.add_goal("Hit 1M ARR", "Grow revenue", target_value=1000000, priority="high")
+    assert await context.save_context()
+    return context
+
+
+def seed_legacy(redis_client, session_id="old"):
+    """Context as earlier versions stored it, one key per part"""
+    redis_client.server.strings.update({
+        f"business:{session_id}:profile": json.dumps({"stage": "launch", "industry": "fintech", "team_size": 3}),
+        f"business:{session_id}:metrics": json.dumps({"mrr": 500}),
+        f"business:{session_id}:goals": json.dumps([{"title": "Hit PMF", "description": "Find fit"}]),
+        f"business:{session_id}:constraints": json.dumps({"budget": 20000}),
+        f"business:{session_id}:metadata": json.dumps({"last_updated": "2024-01-01T00:00:00"})
+    })
+
+
+class TestBusinessContextStore:
+
+    @pytest.mark.asyncio
+    async def test_save_and_load_are_one_round_trip_each(self):
+        redis_client = FakeRedis()
+        await seed(redis_client)
+
+        redis_client.reset_counts()
+        context = BusinessContext(redis_client, "s1")
+        assert await context.save_context()  # An empty context still saves its metadata
+        assert redis_client.round_trips == 1
+
+        redis_client.reset_counts()
+        loaded = BusinessContext(redis_client, "s1")
+        assert await loaded.load_context()
+        print(f"✅ load_context: {redis_client.round_trips} round trip, commands {dict(redis_client.commands)}")
+        assert redis_client.round_trips == 1
+        assert dict(redis_client.commands) == {"hgetall": 1}
+        assert loaded.company_profile.stage == CompanyStage.GROWTH
+        assert loaded.key_metrics.arr == 120000
+        assert loaded.active_goals[0].title == "Hit 1M ARR"
+        assert loaded.resource_constraints.budget == 50000
+        assert loaded.last_updated is not None
+
+        redis_client.reset_counts()
+        assert await loaded.save_context()
+        assert redis_client.round_trips == 1
+        assert dict(redis_client.commands) == {"hset": 1, "expire": 1}
+        assert redis_client.server.ttls["business:s1:context"] == 86400
+
+    @pytest.mark.asyncio
+    async def test_field_updates_write_only_their_field(self):
+        server = FakeRedisServer()
+        process_a, process_b = FakeRedis(server), FakeRedis(server)
+        await seed(process_a)
+
+        context_a = BusinessContext(process_a, "s1")
+        context_b = BusinessContext(process_b, "s1")
+        await context_a.load_context()
+        await context_b.load_context()
+
+        # B changes a goal while A, holding the old goals, updates a metric
+        await context_b.update_goal_progress("Hit 1M ARR", 0.5)
+        process_a.reset_counts()
+        await context_a.update_metric("burn_rate", 20000)
+        assert process_a.round_trips == 1
+        assert dict(process_a.commands) == {"hset": 1, "expire": 1}
+
+        stored = server.hashes["business:s1:context"]
+        assert json.loads(stored["goals"])[0]["progress"] == 0.5
+        assert json.loads(stored["metrics"])["burn_rate"] == 20000
+
+    @pytest.mark.asyncio
+    async def test_request_round_trips(self):
+        """A request loads the context and updates a metric: 10 round trips before, 2 now"""
+        redis_client = FakeRedis()
+        await seed(redis_client)
+        redis_client.reset_counts()
+
+        context = BusinessContext(redis_client, "s1")
+        await context.load_context()
+        await context.update_metric("cash_balance", 400000)
+        print(f"✅ Load plus metric update: {redis_client.round_trips} round trips")
+        assert redis_client.round_trips == 2
+
+    @pytest.mark.asyncio
+    async def test_reads_legacy_per_part_keys(self):
+        redis_client = FakeRedis()
+        seed_legacy(redis_client)
+
+        context = BusinessContext(redis_client, "old")
+        assert await context.load_context()
+        assert redis_client.round_trips == 3  # HGETALL, MGET, then one pipeline copying into the hash
+        assert context.company_profile.industry == Industry.FINTECH
+        assert context.key_metrics.mrr == 500
+
+        redis_client.reset_counts()
+        assert await BusinessContext(redis_client, "old").load_context()
+        assert redis_client.round_trips == 1
+
+    @pytest.mark.asyncio
+    async def test_field_update_keeps_legacy_parts(self):
+        redis_client = FakeRedis()
+        seed_legacy(redis_client)
+
+        context = BusinessContext(redis_client, "old")
+        assert await context.load_context()
+        await context.update_metric("mrr", 800)
+        await context.add_goal("Ship v2", "Launch the next version")
+
+        reloaded = BusinessContext(redis_client, "old")
+        assert await reloaded.load_context()
+        assert reloaded.company_profile.industry == Industry.FINTECH
+        assert reloaded.resource_constraints.budget == 20000
+        assert reloaded.key_metrics.mrr == 800
+        assert [goal.title for goal in reloaded.active_goals] == ["Hit PMF", "Ship v2"]
+
+
+class TestBusinessContextCache:
+
+    @pytest.mark.asyncio
+    async def test_cached_loads_skip_redis(self):
+        redis_client = FakeRedis()
+        cache = BusinessContextCache(redis_client)
+        await cache.start()
+        await seed(redis_client)
+
+        redis_client.reset_counts()
+        first = BusinessContext(redis_client, "s1", cache=cache)
+        await first.load_context()
+        assert redis_client.round_trips == 1
+
+        redis_client.reset_counts()
+        second = BusinessContext(redis_client, "s1", cache=cache)
+        await second.load_context()
+        assert redis_client.round_trips == 0
+        assert second.key_metrics.mrr == 10000
+        assert second.active_goals[0] is not first.active_goals[0]
+
+        # Our own writes refresh the entry instead of invalidating it
+        await second.update_metric("mrr", 20000)
+        redis_client.reset_counts()
+        third = BusinessContext(redis_client, "s1", cache=cache)
+        await third.load_context()
+        assert redis_client.round_trips == 0
+        assert third.key_metrics.mrr == 20000
+        assert cache.stats["hits"] == 2
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_other_processes(self):
+        server = FakeRedisServer()
+        redis_a, redis_b = FakeRedis(server), FakeRedis(server)
+        cache_a, cache_b = BusinessContextCache(redis_a), BusinessContextCache(redis_b)
+        await cache_a.start()
+        await cache_b.start()
+        await seed(redis_b)
+
+        await BusinessContext(redis_a, "s1", cache=cache_a).load_context()
+        assert cache_a.get("s1") is not None
+
+        writer = BusinessContext(redis_b, "s1", cache=cache_b)
+        await writer.load_context()
+        redis_b.reset_counts()
+        await writer.update_metric("mrr", 30000)
+        assert redis_b.round_trips == 1
+        assert dict(redis_b.commands) == {"hset": 1, "expire": 1, "publish": 1}
+
+        await wait_for(lambda: "s1" not in cache_a._entries)
+        redis_a.reset_counts()
+        reader = BusinessContext(redis_a, "s1", cache=cache_a)
+        await reader.load_context()
+        assert redis_a.round_trips == 1
+        assert reader.key_metrics.mrr == 30000
+
+        # The writer's own cache still serves the session
+        assert cache_b.get("s1") is not None
+        await cache_a.close()
+        await cache_b.close()
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_and_resubscribe_clears(self):
+        redis_client = FakeRedis()
+        cache = BusinessContextCache(redis_client, ttl=0.05)
+        await seed(redis_client)
+
+        await BusinessContext(redis_client, "s1", cache=cache).load_context()
+        assert cache.get("s1") is not None
+        await asyncio.sleep(0.06)
+        assert cache.get("s1") is None
+
+        # Invalidations may have been missed before subscribing
+        cache.put("s1", {"metrics": "{}"})
+        await cache.start()
+        assert cache.get("s1") is None
+        await cache.close()
@@ -0,0 +1,193 @@
+"""Tests for the content-addressed cache of generated agent code."""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_builder.agent_spec import create_monitor_agent
+from agent_builder.code_cache import AgentCodeCache
+from agent_builder.code_generator import AgentCodeGenerator, CodeGenerationError
+
+LLM_LATENCY = 0.2
+
+AGENT_CODE = '''import asyncio
+from base_agent import SandboxAgent
+
+
+class EmailMonitorAgent(SandboxAgent):
+
+    def __init__(self):
+        super().__init__()
+        self.name = "Email Monitor Agent"
+
+    async def initialize(self):
+        pass
+
+    async def execute(self):
+        return {"status": "success"}
+
+    async def cleanup(self):
+        pass
+'''
+
+
+class FakeRedis:
+    """The subset of redis.asyncio the cache uses"""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = 0
+
+    async def get(self, key):
+        self.commands += 1
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.commands += 1
+        self.data[key] = value.encode("utf-8")
+
+    async def delete(self, key):
+        self.commands += 1
+        self.data.pop(key, None)
+
+
+def make_spec(**overrides):
+    spec = create_monitor_agent(target="email", frequency=5, created_by="session-1", name="Email Monitor Agent")
+    return spec.model_copy(update=overrides)
+
+
+class CountingGenerator(AgentCodeGenerator):
+    """Replaces the LLM round trip with a fixed delay and counts calls"""
+
+    def __init__(self, cache, code=AGENT_CODE, use_cache=True):
+        super().__init__("test-key", cache=cache, use_cache=use_cache)
+        self.llm_calls = 0
+        self.validations = 0
+        self.code = code
+
+    async def _generate_code_attempt(self, spec, previous_error):
+        self.llm_calls += 1
+        await asyncio.sleep(LLM_LATENCY)
+        return self.code
+
+    async def _validate_code(self, code):
+        self.validations += 1
+        return await super()._validate_code(code)
+
+
+async def timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+class TestAgentCodeCache:
+
+    @pytest.mark.asyncio
+    async def test_repeat_creation_skips_llm_and_validation(self, tmp_path):
+        spec = make_spec()
+        cold = CountingGenerator(AgentCodeCache(tmp_path))
+        code, cold_time = await timed(cold.generate_agent_code(spec))
+        assert code == AGENT_CODE
+        assert (cold.llm_calls, cold.validations) == (1, 1)
+
+        # A new process: empty memory tier, same disk
+        warm = CountingGenerator(AgentCodeCache(tmp_path))
+        code, disk_time = await timed(warm.generate_agent_code(spec))
+        code_again, memory_time = await timed(warm.generate_agent_code(spec))
+        print(f"✅ Agent code: cold {cold_time * 1e3:.0f}ms, disk hit {disk_time * 1e3:.2f}ms, "
+              f"memory hit {memory_time * 1e3:.3f}ms")
+
+        assert code == code_again == AGENT_CODE
+        assert (warm.llm_calls, warm.validations) == (0, 0)
+        assert warm.cache.stats["disk_hits"] == 1 and warm.cache.stats["memory_hits"] == 1
+        assert disk_time < 0.05 and memory_time < 0.005
+
+    @pytest.mark.asyncio
+    async def test_equivalent_specs_share_a_key(self, tmp_path):
+        generator = CountingGenerator(AgentCodeCache(tmp_path))
+        spec = make_spec()
+        equivalent = make_spec(id="another-id", created_by="session-2", status="active",
+                               capabilities=list(reversed(spec.capabilities)))
+        different = make_spec(description="Monitors email every 10 minutes and escalates urgent threads.")
+
+        assert generator.cache_key(spec) == generator.cache_key(equivalent)
+        assert generator.cache_key(spec) != generator.cache_key(different)
+
+        await generator.generate_agent_code(spec)
+        await generator.generate_agent_code(equivalent)
+        assert generator.llm_calls == 1
+        await generator.generate_agent_code(different)
+        assert generator.llm_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_coalesce(self, tmp_path):
+        generator = CountingGenerator(AgentCodeCache(tmp_path))
+        spec = make_spec()
+
+        results = await asyncio.gather(*(generator.generate_agent_code(make_spec(id=str(i))) for i in range(10)))
+        assert results == [AGENT_CODE] * 10
+        assert generator.llm_calls == 1
+        assert generator.cache.stats["coalesced"] == 9
+        assert await generator.generate_agent_code(spec) == AGENT_CODE
+        assert generator.llm_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_is_not_cached(self, tmp_path):
+        generator = CountingGenerator(AgentCodeCache(tmp_path), code="def broken(:\n")
+        spec = make_spec()
+        with patch("tempfile.NamedTemporaryFile"):  # The generator saves failed attempts for debugging
+            waiters = await asyncio.gather(*(generator.generate_agent_code(spec) for _ in range(3)),
+                                           return_exceptions=True)
+        assert all(isinstance(result, CodeGenerationError) for result in waiters)
+        assert generator.llm_calls == 3  # One generation of three attempts, shared by all callers
+
+        generator.code = AGENT_CODE
+        assert await generator.generate_agent_code(spec) == AGENT_CODE
+        assert generator.llm_calls == 4
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_between_hosts(self, tmp_path):
+        redis_client = FakeRedis()
+        first = CountingGenerator(AgentCodeCache(tmp_path / "host1", redis_client=redis_client))
+        await first.generate_agent_code(make_spec())
+
+        second = CountingGenerator(AgentCodeCache(tmp_path / "host2", redis_client=redis_client))
+        assert await second.generate_agent_code(make_spec()) == AGENT_CODE
+        assert second.llm_calls == 0
+        assert second.cache.stats["redis_hits"] == 1
+
+        # Copied down to the local disk tier
+        third = CountingGenerator(AgentCodeCache(tmp_path / "host2"))
+        assert await third.generate_agent_code(make_spec()) == AGENT_CODE
+        assert third.cache.stats["disk_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_corrupted_disk_entry_is_regenerated(self, tmp_path):
+        generator = CountingGenerator(AgentCodeCache(tmp_path))
+        spec = make_spec()
+        await generator.generate_agent_code(spec)
+
+        path = next(tmp_path.rglob("*.json"))
+        entry = json.loads(path.read_text())
+        entry["code"] = entry["code"].replace("pass", "raise SystemExit")
+        path.write_text(json.dumps(entry))
+
+        fresh = CountingGenerator(AgentCodeCache(tmp_path))
+        assert await fresh.generate_agent_code(spec) == AGENT_CODE
+        assert fresh.llm_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_can_be_disabled(self, tmp_path):
+        generator = CountingGenerator(None, use_cache=False)
+        spec = make_spec()
+        await generator.generate_agent_code(spec)
+        await generator.generate_agent_code(spec)
+        assert generator.llm_calls == 2
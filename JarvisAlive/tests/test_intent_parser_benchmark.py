@@ -0,0 +1,203 @@
+"""Accuracy and latency benchmark for IntentParser over a labeled corpus."""
+
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orchestration.intent_parser import IntentParser
+
+
+LABELED_CORPUS = [
+    ("Create a brand for my coffee shop", "branding"),
+    ("Design a logo and visual identity for my startup", "branding"),
+    ("Come up with a company name for my pet grooming business", "branding"),
+    ("I need a color palette and brand colors for a bakery", "branding"),
+    ("Build a landing page and website for my yoga studio", "branding"),
+    ("Find leads in the fintech space", "sales"),
+    ("Generate leads and qualify prospects for our SaaS product", "sales"),
+    ("Set up outreach and follow up with prospects", "sales"),
+    ("Help me close a deal and grow the sales pipeline", "sales"),
+    ("Do a market research and competitor analysis for electric bikes", "market_research"),
+    ("What is the market size and market opportunity for vegan snacks", "market_research"),
+    ("Analyze market trends and industry trends for home fitness", "market_research"),
+    ("Run a feasibility study and market validation for my app idea", "market_research"),
+    ("Launch a social media marketing promotion", "marketing"),
+    ("Improve our seo and google ads advertisement", "marketing"),
+    ("Fix the bug in our api and deploy the software", "engineering"),
+    ("Review the database architecture and system design for the backend code", "engineering"),
+    ("Debug the failing test in the programming pipeline", "engineering"),
+    ("A customer complaint ticket needs escalation and resolution", "customer_support"),
+    ("Troubleshoot the issue using the faq documentation", "customer_support"),
+    ("Draft a contract with privacy terms and check compliance", "legal"),
+    ("File a trademark and review copyright and intellectual property", "legal"),
+    ("Track shipping, warehouse inventory and freight delivery", "logistics"),
+    ("Improve our supply chain logistics and order management fulfillment", "logistics"),
+    ("Prepare the invoice, billing and tax audit", "finance"),
+    ("Create a financial report covering profit and loss and cash flow", "finance"),
+    ("Streamline the workflow with automation to improve process efficiency", "operations"),
+    ("Write a standard operating procedure for operations optimization", "operations"),
+    ("Hello there", "general"),
+    ("What's the weather like today?", "general"),
+]
+
+
+def _percentile(samples, percentile):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(percentile / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class SlowClassificationEngine:
+    """Stand-in AI engine that answers with a fixed delay."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = 0
+
+    async def generate(self, prompt: str, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        match = re.search(r'User Request: "(.*)"', prompt)
+        category = "general"
+        for request, label in LABELED_CORPUS:
+            if match and match.group(1) == request:
+                category = label
+        return SimpleNamespace(content=json.dumps({
+            "primary_intent": category,
+            "confidence_score": 0.95,
+            "reasoning": "stub classification"
+        }))
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    return IntentParser()
+
+
+class TestIntentParserBenchmark:
+    """Benchmarks the compiled rule path, the LLM fast path and the intent LRU."""
+
+    def test_compiled_rules_match_uncompiled_search(self, parser):
+        """Precompiled patterns must find exactly what re.search on the raw strings finds."""
+        for request, _ in LABELED_CORPUS:
+            request_lower = request.lower()
+            for pattern, compiled_patterns in zip(parser.intent_patterns, parser._compiled_patterns):
+                expected = [text for text in pattern.patterns if re.search(text, request_lower)]
+                actual = [text for text, compiled in compiled_patterns if compiled.search(request_lower)]
+                assert actual == expected
+
+    def test_rule_accuracy_and_latency(self, parser):
+        """Report rule-only accuracy and p50/p99 latency over the corpus."""
+        latencies = []
+        correct = 0
+
+        for _ in range(20):
+            for request, label in LABELED_CORPUS:
+                start = time.perf_counter()
+                result = parser._rule_based_parsing(request)
+                latencies.append(time.perf_counter() - start)
+            correct += sum(
+                parser._rule_based_parsing(request).primary_intent == label
+                for request, label in LABELED_CORPUS
+            )
+
+        accuracy = correct / (20 * len(LABELED_CORPUS))
+        p50 = _percentile(latencies, 50) * 1000
+        p99 = _percentile(latencies, 99) * 1000
+
+        print(f"✅ Rule-based intent parsing over {len(LABELED_CORPUS)} labeled requests:")
+        print(f"   - Accuracy: {accuracy:.1%}")
+        print(f"   - p50 latency: {p50:.3f}ms")
+        print(f"   - p99 latency: {p99:.3f}ms")
+
+        assert accuracy >= 0.8
+        assert p99 < 5.0
+
+    @pytest.mark.asyncio
+    async def test_decisive_rules_skip_llm(self, parser):
+        """High-confidence rule matches are returned without an AI round trip."""
+        engine = SlowClassificationEngine(delay=0.01)
+        parser.ai_engine = engine
+
+        result = await parser.parse_intent("Design a logo and visual identity for my startup")
+        assert result.primary_intent == "branding"
+        assert result.confidence_score >= parser.rule_confidence_threshold
+        assert engine.calls == 0
+
+        result = await parser.parse_intent("Hello there")
+        assert engine.calls == 1
+        assert parser.get_parser_stats()["rule_fast_path"] == 1
+
+    @pytest.mark.asyncio
+    async def test_end_to_end_accuracy_and_latency(self, parser):
+        """Compare always-LLM parsing against the fast path plus LRU."""
+        engine = SlowClassificationEngine(delay=0.01)
+        parser.ai_engine = engine
+
+        async def run_corpus(rounds):
+            latencies = []
+            correct = 0
+            for _ in range(rounds):
+                for request, label in LABELED_CORPUS:
+                    start = time.perf_counter()
+                    result = await parser.parse_intent(request)
+                    latencies.append(time.perf_counter() - start)
+                    correct += result.primary_intent == label
+            return latencies, correct / (rounds * len(LABELED_CORPUS))
+
+        # Baseline: no fast path, no caches
+        semantic_cache = parser.semantic_cache
+        parser.semantic_cache = None
+        parser.rule_confidence_threshold = 1.1
+        parser.intent_cache_size = 0
+        baseline_latencies, baseline_accuracy = await run_corpus(2)
+        baseline_calls = engine.calls
+
+        # Fast path and caches enabled
+        engine.calls = 0
+        parser.semantic_cache = semantic_cache
+        parser.rule_confidence_threshold = 0.7
+        parser.intent_cache_size = 256
+        fast_latencies, fast_accuracy = await run_corpus(2)
+
+        print(f"✅ parse_intent with a {engine.delay * 1000:.0f}ms stub LLM:")
+        print(f"   - Always-LLM: accuracy {baseline_accuracy:.1%}, "
+              f"p50 {_percentile(baseline_latencies, 50) * 1000:.2f}ms, "
+              f"p99 {_percentile(baseline_latencies, 99) * 1000:.2f}ms, "
+              f"{baseline_calls} LLM calls")
+        print(f"   - Fast path + caches: accuracy {fast_accuracy:.1%}, "
+              f"p50 {_percentile(fast_latencies, 50) * 1000:.2f}ms, "
+              f"p99 {_percentile(fast_latencies, 99) * 1000:.2f}ms, "
+              f"{engine.calls} LLM calls")
+        print(f"   - Stats: {parser.get_parser_stats()}")
+
+        assert fast_accuracy >= baseline_accuracy - 0.1
+        assert engine.calls < len(LABELED_CORPUS)
+        assert statistics.median(fast_latencies) < statistics.median(baseline_latencies)
+
+    @pytest.mark.asyncio
+    async def test_lru_returns_independent_copies(self, parser):
+        """Cached intents are normalized on whitespace/case and not mutated by callers."""
+        first = await parser.parse_intent("Create a brand for my coffee shop")
+        first.extracted_parameters["mutated"] = True
+
+        second = await parser.parse_intent("  create a BRAND for my   coffee shop ")
+        assert second.primary_intent == first.primary_intent
+        assert "mutated" not in second.extracted_parameters
+        assert parser.get_parser_stats()["cache_hits"] == 1
+
+        parser.intent_cache_size = 2
+        for request in ("Find leads", "Fix the bug", "Draft a contract"):
+            await parser.parse_intent(request)
+        assert len(parser._intent_cache) == 2
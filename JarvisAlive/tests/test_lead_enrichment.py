@@ -0,0 +1,157 @@
+"""Tests for the bounded-concurrency AI enrichment pipeline in LeadScannerAgent."""
+
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engines.base_engine import AIEngineConfig
+from ai_engines.mock_engine import MockAIEngine
+from database.mock_data import MockDataGenerator
+from departments.sales.agents.lead_scanner_implementation import Lead, LeadScannerAgent, ScanCriteria
+
+
+def make_leads(scanner, count, seed=3):
+    random.seed(seed)
+    generator = MockDataGenerator()
+    companies = generator.get_companies()
+    leads = []
+    for _ in range(count):
+        company = random.choice(companies)
+        contact = generator._generate_contact(company, random.choice(["C-Level", "VP", "Director", "Manager"]))
+        leads.append(Lead(
+            lead_id=f"lead_{uuid.uuid4()}",
+            contact=contact,
+            company=company,
+            score=scanner.score_lead(contact, company, ScanCriteria()),
+            discovered_at=datetime.now(),
+            source="mock",
+            outreach_priority="medium"
+        ))
+    return leads
+
+
+class CountingMockEngine(MockAIEngine):
+    """MockAIEngine that records how many calls are in flight."""
+
+    def __init__(self, delay):
+        super().__init__(
+            AIEngineConfig(model="mock-ai-v1", requests_per_minute=1_000_000, enable_cache=False,
+                           cost_per_1k_input_tokens=0.0, cost_per_1k_output_tokens=0.0),
+            deterministic=True
+        )
+        self.set_response_delay(delay, delay)
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().generate(prompt, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def scanner():
+    agent = LeadScannerAgent(mode="mock")
+    return agent
+
+
+class TestBoundedEnrichment:
+
+    @pytest.mark.asyncio
+    async def test_200_leads_scale_with_concurrency(self, scanner):
+        delay, concurrency, count = 0.02, 20, 200
+        scanner.ai_engine = CountingMockEngine(delay)
+        leads = make_leads(scanner, count)
+        companies = {lead.company.id for lead in leads}
+
+        start = time.perf_counter()
+        result = await scanner._enrich_with_ai(leads, max_enrichment=count, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+
+        company_calls = [p for p in scanner.ai_engine.prompts if p.startswith("Analyze this company")]
+        total_calls = len(scanner.ai_engine.prompts)
+        ideal = total_calls / concurrency * delay
+
+        print(f"✅ Enriched {count} leads at concurrency {concurrency} with {delay * 1000:.0f}ms AI latency:")
+        print(f"   - Elapsed: {elapsed:.2f}s (ideal {ideal:.2f}s, 2N/concurrency x delay "
+              f"{2 * count / concurrency * delay:.2f}s, sequential ~{total_calls * delay:.2f}s)")
+        print(f"   - AI calls: {total_calls} ({len(company_calls)} company analyses for {len(companies)} companies)")
+        print(f"   - Stats: {scanner.last_enrichment_stats}")
+
+        assert len(result) == count
+        assert all(lead.enrichment_data for lead in result)
+        assert len(company_calls) == len(companies)
+        assert scanner.ai_engine.max_in_flight <= concurrency
+        assert elapsed < ideal * 1.5 + 0.25
+        assert elapsed < total_calls * delay / 5
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results(self, scanner):
+        scanner.ai_engine = CountingMockEngine(0.05)
+        leads = make_leads(scanner, 40)
+
+        start = time.perf_counter()
+        result = await scanner._enrich_with_ai(leads, max_enrichment=40, concurrency=4, deadline_seconds=0.3)
+        elapsed = time.perf_counter() - start
+
+        enriched = [lead for lead in result if lead.enrichment_data]
+        stats = scanner.last_enrichment_stats
+
+        assert elapsed < 0.5
+        assert len(result) == 40
+        assert 0 < len(enriched) < 40
+        assert stats["enriched"] == len(enriched)
+        assert stats["timed_out"] == 40 - len(enriched)
+        assert scanner.ai_engine.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_per_lead_failures_are_non_fatal(self, scanner, monkeypatch):
+        scanner.ai_engine = CountingMockEngine(0.001)
+        leads = make_leads(scanner, 10)
+        failing = {leads[2].contact.id, leads[7].contact.id}
+        original = scanner._analyze_contact_with_ai
+
+        async def flaky(contact, company):
+            if contact.id in failing:
+                raise ConnectionError("Simulated network timeout")
+            return await original(contact, company)
+
+        monkeypatch.setattr(scanner, "_analyze_contact_with_ai", flaky)
+        original_scores = {lead.lead_id: lead.score for lead in leads}
+
+        result = await scanner._enrich_with_ai(leads, max_enrichment=10)
+
+        assert len(result) == 10
+        for lead in result:
+            if lead.contact.id in failing:
+                assert lead.enrichment_data is None
+                assert lead.score == original_scores[lead.lead_id]
+            else:
+                assert lead.enrichment_data
+        assert scanner.last_enrichment_stats["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_analyze_companies_concurrent_and_deduped(self, scanner):
+        delay = 0.05
+        scanner.ai_engine = CountingMockEngine(delay)
+        companies = MockDataGenerator().get_companies()[:20]
+
+        start = time.perf_counter()
+        results = await scanner._batch_analyze_companies(companies + companies[:5], concurrency=8)
+        elapsed = time.perf_counter() - start
+
+        assert list(results) == [company.id for company in companies]
+        assert elapsed < len(scanner.ai_engine.prompts) * delay / 2
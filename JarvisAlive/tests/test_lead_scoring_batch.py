@@ -0,0 +1,134 @@
+"""Equivalence tests and throughput benchmark for LeadScannerAgent.score_leads_batch."""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.mock_data import MockDataGenerator
+from departments.sales.agents.lead_scanner_implementation import (
+    LeadScannerAgent, LeadTable, ScanCriteria
+)
+
+
+CRITERIA = [
+    ScanCriteria(),
+    ScanCriteria(industries=["SaaS", "FinTech"], titles=["VP of Sales", "CTO"]),
+    ScanCriteria(industries=["Finance"], titles=["marketing director"], company_sizes=["small", "startup"]),
+    ScanCriteria(industries=["healthcare"], titles=["operations"], company_sizes=["enterprise", "medium", "bogus"]),
+    ScanCriteria(titles=["Head of Data"], company_sizes=["large"]),
+]
+
+
+def make_pairs(contact_count, company_count, seed=11):
+    random.seed(seed)
+    generator = MockDataGenerator()
+    generator.generate_data()
+    companies = list(generator.get_companies())
+    industries = ["SaaS", "FinTech", "E-commerce", "Healthcare", "Manufacturing"]
+    while len(companies) < company_count:
+        companies.append(generator._generate_company(random.choice(industries)))
+
+    seniorities = ["C-Level", "VP", "Director", "Manager"]
+    base_contacts = [
+        generator._generate_contact(random.choice(companies), random.choice(seniorities))
+        for _ in range(min(contact_count, 2_000))
+    ]
+    companies_by_id = {company.id: company for company in companies}
+    pairs = []
+    for i in range(contact_count):
+        contact = base_contacts[i % len(base_contacts)]
+        company = companies_by_id[contact.company_id] if i < len(base_contacts) else random.choice(companies)
+        pairs.append((contact, company))
+    return pairs
+
+
+@pytest.fixture
+def scanner():
+    return LeadScannerAgent(mode="mock")
+
+
+class TestScoreLeadsBatchEquivalence:
+
+    @pytest.mark.parametrize("criteria", CRITERIA)
+    def test_matches_score_lead(self, scanner, criteria):
+        pairs = make_pairs(1_500, 300)
+        batch = scanner.score_leads_batch(pairs, criteria)
+
+        assert len(batch) == len(pairs)
+        for row, (contact, company) in enumerate(pairs):
+            assert batch.lead_score(row) == scanner.score_lead(contact, company, criteria)
+
+    def test_news_age_boundaries(self, scanner):
+        contact, company = make_pairs(1, 1)[0]
+        pairs = []
+        for days in (0, 1, 29, 30, 31, 89, 90, 91, 179, 180, 181, 400, -3):
+            news = [item.copy(update={"date": datetime.now() - timedelta(days=days, hours=1)})
+                    for item in company.recent_news]
+            pairs.append((contact, company.copy(update={"recent_news": news[:1]})))
+        pairs.append((contact, company.copy(update={"recent_news": []})))
+
+        batch = scanner.score_leads_batch(pairs, ScanCriteria())
+        for row, (contact, company) in enumerate(pairs):
+            assert batch.lead_score(row) == scanner.score_lead(contact, company, ScanCriteria())
+
+    def test_unencodable_rows_fall_back_to_score_lead(self, scanner):
+        pairs = make_pairs(10, 10)
+        broken = Mock()
+        broken.industry = None
+        pairs.append((pairs[0][0], broken))
+        criteria = ScanCriteria(industries=["SaaS"])
+
+        batch = scanner.score_leads_batch(pairs, criteria)
+
+        assert batch.lead_score(len(pairs) - 1).total_score == 0
+        assert "Error" in batch.explanation(len(pairs) - 1)
+        assert batch.lead_score(0) == scanner.score_lead(*pairs[0], criteria)
+
+    def test_ranked_matches_scan_ordering(self, scanner):
+        pairs = make_pairs(500, 100)
+        criteria = ScanCriteria(industries=["SaaS"], titles=["VP"], min_score=50, max_results=25)
+        batch = scanner.score_leads_batch(LeadTable(pairs), criteria)
+
+        scored = [(row, scanner.score_lead(*pair, criteria).total_score) for row, pair in enumerate(pairs)]
+        scored = [item for item in scored if item[1] >= criteria.min_score]
+        scored.sort(key=lambda item: item[1], reverse=True)
+
+        assert list(batch.ranked(criteria.min_score, criteria.max_results)) == [row for row, _ in scored[:25]]
+
+
+class TestScoreLeadsBatchBenchmark:
+
+    def test_throughput_100k_leads(self, scanner):
+        """Batch scoring over a prebuilt LeadTable vs score_lead per pair at 100k leads."""
+        pairs = make_pairs(100_000, 1_000)
+        criteria = ScanCriteria(industries=["SaaS", "FinTech"], titles=["VP of Sales", "CTO"],
+                                company_sizes=["small", "medium"])
+
+        start = time.perf_counter()
+        per_lead = [scanner.score_lead(contact, company, criteria).total_score for contact, company in pairs]
+        per_lead_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = LeadTable(pairs)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = scanner.score_leads_batch(table, criteria)
+        batch_time = time.perf_counter() - start
+
+        print(f"✅ Scoring {len(pairs):,} leads:")
+        print(f"   - score_lead per pair: {per_lead_time:.2f}s ({len(pairs) / per_lead_time:,.0f} leads/s)")
+        print(f"   - LeadTable build: {build_time * 1000:.1f}ms")
+        print(f"   - score_leads_batch: {batch_time * 1000:.1f}ms ({len(pairs) / batch_time:,.0f} leads/s)")
+        print(f"   - Speedup (scoring): {per_lead_time / batch_time:.1f}x")
+        print(f"   - Speedup (build + scoring): {per_lead_time / (build_time + batch_time):.1f}x")
+
+        assert batch.total_score.tolist() == per_lead
+        assert per_lead_time / batch_time >= 20
@@ -0,0 +1,190 @@
+"""Equivalence tests and scaling benchmark for the indexed LeadStore."""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.lead_store import LeadStore
+from database.mock_data import MockDataGenerator
+from departments.sales.agents.lead_scanner_implementation import LeadScannerAgent, ScanCriteria
+
+
+INDUSTRIES = ["SaaS", "FinTech", "E-commerce", "Healthcare", "Manufacturing"]
+RANGES = ["1-10", "11-50", "51-200", "201-500", "501-1000", "1000+"]
+TITLES = {
+    "C-Level": ["CEO", "CTO", "CFO", "CMO", "COO", "Chief Product Officer", "Chief Revenue Officer"],
+    "VP": ["VP of Sales", "VP of Engineering", "VP of Marketing", "VP of Product", "VP of Operations"],
+    "Director": ["Director of Sales", "Director of Engineering", "Director of Marketing", "Director of Product"],
+    "Manager": ["Sales Manager", "Engineering Manager", "Marketing Manager", "Product Manager"],
+}
+
+
+class Row:
+    """Lightweight stand-in for the pydantic models at benchmark scale."""
+    __slots__ = ("id", "name", "industry", "employee_range", "company_id", "seniority", "title")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+def make_dataset(contact_count, seed=7):
+    rng = random.Random(seed)
+    company_count = max(1, contact_count // 10)
+    companies = [
+        Row(id=f"comp_{i:08x}", name=f"Company {i}", industry=rng.choice(INDUSTRIES),
+            employee_range=rng.choice(RANGES))
+        for i in range(company_count)
+    ]
+    seniorities = list(TITLES)
+    contacts = []
+    for i in range(contact_count):
+        seniority = rng.choice(seniorities)
+        contacts.append(Row(
+            id=f"cont_{i:08x}",
+            company_id=companies[rng.randrange(company_count)].id,
+            seniority=seniority,
+            title=rng.choice(TITLES[seniority])
+        ))
+    return companies, contacts
+
+
+def nested_loop_raw_leads(companies, contacts, industries=None, titles=None, exclude=None):
+    """The pre-index LeadScannerAgent._get_raw_leads join."""
+    if industries:
+        companies = [c for c in companies if c.industry in industries]
+    if exclude:
+        companies = [c for c in companies if c.name not in exclude]
+    if titles:
+        filtered = []
+        for contact in contacts:
+            for title in titles:
+                if title.lower() in contact.title.lower():
+                    filtered.append(contact)
+                    break
+        contacts = filtered
+    pairs = []
+    for contact in contacts:
+        for company in companies:
+            if company.id == contact.company_id:
+                pairs.append((contact, company))
+                break
+    return pairs
+
+
+QUERIES = [
+    {"industries": ["SaaS", "FinTech"], "titles": ["VP", "Director"]},
+    {"titles": ["of sales", "cto"]},
+    {"industries": ["Healthcare"]},
+    {"industries": ["SaaS"], "exclude": ["Company 3", "Company 11"]},
+    {"titles": ["ales man", " "]},
+    {"titles": ["nonexistent title"]},
+    {"industries": []},
+]
+
+
+class TestLeadStoreEquivalence:
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_find_leads_matches_nested_loop(self, query):
+        companies, contacts = make_dataset(2_000)
+        store = LeadStore(companies, contacts)
+
+        expected = nested_loop_raw_leads(companies, contacts, **query)
+        actual = store.find_leads(
+            industries=query.get("industries") or None,
+            exclude_names=query.get("exclude") or None,
+            title_keywords=query.get("titles") or None
+        )
+
+        assert [(c.id, co.id) for c, co in actual] == [(c.id, co.id) for c, co in expected]
+
+    def test_point_lookups_and_seniority(self):
+        companies, contacts = make_dataset(500)
+        store = LeadStore(companies, contacts)
+
+        assert store.get_company(companies[42].id) is companies[42]
+        assert store.get_contact(contacts[99].id) is contacts[99]
+        assert store.get_company("comp_missing") is None
+        assert store.find_contacts(seniority_levels=["VP"]) == [c for c in contacts if c.seniority == "VP"]
+        assert store.find_companies(employee_ranges=["1000+"]) == [
+            c for c in companies if c.employee_range == "1000+"
+        ]
+
+    def test_mock_generator_queries_unchanged(self):
+        generator = MockDataGenerator()
+        companies, contacts = generator.get_companies(), generator.get_contacts()
+
+        criteria = {"industries": ["SaaS", "FinTech"], "titles": ["VP", "Director"], "funding_stages": ["Series B", "Public"]}
+        company_ids = {
+            c.id for c in companies
+            if c.industry in criteria["industries"] and c.funding_stage in criteria["funding_stages"]
+        }
+        expected = [
+            c.id for c in contacts
+            if c.company_id in company_ids and any(t.lower() in c.title.lower() for t in criteria["titles"])
+        ]
+        leads = generator.get_qualified_leads(criteria)
+
+        assert sorted(lead.contact.id for lead in leads) == sorted(expected)
+        assert generator.get_contacts_by_title(["vp"]) == [c for c in contacts if "vp" in c.title.lower()]
+        assert generator.get_company_by_id(companies[7].id) == companies[7]
+        assert generator.get_contact_by_id(contacts[7].id) == contacts[7]
+
+    def test_lead_scanner_raw_leads_unchanged(self):
+        from database.mock_data import get_all_companies, get_all_contacts
+
+        agent = LeadScannerAgent(mode="mock")
+        criteria = ScanCriteria(industries=["SaaS", "E-commerce"], titles=["VP", "Chief"], exclude_companies=["ShopConnect"])
+
+        pairs = asyncio.run(agent._get_raw_leads(criteria))
+        expected = nested_loop_raw_leads(
+            get_all_companies(), get_all_contacts(),
+            industries=criteria.industries, titles=criteria.titles, exclude=criteria.exclude_companies
+        )
+
+        assert [(c.id, co.id) for c, co in pairs] == [(c.id, co.id) for c, co in expected]
+
+
+class TestLeadStoreBenchmark:
+
+    @pytest.mark.parametrize("contact_count", [1_000, 10_000, 100_000, 1_000_000])
+    def test_scan_scaling(self, contact_count):
+        """Index build and scan latency vs the nested-loop join from 1k to 1M contacts."""
+        companies, contacts = make_dataset(contact_count)
+        query = {"industries": ["SaaS", "FinTech"], "titles": ["VP", "Director"]}
+
+        start = time.perf_counter()
+        store = LeadStore(companies, contacts)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pairs = store.find_leads(industries=query["industries"], title_keywords=query["titles"])
+        indexed_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.get_company(companies[-1].id)
+        store.get_contact(contacts[-1].id)
+        lookup_time = time.perf_counter() - start
+
+        # Nested loop is O(contacts x companies): time a contact sample and extrapolate
+        sample_size = min(contact_count, 1_000)
+        start = time.perf_counter()
+        nested_loop_raw_leads(companies, contacts[:sample_size], **query)
+        nested_time = (time.perf_counter() - start) * contact_count / sample_size
+
+        print(f"✅ LeadStore with {contact_count:,} contacts / {len(companies):,} companies:")
+        print(f"   - Index build: {build_time * 1000:.1f}ms")
+        print(f"   - Indexed scan: {indexed_time * 1000:.1f}ms ({len(pairs):,} leads)")
+        print(f"   - Point lookups: {lookup_time * 1e6:.1f}µs")
+        print(f"   - Nested-loop join (extrapolated): {nested_time * 1000:.1f}ms")
+        print(f"   - Speedup: {nested_time / indexed_time:.1f}x")
+
+        assert pairs
+        assert indexed_time < nested_time
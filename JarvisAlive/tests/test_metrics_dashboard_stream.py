@@ -0,0 +1,150 @@
+"""Tests for the change-stream-driven metrics dashboard."""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.metrics_dashboard import MetricsDashboard
+from tests.fake_redis import FakeRedis, FakeRedisServer
+
+SESSION = "s1"
+
+
+async def wait_for(condition, timeout=1.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "condition not met in time"
+        await asyncio.sleep(0.001)
+    return time.perf_counter()
+
+
+async def start_dashboard(server, **options):
+    dashboard = MetricsDashboard(**options)
+    dashboard.mock_mode = False
+    dashboard.session_id = SESSION
+    dashboard.redis_client = FakeRedis(server)
+    dashboard.running = True
+    layout = dashboard.create_layout()
+    task = asyncio.create_task(dashboard.update_dashboard(layout))
+    await wait_for(lambda: dashboard.stats["fetches"] >= 1 and not dashboard._dirty)
+    await asyncio.sleep(dashboard.frame_interval * 2)
+    return dashboard, task
+
+
+async def stop_dashboard(dashboard, task):
+    dashboard.running = False
+    await asyncio.wait_for(task, 3)
+
+
+def renders(dashboard, panel):
+    return dashboard.stats["renders"].get(panel, 0)
+
+
+class TestMetricsDashboardStream:
+
+    @pytest.mark.asyncio
+    async def test_idle_dashboard_sends_no_commands(self):
+        server = FakeRedisServer()
+        dashboard, task = await start_dashboard(server)
+        assert dashboard.notifications_enabled
+        assert "K" in server.config["notify-keyspace-events"]
+
+        dashboard.redis_client.reset_counts()
+        await asyncio.sleep(1.2)
+        print(f"✅ Idle for 1.2s: {dashboard.redis_client.round_trips} Redis round trips")
+        assert dashboard.redis_client.round_trips == 0
+        assert renders(dashboard, "stats") == 1  # Only the initial render
+        assert renders(dashboard, "header") >= 1  # The clock still ticks
+        await stop_dashboard(dashboard, task)
+
+    @pytest.mark.asyncio
+    async def test_write_reaches_panel_within_100ms(self):
+        server = FakeRedisServer()
+        writer = FakeRedis(server)
+        dashboard, task = await start_dashboard(server)
+
+        latencies = []
+        for i in range(5):
+            before = renders(dashboard, "stats")
+            start = time.perf_counter()
+            await writer.set(f"session:{SESSION}:metrics", json.dumps({"leads_generated": i + 1}))
+            end = await wait_for(lambda: renders(dashboard, "stats") > before)
+            latencies.append(end - start)
+            assert dashboard.data["metrics"]["leads_generated"] == i + 1
+
+        print(f"✅ Write to panel update: max {max(latencies) * 1e3:.0f}ms")
+        assert max(latencies) < 0.1
+        assert renders(dashboard, "workflows") == 1  # Untouched sources are not redrawn
+        assert renders(dashboard, "progress") == 1
+        await stop_dashboard(dashboard, task)
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_into_one_frame(self):
+        server = FakeRedisServer()
+        writer = FakeRedis(server)
+        dashboard, task = await start_dashboard(server, frame_interval=0.05)
+
+        dashboard.redis_client.reset_counts()
+        for i in range(20):
+            await writer.set(f"session:{SESSION}:metrics", json.dumps({"leads_generated": i}))
+        await writer.set(f"session:{SESSION}:current_task", json.dumps(None))
+        await wait_for(lambda: renders(dashboard, "progress") == 2)
+        await asyncio.sleep(0.1)
+
+        assert dashboard.data["metrics"]["leads_generated"] == 19
+        assert renders(dashboard, "stats") == 2
+        assert renders(dashboard, "performance") == 2
+        assert dashboard.redis_client.round_trips == 1
+        assert dict(dashboard.redis_client.commands) == {"mget": 1}
+        assert dashboard.stats["coalesced"] >= 19
+        await stop_dashboard(dashboard, task)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_values_are_not_redrawn(self):
+        server = FakeRedisServer()
+        writer = FakeRedis(server)
+        payload = json.dumps([{"name": "Outreach", "status": "running", "progress": 10, "elapsed_time": 1.0}])
+        await writer.set(f"session:{SESSION}:workflows", payload)
+        dashboard, task = await start_dashboard(server)
+        assert renders(dashboard, "workflows") == 1
+
+        await writer.set(f"session:{SESSION}:workflows", payload)
+        await wait_for(lambda: dashboard.stats["fetches"] == 2)
+        await asyncio.sleep(0.05)
+        assert renders(dashboard, "workflows") == 1
+        await stop_dashboard(dashboard, task)
+
+    @pytest.mark.asyncio
+    async def test_polls_when_notifications_unavailable(self, monkeypatch):
+        server = FakeRedisServer()
+        writer = FakeRedis(server)
+
+        def config_disabled(self, name):
+            raise Exception("unknown command 'CONFIG'")
+
+        monkeypatch.setattr(FakeRedis, "_config_get", config_disabled)
+        dashboard, task = await start_dashboard(server, poll_interval=0.2)
+        assert not dashboard.notifications_enabled
+
+        await writer.set(f"session:{SESSION}:metrics", json.dumps({"leads_generated": 7}))
+        await wait_for(lambda: (dashboard.data.get("metrics") or {}).get("leads_generated") == 7, timeout=0.5)
+        await stop_dashboard(dashboard, task)
+
+    @pytest.mark.asyncio
+    async def test_mock_mode_refreshes_every_second(self):
+        dashboard = MetricsDashboard()
+        dashboard.mock_mode = True
+        await dashboard.initialize("demo")
+        dashboard.running = True
+        task = asyncio.create_task(dashboard.update_dashboard(dashboard.create_layout()))
+
+        await wait_for(lambda: dashboard.stats["fetches"] >= 2, timeout=2.0)
+        assert dashboard.data["metrics"]["leads_generated"] >= 47
+        assert len(dashboard.data["workflows"]) == 3
+        await stop_dashboard(dashboard, task)
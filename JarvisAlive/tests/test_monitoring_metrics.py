@@ -0,0 +1,221 @@
+"""Tests for the Prometheus metrics and trace spans on hot paths."""
+
+import asyncio
+import os
+import re
+import sys
+import time
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engines.base_engine import AIEngineConfig
+from ai_engines.mock_engine import MockAIEngine
+from monitoring import metrics
+from monitoring.metrics import MetricsRegistry
+from monitoring.tracing import inject_context, span
+from orchestration.persistent.base_agent import PersistentAgent, TaskRequest
+from orchestration.persistent.concurrent_orchestrator import ConcurrentOrchestrator, ConcurrentTask, ExecutionBatch
+from orchestration.persistent.message_bus import MessageBus, MessageType
+from tests.fake_redis import FakeRedis
+
+
+def sample(name: str, **labels) -> float:
+    """Value of one sample in the global registry's exposition, 0 when absent"""
+    for line in metrics.render().splitlines():
+        match = re.match(r"([^{ ]+)(?:\{(.*)\})? (\S+)$", line)
+        if not match or match.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2) or ""))
+        if all(found.get(key) == value for key, value in labels.items()):
+            return float(match.group(3))
+    return 0.0
+
+
+def mock_engine(delay: float = 0.0) -> MockAIEngine:
+    config = AIEngineConfig(model="mock-ai-v1", enable_cache=False, cost_per_1k_input_tokens=0.0,
+                            cost_per_1k_output_tokens=0.0, requests_per_minute=10 ** 6, requests_per_hour=10 ** 6)
+    return MockAIEngine(config, response_delay_min=delay, response_delay_max=delay)
+
+
+class EchoAgent(PersistentAgent):
+
+    async def process_task(self, task_type, input_data):
+        await asyncio.sleep(input_data.get("delay", 0))
+        if task_type == "fail":
+            raise ValueError("failed")
+        return {"echo": input_data}
+
+
+class TestRegistry:
+
+    def test_exposition_format(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests", "Requests served", ["path"])
+        depth = registry.gauge("depth", "Queue depth")
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        requests.labels('/a"b\n').inc()
+        requests.labels(path='/a"b\n').inc(2)
+        depth.set_function(lambda: 7)
+        for value in (0.05, 0.5, 0.5, 3.0):
+            latency.observe(value)
+
+        text = registry.render()
+        assert "# HELP requests Requests served\n# TYPE requests counter\n" in text
+        assert 'requests_total{path="/a\\"b\\n"} 3' in text
+        assert "# TYPE depth gauge\ndepth 7\n" in text
+        assert 'latency_seconds_bucket{le="0.1"} 1\n' in text
+        assert 'latency_seconds_bucket{le="1"} 3\n' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4\n' in text
+        assert "latency_seconds_sum 4.05\nlatency_seconds_count 4\n" in text
+
+        assert registry.counter("requests", "Requests served", ["path"]) is requests
+        with pytest.raises(TypeError):
+            metrics._Metric("bare", "Metric without a kind")
+        with pytest.raises(ValueError):
+            registry.gauge("requests", "Requests served", ["path"])
+        with pytest.raises(ValueError):
+            requests.labels("a", "b")
+
+    def test_metrics_server(self):
+        server = metrics.start_metrics_server(port=0, host="127.0.0.1")
+        try:
+            assert metrics.start_metrics_server(port=0) is server
+            metrics.BUS_PUBLISHED.labels("server_check").inc()
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.headers["Content-Type"] == metrics.CONTENT_TYPE
+                body = response.read().decode()
+            assert 'heyjarvis_message_bus_published_total{type="server_check"} 1' in body
+        finally:
+            metrics.stop_metrics_server()
+
+    def test_api_server_route(self):
+        from fastapi.testclient import TestClient
+        import api_server
+
+        metrics.BUS_DELIVERED.labels("route_check").inc()
+        response = TestClient(api_server.app).get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'heyjarvis_message_bus_delivered_total{type="route_check"} 1' in response.text
+
+
+class TestHotPathInstrumentation:
+
+    @pytest.mark.asyncio
+    async def test_llm_latency_and_tokens(self):
+        engine = mock_engine()
+        before = sample("heyjarvis_llm_request_duration_seconds_count", engine="mock", outcome="success")
+        tokens_before = sample("heyjarvis_llm_tokens_count", engine="mock", direction="output")
+
+        for i in range(3):
+            response = await engine.generate(f"Summarise report {i}")
+
+        assert sample("heyjarvis_llm_request_duration_seconds_count", engine="mock", outcome="success") == before + 3
+        assert sample("heyjarvis_llm_tokens_count", engine="mock", direction="output") == tokens_before + 3
+        assert sample("heyjarvis_llm_tokens_sum", engine="mock", direction="output") >= response.usage["output_tokens"]
+
+    @pytest.mark.asyncio
+    async def test_agent_queue_depth_and_task_time(self):
+        agent = EchoAgent("metrics_agent")
+        await agent.start()
+        try:
+            await agent.submit_task(TaskRequest("t1", "echo", {"delay": 0.05}))
+            await agent.submit_task(TaskRequest("t2", "echo", {}))
+            await agent.submit_task(TaskRequest("t3", "fail", {}))
+            await asyncio.sleep(0.01)
+            assert sample("heyjarvis_agent_queue_depth", agent="metrics_agent") == 2
+
+            for _ in range(100):
+                if agent.health.total_tasks_processed == 3:
+                    break
+                await asyncio.sleep(0.01)
+            assert sample("heyjarvis_agent_queue_depth", agent="metrics_agent") == 0
+            assert sample("heyjarvis_agent_task_duration_seconds_count", agent="metrics_agent", outcome="success") == 2
+            assert sample("heyjarvis_agent_task_duration_seconds_count", agent="metrics_agent", outcome="error") == 1
+            assert sample("heyjarvis_agent_queue_wait_seconds_sum", agent="metrics_agent") >= 0.05
+        finally:
+            await agent.stop()
+        assert 'agent="metrics_agent"' not in metrics.render().split("heyjarvis_agent_queue_wait")[0]
+
+    @pytest.mark.asyncio
+    async def test_declined_tasks_are_timed_as_cancelled(self, monkeypatch):
+        orchestrator = ConcurrentOrchestrator(agent_pool=None, message_bus=None)
+
+        async def decline(task, batch):
+            return False
+
+        monkeypatch.setattr(orchestrator, "_request_approval", decline)
+        task = ConcurrentTask("declined", "metrics_declined", "Declined at approval", {})
+        before = sample("heyjarvis_orchestrator_task_duration_seconds_count",
+                        task_type="metrics_declined", outcome="cancelled")
+
+        await orchestrator._execute_single_task(task, ExecutionBatch("batch", [task], "user", "session"))
+
+        assert sample("heyjarvis_orchestrator_task_duration_seconds_count",
+                      task_type="metrics_declined", outcome="cancelled") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_message_bus_publish_and_deliver(self):
+        bus = MessageBus()
+        bus.redis_client = FakeRedis()
+        received = []
+        bus.subscriptions["events"] = {(received.append, None)}
+
+        published = sample("heyjarvis_message_bus_published_total", type="user_event")
+        delivered = sample("heyjarvis_message_bus_delivered_total", type="user_event")
+        pubsub = bus.redis_client.pubsub()
+        await pubsub.subscribe("events")
+        await bus.publish("events", MessageType.USER_EVENT, "tester", {"n": 1})
+        assert sample("heyjarvis_message_bus_published_total", type="user_event") == published + 1
+
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
+        await bus._process_message("events", message["data"])
+        assert [m.payload for m in received] == [{"n": 1}]
+        assert sample("heyjarvis_message_bus_delivered_total", type="user_event") == delivered + 1
+
+    @pytest.mark.asyncio
+    async def test_spans_without_sdk(self):
+        with span("outer", attribute=None) as current:
+            current.set_attribute("key", "value")
+            carrier = inject_context()
+        assert carrier is None
+        assert TaskRequest("t", "echo", {}, trace_context=carrier).trace_context is None
+
+        with pytest.raises(RuntimeError):
+            with span("failing"):
+                raise RuntimeError("boom")
+
+
+class TestOverhead:
+
+    @pytest.mark.asyncio
+    async def test_instrumentation_overhead_under_two_percent(self):
+        # Concurrent mock LLM calls, timed through the instrumented generate()
+        # and the bare _generate() it wraps, interleaved. 20ms is still far
+        # below any provider's latency, so this bounds the real overhead
+        engine = mock_engine(delay=0.02)
+        callers, calls = 8, 10
+
+        async def workload(generate):
+            async def caller(c):
+                for i in range(calls):
+                    await generate(f"Prompt {c}-{i}")
+            start = time.perf_counter()
+            await asyncio.gather(*(caller(c) for c in range(callers)))
+            return time.perf_counter() - start
+
+        await workload(engine.generate)
+        instrumented, bare = [], []
+        for _ in range(7):
+            instrumented.append(await workload(engine.generate))
+            bare.append(await workload(engine._generate))
+
+        overhead = (min(instrumented) - min(bare)) / min(bare)
+        print(f"✅ Instrumentation overhead on {callers * calls} mock calls: {overhead * 100:.2f}% "
+              f"({min(instrumented) * 1e3:.0f}ms vs {min(bare) * 1e3:.0f}ms)")
+        assert overhead < 0.02
@@ -0,0 +1,118 @@
+"""Single-pass entity extraction tests and latency benchmark for ParameterExtractor."""
+
+import os
+import statistics
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.parameter_extractor import ParameterExtractor
+
+
+REQUESTS = [
+    "Monitor my Gmail for emails from support@example.com every 5 minutes with subject 'urgent'",
+    "Send Slack notifications to #alerts channel general",
+    "Scrape https://example.com every hour and extract data from www.example.org/path",
+    "Analyze data from /path/to/data.csv and find trends, statistics and time series outliers",
+    "Copy files from /source to /backup, then compress C:\\data\\reports and move ./a to ~/b.",
+    "This is a random request that shouldn't match any template",
+]
+
+LONG_REQUEST = " ".join([
+    "Our support team is drowning in email, so I want an agent that checks Gmail every 10 minutes.",
+    "It should watch for messages from billing@example.com or anything titled 'Invoice overdue'.",
+    "When one arrives, post to #finance-alerts and ping @oncall so somebody follows up quickly.",
+    "Separately, every night at 2am it should backup files from /var/data/exports to /mnt/backups/daily.",
+    "Once a week it should analyze data from https://reports.example.com/sales.csv, find trends",
+    "and anomalies, and compare the distribution against last quarter's statistics.",
+    "Finally, scrape https://status.example.com every 30 minutes and extract the incident list.",
+] * 4)
+
+
+@pytest.fixture
+def extractor():
+    return ParameterExtractor()
+
+
+class TestSinglePassExtraction:
+
+    @pytest.mark.parametrize("request_text", REQUESTS + [LONG_REQUEST])
+    def test_shared_entities_match_per_template_scoring(self, extractor, request_text):
+        """Scores and entities from the shared pass equal running extractors per template."""
+        shared = extractor.extract_all_entities(request_text)
+
+        for pattern in extractor.intent_patterns.values():
+            assert extractor.calculate_intent_confidence(request_text, pattern, shared) == \
+                extractor.calculate_intent_confidence(request_text, pattern)
+
+            names = pattern.required_entities + pattern.optional_entities
+            assert extractor.extract_entities(request_text, names, shared) == \
+                extractor.extract_entities(request_text, names)
+
+    def test_each_extractor_runs_once_per_request(self, monkeypatch):
+        calls = {}
+        for method_name in (
+            "_extract_email_filter", "_extract_email_address", "_extract_subject_filter",
+            "_extract_slack_channel", "_extract_url", "_extract_file_path",
+            "_extract_operation", "_extract_analysis_type", "_extract_time_interval"
+        ):
+            original = getattr(ParameterExtractor, method_name)
+
+            def counting(self, text, _original=original, _name=method_name):
+                calls[_name] = calls.get(_name, 0) + 1
+                return _original(self, text)
+
+            monkeypatch.setattr(ParameterExtractor, method_name, counting)
+
+        ParameterExtractor().extract_parameters(LONG_REQUEST)
+
+        assert len(calls) == 9
+        assert all(count == 1 for count in calls.values()), calls
+
+    def test_extraction_results(self, extractor):
+        result = extractor.extract_parameters(REQUESTS[0])
+        assert result.template_match == "gmail_monitor"
+        assert result.extracted_parameters["email_filter"] == "from:support@example.com"
+        assert result.extracted_parameters["check_interval"] == "300"
+        assert result.extracted_parameters["subject_filter"] == "urgent"
+
+        result = extractor.extract_parameters(REQUESTS[3])
+        assert result.template_match == "data_analyzer"
+        assert result.extracted_parameters["analysis_type"] == "trend"
+
+
+class TestParameterExtractorBenchmark:
+
+    def test_long_request_latency(self, extractor):
+        """Per-request latency for long, multi-sentence requests, single pass vs per template."""
+        iterations = 100
+
+        def per_template_pass():
+            for pattern in extractor.intent_patterns.values():
+                extractor.calculate_intent_confidence(LONG_REQUEST, pattern)
+            best = extractor.intent_patterns["gmail_monitor"]
+            extractor.extract_entities(LONG_REQUEST, best.required_entities + best.optional_entities)
+
+        baseline = []
+        single_pass = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            per_template_pass()
+            baseline.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            extractor.extract_parameters(LONG_REQUEST)
+            single_pass.append(time.perf_counter() - start)
+
+        baseline_ms = statistics.median(baseline) * 1000
+        single_pass_ms = statistics.median(single_pass) * 1000
+
+        print(f"✅ Parameter extraction over a {len(LONG_REQUEST)}-character request:")
+        print(f"   - Per-template extraction: {baseline_ms:.2f}ms median")
+        print(f"   - Single pass: {single_pass_ms:.2f}ms median")
+        print(f"   - Speedup: {baseline_ms / single_pass_ms:.1f}x")
+
+        assert single_pass_ms < baseline_ms
@@ -0,0 +1,163 @@
+"""Tests for off-loop, batched Docker operations in the sandbox manager."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_builder.agent_spec import create_monitor_agent
+from agent_builder.docker_executor import DockerCallTimeout, DockerExecutor
+from agent_builder.sandbox import SandboxConfig, SandboxManager
+from tests.fake_docker import FakeDockerClient
+
+LATENCY = 0.1
+CONTAINERS = 8
+
+
+async def max_loop_lag(work, interval=0.001):
+    """Run ``work`` while a probe task measures how late the loop wakes it"""
+    lags, done = [], False
+
+    async def probe():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(interval * 2)
+    start = time.perf_counter()
+    try:
+        result = await work()
+    finally:
+        elapsed = time.perf_counter() - start
+        done = True
+        await probe_task
+    return max(lags), elapsed, result
+
+
+async def make_manager(docker_client, containers=CONTAINERS, **config):
+    manager = SandboxManager(SandboxConfig(pool_target_size=0, **config), docker_client=docker_client)
+    await manager.initialize()
+    spec = create_monitor_agent(target="email", frequency=5, created_by="test")
+    container_ids = [await manager.create_sandbox(f"agent{i}", "print('hi')", spec) for i in range(containers)]
+    for container_id in container_ids:
+        manager.active_containers[container_id].status = "running"
+    return manager, container_ids
+
+
+class TestDockerExecutor:
+
+    @pytest.mark.asyncio
+    async def test_per_call_timeout(self):
+        executor = DockerExecutor(max_workers=2, timeout=0.05)
+        start = time.perf_counter()
+        with pytest.raises(DockerCallTimeout):
+            await executor.run(time.sleep, 0.5)
+        assert time.perf_counter() - start < 0.3
+        assert await executor.run(time.sleep, 0.1, call_timeout=None) is None
+        assert executor.timeouts == 1
+        executor.close()
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self):
+        docker_client = FakeDockerClient({"stats": LATENCY})
+        manager, _ = await make_manager(docker_client, containers=6, docker_workers=2)
+
+        docker_client.max_in_flight = 0
+        _, elapsed, stats = await max_loop_lag(manager.get_all_container_stats)
+        assert docker_client.max_in_flight == 2
+        assert elapsed >= 3 * LATENCY * 0.9
+        assert all(stats.values())
+        await manager.cleanup_all()
+
+
+class TestOffLoopSandboxManager:
+
+    @pytest.mark.asyncio
+    async def test_stats_for_all_run_in_parallel_off_loop(self):
+        docker_client = FakeDockerClient({"stats": LATENCY})
+        manager, container_ids = await make_manager(docker_client)
+
+        # One-at-a-time polling, as callers had to before
+        async def poll_each():
+            return [await manager.get_container_stats(container_id) for container_id in container_ids]
+
+        sequential_lag, sequential, _ = await max_loop_lag(poll_each)
+        lag, parallel, stats = await max_loop_lag(manager.get_all_container_stats)
+        print(f"✅ Stats for {CONTAINERS} containers: {parallel * 1e3:.0f}ms batched vs {sequential * 1e3:.0f}ms "
+              f"one at a time; max loop lag {lag * 1e3:.1f}ms")
+
+        assert set(stats) == set(container_ids)
+        assert all(s["memory_usage_mb"] == 64 for s in stats.values())
+        assert sequential >= CONTAINERS * LATENCY * 0.9
+        assert parallel < sequential / 3
+        assert max(lag, sequential_lag) < 0.05  # Each Docker call waits on a worker thread, not the loop
+        await manager.cleanup_all()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_all_is_parallel_and_loop_stays_responsive(self):
+        docker_client = FakeDockerClient({"stop": LATENCY, "remove": LATENCY})
+        manager, container_ids = await make_manager(docker_client)
+
+        lag, elapsed, _ = await max_loop_lag(manager.cleanup_all)
+        print(f"✅ cleanup_all of {CONTAINERS} containers: {elapsed * 1e3:.0f}ms, max loop lag {lag * 1e3:.1f}ms")
+
+        assert not manager.active_containers
+        assert sorted(docker_client.removed) == sorted(container_ids)
+        assert elapsed < CONTAINERS * 2 * LATENCY / 3
+        assert lag < 0.05
+
+    @pytest.mark.asyncio
+    async def test_batch_stop_reports_each_container(self):
+        docker_client = FakeDockerClient({"stop": LATENCY})
+        manager, container_ids = await make_manager(docker_client, containers=4)
+
+        results = await manager.stop_agents(container_ids + ["agent-missing"])
+        assert results == {**{container_id: True for container_id in container_ids}, "agent-missing": False}
+        assert all(manager.active_containers[c].status == "exited" for c in container_ids)
+        assert await manager.cleanup_sandboxes(container_ids) == {c: True for c in container_ids}
+
+    @pytest.mark.asyncio
+    async def test_slow_docker_call_times_out(self):
+        docker_client = FakeDockerClient({"logs": 1.0})
+        manager, (container_id,) = await make_manager(docker_client, containers=1, docker_call_timeout=0.1)
+
+        start = time.perf_counter()
+        logs = await manager.get_agent_logs(container_id)
+        assert time.perf_counter() - start < 0.5
+        assert logs[0].startswith("Error getting logs")
+        await manager.cleanup_all()
+
+    @pytest.mark.asyncio
+    async def test_streaming_stats_subscription(self):
+        docker_client = FakeDockerClient({"stats": 0.02})
+        manager, (container_id,) = await make_manager(docker_client, containers=1)
+        container = manager.active_containers[container_id]
+
+        samples = []
+        async for sample in manager.stream_container_stats(container_id):
+            samples.append(sample)
+            if len(samples) == 3:
+                break
+        assert [s["cpu_usage"] for s in samples] == [20.0] * 3
+
+        # The reader thread stops after the consumer leaves
+        await asyncio.sleep(0.1)
+        produced = container.samples
+        await asyncio.sleep(0.1)
+        assert container.samples == produced
+
+        # A subscription ends when the container stops
+        async def stop_later():
+            await asyncio.sleep(0.1)
+            container.status = "exited"
+
+        asyncio.create_task(stop_later())
+        remaining = [sample async for sample in manager.stream_container_stats(container_id)]
+        assert 1 <= len(remaining) <= 10
+        await manager.cleanup_all()
@@ -0,0 +1,228 @@
+"""Tests for the warm sandbox container pool, against an in-memory Docker client."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_builder.agent_spec import create_monitor_agent
+from agent_builder.sandbox import SandboxConfig, SandboxManager
+from agent_builder.container_pool import SandboxPool
+from tests.fake_docker import FakeDockerClient
+
+CREATE_LATENCY = 0.2
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+async def steady_load(pool, workers=3, runs_per_worker=10, work=0.05):
+    """Acquire, hold and release sandboxes from concurrent workers; returns acquire latencies"""
+    latencies = []
+
+    async def worker():
+        for _ in range(runs_per_worker):
+            start = time.perf_counter()
+            sandbox = await pool.acquire()
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(work)
+            await pool.release(sandbox)
+            await asyncio.sleep(work)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return latencies
+
+
+class TestSandboxPool:
+
+    @pytest.mark.asyncio
+    async def test_warm_pool_removes_cold_start_from_acquire(self):
+        cold = SandboxPool(FakeDockerClient({"create": CREATE_LATENCY}), SandboxConfig(), target_size=0, max_size=8)
+        cold_latencies = await steady_load(cold)
+        await cold.close()
+
+        docker_client = FakeDockerClient({"create": CREATE_LATENCY})
+        warm = SandboxPool(docker_client, SandboxConfig(), target_size=4, max_size=8)
+        await warm.start()
+        await warm.fill()
+        warm_latencies = await steady_load(warm)
+        stats = warm.stats()
+        await warm.close()
+
+        cold_p95, warm_p95 = percentile(cold_latencies, 0.95), percentile(warm_latencies, 0.95)
+        print(f"✅ p95 acquire latency: cold {cold_p95 * 1e3:.1f}ms, warm {warm_p95 * 1e3:.2f}ms "
+              f"({stats['hits']} hits, {stats['misses']} misses, {stats['created']} containers created)")
+        assert cold_p95 >= CREATE_LATENCY
+        assert warm_p95 < 0.01
+        assert stats["misses"] == 0
+        # Released containers are reused, not recreated
+        assert stats["created"] <= 8
+        assert not docker_client.containers.by_name
+
+    @pytest.mark.asyncio
+    async def test_replenishes_in_background_and_respects_max_size(self):
+        docker_client = FakeDockerClient({"create": 0.05})
+        pool = SandboxPool(docker_client, SandboxConfig(), target_size=2, max_size=3)
+        await pool.start()
+        await pool.fill()
+
+        held = [await pool.acquire(), await pool.acquire()]
+        for _ in range(50):
+            if pool.stats()["idle"] == 1:
+                break
+            await asyncio.sleep(0.02)
+        assert pool.stats()["idle"] == 1  # Refilled as far as max_size allows
+
+        held.append(await pool.acquire())
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.1)
+        assert not waiter.done()  # All three containers are in use
+
+        await pool.release(held.pop())
+        sandbox = await asyncio.wait_for(waiter, 1)
+        assert pool.size <= 3
+        await pool.release(sandbox)
+        for sandbox in held:
+            await pool.release(sandbox)
+        await pool.close()
+        assert not docker_client.containers.by_name
+
+    @pytest.mark.asyncio
+    async def test_release_resets_or_recycles(self):
+        docker_client = FakeDockerClient()
+        pool = SandboxPool(docker_client, SandboxConfig(), target_size=1, max_size=2, max_uses=2)
+        await pool.fill()
+
+        sandbox = await pool.acquire()
+        (sandbox.agent_dir / "agent.py").write_text("print('first agent')")
+        (sandbox.secrets_dir / "token.txt").write_text("secret")
+        await pool.release(sandbox)
+        assert list(sandbox.agent_dir.iterdir()) == [] and list(sandbox.secrets_dir.iterdir()) == []
+        assert sandbox.container.exec_calls[-1]["cmd"][0] == "sh"
+
+        # Second use reaches max_uses: replaced instead of reset
+        again = await pool.acquire()
+        assert again is sandbox
+        await pool.release(again)
+        assert sandbox.name in docker_client.removed
+        assert not sandbox.workdir.exists()
+
+        # A container that died while in use is not returned to the pool
+        broken = await pool.acquire()
+        broken.container.status = "exited"
+        await pool.release(broken)
+        assert broken.name in docker_client.removed
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_leftover_processes_do_not_reach_next_tenant(self):
+        docker_client = FakeDockerClient()
+        pool = SandboxPool(docker_client, SandboxConfig(), target_size=1, max_size=2)
+        await pool.fill()
+
+        tenant_a = await pool.acquire()
+        tenant_a.container.processes.append(("agentuser", "python /tmp/watch_secrets.py"))
+        await pool.release(tenant_a)
+        assert tenant_a.container.exec_calls[-1]["user"] == "agentuser"
+
+        tenant_b = await pool.acquire()
+        assert tenant_b is tenant_a
+        assert tenant_b.container.processes == []
+        await pool.release(tenant_b)
+
+        # A process the reset cannot kill means the container is discarded
+        tenant_c = await pool.acquire()
+        tenant_c.container.processes.append(("root", "sleep 1000"))
+        await pool.release(tenant_c)
+        assert tenant_c.name in docker_client.removed
+
+        tenant_d = await pool.acquire()
+        assert tenant_d is not tenant_c and tenant_d.container.processes == []
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_health_check_replaces_dead_idle_containers(self):
+        docker_client = FakeDockerClient()
+        pool = SandboxPool(docker_client, SandboxConfig(), target_size=3, max_size=4, health_check_interval=0.05)
+        await pool.fill()
+        victim = pool._idle[0]
+        victim.container.remove(force=True)  # Removed behind the pool's back
+
+        await pool.start()
+        for _ in range(50):
+            if victim not in pool._idle and pool.stats()["idle"] == 3:
+                break
+            await asyncio.sleep(0.02)
+        assert victim not in pool._idle
+        assert pool.stats()["idle"] == 3
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_surplus_idle_containers_expire(self):
+        docker_client = FakeDockerClient()
+        pool = SandboxPool(docker_client, SandboxConfig(), target_size=1, max_size=4,
+                           health_check_interval=0.05, idle_timeout=0.1)
+        burst = await asyncio.gather(*(pool.acquire() for _ in range(4)))
+        for sandbox in burst:
+            await pool.release(sandbox)
+        assert pool.stats()["idle"] == 4  # Kept for reuse while the burst may continue
+
+        await pool.start()
+        for _ in range(50):
+            if pool.stats()["idle"] == 1:
+                break
+            await asyncio.sleep(0.02)
+        assert pool.stats()["idle"] == 1
+        assert len(docker_client.containers.by_name) == 1
+        await pool.close()
+
+
+class TestSandboxManagerWithPool:
+
+    @pytest.mark.asyncio
+    async def test_deploy_runs_in_warm_container(self):
+        docker_client = FakeDockerClient({"create": CREATE_LATENCY})
+        manager = SandboxManager(SandboxConfig(pool_target_size=2, max_memory_mb=1024), docker_client=docker_client)
+        await manager.initialize()
+        await manager.pool.fill()
+        spec = create_monitor_agent(target="email", frequency=5, created_by="test")
+
+        start = time.perf_counter()
+        container_id = await manager.create_sandbox("monitor", "print('hi')", spec, secrets={"gmail_token": "abc"})
+        assert time.perf_counter() - start < CREATE_LATENCY / 2
+
+        sandbox = manager.pooled_sandboxes[container_id]
+        assert (sandbox.agent_dir / "agent.py").read_text() == "print('hi')"
+        assert (sandbox.secrets_dir / "gmail_token.txt").read_text() == "abc"
+        assert sandbox.container.updates[-1]["mem_limit"] == f"{spec.resource_limits.memory}m"
+
+        result = await manager.execute_agent(container_id, timeout=5)
+        assert result["status"] == "success" and result["exit_code"] == 0
+        exec_call = sandbox.container.exec_calls[-1]
+        assert exec_call["cmd"] == ["python", "/app/base_agent.py"]
+        assert exec_call["environment"]["SANDBOX_ID"] == container_id
+        assert await manager.get_agent_logs(container_id) == ['{"status": "success"}']
+
+        assert await manager.cleanup_sandbox(container_id)
+        assert container_id not in manager.active_containers
+        assert sandbox in manager.pool._idle
+        await manager.cleanup_all()
+        assert not docker_client.containers.by_name
+
+    @pytest.mark.asyncio
+    async def test_pool_disabled_creates_per_agent(self):
+        docker_client = FakeDockerClient()
+        manager = SandboxManager(SandboxConfig(pool_target_size=0), docker_client=docker_client)
+        await manager.initialize()
+        spec = create_monitor_agent(target="email", frequency=5, created_by="test")
+
+        container_id = await manager.create_sandbox("monitor", "print('hi')", spec)
+        assert manager.pool is None
+        assert docker_client.containers.by_name[container_id].kwargs["command"] == ["python", "/app/base_agent.py"]
+        await manager.cleanup_all()
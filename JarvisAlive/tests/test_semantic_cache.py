@@ -0,0 +1,226 @@
+"""Tests for the offline semantic classification cache."""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engines.semantic_cache import HashedFeatureVectorizer, SemanticCache
+from orchestration.intent_parser import IntentParser
+from orchestration.jarvis import Jarvis, JarvisConfig
+
+
+class CountingEngine:
+    """Stand-in AI engine that always classifies as branding."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt: str, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return SimpleNamespace(content=json.dumps({
+            "primary_intent": "branding",
+            "confidence_score": 0.9,
+            "reasoning": "stub classification"
+        }))
+
+
+class ExtractingEngine(CountingEngine):
+    """Stand-in AI engine that also extracts parameters from the request."""
+
+    async def generate(self, prompt: str, **kwargs):
+        response = await super().generate(prompt, **kwargs)
+        request = prompt.split('User Request: "', 1)[1].split('"', 1)[0]
+        data = json.loads(response.content)
+        data["extracted_parameters"] = {"business_type": "coffee shop"}
+        if "Paris" in request:
+            data["extracted_parameters"]["location"] = "Paris"
+        return SimpleNamespace(content=json.dumps(data))
+
+
+class TestHashedFeatureVectorizer:
+
+    def test_near_duplicates_are_similar(self):
+        vectorizer = HashedFeatureVectorizer()
+        left = vectorizer.vectorize("create a brand for my coffee shop")
+        right = vectorizer.vectorize("make branding for a coffee shop")
+        assert vectorizer.similarity(left, right) >= 0.85
+
+    def test_different_requests_are_dissimilar(self):
+        vectorizer = HashedFeatureVectorizer()
+        left = vectorizer.vectorize("create a brand for my coffee shop")
+        right = vectorizer.vectorize("market research for my coffee shop")
+        assert vectorizer.similarity(left, right) < 0.85
+
+    def test_vectors_are_unit_length(self):
+        vectorizer = HashedFeatureVectorizer()
+        vector = vectorizer.vectorize("Find fintech leads in New York")
+        assert vectorizer.similarity(vector, vector) == pytest.approx(1.0)
+        assert vectorizer.vectorize("the a an") == {}
+
+
+class TestSemanticCache:
+
+    def test_hit_above_threshold_and_stats(self):
+        cache = SemanticCache("test")
+        fingerprint = SemanticCache.fingerprint("prompt v1")
+
+        assert cache.lookup("create a brand for my coffee shop", fingerprint) is None
+        cache.store("create a brand for my coffee shop", {"intent": "branding"}, fingerprint)
+
+        assert cache.lookup("make branding for a coffee shop", fingerprint) == {"intent": "branding"}
+        assert cache.lookup("analyze competitors for a coffee shop", fingerprint) is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    def test_prompt_change_invalidates(self):
+        cache = SemanticCache("test")
+        cache.store("design a logo", "branding", SemanticCache.fingerprint("prompt v1"))
+
+        assert cache.lookup("design a logo", SemanticCache.fingerprint("prompt v2")) is None
+        assert cache.get_stats()["invalidations"] == 1
+        assert cache.get_stats()["entries"] == 0
+
+    def test_scopes_are_isolated(self):
+        cache = SemanticCache("test")
+        fingerprint = SemanticCache.fingerprint("prompt")
+        cache.store("design a logo", "branding", fingerprint, scope="session-a")
+
+        assert cache.lookup("design a logo", fingerprint, scope="session-b") is None
+        assert cache.lookup("design a logo", fingerprint, scope="session-a") == "branding"
+
+    def test_values_are_copied_and_entries_bounded(self):
+        cache = SemanticCache("test", max_entries=2)
+        fingerprint = SemanticCache.fingerprint("prompt")
+        cache.store("design a logo", {"tags": []}, fingerprint)
+
+        cache.lookup("design a logo", fingerprint)["tags"].append("mutated")
+        assert cache.lookup("design a logo", fingerprint) == {"tags": []}
+
+        cache.store("find fintech leads", "sales", fingerprint)
+        cache.store("fix the api bug", "engineering", fingerprint)
+        assert cache.get_stats()["entries"] == 2
+        assert cache.get_stats()["evictions"] == 1
+
+
+class TestIntentParserSemanticCache:
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_skips_llm(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        parser = IntentParser()
+        engine = CountingEngine()
+        parser.ai_engine = engine
+
+        first = await parser._ai_semantic_parsing("create a brand for my coffee shop")
+        second = await parser._ai_semantic_parsing("make branding for a coffee shop")
+
+        assert engine.calls == 1
+        assert second.primary_intent == first.primary_intent
+        assert parser.get_parser_stats()["semantic_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_does_not_reuse_parameters(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        parser = IntentParser()
+        engine = ExtractingEngine()
+        parser.ai_engine = engine
+
+        first = await parser._ai_semantic_parsing("Create a brand for my coffee shops in Paris")
+        second = await parser._ai_semantic_parsing("Create a brand for my coffee shop")
+        third = await parser._ai_semantic_parsing("Create a brand for my coffee shop company in Paris")
+
+        assert engine.calls == 1
+        assert first.extracted_parameters == {"business_type": "coffee shop", "location": "Paris"}
+        assert (second.primary_intent, second.confidence_score, second.reasoning) == \
+            (first.primary_intent, first.confidence_score, first.reasoning)
+        assert second.suggested_agents == first.suggested_agents
+        assert second.extracted_parameters == {}
+        assert third.extracted_parameters == {"business_type": "company"}
+
+    @pytest.mark.asyncio
+    async def test_prompt_change_forces_new_classification(self, monkeypatch):
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        parser = IntentParser()
+        engine = CountingEngine()
+        parser.ai_engine = engine
+
+        await parser._ai_semantic_parsing("create a brand for my coffee shop")
+
+        original_prompt = parser._create_classification_prompt
+        monkeypatch.setattr(
+            parser,
+            "_create_classification_prompt",
+            lambda request, context=None: original_prompt(request, context) + "\nBe concise."
+        )
+        await parser._ai_semantic_parsing("create a brand for my coffee shop")
+
+        assert engine.calls == 2
+
+
+class BusinessLLM:
+    """Stand-in business LLM whose success criteria restate the request's target."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        request = messages[-1].content.split("Business Request: ", 1)[1].split("\n", 1)[0]
+        return SimpleNamespace(content=json.dumps({
+            "category": "GROW_REVENUE",
+            "confidence": 0.9,
+            "suggested_departments": ["Sales", "Marketing"],
+            "key_metrics_to_track": ["MRR"],
+            "reasoning": f"Revenue target in: {request}",
+            "complexity_level": "moderate",
+            "estimated_timeline": f"Timeline for: {request}",
+            "prerequisites": [f"Pipeline review for: {request}"],
+            "success_criteria": [f"Criteria for: {request}"]
+        }))
+
+
+class TestJarvisBusinessIntentCache:
+
+    @staticmethod
+    def make_jarvis():
+        jarvis = Jarvis.__new__(Jarvis)
+        jarvis.config = JarvisConfig(orchestrator_config=None)
+        jarvis.business_context = None
+        jarvis.business_llm = BusinessLLM()
+        jarvis.intent_cache = SemanticCache("jarvis_business_intent")
+
+        async def no_context(session_id):
+            return None
+
+        jarvis._ensure_business_context = no_context
+        return jarvis
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_does_not_reuse_request_details(self):
+        jarvis = self.make_jarvis()
+        first_request = "grow subscription revenue 50% this year with outbound sales"
+        second_request = "grow subscription revenue 20% this year with outbound sales"
+        vectorizer = jarvis.intent_cache.vectorizer
+        assert vectorizer.similarity(vectorizer.vectorize(first_request), vectorizer.vectorize(second_request)) >= 0.85
+
+        first = await jarvis.analyze_business_intent(first_request, "session")
+        second = await jarvis.analyze_business_intent(second_request, "session")
+
+        assert jarvis.business_llm.calls == 1
+        assert first.success_criteria == [f"Criteria for: {first_request}"]
+        assert (second.category, second.confidence, second.suggested_departments, second.complexity_level) == \
+            (first.category, first.confidence, first.suggested_departments, first.complexity_level)
+        for field in ("success_criteria", "reasoning", "estimated_timeline", "prerequisites"):
+            assert getattr(second, field) != getattr(first, field)
+        assert "20%" in second.success_criteria[0]
+        assert second is not await jarvis.analyze_business_intent(second_request, "session")
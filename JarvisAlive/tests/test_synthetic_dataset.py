@@ -0,0 +1,176 @@
+"""Tests and scale benchmark for the chunked, memory-mapped SyntheticDataset."""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.mock_data import MockDataGenerator, open_snapshot
+from database.synthetic_dataset import SyntheticDataset
+
+
+def snapshot_bytes(path):
+    return {
+        name: (Path(path) / name).read_bytes()
+        for name in sorted(os.listdir(path)) if name.endswith(".npy")
+    }
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    path = tmp_path_factory.mktemp("snapshot") / "leads"
+    return SyntheticDataset.generate(str(path), companies=3_000, contacts=30_000, seed=11, chunk_size=4_096)
+
+
+class TestGeneration:
+
+    def test_same_seed_is_byte_identical(self, tmp_path, dataset):
+        again = SyntheticDataset.generate(str(tmp_path / "again"), companies=3_000, contacts=30_000,
+                                          seed=11, chunk_size=4_096)
+        assert snapshot_bytes(again.path) == snapshot_bytes(dataset.path)
+        # News dates are relative to each snapshot's generated_at
+        assert again.company(17).dict(exclude={"recent_news"}) == dataset.company(17).dict(exclude={"recent_news"})
+        assert again.contact(1234) == dataset.contact(1234)
+
+    def test_different_seed_differs(self, tmp_path, dataset):
+        other = SyntheticDataset.generate(str(tmp_path / "other"), companies=3_000, contacts=30_000,
+                                          seed=12, chunk_size=4_096)
+        assert not np.array_equal(other.columns["contact_company"], dataset.columns["contact_company"])
+
+    def test_ids_unique_and_distributions_plausible(self, dataset):
+        assert len(np.unique(dataset.columns["company_id"])) == dataset.company_count
+        assert len(np.unique(dataset.columns["contact_id"])) == dataset.contact_count
+
+        industries = np.bincount(dataset.columns["company_industry"]) / dataset.company_count
+        assert industries[dataset.vocab["industry"].index("SaaS")] == pytest.approx(0.4, abs=0.03)
+        counts = np.asarray(dataset.columns["company_employee_count"])
+        assert counts.min() >= 1 and counts.max() <= 5000
+
+        generator = MockDataGenerator()
+        for row in range(0, dataset.company_count, 97):
+            company = dataset.company(row)
+            assert company.employee_range == generator._get_employee_range(company.employee_count)
+
+    def test_existing_snapshot_not_overwritten_by_default(self, dataset):
+        with pytest.raises(FileExistsError):
+            SyntheticDataset.generate(dataset.path, companies=10, contacts=10)
+        assert not [name for name in os.listdir(os.path.dirname(dataset.path)) if ".tmp-" in name]
+
+    def test_open_matches_generated(self, dataset):
+        opened = open_snapshot(dataset.path)
+        assert opened.manifest == dataset.manifest
+        assert opened.contact(999) == dataset.contact(999)
+        assert isinstance(opened.columns["contact_company"], np.memmap)
+
+
+class TestLookups:
+
+    def test_id_lookups_round_trip(self, dataset):
+        for row in range(0, dataset.contact_count, 1_013):
+            contact = dataset.contact(row)
+            assert dataset.contact_row(contact.id) == row
+            assert dataset.get_contact(contact.id) == contact
+            company = dataset.get_company(contact.company_id)
+            assert company.name == contact.company_name
+            assert company.location == contact.location
+
+        assert dataset.get_company("comp_zzzz") is None
+        assert dataset.get_contact("cont_not-hex") is None
+        assert dataset.company_row("cont_00000001") is None
+
+    def test_filters_match_brute_force(self, dataset):
+        columns = dataset.columns
+        vocab = dataset.vocab
+        industry = np.array(vocab["industry"])[columns["company_industry"]]
+        funding = np.array(vocab["funding_stage"])[columns["company_funding_stage"]]
+        employees = np.asarray(columns["company_employee_count"])
+        title = np.array(vocab["title"])[columns["contact_title"]]
+        seniority = np.array(vocab["seniority"])[columns["contact_seniority"]]
+        contact_company = np.asarray(columns["contact_company"])
+
+        expected = np.flatnonzero(np.isin(industry, ["SaaS", "FinTech"]) & (funding == "Seed")
+                                  & (employees >= 50) & (employees <= 500))
+        actual = dataset.company_rows(industries=["SaaS", "FinTech"], funding_stages=["Seed"],
+                                      min_employees=50, max_employees=500)
+        assert np.array_equal(actual, expected)
+
+        title_match = np.array([("vp" in t.lower()) or ("director" in t.lower()) for t in title])
+        expected_contacts = np.flatnonzero(title_match & np.isin(industry[contact_company], ["Healthcare"]))
+        leads = dataset.find_leads(industries=["Healthcare"], title_keywords=["VP", "Director"])
+        assert np.array_equal(leads.contacts, expected_contacts)
+        assert np.array_equal(leads.companies, contact_company[expected_contacts])
+
+        expected_contacts = np.flatnonzero(np.isin(seniority, ["C-Level"]) & (contact_company < 40))
+        actual = dataset.contact_rows(seniority_levels=["C-Level"], company_rows=np.arange(40))
+        assert np.array_equal(actual, expected_contacts)
+        assert np.array_equal(dataset.contact_rows(company_rows=np.array([5, 3])),
+                              np.flatnonzero(np.isin(contact_company, [3, 5])))
+
+        assert len(dataset.company_rows(industries=["Unknown"])) == 0
+        assert len(dataset.find_leads()) == dataset.contact_count
+
+    def test_materialized_leads(self, dataset):
+        rows = dataset.find_leads(industries=["SaaS"], seniority_levels=["VP"])
+        for contact, company in dataset.iter_leads(rows, limit=50):
+            assert contact.company_id == company.id
+            assert company.industry == "SaaS"
+            assert contact.seniority == "VP"
+            assert contact.title in MockDataGenerator()._titles_by_seniority["VP"]
+
+
+class TestChunking:
+
+    def test_chunk_boundaries_cover_every_row(self, tmp_path):
+        dataset = SyntheticDataset.generate(str(tmp_path / "tiny"), companies=7, contacts=23, seed=3, chunk_size=5)
+        assert dataset.company_count == 7 and dataset.contact_count == 23
+        assert len(np.unique(dataset.columns["contact_id"])) == 23
+        assert np.asarray(dataset.columns["contact_company"]).max() < 7
+        assert sum(len(dataset.postings("company", [row])) for row in range(7)) == 23
+
+
+class TestScaleBenchmark:
+
+    def test_million_contacts(self, tmp_path):
+        """1M contacts / 100k companies: generate, reopen, and query."""
+        path = str(tmp_path / "million")
+
+        start = time.perf_counter()
+        MockDataGenerator().generate_snapshot(path, companies=100_000, contacts=1_000_000, seed=7)
+        generation_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dataset = open_snapshot(path)
+        open_time = time.perf_counter() - start
+
+        contact_ids = [dataset.contact_id(row) for row in range(0, 1_000_000, 997)]
+        start = time.perf_counter()
+        rows = [dataset.contact_row(contact_id) for contact_id in contact_ids]
+        id_lookup_time = (time.perf_counter() - start) / len(contact_ids)
+
+        start = time.perf_counter()
+        leads = dataset.find_leads(industries=["SaaS", "FinTech"], title_keywords=["VP", "Director"])
+        query_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        materialized = list(dataset.iter_leads(leads, limit=100))
+        materialize_time = (time.perf_counter() - start) / len(materialized)
+
+        size_mb = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)) / 1e6
+        print(f"✅ Snapshot of 1,000,000 contacts / 100,000 companies ({size_mb:.0f}MB on disk):")
+        print(f"   - Generation: {generation_time:.2f}s")
+        print(f"   - Open: {open_time * 1000:.1f}ms")
+        print(f"   - Id lookup: {id_lookup_time * 1e6:.1f}µs")
+        print(f"   - find_leads: {query_time * 1000:.1f}ms ({len(leads):,} leads)")
+        print(f"   - Materialize: {materialize_time * 1e6:.0f}µs per lead")
+
+        assert rows == list(range(0, 1_000_000, 997))
+        assert len(leads) > 100_000
+        assert open_time < 0.1
+        assert id_lookup_time < 0.0002
+        assert query_time < 1.0
+        assert generation_time < 60
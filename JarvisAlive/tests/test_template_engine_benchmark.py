@@ -0,0 +1,135 @@
+"""Tests and bulk-rendering benchmark for TemplateEngine caching and render_many."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import template_engine as template_engine_module
+from templates.template_engine import TemplateEngine, TemplateInfo, TemplateValidationError
+
+
+BASE_PARAMS = {
+    "gmail_monitor": {"email_filter": "from:support@example.com", "check_interval": "300"},
+    "slack_notifier": {"channel": "#alerts"},
+    "web_scraper": {"target_url": "https://example.com", "scrape_interval": "3600"},
+    "file_processor": {"input_path": "/data/in", "operation": "copy"},
+    "data_analyzer": {"data_source": "/data/sales.csv", "analysis_type": "summary"},
+}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return TemplateEngine(bytecode_cache_dir=tmp_path / "jinja_cache")
+
+
+class TestTemplateEngineCaching:
+
+    @pytest.mark.parametrize("template_name", sorted(BASE_PARAMS))
+    def test_library_templates_render_valid_code(self, engine, template_name):
+        success, result = engine.test_template(template_name, BASE_PARAMS[template_name])
+        assert success, result
+
+    def test_bytecode_cache_written_to_disk(self, engine, tmp_path):
+        engine.render_template("slack_notifier", BASE_PARAMS["slack_notifier"])
+        assert list((tmp_path / "jinja_cache").iterdir())
+
+    def test_validation_is_memoized(self, engine, monkeypatch):
+        parse_calls = []
+        original_parse = template_engine_module.ast.parse
+
+        def counting_parse(code, *args, **kwargs):
+            parse_calls.append(code)
+            return original_parse(code, *args, **kwargs)
+
+        monkeypatch.setattr(template_engine_module.ast, "parse", counting_parse)
+
+        first = engine.render_template("gmail_monitor", BASE_PARAMS["gmail_monitor"])
+        second = engine.render_template("gmail_monitor", BASE_PARAMS["gmail_monitor"])
+
+        assert first == second
+        assert len(parse_calls) == 1
+
+    def test_invalid_code_error_is_memoized(self, tmp_path):
+        engine = TemplateEngine(templates_dir=tmp_path / "library", bytecode_cache_dir=tmp_path / "cache")
+        engine.create_custom_template(
+            "broken",
+            "def broken(:\n    pass\n",
+            TemplateInfo("broken", "Broken template", [], [], [], [])
+        )
+
+        for _ in range(2):
+            with pytest.raises(TemplateValidationError, match="Invalid Python syntax"):
+                engine.render_template("broken", {})
+        assert len(engine._validation_cache) == 1
+
+
+class TestRenderMany:
+
+    def test_matches_render_template_in_order(self, engine):
+        parameter_sets = [
+            dict(BASE_PARAMS["slack_notifier"], agent_name=f"Notifier {i % 3}")
+            for i in range(9)
+        ]
+        expected = [engine.render_template("slack_notifier", params) for params in parameter_sets]
+
+        assert engine.render_many("slack_notifier", parameter_sets) == expected
+
+    def test_process_pool_matches_in_process(self, engine):
+        parameter_sets = [
+            dict(BASE_PARAMS["file_processor"], agent_name=f"Processor {i}")
+            for i in range(12)
+        ]
+        in_process = engine.render_many("file_processor", parameter_sets, max_workers=1)
+        pooled = engine.render_many("file_processor", parameter_sets, max_workers=2, chunksize=4)
+
+        assert pooled == in_process
+
+    def test_return_exceptions(self, engine):
+        parameter_sets = [BASE_PARAMS["web_scraper"], {"target_url": "https://example.com"}]
+
+        with pytest.raises(TemplateValidationError, match="Missing required parameters"):
+            engine.render_many("web_scraper", parameter_sets)
+
+        results = engine.render_many("web_scraper", parameter_sets, return_exceptions=True)
+        assert isinstance(results[0], str)
+        assert isinstance(results[1], TemplateValidationError)
+
+    def test_bulk_render_10k_agents(self, engine):
+        """Benchmark rendering 10k agents for many sessions with render_many."""
+        total_agents = 10_000
+        sessions = 100
+        templates = sorted(BASE_PARAMS)
+        requests = [
+            (
+                templates[i % len(templates)],
+                dict(BASE_PARAMS[templates[i % len(templates)]], agent_name=f"Session {i % sessions} Agent")
+            )
+            for i in range(total_agents)
+        ]
+
+        # Baseline: the per-call path without memoized validation, sampled and extrapolated
+        baseline_engine = TemplateEngine(validation_cache_size=0)
+        sample = requests[:250]
+        start = time.perf_counter()
+        for template_name, params in sample:
+            baseline_engine.render_template(template_name, params)
+        baseline_estimate = (time.perf_counter() - start) / len(sample) * total_agents
+
+        start = time.perf_counter()
+        rendered = 0
+        for template_name in templates:
+            parameter_sets = [params for name, params in requests if name == template_name]
+            rendered += len(engine.render_many(template_name, parameter_sets))
+        bulk_time = time.perf_counter() - start
+
+        print(f"✅ Rendered {rendered} agents with render_many:")
+        print(f"   - Per-call baseline (extrapolated): {baseline_estimate:.2f}s")
+        print(f"   - render_many: {bulk_time:.2f}s ({rendered / bulk_time:,.0f} agents/s)")
+        print(f"   - Speedup: {baseline_estimate / bulk_time:.1f}x")
+
+        assert rendered == total_agents
+        assert bulk_time < baseline_estimate / 5
@@ -0,0 +1,152 @@
+"""Tests for the embedded time-series metrics store."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import monitoring.timeseries
+from monitoring.timeseries import DEFAULT_TIERS, TimeSeriesStore, get_default_store
+from orchestration.persistent.advanced_features import PerformanceAnalyticsEngine
+
+T0 = 1_699_999_200  # On an hour boundary
+
+
+def fill(store, name, seconds, start=T0, value=lambda i: i % 100):
+    for i in range(seconds):
+        store.record(name, value(i), start + i)
+
+
+class TestTimeSeriesStore:
+
+    def test_rollups_keep_min_max_sum_count_last(self):
+        store = TimeSeriesStore()
+        for i, value in enumerate([5, 1, 9, 3]):
+            store.record("latency", value, T0 + i * 20)  # 0, 20, 40, 60s
+
+        minute = store.query("latency", T0, T0 + 119, resolution=60)
+        assert [(b.timestamp, b.min, b.max, b.sum, b.count, b.last) for b in minute] == [
+            (T0, 1, 9, 15, 3, 9), (T0 + 60, 3, 3, 3, 1, 3)
+        ]
+        (hour,) = store.query("latency", T0, T0 + 3599, resolution=3600)
+        assert (hour.min, hour.max, hour.count, hour.last, hour.mean) == (1, 9, 4, 3, 4.5)
+        assert len(store.query("latency", T0, T0 + 60, resolution=1)) == 4
+
+    def test_range_queries_pick_the_finest_covering_tier(self):
+        store = TimeSeriesStore()
+        now = T0 + 3 * 3600
+        fill(store, "cpu", 3 * 3600)
+
+        assert store.resolution_for(now - 600, now) == 1
+        assert store.resolution_for(now - 2 * 3600, now) == 60
+        assert store.resolution_for(now - 3 * 86400, now) == 3600
+
+        recent = store.query("cpu", now - 10, now)
+        assert [b.timestamp for b in recent] == list(range(now - 10, now))
+        assert len(store.query("cpu", now - 2 * 3600, now)) == 120
+        # Older than the 1s tier keeps: only coarser buckets remain
+        assert store.query("cpu", T0, T0 + 10, resolution=1) == []
+        assert store.query("cpu", T0, T0 + 10, resolution=60)[0].count == 60
+
+    def test_window_aggregate_and_trend(self):
+        store = TimeSeriesStore()
+        fill(store, "queue_depth", 600, value=lambda i: 10 if i < 300 else 20)
+        end = T0 + 600
+
+        summary = store.aggregate("queue_depth", 300, end)
+        assert (summary.count, summary.min, summary.max, summary.mean, summary.last) == (300, 20, 20, 20, 20)
+        assert store.trend("queue_depth", 300, end) == "increasing"
+        assert store.trend("queue_depth", 100, end) == "stable"
+        assert store.trend("missing", 100, end) == "insufficient_data"
+
+    def test_window_cost_does_not_grow_with_history(self):
+        short, long = TimeSeriesStore(), TimeSeriesStore()
+        fill(short, "x", 120)
+        fill(long, "x", 3 * 86400)
+
+        def time_aggregate(store, end):
+            start = time.perf_counter()
+            for _ in range(200):
+                store.aggregate("x", 60, end)
+            return time.perf_counter() - start
+
+        short_time = time_aggregate(short, T0 + 120)
+        long_time = time_aggregate(long, T0 + 3 * 86400)
+        print(f"✅ 60s window aggregate: {short_time / 200 * 1e6:.0f}µs with 2m of history, "
+              f"{long_time / 200 * 1e6:.0f}µs with 3 days")
+        assert long_time < short_time * 3
+
+    def test_memory_is_bounded_across_series_and_uptime(self):
+        store = TimeSeriesStore(max_series=500)
+        for series in range(500):
+            # A sample every 5 minutes for 4 days
+            for i in range(0, 4 * 86400, 300):
+                store.record(f"agent.{series}.processing_time_ms", series, T0 + i)
+        full_per_series = sum(capacity for _, capacity in DEFAULT_TIERS) * 48
+
+        print(f"✅ 500 series over 4 days: {store.memory_bytes() / 1e6:.1f}MB of buckets "
+              f"(bound {store.max_memory_bytes() / 1e6:.1f}MB)")
+        assert store.memory_bytes() <= 500 * full_per_series
+        assert store.memory_bytes() <= store.max_memory_bytes()
+        rings = store._series["agent.0.processing_time_ms"]
+        assert [len(ring) for ring in rings] == [900, 1152, 96]
+
+        assert not store.record("one.too.many", 1, T0)
+        assert store.stats["dropped_series"] == 1
+
+    def test_late_samples(self):
+        store = TimeSeriesStore(tiers=[(1, 10), (60, 10)])
+        fill(store, "x", 100)
+        assert store.record("x", 1000, T0 + 95)  # Still in the 1s ring
+        assert store.query("x", T0 + 95, T0 + 95, resolution=1)[0].max == 1000
+        assert store.record("x", 1000, T0 + 5)  # Only the minute tier still has it
+        assert store.query("x", T0, T0 + 59, resolution=60)[0].max == 1000
+        assert not store.record("x", 1, T0 - 3600)
+        assert store.stats["late_samples"] == 1
+
+    def test_snapshot_and_restore(self, tmp_path):
+        store = TimeSeriesStore()
+        fill(store, "cpu", 2000)  # The 1s ring has wrapped
+        fill(store, "memory", 30, value=lambda i: i * 1.5)
+        path = tmp_path / "metrics" / "timeseries.snap"
+        store.snapshot(path)
+
+        restored = TimeSeriesStore.restore(path)
+        assert restored.series() == ["cpu", "memory"]
+        for resolution, _ in DEFAULT_TIERS:
+            for name in ("cpu", "memory"):
+                assert restored.query(name, T0, T0 + 2000, resolution) == store.query(name, T0, T0 + 2000, resolution)
+
+        # A restored store keeps recording from where it left off
+        restored.record("cpu", 7, T0 + 2000)
+        assert restored.latest("cpu") == 7
+        assert len(restored._series["cpu"][0]) == 900
+
+        path.write_bytes(b"not a snapshot")
+        with pytest.raises(ValueError):
+            TimeSeriesStore.restore(path)
+
+
+class TestPerformanceAnalyticsTrends:
+
+    @pytest.mark.asyncio
+    async def test_trends_come_from_the_store(self):
+        store = TimeSeriesStore()
+        now = time.time()
+        fill(store, "error_rate", 600, start=now - 600, value=lambda i: 0.01 if i < 300 else 0.2)
+
+        engine = PerformanceAnalyticsEngine(timeseries=store)
+        analysis = await engine.analyze_system_performance({"error_rate": 0.2, "status": "degraded"})
+        assert analysis["trends"] == {"error_rate": "increasing"}
+        assert "status" not in store
+
+    @pytest.mark.asyncio
+    async def test_defaults_to_the_process_store(self, monkeypatch):
+        monkeypatch.setattr(monitoring.timeseries, "_default_store", TimeSeriesStore())
+        engine = PerformanceAnalyticsEngine()
+        await engine.analyze_system_performance({"error_rate": 0.2})
+        assert engine.metrics_history is get_default_store()
+        assert get_default_store().latest("error_rate") == 0.2
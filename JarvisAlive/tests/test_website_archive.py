@@ -0,0 +1,179 @@
+"""Tests for streaming ZIP / tar.gz export of generated websites."""
+
+import copy
+import io
+import os
+import sys
+import tarfile
+import threading
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from departments.website.site_archive import SiteArchive
+from departments.website.website_generator_agent import WebsiteGeneratorAgent, WebsiteResult
+
+
+REQUIREMENTS = {"brand_name": "Northwind", "business_idea": "Developer tools for data teams", "industry": "tech"}
+
+
+def make_agent(tmp_path, **config):
+    config = {"website_outputs_dir": str(tmp_path), "export_formats": ["json", "html", "react"], **config}
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": ""}):
+        return WebsiteGeneratorAgent(config)
+
+
+def make_site(agent, pages):
+    site = agent._generate_fallback_website(REQUIREMENTS)
+    template = site.website_structure[0]
+    structure = [{**copy.deepcopy(template), "page": f"Page {i}",
+                  "sections": [dict(section, subheadline=f"Page {i} {section.get('id')}") for section in template["sections"]] * 8}
+                 for i in range(pages)]
+    return WebsiteResult(
+        sitemap=[page["page"] for page in structure],
+        website_structure=structure,
+        homepage=site.homepage,
+        style_guide=site.style_guide
+    )
+
+
+async def consume(stream):
+    """Drain an archive stream: (time to first chunk, total bytes, peak traced memory)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    first, total = None, 0
+    async for chunk in stream:
+        if first is None and chunk:
+            first = time.perf_counter() - start
+        total += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, elapsed, total, peak
+
+
+class TestSiteArchive:
+
+    @pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+    def test_round_trip(self, archive_format):
+        archive = SiteArchive(archive_format)
+        chunks = [archive.add("site/index.html", "<h1>Hi</h1>"), archive.add("site/logo.bin", b"\x00\x01")]
+        chunks.append(archive.close())
+        data = b"".join(chunks)
+
+        if archive_format == "zip":
+            assert chunks[0]  # Entries are emitted as they are added
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                assert zf.testzip() is None
+                assert zf.read("site/index.html") == b"<h1>Hi</h1>"
+                assert zf.read("site/logo.bin") == b"\x00\x01"
+        else:
+            with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tf:
+                assert tf.extractfile("site/index.html").read() == b"<h1>Hi</h1>"
+                assert tf.extractfile("site/logo.bin").read() == b"\x00\x01"
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            SiteArchive("rar")
+
+
+class TestStreamingExport:
+
+    @pytest.mark.asyncio
+    async def test_archive_matches_saved_outputs(self, tmp_path):
+        agent = make_agent(tmp_path)
+        site = make_site(agent, 5)
+        saved = await agent._save_website_outputs(site, REQUIREMENTS)
+        base_name = Path(saved["html"]).name[:-len("_site")]
+
+        data = b"".join([chunk async for chunk in agent.stream_website_archive(site, REQUIREMENTS, base_name=base_name)])
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            names = set(zf.namelist())
+            on_disk = {p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if p.is_file()}
+            assert names == on_disk
+            for name in names:
+                if not name.endswith((".json", "README.md")):  # Both embed a generation timestamp
+                    assert zf.read(name) == (tmp_path / name).read_bytes(), name
+
+    @pytest.mark.asyncio
+    async def test_archive_export_format_streams_to_disk(self, tmp_path):
+        agent = make_agent(tmp_path, export_formats=["html", "archive"], archive_format="tar.gz")
+        saved = await agent._save_website_outputs(make_site(agent, 3), REQUIREMENTS)
+
+        assert saved["archive"].endswith(".tar.gz")
+        with tarfile.open(saved["archive"], mode="r:gz") as tf:
+            assert sum(name.endswith(".html") for name in tf.getnames()) == 4
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_renders_and_compresses_off_the_event_loop(self, tmp_path):
+        agent = make_agent(tmp_path, export_formats=["html"])
+        agent.fragment_cache = type(agent.fragment_cache)(max_entries=0)  # Render every file
+        threads = set()
+        render_page, add = agent._generate_html_page, SiteArchive.add
+
+        def recording_render(*args):
+            threads.add(threading.get_ident())
+            return render_page(*args)
+
+        def recording_add(archive, *args):
+            threads.add(threading.get_ident())
+            return add(archive, *args)
+
+        with patch.object(agent, "_generate_html_page", recording_render), \
+                patch.object(SiteArchive, "add", recording_add):
+            data = b"".join([chunk async for chunk in agent.stream_website_archive(make_site(agent, 3), REQUIREMENTS)])
+
+        assert threads and threading.get_ident() not in threads
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert sum(name.endswith(".html") for name in zf.namelist()) == 4
+
+    @pytest.mark.asyncio
+    async def test_flat_memory_and_first_byte_after_first_page(self, tmp_path):
+        agent = make_agent(tmp_path, export_formats=["html"])
+        results = {}
+        for pages in (50, 500):
+            site = make_site(agent, pages)
+            agent.fragment_cache = type(agent.fragment_cache)(max_entries=0)  # Render every file
+            results[pages] = await consume(agent.stream_website_archive(site, REQUIREMENTS))
+
+        for pages, (first, elapsed, total, peak) in results.items():
+            print(f"✅ {pages} pages: first byte {first * 1e3:.1f}ms, total {elapsed * 1e3:.0f}ms, "
+                  f"{total / 1e6:.1f}MB streamed, peak memory {peak / 1e6:.2f}MB")
+
+        small, large = results[50], results[500]
+        assert large[2] > small[2] * 10
+        # Peak memory follows the largest page and the ZIP central directory (a few
+        # hundred bytes per entry), not the archive, which is never held in memory
+        assert large[3] < small[3] * 3
+        # The first bytes follow the first render, independent of site size
+        assert large[0] < large[1] / 20
+        assert large[0] < small[0] * 3 + 0.01
+
+
+class TestExportEndpoint:
+
+    def test_streams_archive_from_api_server(self, tmp_path):
+        from fastapi.testclient import TestClient
+        import api_server
+
+        agent = make_agent(tmp_path)
+        with patch.object(api_server, "website_agent", agent):
+            client = TestClient(api_server.app)
+            response = client.post("/websites/export", json={"state": REQUIREMENTS, "formats": ["html"]})
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/zip"
+            assert "chunked" in response.headers.get("transfer-encoding", "chunked")
+            assert response.headers["content-disposition"].endswith('.zip"')
+            with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+                assert any(name.endswith("_site/index.html") for name in zf.namelist())
+
+            assert client.post("/websites/export", json={"state": REQUIREMENTS, "archive_format": "rar"}).status_code == 400
+            assert client.post("/websites/export", json={"state": {}}).status_code == 400
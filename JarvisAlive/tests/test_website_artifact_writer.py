@@ -0,0 +1,146 @@
+"""Tests for non-blocking, atomic website artifact writes."""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from departments.website.artifact_writer import ArtifactWriter
+from departments.website.website_generator_agent import WebsiteGeneratorAgent, WebsiteResult
+
+
+def make_agent(tmp_path, **config):
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": ""}):
+        return WebsiteGeneratorAgent({"website_outputs_dir": str(tmp_path), **config})
+
+
+def large_site(agent, pages):
+    site = agent._generate_fallback_website({
+        "brand_name": "Northwind",
+        "business_idea": "Developer tools for data teams",
+        "industry": "tech"
+    })
+    template = site.website_structure[0]
+    sections = template["sections"] * 4
+    structure = [{**template, "page": f"Page {i}", "sections": sections} for i in range(pages)]
+    return WebsiteResult(
+        sitemap=[page["page"] for page in structure],
+        website_structure=structure,
+        homepage=site.homepage,
+        style_guide=site.style_guide
+    )
+
+
+async def loop_lags(work, interval=0.001):
+    """Run ``work`` while a probe task measures how late the loop wakes it; returns the sorted lags"""
+    lags, done = [], False
+
+    async def probe():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(interval * 2)
+    try:
+        result = await work()
+    finally:
+        done = True
+        await probe_task
+    return sorted(lags), result
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+class TestArtifactWriter:
+
+    @pytest.mark.asyncio
+    async def test_writes_atomically_and_creates_directories_once(self, tmp_path):
+        writer = ArtifactWriter(max_workers=4)
+        files = {tmp_path / "site" / "nested" / f"page_{i}.html": f"<p>{i}</p>" for i in range(50)}
+        files[tmp_path / "site" / "logo.bin"] = b"\x89PNG"
+
+        original_mkdir = Path.mkdir
+        with patch.object(Path, "mkdir", autospec=True, side_effect=original_mkdir) as mkdir:
+            await writer.write_many(files)
+            await writer.write(tmp_path / "site" / "nested" / "page_0.html", "<p>replaced</p>")
+        writer.close()
+
+        assert len(mkdir.call_args_list) <= writer.max_workers + 1
+        assert (tmp_path / "site" / "nested" / "page_0.html").read_text() == "<p>replaced</p>"
+        assert (tmp_path / "site" / "nested" / "page_7.html").read_text() == "<p>7</p>"
+        assert (tmp_path / "site" / "logo.bin").read_bytes() == b"\x89PNG"
+        assert not list(tmp_path.rglob("*.tmp"))
+        assert writer.files_written == 52
+
+    @pytest.mark.asyncio
+    async def test_failed_write_leaves_no_partial_file(self, tmp_path):
+        writer = ArtifactWriter()
+        target = tmp_path / "index.html"
+        target.write_text("previous")
+
+        with patch("os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                await writer.write_many({target: "new", tmp_path / "other.html": "other"})
+        writer.close()
+
+        assert target.read_text() == "previous"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["index.html"]
+
+
+class TestWebsiteGeneratorOutputs:
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive_during_500_page_site(self, tmp_path):
+        agent = make_agent(tmp_path / "async")
+        site = large_site(agent, 500)
+
+        lags, site_dir = await loop_lags(lambda: agent._save_html_output(site, {}, "northwind"))
+        agent.artifact_writer.close()
+
+        def write_synchronously():
+            # The previous implementation: open()/write() for each page on the loop
+            site_dir = tmp_path / "sync"
+            site_dir.mkdir()
+            for page in site.website_structure:
+                with open(site_dir / f"{page['page']}.html", "w", encoding="utf-8") as f:
+                    f.write(agent._generate_html_page(page, site))
+
+        async def sync_work():
+            write_synchronously()
+
+        sync_lags, _ = await loop_lags(sync_work)
+        lag = percentile(lags, 0.99)
+        print(f"✅ p99 loop lag writing 500 pages: {lag * 1e3:.2f}ms, max {lags[-1] * 1e3:.2f}ms "
+              f"(synchronous writes: {sync_lags[-1] * 1e3:.1f}ms)")
+
+        written = list(Path(site_dir).glob("*.html"))
+        assert len(written) == 501  # Pages plus index.html
+        assert (Path(site_dir) / "styles.css").exists()
+        assert not list(Path(site_dir).glob("*.tmp"))
+        # p99 rather than max: a single wakeup can run late on a busy host even with an idle loop
+        assert lag < 0.005
+
+    @pytest.mark.asyncio
+    async def test_all_formats_written(self, tmp_path):
+        agent = make_agent(tmp_path, export_formats=["json", "html", "react"])
+        site = large_site(agent, 3)
+        saved = await agent._save_website_outputs(site, {"brand_name": "Northwind"})
+        agent.artifact_writer.close()
+
+        assert set(saved) == {"json", "html", "react"}
+        react_dir = Path(saved["react"])
+        assert {p.relative_to(react_dir).as_posix() for p in react_dir.rglob("*")} == {
+            "package.json", "vite.config.js", "index.html", "README.md",
+            "src", "src/main.jsx", "src/App.jsx", "src/index.css", "src/components"
+        }
+        assert '"sitemap"' in Path(saved["json"]).read_text(encoding="utf-8")
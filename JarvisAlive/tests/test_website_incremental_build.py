@@ -0,0 +1,189 @@
+"""Tests for incremental, content-hashed website regeneration."""
+
+import copy
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from departments.website.artifact_writer import ArtifactWriter
+from departments.website.site_build import FragmentCache, SiteBuild, fingerprint
+from departments.website.website_generator_agent import WebsiteGeneratorAgent, WebsiteResult
+
+
+REQUIREMENTS = {"brand_name": "Northwind", "business_idea": "Developer tools for data teams", "industry": "tech"}
+
+
+def make_agent(tmp_path, **config):
+    config = {"website_outputs_dir": str(tmp_path), "incremental_builds": True,
+              "export_formats": ["json", "html", "react"], **config}
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": ""}):
+        return WebsiteGeneratorAgent(config)
+
+
+def make_site(agent, pages=50):
+    site = agent._generate_fallback_website(REQUIREMENTS)
+    template = site.website_structure[0]
+    structure = [{**copy.deepcopy(template), "page": f"Page {i}"} for i in range(pages)]
+    return WebsiteResult(
+        sitemap=[page["page"] for page in structure],
+        website_structure=structure,
+        homepage=site.homepage,
+        style_guide=site.style_guide
+    )
+
+
+async def build(agent, site):
+    """Save all formats, counting calls to each page renderer"""
+    counts = {}
+
+    def counting(name):
+        original = getattr(agent, name)
+
+        def wrapper(*args, **kwargs):
+            counts[name] = counts.get(name, 0) + 1
+            return original(*args, **kwargs)
+        return wrapper
+
+    renderers = ["_generate_css", "_generate_html_page", "_generate_index_html",
+                 "_generate_react_app", "_generate_react_css"]
+    with patch.multiple(agent, **{name: counting(name) for name in renderers}):
+        saved = await agent._save_website_outputs(site, REQUIREMENTS)
+    return saved, counts, agent.last_build_report
+
+
+def untimed(paths):
+    """Paths other than the README, whose to-the-second timestamp changes between most builds"""
+    return [path for path in paths if path != "README.md"]
+
+
+def mtimes(directory):
+    return {p.name: p.stat().st_mtime_ns for p in Path(directory).iterdir()}
+
+
+class TestIncrementalRegeneration:
+
+    @pytest.mark.asyncio
+    async def test_one_page_edit_renders_and_writes_only_that_page(self, tmp_path):
+        # Separate agents so the in-memory fragment cache does not hide the renders
+        site = make_site(make_agent(tmp_path))
+        saved, counts, report = await build(make_agent(tmp_path), site)
+        assert counts["_generate_html_page"] == 50
+        assert len(report["html"]["written"]) == 52  # Pages, index.html and styles.css
+        before = mtimes(saved["html"])
+
+        # Rebuild with no changes: nothing rendered or written but the generation timestamps
+        blueprint = json.loads(Path(saved["json"]).read_text())
+        saved_again, counts, report = await build(make_agent(tmp_path), site)
+        assert saved_again == saved
+        assert counts == {}
+        assert report["html"]["written"] == []
+        assert report["json"]["written"] == ["website_northwind.json"]
+        assert untimed(report["react"]["written"]) == []
+        assert not any(r["removed"] for r in report.values())
+        rebuilt = json.loads(Path(saved["json"]).read_text())
+        assert rebuilt["metadata"]["generated_at"] > blueprint["metadata"]["generated_at"]
+        assert rebuilt["website_results"] == blueprint["website_results"]
+
+        # Edit one page
+        site.website_structure[17]["sections"][0]["subheadline"] = "Now with streaming pipelines"
+        _, counts, report = await build(make_agent(tmp_path), site)
+        assert counts == {"_generate_html_page": 1}
+        assert report["html"]["written"] == ["page_17.html"]
+        assert report["json"]["written"] == ["website_northwind.json"]
+        assert untimed(report["react"]["written"]) == []
+        after = mtimes(saved["html"])
+        assert {name for name in after if after[name] != before.get(name)} == {"page_17.html", ".build-manifest.json"}
+        assert "streaming pipelines" in (Path(saved["html"]) / "page_17.html").read_text()
+
+        manifest = json.loads((Path(saved["html"]) / ".build-manifest.json").read_text())
+        assert manifest["last_build"]["written"] == ["page_17.html"]
+        assert len(manifest["files"]) == 52
+
+    @pytest.mark.asyncio
+    async def test_dependents_follow_their_inputs(self, tmp_path):
+        site = make_site(make_agent(tmp_path), pages=10)
+        saved, _, _ = await build(make_agent(tmp_path), site)
+
+        # Colors only feed the stylesheets
+        site.style_guide["colors"] = ["#000000", "#FFFFFF", "#10B981", "#F59E0B"]
+        _, counts, report = await build(make_agent(tmp_path), site)
+        assert counts == {"_generate_css": 1, "_generate_react_css": 1}
+        assert report["html"]["written"] == ["styles.css"]
+        assert untimed(report["react"]["written"]) == ["src/index.css"]
+
+        # A new page changes the navigation of every page
+        site.website_structure.append({**copy.deepcopy(site.website_structure[0]), "page": "Careers"})
+        site.sitemap.append("Careers")
+        _, counts, report = await build(make_agent(tmp_path), site)
+        assert counts == {"_generate_html_page": 11, "_generate_index_html": 1}
+
+        # A removed page is deleted from disk
+        del site.website_structure[3]
+        site.sitemap.remove("Page 3")
+        _, _, report = await build(make_agent(tmp_path), site)
+        assert report["html"]["removed"] == ["page_3.html"]
+        assert not (Path(saved["html"]) / "page_3.html").exists()
+
+    @pytest.mark.asyncio
+    async def test_deleted_output_is_rewritten(self, tmp_path):
+        site = make_site(make_agent(tmp_path), pages=5)
+        saved, _, _ = await build(make_agent(tmp_path), site)
+        (Path(saved["html"]) / "page_2.html").unlink()
+
+        _, counts, report = await build(make_agent(tmp_path), site)
+        assert report["html"]["written"] == ["page_2.html"]
+        assert (Path(saved["html"]) / "page_2.html").exists()
+
+    @pytest.mark.asyncio
+    async def test_fragments_memoized_across_sites(self, tmp_path):
+        agent = make_agent(tmp_path)
+        site = make_site(agent, pages=5)
+        await build(agent, site)
+        _, counts, report = await build(agent, site)
+        assert counts == {}
+
+        # Same content into a fresh directory: written, but not rendered again
+        agent.outputs_dir = tmp_path / "mirror"
+        _, counts, report = await build(agent, site)
+        assert counts == {}
+        assert len(report["html"]["written"]) == 7
+        assert agent.fragment_cache.hits >= 7
+
+
+class TestSiteBuild:
+
+    @pytest.mark.asyncio
+    async def test_identical_render_not_rewritten(self, tmp_path):
+        writer = ArtifactWriter()
+        first = SiteBuild(tmp_path, writer, incremental=True)
+        await first.start()
+        first.add("a.txt", "text", fingerprint("v1"), lambda: "same")
+        await first.finish()
+
+        # Inputs changed, rendered bytes did not
+        second = SiteBuild(tmp_path, writer, incremental=True)
+        await second.start()
+        second.add("a.txt", "text", fingerprint("v2"), lambda: "same")
+        report = await second.finish()
+        writer.close()
+        assert report["rendered"] == ["a.txt"] and report["written"] == [] and report["unchanged"] == ["a.txt"]
+
+    def test_fragment_cache_lru(self):
+        cache = FragmentCache(max_entries=2)
+        cache.put("page", "a", "A")
+        cache.put("page", "b", "B")
+        assert cache.get("page", "a") == "A"
+        cache.put("page", "c", "C")
+        assert cache.get("page", "b") is None
+        assert cache.get("css", "a") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_fingerprint_is_order_independent_for_dicts(self):
+        assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+        assert fingerprint({"a": 1}) != fingerprint({"a": 2})
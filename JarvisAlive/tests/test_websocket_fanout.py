@@ -0,0 +1,192 @@
+"""Tests for serialize-once WebSocket fan-out with per-connection outbound queues."""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation.websocket_fanout import SlowConsumerPolicy, drain_all
+from conversation.websocket_handler import MessageType, OperatingMode, WebSocketHandler, WebSocketMessage
+
+
+class FakeSocket:
+    """In-process socket; a gated socket blocks in send() until released."""
+
+    def __init__(self, gated=False, fail=False):
+        self.messages = []
+        self.closed = False
+        self.fail = fail
+        self.gate = asyncio.Event()
+        if not gated:
+            self.gate.set()
+
+    async def send(self, data):
+        await self.gate.wait()
+        if self.fail:
+            raise ConnectionError("client went away")
+        self.messages.append(json.loads(data))
+
+    async def close(self):
+        self.closed = True
+
+
+def message(content, message_type=MessageType.AGENT_STATUS, **details):
+    return WebSocketMessage(
+        id=content,
+        type=message_type,
+        mode=OperatingMode.HYBRID,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        content=content,
+        details=details
+    )
+
+
+async def connect(handler, sockets, session_id="session"):
+    ids = []
+    for socket in sockets:
+        conn_id = await handler.add_connection(socket, mode=OperatingMode.JARVIS)
+        await handler.subscribe_to_session(conn_id, session_id)
+        ids.append(conn_id)
+    await handler.flush()
+    for socket in sockets:
+        socket.messages.clear()  # Welcome messages
+    return ids
+
+
+async def stalled_connection(handler, socket, session_id="session"):
+    """Connect a gated socket; the welcome message occupies its writer until released."""
+    conn_id = await handler.add_connection(socket, mode=OperatingMode.JARVIS)
+    await handler.subscribe_to_session(conn_id, session_id)
+    await asyncio.sleep(0)
+    return conn_id
+
+
+class TestFanOut:
+
+    @pytest.mark.asyncio
+    async def test_stalled_client_does_not_delay_broadcast(self):
+        async def broadcast_latencies(stalled):
+            handler = WebSocketHandler(max_queue_size=64)
+            sockets = [FakeSocket() for _ in range(999)]
+            healthy_writers = [handler.writers[c] for c in await connect(handler, sockets)]
+            if stalled:
+                await stalled_connection(handler, FakeSocket(gated=True))
+
+            latencies, deliveries = [], []
+            for i in range(50):
+                start = time.perf_counter()
+                await handler.broadcast_to_session("session", message(f"update {i}"))
+                latencies.append(time.perf_counter() - start)
+                assert await drain_all(healthy_writers, timeout=1)
+                deliveries.append(time.perf_counter() - start)
+
+            assert all([m["content"] for m in s.messages] == [f"update {i}" for i in range(50)] for s in sockets)
+            await handler.stop()
+            return statistics.median(latencies), statistics.median(deliveries)
+
+        healthy = await broadcast_latencies(stalled=False)
+        with_stalled = await broadcast_latencies(stalled=True)
+        print(f"✅ Broadcast to 1,000 sockets: {healthy[0] * 1e3:.2f}ms (all healthy), "
+              f"{with_stalled[0] * 1e3:.2f}ms (one stalled); delivery {healthy[1] * 1e3:.1f}ms / "
+              f"{with_stalled[1] * 1e3:.1f}ms")
+        assert with_stalled[0] < healthy[0] * 2 + 0.002
+        assert with_stalled[1] < healthy[1] * 2 + 0.01
+
+    @pytest.mark.asyncio
+    async def test_message_encoded_once_per_broadcast(self):
+        handler = WebSocketHandler()
+        await connect(handler, [FakeSocket() for _ in range(20)])
+        with patch.object(WebSocketMessage, "to_json", autospec=True, side_effect=WebSocketMessage.to_json) as to_json:
+            await handler.broadcast_to_session("session", message("once"))
+            await handler.broadcast_all(message("all"))
+        assert to_json.call_count == 2
+        await handler.stop()
+
+    @pytest.mark.asyncio
+    async def test_mode_filtering_preserved(self):
+        handler = WebSocketHandler()
+        builder, jarvis = FakeSocket(), FakeSocket()
+        for socket, mode in ((builder, OperatingMode.AGENT_BUILDER), (jarvis, OperatingMode.JARVIS)):
+            conn_id = await handler.add_connection(socket, mode=mode)
+            await handler.subscribe_to_session(conn_id, "session")
+        await handler.send_agent_created("session", {"name": "Lead Scanner"})
+        await handler.send_department_activated("session", "Sales", 4)
+        await handler.flush()
+        assert [m["type"] for m in builder.messages] == ["agent_status", "agent_created"]
+        assert [m["type"] for m in jarvis.messages] == ["agent_status", "department_activated"]
+        await handler.stop()
+
+
+class TestSlowConsumerPolicies:
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        handler = WebSocketHandler(max_queue_size=4, slow_consumer_policy=SlowConsumerPolicy.DROP_OLDEST)
+        socket = FakeSocket(gated=True)
+        conn_id = await stalled_connection(handler, socket)
+        for i in range(10):
+            await handler.broadcast_to_session("session", message(f"m{i}"))
+        assert handler.get_connection_stats()[conn_id]["dropped"] == 6
+
+        socket.gate.set()
+        await handler.flush(timeout=1)
+        assert [m["content"] for m in socket.messages[1:]] == ["m6", "m7", "m8", "m9"]
+        await handler.stop()
+
+    @pytest.mark.asyncio
+    async def test_coalesce_progress_updates(self):
+        handler = WebSocketHandler(max_queue_size=4, slow_consumer_policy=SlowConsumerPolicy.COALESCE)
+        socket = FakeSocket(gated=True)
+        await stalled_connection(handler, socket)
+        await handler.send_business_insight("session", "Pipeline is growing", "sales")
+        for progress in range(0, 101, 10):
+            await handler.send_workflow_progress("session", "Lead scan", progress, f"step {progress}")
+            await handler.send_workflow_progress("session", "Outreach", progress // 2, "composing")
+        await handler.send_kpi_alert("session", "reply_rate", "drop", "Reply rate fell")
+
+        socket.gate.set()
+        await handler.flush(timeout=1)
+        received = [(m["type"], (m["details"] or {}).get("workflow"), (m["details"] or {}).get("progress"))
+                    for m in socket.messages[1:]]
+        assert received == [
+            ("business_insight", None, None),
+            ("workflow_progress", "Lead scan", 100),
+            ("workflow_progress", "Outreach", 50),
+            ("kpi_alert", None, None),
+        ]
+        await handler.stop()
+
+    @pytest.mark.asyncio
+    async def test_disconnect(self):
+        handler = WebSocketHandler(max_queue_size=4, slow_consumer_policy=SlowConsumerPolicy.DISCONNECT)
+        healthy, stalled = FakeSocket(), FakeSocket(gated=True)
+        await connect(handler, [healthy])
+        conn_id = await stalled_connection(handler, stalled)
+        for i in range(6):
+            await handler.broadcast_to_session("session", message(f"m{i}"))
+            await asyncio.sleep(0)  # The healthy client keeps up
+
+        assert conn_id not in handler.connections and conn_id not in handler.writers
+        assert conn_id not in handler.subscriptions["session"]
+        assert stalled.closed and handler.disconnected_slow_consumers == 1
+        await handler.flush(timeout=1)
+        assert len(healthy.messages) == 6
+        await handler.stop()
+
+    @pytest.mark.asyncio
+    async def test_send_error_removes_connection(self):
+        handler = WebSocketHandler()
+        conn_id = await handler.add_connection(FakeSocket(fail=True), mode=OperatingMode.JARVIS)
+        await handler.subscribe_to_session(conn_id, "session")
+        await handler.flush(timeout=1)
+        await asyncio.sleep(0)
+        assert conn_id not in handler.connections
+        assert "session" not in handler.subscriptions
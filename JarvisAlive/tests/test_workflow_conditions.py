@@ -0,0 +1,166 @@
+"""Tests for the compiled workflow condition language."""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from departments.sales.workflow_conditions import ConditionError, compile_condition
+from departments.sales.workflow_orchestrator import (
+    WorkflowOrchestrator, WorkflowStep, WorkflowStepStatus, WorkflowStepType, WorkflowTemplate
+)
+
+
+class Lead:
+    def __init__(self, score, company):
+        self.score = score
+        self.company = company
+        self._secret = "hidden"
+
+
+CONTEXT = {
+    "responses": 3,
+    "leads": [1, 2],
+    "stage": "qualified",
+    "lead": Lead(82, {"industry": "saas", "employees": 250}),
+    "flags": {"vip": True},
+}
+
+
+def template_with(condition, template_id="conditional"):
+    return WorkflowTemplate(
+        template_id=template_id,
+        name="Conditional",
+        description="Conditional step",
+        category="outreach",
+        steps=[WorkflowStep(
+            step_id="gated",
+            name="Gated",
+            step_type=WorkflowStepType.CUSTOM,
+            agent_class="None",
+            function_name="run",
+            condition=condition,
+            estimated_duration=1
+        )]
+    )
+
+
+class TestGrammar:
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("responses > 0", True),
+        ("responses >= 3 and responses < 4", True),
+        ("0 < responses <= 2", False),
+        ("1 < 2 < responses", True),
+        ("stage == 'qualified'", True),
+        ("stage != 'qualified' or flags.vip", True),
+        ("not flags.vip", False),
+        ("stage in ['qualified', 'won']", True),
+        ("stage not in ('lost', 'won')", True),
+        ("'saas' in {'saas', 'fintech'}", True),
+        ("lead.score >= 80 and lead.company.industry == 'saas'", True),
+        ("lead.company.employees > -1", True),
+        ("len(leads) == 2", True),
+        ("len(missing) > 0", False),
+        ("missing is None", True),
+        ("lead.company.missing.deeper is None", True),
+        ("missing > 0", False),
+        ("missing < 0", False),
+        ("'x' in missing", False),
+        ("responses in [1, responses]", True),
+        ("True", True),
+        ("0", False),
+    ])
+    def test_evaluates(self, expression, expected):
+        assert compile_condition(expression)(CONTEXT) is expected
+
+    @pytest.mark.parametrize("expression", [
+        "__import__('os').system('true')",
+        "lead.__class__",
+        "lead._secret",
+        "_private",
+        "context.get('responses', 0) > 0",
+        "len(leads, 2)",
+        "open('x')",
+        "(lambda: 1)()",
+        "[x for x in leads]",
+        "leads[0]",
+        "responses + 1 > 2",
+        "f'{stage}' == 'x'",
+        "responses if stage else 0",
+        "b'bytes'",
+        "stage = 1",
+        "responses >",
+        "",
+        pytest.param("x" * 2000, id="too_long"),
+    ])
+    def test_rejects_outside_grammar(self, expression):
+        with pytest.raises(ConditionError):
+            compile_condition(expression)
+
+    def test_error_points_at_offending_syntax(self):
+        with pytest.raises(ConditionError, match="column 13"):
+            compile_condition("responses > lead.__class__")
+
+
+class TestOrchestratorIntegration:
+
+    def test_invalid_condition_rejected_at_registration(self):
+        orchestrator = WorkflowOrchestrator()
+        with pytest.raises(ConditionError, match="Step 'gated' of template 'broken'"):
+            orchestrator.create_template(template_with("__import__('os')", "broken"))
+        assert "broken" not in orchestrator.templates
+
+    def test_conditions_compiled_once_per_template(self):
+        orchestrator = WorkflowOrchestrator()
+        orchestrator.create_template(template_with("responses > 0"))
+        condition = orchestrator.compiled_conditions["conditional"]["gated"]
+        assert condition({"responses": 1}) and not condition({})
+        assert set(orchestrator.compiled_conditions["lead_generation_basic"]) == {"enrich_high_value"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("responses, status", [(0, WorkflowStepStatus.SKIPPED),
+                                                   (2, WorkflowStepStatus.COMPLETED)])
+    async def test_step_gated_by_context(self, responses, status):
+        orchestrator = WorkflowOrchestrator()
+        orchestrator.create_template(template_with("responses > 0"))
+        execution_id = await orchestrator.execute_workflow("conditional")
+        execution = orchestrator.executions[execution_id]
+        execution.context_data["responses"] = responses  # As if set by an earlier step
+        await orchestrator.active_executions[execution_id]
+        assert execution.step_results["gated"].status == status
+
+    def test_runtime_error_defaults_to_true(self):
+        orchestrator = WorkflowOrchestrator()
+        assert orchestrator._evaluate_condition("stage > 3", {"stage": "qualified"}) is True
+        with pytest.raises(ConditionError):
+            orchestrator._evaluate_condition("import os", {})
+
+
+class TestBenchmark:
+
+    def test_at_least_10x_faster_than_eval(self):
+        expression = "responses > 0 and stage in ['qualified', 'won'] and len(leads) >= 2"
+        compiled = compile_condition(expression)
+        context = {"responses": 3, "stage": "qualified", "leads": [1, 2]}
+        eval_context = dict(context, len=len)
+        assert compiled(context) is bool(eval(expression, {"__builtins__": {}}, eval_context))
+
+        def best_of(function, runs=5, iterations=20_000):
+            best = float("inf")
+            for _ in range(runs):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    function()
+                best = min(best, time.perf_counter() - start)
+            return best / iterations
+
+        # The previous implementation parsed and evaluated the string on every call
+        eval_time = best_of(lambda: eval(expression, {"__builtins__": {}}, eval_context))
+        compiled_time = best_of(lambda: compiled(context))
+        print(f"✅ Condition: eval {eval_time * 1e6:.2f}µs, compiled {compiled_time * 1e6:.2f}µs "
+              f"({eval_time / compiled_time:.0f}x)")
+        assert compiled_time * 10 < eval_time
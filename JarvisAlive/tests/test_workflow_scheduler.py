@@ -0,0 +1,219 @@
+"""Tests for the event-driven DAG scheduler in WorkflowOrchestrator."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from departments.sales.workflow_orchestrator import (
+    WorkflowOrchestrator, WorkflowPriority, WorkflowStep, WorkflowStepStatus, WorkflowStepType, WorkflowTemplate
+)
+
+
+UNIT = 0.05  # Seconds per estimated_duration unit
+
+
+class SleepAgent:
+    """Sleeps for the step's estimated duration and records start/finish order."""
+
+    def __init__(self):
+        self.started = []
+        self.finished = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def run(self, step_id, units, context, fail=False, cleanup=0):
+        self.started.append(step_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(units * UNIT)
+            if fail:
+                raise RuntimeError(f"{step_id} failed")
+        finally:
+            await asyncio.sleep(cleanup * UNIT)
+            self.in_flight -= 1
+        self.finished.append(step_id)
+        return {f"{step_id}_done": True}
+
+
+def step(step_id, units, dependencies=(), **kwargs):
+    parameters = {"step_id": step_id, "units": units}
+    parameters.update(kwargs.pop("parameters", {}))
+    return WorkflowStep(
+        step_id=step_id,
+        name=step_id,
+        step_type=WorkflowStepType.CUSTOM,
+        agent_class="SleepAgent",
+        function_name="run",
+        parameters=parameters,
+        dependencies=list(dependencies),
+        estimated_duration=units,
+        retry_count=0,
+        retry_delay=0,
+        **kwargs
+    )
+
+
+async def run_template(template, config=None):
+    orchestrator = WorkflowOrchestrator(config)
+    agent = SleepAgent()
+    orchestrator.register_agent("SleepAgent", agent)
+    orchestrator.create_template(template)
+    execution_id = await orchestrator.execute_workflow(template.template_id)
+    start = time.perf_counter()
+    await orchestrator.active_executions[execution_id]
+    elapsed = time.perf_counter() - start
+    return orchestrator.executions[execution_id], agent, elapsed
+
+
+def round_based_makespan(template):
+    """Makespan of the previous scheduler: each round waits for its slowest step"""
+    steps = {s.step_id: s for s in template.steps}
+    done, total = set(), 0
+    while len(done) < len(steps):
+        ready = [s for s in steps.values() if s.step_id not in done and all(d in done for d in s.dependencies)]
+        total += max(s.estimated_duration for s in ready)
+        done.update(s.step_id for s in ready)
+    return total
+
+
+class TestEventDrivenScheduling:
+
+    @pytest.mark.asyncio
+    async def test_skewed_durations_finish_near_critical_path(self):
+        # A slow enrichment branch next to a chain of quick outreach steps; the
+        # round-based scheduler stalls every quick step behind the slow one
+        chain = [step("compose_1", 1, ["scan"])] + [
+            step(f"compose_{i}", 1, [f"compose_{i - 1}"]) for i in range(2, 9)
+        ]
+        template = WorkflowTemplate(
+            template_id="skewed",
+            name="Skewed",
+            description="Skewed step durations",
+            category="outreach",
+            steps=[
+                step("scan", 1),
+                step("enrich", 8, ["scan"]),
+                step("slow_a", 6, ["compose_1"]),
+                *chain,
+                step("report", 1, ["enrich", "compose_8", "slow_a"]),
+            ]
+        )
+
+        execution, agent, elapsed = await run_template(template)
+
+        critical_path = template.estimated_total_duration * UNIT
+        rounds = round_based_makespan(template) * UNIT
+        print(f"✅ Makespan {elapsed:.2f}s: critical path {critical_path:.2f}s, round-based {rounds:.2f}s")
+
+        assert execution.status == WorkflowStepStatus.COMPLETED
+        assert all(r.status == WorkflowStepStatus.COMPLETED for r in execution.step_results.values())
+        assert agent.finished[-1] == "report"
+        assert elapsed < critical_path + 0.15
+        assert elapsed < rounds * 0.75
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_and_critical_path_priority(self):
+        # Independent roots whose downstream work differs; with one slot the
+        # root on the longest remaining path must start first
+        template = WorkflowTemplate(
+            template_id="capped",
+            name="Capped",
+            description="Concurrency cap",
+            category="outreach",
+            max_concurrent_steps=1,
+            steps=[
+                step("short_root", 1),
+                step("long_root", 1),
+                step("mid_root", 1, priority=WorkflowPriority.CRITICAL),
+                step("tail_long", 5, ["long_root"]),
+                step("tail_mid", 2, ["mid_root"]),
+                step("tie_low", 1, priority=WorkflowPriority.LOW),
+                step("tie_high", 1, priority=WorkflowPriority.HIGH),
+            ]
+        )
+        execution, agent, _ = await run_template(template)
+
+        assert agent.max_in_flight == 1
+        assert agent.started[:2] == ["long_root", "tail_long"]
+        assert agent.started.index("mid_root") < agent.started.index("short_root")
+        assert agent.started.index("tie_high") < agent.started.index("tie_low")
+
+    @pytest.mark.asyncio
+    async def test_config_cap(self):
+        template = WorkflowTemplate(
+            template_id="wide", name="Wide", description="Wide", category="outreach",
+            steps=[step(f"s{i}", 1) for i in range(10)]
+        )
+        execution, agent, elapsed = await run_template(template, {"max_concurrent_steps": 3})
+        assert agent.max_in_flight == 3
+        assert elapsed >= 4 * UNIT
+        assert execution.status == WorkflowStepStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_failed_and_skipped_steps_release_dependents(self):
+        template = WorkflowTemplate(
+            template_id="failing", name="Failing", description="Failing", category="outreach",
+            steps=[
+                step("flaky", 1, parameters={"fail": True}),
+                step("skipped", 1, condition="False"),
+                step("after", 1, ["flaky", "skipped"]),
+            ]
+        )
+        execution, agent, _ = await run_template(template)
+
+        assert execution.step_results["flaky"].status == WorkflowStepStatus.FAILED
+        assert execution.step_results["skipped"].status == WorkflowStepStatus.SKIPPED
+        assert execution.step_results["after"].status == WorkflowStepStatus.COMPLETED
+        assert execution.status == WorkflowStepStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_step_crash_fails_workflow_and_cancels_running_steps(self, monkeypatch):
+        template = WorkflowTemplate(
+            template_id="crash", name="Crash", description="Crash", category="outreach",
+            steps=[step("crash", 1), step("long", 20, parameters={"cleanup": 1}), step("after", 1, ["crash"])]
+        )
+        orchestrator = WorkflowOrchestrator()
+        agent = SleepAgent()
+        orchestrator.register_agent("SleepAgent", agent)
+        orchestrator.create_template(template)
+
+        original = orchestrator._execute_step
+
+        async def crashing(execution_id, workflow_step):
+            if workflow_step.step_id == "crash":
+                await asyncio.sleep(UNIT)
+                raise RuntimeError("scheduler-level failure")
+            return await original(execution_id, workflow_step)
+
+        monkeypatch.setattr(orchestrator, "_execute_step", crashing)
+        execution_id = await orchestrator.execute_workflow("crash")
+        start = time.perf_counter()
+        await orchestrator.active_executions[execution_id]
+
+        assert orchestrator.executions[execution_id].status == WorkflowStepStatus.FAILED
+        assert time.perf_counter() - start < 10 * UNIT
+        assert "long" not in agent.finished and "after" not in agent.started
+        assert agent.in_flight == 0  # Cancelled steps have unwound by the time the workflow ends
+
+    def test_remaining_paths(self):
+        template = WorkflowTemplate(
+            template_id="paths", name="Paths", description="Paths", category="outreach",
+            steps=[step("a", 2), step("b", 3, ["a"]), step("c", 1, ["a"]), step("d", 4, ["b", "c"])]
+        )
+        assert template.calculate_remaining_paths() == {"a": 9, "b": 7, "c": 5, "d": 4}
+        assert template.estimated_total_duration == 9
+
+    @pytest.mark.asyncio
+    async def test_default_templates_still_complete(self):
+        orchestrator = WorkflowOrchestrator()
+        execution_id = await orchestrator.execute_workflow("lead_generation_basic")
+        await orchestrator.active_executions[execution_id]
+        execution = orchestrator.executions[execution_id]
+        assert execution.status == WorkflowStepStatus.COMPLETED
+        assert len(execution.step_results) == len(orchestrator.templates["lead_generation_basic"].steps)